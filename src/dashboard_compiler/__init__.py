@@ -3,6 +3,7 @@
 from beartype import BeartypeConf
 from beartype.claw import beartype_this_package
 
+from dashboard_compiler.batch import compile_many, iter_compile
 from dashboard_compiler.dashboard_compiler import dump, load, render
 
 # Enable strict BearType checking:
@@ -16,7 +17,9 @@ beartype_this_package(
 )
 
 __all__ = [
+    'compile_many',
     'dump',
+    'iter_compile',
     'load',
     'render',
 ]
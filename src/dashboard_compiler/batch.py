@@ -0,0 +1,148 @@
+"""Compile many dashboards into a stream of NDJSON lines.
+
+Meant for scripts that generate dashboards in bulk. Sources are compiled as the lines are
+consumed, in order, either in the calling process or spread over a pool of processes, so
+memory stays bounded however many dashboards pass through.
+"""
+
+import io
+import itertools
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import yaml
+
+from dashboard_compiler.dashboard.config import Dashboard
+from dashboard_compiler.dashboard_compiler import load, render
+from dashboard_compiler.loader import DashboardConfig
+from dashboard_compiler.shared.errors import CompileError
+
+type DashboardSource = Path | str | Dashboard
+"""A YAML file, the YAML text of a dashboard file, or a Dashboard object."""
+
+BATCH_SIZE = 8
+"""Sources sent to a worker process at a time, to spread the cost of passing them between processes."""
+
+BATCHES_PER_WORKER = 2
+"""Batches in flight per worker process, enough to keep the workers busy without compiling far ahead of the consumer."""
+
+
+@dataclass(frozen=True)
+class _Compiled:
+    """The NDJSON lines of one source, or why it failed to compile."""
+
+    source: str
+    lines: list[str] = field(default_factory=list)
+    error: str | None = None
+
+
+def iter_compile(sources: Iterable[DashboardSource], workers: int = 1, errors: list[CompileError] | None = None) -> Iterator[str]:
+    """Compile dashboards lazily into NDJSON lines, one line per dashboard, in the order of the sources.
+
+    Sources are only read from the iterable as lines are consumed. With more than one worker,
+    a few batches of sources are compiled ahead in a pool of processes.
+
+    Args:
+        sources: Paths of YAML files, YAML text of dashboard files, or Dashboard objects.
+            Paths must be Path objects, as strings are read as YAML text.
+        workers: Number of processes to compile in, 1 compiles in the calling process.
+        errors: List to collect the sources that fail to compile in, which are then skipped.
+            If None, the first source that fails to compile raises.
+
+    Yields:
+        The NDJSON lines of the compiled dashboards.
+
+    Raises:
+        CompileError: If a source fails to compile and no error list is given.
+
+    """
+    numbered = enumerate(sources)
+    if workers <= 1:
+        for index, source in numbered:
+            yield from _lines(_compile_source(index, source), errors)
+        return
+
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        pending: deque[Future[list[_Compiled]]] = deque()
+        for batch in itertools.batched(numbered, BATCH_SIZE):
+            pending.append(pool.submit(_compile_batch, list(batch)))
+            if len(pending) >= workers * BATCHES_PER_WORKER:
+                yield from _batch_lines(pending.popleft(), errors)
+        while len(pending) > 0:
+            yield from _batch_lines(pending.popleft(), errors)
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+
+def compile_many(
+    sources: Iterable[DashboardSource], output: io.TextIOBase, workers: int = 1, errors: list[CompileError] | None = None
+) -> int:
+    """Compile dashboards and write them to an NDJSON file as they are compiled.
+
+    Args:
+        sources: Paths of YAML files, YAML text of dashboard files, or Dashboard objects, as for iter_compile.
+        output: Text file to write the NDJSON lines to.
+        workers: Number of processes to compile in, 1 compiles in the calling process.
+        errors: List to collect the sources that fail to compile in, which are then skipped.
+            If None, the first source that fails to compile raises.
+
+    Returns:
+        The number of dashboards written.
+
+    Raises:
+        CompileError: If a source fails to compile and no error list is given.
+
+    """
+    count = 0
+    for line in iter_compile(sources, workers=workers, errors=errors):
+        _ = output.write(line + '\n')
+        count += 1
+    return count
+
+
+def _batch_lines(future: Future[list[_Compiled]], errors: list[CompileError] | None) -> Iterator[str]:
+    for compiled in future.result():
+        yield from _lines(compiled, errors)
+
+
+def _lines(compiled: _Compiled, errors: list[CompileError] | None) -> Iterator[str]:
+    if compiled.error is None:
+        yield from compiled.lines
+        return
+    error = CompileError(compiled.source, compiled.error)
+    if errors is None:
+        raise error
+    errors.append(error)
+
+
+def _compile_batch(batch: list[tuple[int, DashboardSource]]) -> list[_Compiled]:
+    """Compile a batch of sources in a worker process."""
+    return [_compile_source(index, source) for index, source in batch]
+
+
+def _compile_source(index: int, source: DashboardSource) -> _Compiled:
+    """Compile the dashboards of a source, catching the errors so that they can be passed between processes."""
+    name = _source_name(index, source)
+    try:
+        if isinstance(source, Dashboard):
+            dashboards = [source]
+        elif isinstance(source, Path):
+            dashboards = load(str(source))
+        else:
+            dashboards = DashboardConfig.model_validate(yaml.safe_load(source)).dashboards
+        return _Compiled(source=name, lines=[render(dashboard).model_dump_json(by_alias=True) for dashboard in dashboards])
+    except (OSError, yaml.YAMLError, ValueError, TypeError, KeyError) as e:
+        return _Compiled(source=name, error=str(e))
+
+
+def _source_name(index: int, source: DashboardSource) -> str:
+    """Name a source in error messages."""
+    if isinstance(source, Dashboard):
+        return f'dashboard {source.name!r} (source {index})'
+    if isinstance(source, Path):
+        return str(source)
+    return f'YAML text (source {index})'
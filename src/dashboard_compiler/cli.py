@@ -3,16 +3,36 @@
 import asyncio
 import logging
 import webbrowser
+from collections.abc import AsyncIterator
 from pathlib import Path
 
 import aiohttp
 import rich_click as click
+import yaml
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.table import Table
 
+from dashboard_compiler.dashboard.config import Dashboard
 from dashboard_compiler.dashboard_compiler import load, render
-from dashboard_compiler.kibana_client import KibanaClient, SavedObjectError
+from dashboard_compiler.field_snapshot import FieldIndex, FieldIssue, FieldSnapshot, collect_field_references, referenced_data_views
+from dashboard_compiler.kibana_client import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_MAX_CONCURRENCY,
+    MANAGED_TAG_ID,
+    KibanaClient,
+    KibanaDataViewFields,
+    KibanaSavedObject,
+    KibanaSavedObjectsResponse,
+    KibanaScreenshotResult,
+    MissingReference,
+    SavedObjectError,
+    add_tag_reference,
+    managed_tag_ndjson,
+)
+from dashboard_compiler.kibana_targets import TargetUploadResult, load_targets, upload_to_targets
+from dashboard_compiler.schema import dashboard_schema_json, dashboard_schema_version
+from dashboard_compiler.upload_journal import UploadJournal
 
 click.rich_click.USE_RICH_MARKUP = True
 click.rich_click.SHOW_ARGUMENTS = True
@@ -27,12 +47,14 @@ PROJECT_ROOT = Path(__file__).parent.parent.parent
 DEFAULT_INPUT_DIR = PROJECT_ROOT / 'inputs'
 DEFAULT_SCENARIO_DIR = PROJECT_ROOT / 'tests/dashboards/scenarios'
 DEFAULT_OUTPUT_DIR = PROJECT_ROOT / 'output'
+DEFAULT_FIELDS_SNAPSHOT = DEFAULT_OUTPUT_DIR / 'fields_snapshot.json'
 
 ICON_SUCCESS = '✓'
 ICON_ERROR = '✗'
 ICON_WARNING = '⚠'
 ICON_UPLOAD = '📤'
 ICON_BROWSER = '🌐'
+ICON_DELETE = '🗑'
 
 
 def create_error_table(errors: list[SavedObjectError]) -> Table:
@@ -55,6 +77,31 @@ def create_error_table(errors: list[SavedObjectError]) -> Table:
     return error_table
 
 
+def create_missing_references_table(missing: list[MissingReference]) -> Table:
+    """Create a Rich table of the references that Kibana could not resolve, grouped by dashboard.
+
+    Args:
+        missing: Missing references found by the preflight check.
+
+    Returns:
+        A formatted Rich table with one row per dashboard and missing object.
+
+    """
+    table = Table(show_header=True, header_style='bold red')
+    table.add_column('Dashboard')
+    table.add_column('Type')
+    table.add_column('Missing ID', style='red')
+    table.add_column('Reason')
+
+    previous_dashboard: str | None = None
+    for reference in missing:
+        dashboard = reference.dashboard_id if reference.dashboard_id != previous_dashboard else ''
+        table.add_row(dashboard, reference.type, reference.id, reference.message)
+        previous_dashboard = reference.dashboard_id
+
+    return table
+
+
 def _extract_error_message(error: SavedObjectError) -> str:
     if error.error:
         message: str | None = error.error.get('message')
@@ -94,10 +141,7 @@ def compile_yaml_to_json(yaml_path: Path) -> tuple[list[str], str | None]:
     """
     try:
         dashboards = load(str(yaml_path))
-        json_lines: list[str] = []
-        for dashboard in dashboards:
-            dashboard_kbn_model = render(dashboard)
-            json_lines.append(dashboard_kbn_model.model_dump_json(by_alias=True))
+        json_lines = [dashboard_ndjson_line(dashboard) for dashboard in dashboards]
     except FileNotFoundError:
         return [], f'YAML file not found: {yaml_path}'
     except (ValueError, TypeError, KeyError) as e:
@@ -106,6 +150,32 @@ def compile_yaml_to_json(yaml_path: Path) -> tuple[list[str], str | None]:
         return json_lines, None
 
 
+def dashboard_ndjson_line(dashboard: Dashboard) -> str:
+    """Compile a dashboard into its line of the NDJSON output.
+
+    Args:
+        dashboard: The dashboard to compile.
+
+    Returns:
+        The compiled dashboard as a single line of JSON.
+
+    """
+    return render(dashboard).model_dump_json(by_alias=True)
+
+
+def find_yaml_files(directory: Path) -> list[Path]:
+    """Find all YAML files below a directory, in the order they are compiled in.
+
+    Args:
+        directory: Directory to search for YAML files.
+
+    Returns:
+        Sorted list of Path objects pointing to YAML files.
+
+    """
+    return sorted(directory.rglob('*.yaml'))
+
+
 def get_yaml_files(directory: Path) -> list[Path]:
     """Get all YAML files from a directory recursively.
 
@@ -123,7 +193,7 @@ def get_yaml_files(directory: Path) -> list[Path]:
         msg = f'Directory not found: {directory}'
         raise click.ClickException(msg)
 
-    yaml_files = sorted(directory.rglob('*.yaml'))
+    yaml_files = find_yaml_files(directory)
 
     if len(yaml_files) == 0:
         console.print(f'[yellow]{ICON_WARNING}[/yellow] Warning: No YAML files found in {directory}', style='yellow')
@@ -131,6 +201,118 @@ def get_yaml_files(directory: Path) -> list[Path]:
     return yaml_files
 
 
+def compile_yaml_files(yaml_files: list[Path], output_dir: Path | None = None) -> tuple[list[str], list[str]]:
+    """Compile YAML files with a progress display and print a summary of the results.
+
+    Args:
+        yaml_files: YAML dashboard files to compile.
+        output_dir: Directory to write one NDJSON file per input directory to, or None to skip writing.
+
+    Returns:
+        Tuple of (NDJSON lines of all compiled dashboards, error messages of files that failed).
+
+    """
+    ndjson_lines: list[str] = []
+    errors: list[str] = []
+
+    with Progress(
+        SpinnerColumn(),
+        TextColumn('[progress.description]{task.description}'),
+        console=console,
+    ) as progress:
+        task = progress.add_task('Compiling dashboards...', total=len(yaml_files))
+
+        for yaml_file in yaml_files:
+            progress.update(task, description=f'Compiling: {_display_path(yaml_file)}')
+            compiled_jsons, error = _compile_file(yaml_file, output_dir)
+            ndjson_lines.extend(compiled_jsons)
+            if error is not None:
+                errors.append(error)
+            progress.advance(task)
+
+    _print_compile_summary(len(ndjson_lines), errors)
+    return ndjson_lines, errors
+
+
+async def stream_compiled_yaml_files(yaml_files: list[Path], output_dir: Path, combined_file: Path) -> AsyncIterator[str]:
+    """Compile YAML files one at a time in a worker thread, yielding each NDJSON line as soon as it is ready.
+
+    The event loop stays free while a file compiles, so a consumer such as an upload can run in
+    parallel with compilation. Files are only compiled as fast as the lines are consumed. The
+    per-directory and combined NDJSON files are written as compilation progresses, and a summary
+    is printed at the end.
+
+    Args:
+        yaml_files: YAML dashboard files to compile.
+        output_dir: Directory to write one NDJSON file per input directory to.
+        combined_file: File to write all compiled NDJSON lines to.
+
+    Yields:
+        NDJSON lines of the compiled dashboards.
+
+    """
+    compiled_count = 0
+    errors: list[str] = []
+
+    with (
+        Progress(SpinnerColumn(), TextColumn('[progress.description]{task.description}'), console=console) as progress,
+        combined_file.open('w') as combined,
+    ):
+        task = progress.add_task('Compiling dashboards...', total=len(yaml_files))
+        for yaml_file in yaml_files:
+            progress.update(task, description=f'Compiling: {_display_path(yaml_file)}')
+            compiled_jsons, error = await asyncio.to_thread(_compile_file, yaml_file, output_dir)
+            if error is not None:
+                errors.append(error)
+            for line in compiled_jsons:
+                _ = combined.write(line + '\n')
+                compiled_count += 1
+                yield line
+            progress.advance(task)
+
+    _print_compile_summary(compiled_count, errors)
+
+
+def _compile_file(yaml_file: Path, output_dir: Path | None) -> tuple[list[str], str | None]:
+    compiled_jsons, error = compile_yaml_to_json(yaml_file)
+    if len(compiled_jsons) > 0 and output_dir is not None:
+        write_ndjson(output_dir / f'{yaml_file.parent.stem}.ndjson', compiled_jsons, overwrite=True)
+    return compiled_jsons, error
+
+
+def _print_compile_summary(compiled_count: int, errors: list[str]) -> None:
+    if compiled_count > 0:
+        console.print(f'[green]{ICON_SUCCESS}[/green] Successfully compiled {compiled_count} dashboard(s)')
+
+    if len(errors) > 0:
+        console.print(f'\n[yellow]{ICON_WARNING}[/yellow] Encountered {len(errors)} error(s):', style='yellow')
+        for error in errors:
+            console.print(f'  [red]•[/red] {error}', style='red')
+
+
+def _display_path(path: Path) -> Path:
+    try:
+        return path.relative_to(PROJECT_ROOT)
+    except ValueError:
+        return path
+
+
+def validate_kibana_auth(api_key: str | None, username: str | None, password: str | None) -> None:
+    """Validate that at most one complete Kibana authentication method was given.
+
+    Raises:
+        click.UsageError: If API key and basic auth are combined, or only half of basic auth is given.
+
+    """
+    if api_key is not None and (username is not None or password is not None):
+        msg = 'Cannot use --kibana-api-key together with --kibana-username or --kibana-password. Choose one authentication method.'
+        raise click.UsageError(msg)
+
+    if (username is not None and password is None) or (password is not None and username is None):
+        msg = '--kibana-username and --kibana-password must be used together for basic authentication.'
+        raise click.UsageError(msg)
+
+
 @click.group()
 @click.version_option(version='0.1.0')
 def cli() -> None:
@@ -144,7 +326,12 @@ def cli() -> None:
     Common workflows:
         1. Compile dashboards:     kb-dashboard compile
         2. Compile and upload:     kb-dashboard compile --upload
-        3. Take a screenshot:      kb-dashboard screenshot --dashboard-id ID --output file.png
+        3. Upload to many targets: kb-dashboard upload --targets targets.yaml
+        4. Sync a Kibana space:    kb-dashboard sync --dry-run
+        5. Take a screenshot:      kb-dashboard screenshot --dashboard-id ID --output file.png
+        6. Screenshot many:        kb-dashboard screenshots --manifest output/compiled_dashboards.ndjson
+        7. Snapshot field names:   kb-dashboard fields pull
+        8. Export the YAML schema: kb-dashboard schema --output schema.json
 
     \b
     Authentication:
@@ -230,7 +417,44 @@ def cli() -> None:
     is_flag=True,
     help='Disable SSL certificate verification (useful for self-signed certificates in local development).',
 )
-def compile_dashboards(  # noqa: PLR0913, PLR0912
+@click.option(
+    '--skip-unchanged',
+    is_flag=True,
+    help='Only upload dashboards that are new or differ from what Kibana already has. Implies --overwrite for changed dashboards.',
+)
+@click.option(
+    '--upload-batch-size',
+    type=click.IntRange(min=1),
+    default=DEFAULT_BATCH_SIZE,
+    help=f'Maximum number of saved objects sent to Kibana per import request. Default: {DEFAULT_BATCH_SIZE}',
+)
+@click.option(
+    '--upload-concurrency',
+    type=click.IntRange(min=1),
+    default=DEFAULT_MAX_CONCURRENCY,
+    help=f'Maximum number of import requests sent to Kibana in parallel. Default: {DEFAULT_MAX_CONCURRENCY}',
+)
+@click.option(
+    '--resume',
+    is_flag=True,
+    help='Continue an interrupted upload, sending only the dashboards that were not uploaded yet.',
+)
+@click.option(
+    '--pipeline',
+    is_flag=True,
+    help='Upload dashboards while later files are still compiling, instead of after all of them are compiled.',
+)
+@click.option(
+    '--check-references',
+    is_flag=True,
+    help='Before uploading, check that every referenced data view and linked dashboard exists in Kibana, and stop if any is missing.',
+)
+@click.option(
+    '--fields-snapshot',
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help='Field snapshot written by `kb-dashboard fields pull`. Every field used with a data view is checked against it before compiling.',
+)
+def compile_dashboards(  # noqa: PLR0913
     input_dir: Path,
     output_dir: Path,
     output_file: str,
@@ -242,6 +466,13 @@ def compile_dashboards(  # noqa: PLR0913, PLR0912
     no_browser: bool,
     overwrite: bool,
     kibana_no_ssl_verify: bool,
+    skip_unchanged: bool,
+    upload_batch_size: int,
+    upload_concurrency: int,
+    resume: bool,
+    pipeline: bool,
+    check_references: bool,
+    fields_snapshot: Path | None,
 ) -> None:
     r"""Compile YAML dashboard configurations to NDJSON format.
 
@@ -271,13 +502,31 @@ def compile_dashboards(  # noqa: PLR0913, PLR0912
         export KIBANA_URL=https://kibana.example.com
         export KIBANA_API_KEY=your-api-key
         kb-dashboard compile --upload
+
+        # Only upload dashboards that changed since the last upload
+        kb-dashboard compile --upload --skip-unchanged
+
+        # Finish an upload that failed part way
+        kb-dashboard compile --upload --resume
+
+        # Upload while compiling, for large sets of dashboards
+        kb-dashboard compile --upload --pipeline
+
+        # Stop before uploading if a data view or linked dashboard is missing
+        kb-dashboard compile --upload --check-references
+
+        # Check field names offline against a snapshot from `kb-dashboard fields pull`
+        kb-dashboard compile --fields-snapshot output/fields_snapshot.json
     """
-    if kibana_api_key is not None and (kibana_username is not None or kibana_password is not None):
-        msg = 'Cannot use --kibana-api-key together with --kibana-username or --kibana-password. Choose one authentication method.'
+    validate_kibana_auth(kibana_api_key, kibana_username, kibana_password)
+    if resume is True and skip_unchanged is True:
+        msg = '--resume cannot be used with --skip-unchanged, which already skips dashboards Kibana has.'
         raise click.UsageError(msg)
-
-    if (kibana_username is not None and kibana_password is None) or (kibana_password is not None and kibana_username is None):
-        msg = '--kibana-username and --kibana-password must be used together for basic authentication.'
+    if pipeline is True and (upload is False or skip_unchanged is True):
+        msg = '--pipeline requires --upload and cannot be used with --skip-unchanged.'
+        raise click.UsageError(msg)
+    if check_references is True and pipeline is True:
+        msg = '--check-references needs every dashboard compiled before uploading and cannot be used with --pipeline.'
         raise click.UsageError(msg)
 
     output_dir.mkdir(parents=True, exist_ok=True)
@@ -287,53 +536,38 @@ def compile_dashboards(  # noqa: PLR0913, PLR0912
         console.print('[yellow]No YAML files to compile.[/yellow]')
         return
 
-    ndjson_lines: list[str] = []
-    errors: list[str] = []
-
-    with Progress(
-        SpinnerColumn(),
-        TextColumn('[progress.description]{task.description}'),
-        console=console,
-    ) as progress:
-        task = progress.add_task('Compiling dashboards...', total=len(yaml_files))
-
-        for yaml_file in yaml_files:
-            try:
-                display_path = yaml_file.relative_to(PROJECT_ROOT)
-            except ValueError:
-                display_path = yaml_file
-            progress.update(task, description=f'Compiling: {display_path}')
-            compiled_jsons, error = compile_yaml_to_json(yaml_file)
-
-            if len(compiled_jsons) > 0:
-                filename = yaml_file.parent.stem
-                individual_file = output_dir / f'{filename}.ndjson'
-                write_ndjson(individual_file, compiled_jsons, overwrite=True)
-                ndjson_lines.extend(compiled_jsons)
-            elif error is not None:
-                errors.append(error)
-
-            progress.advance(task)
+    if fields_snapshot is not None:
+        check_fields(yaml_files, fields_snapshot)
 
-    if len(ndjson_lines) > 0:
-        console.print(f'[green]{ICON_SUCCESS}[/green] Successfully compiled {len(ndjson_lines)} dashboard(s)')
+    combined_file = output_dir / output_file
+    if pipeline is True:
+        console.print(f'[blue]{ICON_UPLOAD}[/blue] Compiling and uploading to Kibana at {kibana_url}...')
+        asyncio.run(
+            upload_to_kibana(
+                combined_file,
+                kibana_url,
+                kibana_username,
+                kibana_password,
+                kibana_api_key,
+                overwrite,
+                not no_browser,
+                ssl_verify=not kibana_no_ssl_verify,
+                batch_size=upload_batch_size,
+                max_concurrency=upload_concurrency,
+                resume=resume,
+                compile_from=yaml_files,
+            )
+        )
+        return
 
-    if len(errors) > 0:
-        console.print(f'\n[yellow]{ICON_WARNING}[/yellow] Encountered {len(errors)} error(s):', style='yellow')
-        for error in errors:
-            console.print(f'  [red]•[/red] {error}', style='red')
+    ndjson_lines, _ = compile_yaml_files(yaml_files, output_dir)
 
     if len(ndjson_lines) == 0:
         console.print(f'[red]{ICON_ERROR}[/red] No valid YAML configurations found or compiled.', style='red')
         return
 
-    combined_file = output_dir / output_file
     write_ndjson(combined_file, ndjson_lines, overwrite=True)
-    try:
-        display_path = combined_file.relative_to(PROJECT_ROOT)
-    except ValueError:
-        display_path = combined_file
-    console.print(f'[green]{ICON_SUCCESS}[/green] Wrote combined file: {display_path}')
+    console.print(f'[green]{ICON_SUCCESS}[/green] Wrote combined file: {_display_path(combined_file)}')
 
     if upload is True:
         console.print(f'\n[blue]{ICON_UPLOAD}[/blue] Uploading to Kibana at {kibana_url}...')
@@ -347,6 +581,11 @@ def compile_dashboards(  # noqa: PLR0913, PLR0912
                 overwrite,
                 not no_browser,
                 ssl_verify=not kibana_no_ssl_verify,
+                batch_size=upload_batch_size,
+                max_concurrency=upload_concurrency,
+                skip_unchanged=skip_unchanged,
+                resume=resume,
+                check_references=check_references,
             )
         )
 
@@ -360,9 +599,22 @@ async def upload_to_kibana(  # noqa: PLR0913
     overwrite: bool,
     open_browser: bool,
     ssl_verify: bool = True,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    skip_unchanged: bool = False,
+    resume: bool = False,
+    compile_from: list[Path] | None = None,
+    check_references: bool = False,
 ) -> None:
     """Upload NDJSON file to Kibana.
 
+    Unless only changed objects are uploaded, progress is recorded in a journal next to the NDJSON
+    file. The journal is removed once every object is uploaded, and kept otherwise so that the
+    upload can be resumed.
+
+    With `compile_from`, the YAML files are compiled while uploading: compiled dashboards are
+    uploaded in batches as soon as they are ready, and the NDJSON file is written along the way.
+
     Args:
         ndjson_file: Path to NDJSON file to upload
         kibana_url: Kibana base URL
@@ -372,9 +624,15 @@ async def upload_to_kibana(  # noqa: PLR0913
         overwrite: Whether to overwrite existing objects
         open_browser: Whether to open browser after successful upload
         ssl_verify: Whether to verify SSL certificates (default: True)
+        batch_size: Maximum number of saved objects per import request
+        max_concurrency: Maximum number of import requests in flight at the same time
+        skip_unchanged: Whether to upload only objects that are new or differ from Kibana's copy
+        resume: Whether to skip the objects recorded in the journal of an earlier, interrupted upload
+        compile_from: YAML files to compile into `ndjson_file` while uploading, instead of uploading an existing file
+        check_references: Whether to check that referenced data views and dashboards exist before uploading anything
 
     Raises:
-        click.ClickException: If upload fails.
+        click.ClickException: If upload fails, if referenced objects are missing, or if no dashboard compiled from `compile_from`.
 
     """
     client = KibanaClient(
@@ -386,84 +644,216 @@ async def upload_to_kibana(  # noqa: PLR0913
     )
 
     try:
-        result = await client.upload_ndjson(ndjson_file, overwrite=overwrite)
+        if check_references is True:
+            await _ensure_references_exist(client, ndjson_file)
+
+        if skip_unchanged is True:
+            incremental = await client.upload_ndjson_incremental(ndjson_file, batch_size=batch_size, max_concurrency=max_concurrency)
+            counts = f'{len(incremental.created)} new, {len(incremental.updated)} changed, {len(incremental.skipped)} unchanged'
+            console.print(f'[blue]{ICON_UPLOAD}[/blue] {counts} object(s), skipped the unchanged ones')
+            result = incremental.import_response
+        else:
+            journal_path = ndjson_file.with_name(f'{ndjson_file.name}.journal')
+            target = kibana_url.rstrip('/')
+            journal = UploadJournal.resume(journal_path, target) if resume is True else UploadJournal.start(journal_path, target)
+            if len(journal) > 0:
+                console.print(f'[blue]{ICON_UPLOAD}[/blue] Resuming upload, {len(journal)} object(s) were already uploaded')
+            if compile_from is not None:
+                lines = stream_compiled_yaml_files(compile_from, ndjson_file.parent, ndjson_file)
+                result = await client.upload_ndjson_stream(
+                    lines, overwrite=overwrite, batch_size=batch_size, max_concurrency=max_concurrency, journal=journal
+                )
+            else:
+                result = await client.upload_ndjson(
+                    ndjson_file, overwrite=overwrite, batch_size=batch_size, max_concurrency=max_concurrency, journal=journal
+                )
+            if len(result.errors) == 0:
+                journal.remove()
+            if compile_from is not None and ndjson_file.stat().st_size == 0:
+                msg = 'No dashboards were compiled, nothing to upload'
+                raise click.ClickException(msg)
+
+        _report_upload_result(client, result, open_browser=open_browser, skip_unchanged=skip_unchanged)
+
+    except (aiohttp.ClientError, OSError, ValueError) as e:
+        msg = f'Error uploading to Kibana: {e}{_resume_hint(skip_unchanged)}'
+        raise click.ClickException(msg) from e
 
-        if result.success is True:
-            console.print(f'[green]{ICON_SUCCESS}[/green] Successfully uploaded {result.success_count} object(s) to Kibana')
 
-            dashboard_ids = [obj.destination_id or obj.id for obj in result.success_results if obj.type == 'dashboard']
+def _report_upload_result(client: KibanaClient, result: KibanaSavedObjectsResponse, *, open_browser: bool, skip_unchanged: bool) -> None:
+    if result.success is True:
+        console.print(f'[green]{ICON_SUCCESS}[/green] Successfully uploaded {result.success_count} object(s) to Kibana')
 
-            if len(dashboard_ids) > 0 and open_browser is True:
-                dashboard_url = client.get_dashboard_url(dashboard_ids[0])
-                console.print(f'[blue]{ICON_BROWSER}[/blue] Opening dashboard: {dashboard_url}')
-                _ = webbrowser.open_new_tab(dashboard_url)
+        dashboard_ids = [obj.destination_id or obj.id for obj in result.success_results if obj.type == 'dashboard']
 
-            if len(result.errors) > 0:
-                console.print(f'\n[yellow]{ICON_WARNING}[/yellow] Encountered {len(result.errors)} error(s):')
-                console.print(create_error_table(result.errors))
-        else:
-            console.print(f'[red]{ICON_ERROR}[/red] Upload failed', style='red')
-            if len(result.errors) > 0:
-                console.print(create_error_table(result.errors))
-            msg = 'Upload to Kibana failed'
-            raise click.ClickException(msg)
+        if len(dashboard_ids) > 0 and open_browser is True:
+            dashboard_url = client.get_dashboard_url(dashboard_ids[0])
+            console.print(f'[blue]{ICON_BROWSER}[/blue] Opening dashboard: {dashboard_url}')
+            _ = webbrowser.open_new_tab(dashboard_url)
 
-    except (OSError, ValueError) as e:
-        msg = f'Error uploading to Kibana: {e}'
-        raise click.ClickException(msg) from e
+        if len(result.errors) > 0:
+            console.print(f'\n[yellow]{ICON_WARNING}[/yellow] Encountered {len(result.errors)} error(s):')
+            console.print(create_error_table(result.errors))
+    else:
+        console.print(f'[red]{ICON_ERROR}[/red] Upload failed', style='red')
+        if len(result.errors) > 0:
+            console.print(create_error_table(result.errors))
+        msg = f'Upload to Kibana failed{_resume_hint(skip_unchanged)}'
+        raise click.ClickException(msg)
 
 
-@cli.command('screenshot')
-@click.option(
-    '--dashboard-id',
-    required=True,
-    help='Kibana dashboard ID to capture. Find this in the dashboard URL.',
-)
+async def _ensure_references_exist(client: KibanaClient, ndjson_file: Path) -> None:
+    missing = await client.check_references(ndjson_file)
+    if len(missing) > 0:
+        console.print(f'[red]{ICON_ERROR}[/red] Compiled dashboards reference objects that are missing in Kibana:', style='red')
+        console.print(create_missing_references_table(missing))
+        msg = f'{len(missing)} missing reference(s), nothing was uploaded'
+        raise click.ClickException(msg)
+
+
+def _resume_hint(skip_unchanged: bool) -> str:
+    return '' if skip_unchanged is True else '. Run again with --resume to upload only the remaining objects.'
+
+
+@cli.command('upload')
 @click.option(
-    '--output',
-    type=click.Path(path_type=Path),
+    '--targets',
+    'targets_file',
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
     required=True,
-    help='Path where the PNG screenshot will be saved. Example: ./dashboard.png',
+    help='YAML file listing the Kibana targets (URL, space and credential environment variables) to upload to.',
 )
 @click.option(
-    '--time-from',
-    type=str,
-    help=(
-        'Start time for dashboard data range. Accepts ISO 8601 format ("2024-01-01T00:00:00Z") '
-        'or relative time ("now-7d", "now-24h", "now-1M"). If omitted, uses dashboard default.'
-    ),
+    '--input-dir',
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+    default=DEFAULT_INPUT_DIR,
+    help='Directory containing YAML dashboard files to compile and upload.',
 )
 @click.option(
-    '--time-to',
-    type=str,
-    help=(
-        'End time for dashboard data range. Accepts ISO 8601 format ("2024-12-31T23:59:59Z") '
-        'or relative time ("now", "now-1h"). If omitted, uses dashboard default.'
-    ),
+    '--overwrite/--no-overwrite',
+    default=True,
+    help='Whether to overwrite existing dashboards in each target.',
 )
 @click.option(
-    '--width',
-    type=click.IntRange(min=1),
-    default=1920,
-    help='Screenshot width in pixels. Standard resolutions: 1920 (Full HD), 3840 (4K). Default: 1920',
+    '--skip-unchanged',
+    is_flag=True,
+    help='Upload to each target only the dashboards that are new or differ from the copy already in it.',
 )
 @click.option(
-    '--height',
+    '--concurrency',
     type=click.IntRange(min=1),
-    default=1080,
-    help='Screenshot height in pixels. Standard resolutions: 1080 (Full HD), 2160 (4K). Default: 1080',
+    default=DEFAULT_MAX_CONCURRENCY,
+    show_default=True,
+    help='Maximum number of import requests in flight per target.',
 )
+def upload_dashboards(targets_file: Path, input_dir: Path, overwrite: bool, skip_unchanged: bool, concurrency: int) -> None:
+    r"""Compile dashboards once and upload them to several Kibana targets.
+
+    This command compiles every YAML file in the input directory, then uploads
+    the result to all targets in the targets file at the same time. Each target
+    names the environment variables holding its credentials, so no secrets are
+    stored in the file.
+
+    \b
+    Targets file example:
+        targets:
+          - name: prod
+            url: https://kibana.example.com
+            api_key_env: PROD_KIBANA_API_KEY
+          - name: staging-observability
+            url: https://staging-kibana.example.com
+            space: observability
+            username_env: STAGING_KIBANA_USERNAME
+            password_env: STAGING_KIBANA_PASSWORD
+
+    \b
+    Examples:
+        # Upload to every target
+        kb-dashboard upload --targets targets.yaml --input-dir ./dashboards
+
+        # Upload only the dashboards each target does not have yet
+        kb-dashboard upload --targets targets.yaml --skip-unchanged
+    """
+    try:
+        targets = load_targets(targets_file)
+    except (OSError, ValueError) as e:
+        msg = f'Error loading targets file {targets_file}: {e}'
+        raise click.ClickException(msg) from e
+
+    yaml_files = get_yaml_files(input_dir)
+    ndjson_lines, errors = compile_yaml_files(yaml_files)
+    if len(ndjson_lines) == 0:
+        msg = 'No dashboards were compiled, nothing to upload'
+        raise click.ClickException(msg)
+    if len(errors) > 0:
+        console.print(f'[yellow]{ICON_WARNING}[/yellow] Uploading the {len(ndjson_lines)} dashboard(s) that compiled successfully')
+
+    console.print(f'[blue]{ICON_UPLOAD}[/blue] Uploading to {len(targets)} target(s)...')
+    results = asyncio.run(
+        upload_to_targets(
+            targets,
+            '\n'.join(ndjson_lines),
+            overwrite=overwrite,
+            skip_unchanged=skip_unchanged,
+            max_concurrency=concurrency,
+        )
+    )
+    console.print(create_target_results_table(results))
+
+    failed = [result for result in results if result.success is False]
+    for result in failed:
+        console.print(f'\n[red]{ICON_ERROR}[/red] {result.target.name}:', style='red')
+        console.print(create_error_table(result.errors))
+    if len(failed) > 0:
+        msg = f'Upload failed for {len(failed)} of {len(results)} target(s)'
+        raise click.ClickException(msg)
+
+
+def create_target_results_table(results: list[TargetUploadResult]) -> Table:
+    """Create a Rich table summarizing the upload to each target.
+
+    Args:
+        results: Upload results, one per target.
+
+    Returns:
+        A formatted Rich table with one row per target.
+
+    """
+    table = Table(show_header=True, header_style='bold')
+    table.add_column('Target')
+    table.add_column('URL')
+    table.add_column('Space')
+    table.add_column('Uploaded', justify='right')
+    table.add_column('Errors', justify='right')
+    table.add_column('Time', justify='right')
+    table.add_column('Status')
+
+    for result in results:
+        status = f'[green]{ICON_SUCCESS} ok[/green]' if result.success is True else f'[red]{ICON_ERROR} failed[/red]'
+        table.add_row(
+            result.target.name,
+            result.target.url,
+            result.target.space if result.target.space is not None else 'default',
+            str(result.uploaded),
+            str(len(result.errors)),
+            f'{result.elapsed:.1f}s',
+            status,
+        )
+
+    return table
+
+
+@cli.command('sync')
 @click.option(
-    '--browser-timezone',
-    type=str,
-    default='UTC',
-    help='Browser timezone for rendering time-based data. Examples: "UTC", "America/New_York", "Europe/London". Default: UTC',
+    '--input-dir',
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+    default=DEFAULT_INPUT_DIR,
+    help='Directory containing the complete set of YAML dashboard files to sync.',
 )
 @click.option(
-    '--timeout',
-    type=click.IntRange(min=1),
-    default=300,
-    help='Maximum time in seconds to wait for screenshot generation. Increase for complex dashboards. Default: 300',
+    '--dry-run',
+    is_flag=True,
+    help='Print the sync plan without changing anything in Kibana.',
 )
 @click.option(
     '--kibana-url',
@@ -472,6 +862,12 @@ async def upload_to_kibana(  # noqa: PLR0913
     default='http://localhost:5601',
     help='Kibana base URL. Example: https://kibana.example.com (env: KIBANA_URL)',
 )
+@click.option(
+    '--kibana-space',
+    type=str,
+    envvar='KIBANA_SPACE',
+    help='Kibana space to sync. Defaults to the default space. (env: KIBANA_SPACE)',
+)
 @click.option(
     '--kibana-username',
     type=str,
@@ -504,10 +900,268 @@ async def upload_to_kibana(  # noqa: PLR0913
     is_flag=True,
     help='Disable SSL certificate verification (useful for self-signed certificates in local development).',
 )
-def screenshot_dashboard(  # noqa: PLR0913
-    dashboard_id: str,
-    output: Path,
-    time_from: str | None,
+@click.option(
+    '--managed-tag',
+    type=str,
+    default=MANAGED_TAG_ID,
+    help=f'ID of the Kibana tag marking dashboards as managed by sync. Only tagged dashboards are ever deleted. Default: {MANAGED_TAG_ID}',
+)
+@click.option(
+    '--concurrency',
+    type=click.IntRange(min=1),
+    default=DEFAULT_MAX_CONCURRENCY,
+    help=f'Maximum number of requests sent to Kibana in parallel. Default: {DEFAULT_MAX_CONCURRENCY}',
+)
+def sync_dashboards(  # noqa: PLR0913
+    input_dir: Path,
+    dry_run: bool,
+    kibana_url: str,
+    kibana_space: str | None,
+    kibana_username: str | None,
+    kibana_password: str | None,
+    kibana_api_key: str | None,
+    kibana_no_ssl_verify: bool,
+    managed_tag: str,
+    concurrency: int,
+) -> None:
+    r"""Make a Kibana space match the YAML dashboards, deleting removed ones.
+
+    This command compiles every YAML file in the input directory, tags the
+    compiled dashboards as managed, and then creates or updates the ones that
+    are new or changed and deletes managed dashboards that no longer exist in
+    YAML. Dashboards without the managed tag are never touched.
+
+    The plan is always printed before any change is made.
+
+    \b
+    Examples:
+        # Show what would change
+        kb-dashboard sync --input-dir ./dashboards --dry-run
+
+        # Sync a specific space
+        kb-dashboard sync --input-dir ./dashboards --kibana-space observability
+    """
+    validate_kibana_auth(kibana_api_key, kibana_username, kibana_password)
+
+    yaml_files = get_yaml_files(input_dir)
+    ndjson_lines, errors = compile_yaml_files(yaml_files)
+    if len(errors) > 0:
+        msg = f'Refusing to sync: {len(errors)} file(s) failed to compile and their dashboards would be deleted.'
+        raise click.ClickException(msg)
+    if len(ndjson_lines) == 0:
+        msg = f'Refusing to sync: no dashboards were compiled from {input_dir}, every managed dashboard would be deleted.'
+        raise click.ClickException(msg)
+
+    client = KibanaClient(
+        url=kibana_url,
+        username=kibana_username,
+        password=kibana_password,
+        api_key=kibana_api_key,
+        ssl_verify=not kibana_no_ssl_verify,
+        space_id=kibana_space,
+    )
+    asyncio.run(sync_to_kibana(client, ndjson_lines, managed_tag=managed_tag, dry_run=dry_run, max_concurrency=concurrency))
+
+
+async def sync_to_kibana(
+    client: KibanaClient,
+    ndjson_lines: list[str],
+    *,
+    managed_tag: str = MANAGED_TAG_ID,
+    dry_run: bool = False,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+) -> None:
+    """Create, update and delete managed dashboards so that Kibana matches the compiled output.
+
+    Args:
+        client: Client for the Kibana space to sync
+        ndjson_lines: NDJSON lines of the complete set of compiled dashboards
+        managed_tag: ID of the tag marking managed dashboards
+        dry_run: Whether to stop after printing the plan
+        max_concurrency: Maximum number of requests in flight at the same time
+
+    Raises:
+        click.ClickException: If Kibana cannot be reached or any change fails.
+
+    """
+    tagged_lines = [managed_tag_ndjson(managed_tag), *(add_tag_reference(line, managed_tag) for line in ndjson_lines)]
+    compiled = [KibanaSavedObject.model_validate_json(line) for line in tagged_lines]
+
+    try:
+        plan = await client.upload_ndjson_incremental('\n'.join(tagged_lines), dry_run=True, max_concurrency=max_concurrency)
+        managed = await client.find_saved_objects('dashboard', has_reference=('tag', managed_tag), fields=['title'])
+    except aiohttp.ClientError as e:
+        msg = f'Error communicating with Kibana: {e}'
+        raise click.ClickException(msg) from e
+
+    compiled_ids = {obj.id for obj in compiled}
+    stale = [obj for obj in managed if obj.id not in compiled_ids]
+    changed_ids = set(plan.created) | set(plan.updated)
+
+    console.print(create_sync_plan_table(compiled, plan.created, plan.updated, stale))
+    summary = f'{len(plan.created)} to create, {len(plan.updated)} to update, {len(stale)} to delete, {len(plan.skipped)} unchanged'
+    console.print(f'Plan: {summary}')
+    if dry_run is True or (len(changed_ids) == 0 and len(stale) == 0):
+        return
+
+    try:
+        if len(changed_ids) > 0:
+            changed_lines = [line for line, obj in zip(tagged_lines, compiled, strict=True) if obj.id in changed_ids]
+            console.print(f'[blue]{ICON_UPLOAD}[/blue] Uploading {len(changed_lines)} object(s)...')
+            result = await client.upload_ndjson('\n'.join(changed_lines), overwrite=True, max_concurrency=max_concurrency)
+            if len(result.errors) > 0:
+                console.print(create_error_table(result.errors))
+                msg = 'Sync failed while uploading, no dashboards were deleted'
+                raise click.ClickException(msg)
+            console.print(f'[green]{ICON_SUCCESS}[/green] Uploaded {result.success_count} object(s)')
+
+        if len(stale) > 0:
+            console.print(f'[blue]{ICON_DELETE}[/blue] Deleting {len(stale)} dashboard(s)...')
+            deletion = await client.delete_saved_objects([(obj.type, obj.id) for obj in stale], max_concurrency=max_concurrency)
+            if len(deletion.errors) > 0:
+                console.print(create_error_table(deletion.errors))
+                msg = f'Sync failed to delete {len(deletion.errors)} dashboard(s)'
+                raise click.ClickException(msg)
+            console.print(f'[green]{ICON_SUCCESS}[/green] Deleted {len(deletion.deleted)} dashboard(s)')
+    except aiohttp.ClientError as e:
+        msg = f'Error communicating with Kibana: {e}'
+        raise click.ClickException(msg) from e
+
+
+def create_sync_plan_table(
+    compiled: list[KibanaSavedObject],
+    created: list[str],
+    updated: list[str],
+    stale: list[KibanaSavedObject],
+) -> Table:
+    """Create a Rich table listing the changes a sync will make.
+
+    Args:
+        compiled: Compiled saved objects, used for titles
+        created: IDs of objects that will be created
+        updated: IDs of objects that will be updated
+        stale: Managed objects in Kibana that will be deleted
+
+    Returns:
+        A formatted Rich table with one row per change.
+
+    """
+    table = Table(show_header=True, header_style='bold')
+    table.add_column('Action')
+    table.add_column('Type')
+    table.add_column('ID')
+    table.add_column('Title')
+
+    actions = dict.fromkeys(created, '[green]create[/green]') | dict.fromkeys(updated, '[yellow]update[/yellow]')
+    for obj in compiled:
+        if obj.id in actions:
+            table.add_row(actions[obj.id], obj.type, obj.id, _saved_object_title(obj))
+    for obj in stale:
+        table.add_row('[red]delete[/red]', obj.type, obj.id, _saved_object_title(obj))
+
+    return table
+
+
+def _saved_object_title(saved_object: KibanaSavedObject) -> str:
+    title: object = saved_object.attributes.get('title', saved_object.attributes.get('name'))
+    return title if isinstance(title, str) else ''
+
+
+@cli.command('screenshot')
+@click.option(
+    '--dashboard-id',
+    required=True,
+    help='Kibana dashboard ID to capture. Find this in the dashboard URL.',
+)
+@click.option(
+    '--output',
+    type=click.Path(path_type=Path),
+    required=True,
+    help='Path where the PNG screenshot will be saved. Example: ./dashboard.png',
+)
+@click.option(
+    '--time-from',
+    type=str,
+    help=(
+        'Start time for dashboard data range. Accepts ISO 8601 format ("2024-01-01T00:00:00Z") '
+        'or relative time ("now-7d", "now-24h", "now-1M"). If omitted, uses dashboard default.'
+    ),
+)
+@click.option(
+    '--time-to',
+    type=str,
+    help=(
+        'End time for dashboard data range. Accepts ISO 8601 format ("2024-12-31T23:59:59Z") '
+        'or relative time ("now", "now-1h"). If omitted, uses dashboard default.'
+    ),
+)
+@click.option(
+    '--width',
+    type=click.IntRange(min=1),
+    default=1920,
+    help='Screenshot width in pixels. Standard resolutions: 1920 (Full HD), 3840 (4K). Default: 1920',
+)
+@click.option(
+    '--height',
+    type=click.IntRange(min=1),
+    default=1080,
+    help='Screenshot height in pixels. Standard resolutions: 1080 (Full HD), 2160 (4K). Default: 1080',
+)
+@click.option(
+    '--browser-timezone',
+    type=str,
+    default='UTC',
+    help='Browser timezone for rendering time-based data. Examples: "UTC", "America/New_York", "Europe/London". Default: UTC',
+)
+@click.option(
+    '--timeout',
+    type=click.IntRange(min=1),
+    default=300,
+    help='Maximum time in seconds to wait for screenshot generation. Increase for complex dashboards. Default: 300',
+)
+@click.option(
+    '--kibana-url',
+    type=str,
+    envvar='KIBANA_URL',
+    default='http://localhost:5601',
+    help='Kibana base URL. Example: https://kibana.example.com (env: KIBANA_URL)',
+)
+@click.option(
+    '--kibana-username',
+    type=str,
+    envvar='KIBANA_USERNAME',
+    help=(
+        'Kibana username for basic authentication. Must be used with --kibana-password. '
+        'Mutually exclusive with --kibana-api-key. (env: KIBANA_USERNAME)'
+    ),
+)
+@click.option(
+    '--kibana-password',
+    type=str,
+    envvar='KIBANA_PASSWORD',
+    help=(
+        'Kibana password for basic authentication. Must be used with --kibana-username. '
+        'Mutually exclusive with --kibana-api-key. (env: KIBANA_PASSWORD)'
+    ),
+)
+@click.option(
+    '--kibana-api-key',
+    type=str,
+    envvar='KIBANA_API_KEY',
+    help=(
+        'Kibana API key for authentication (recommended for production). '
+        'Mutually exclusive with --kibana-username/--kibana-password. (env: KIBANA_API_KEY)'
+    ),
+)
+@click.option(
+    '--kibana-no-ssl-verify',
+    is_flag=True,
+    help='Disable SSL certificate verification (useful for self-signed certificates in local development).',
+)
+def screenshot_dashboard(  # noqa: PLR0913
+    dashboard_id: str,
+    output: Path,
+    time_from: str | None,
     time_to: str | None,
     width: int,
     height: int,
@@ -541,13 +1195,7 @@ def screenshot_dashboard(  # noqa: PLR0913
         kb-dashboard screenshot --dashboard-id my-dashboard --output dashboard.png \
             --width 3840 --height 2160
     """
-    if kibana_api_key is not None and (kibana_username is not None or kibana_password is not None):
-        msg = 'Cannot use --kibana-api-key together with --kibana-username or --kibana-password. Choose one authentication method.'
-        raise click.UsageError(msg)
-
-    if (kibana_username is not None and kibana_password is None) or (kibana_password is not None and kibana_username is None):
-        msg = '--kibana-username and --kibana-password must be used together for basic authentication.'
-        raise click.UsageError(msg)
+    validate_kibana_auth(kibana_api_key, kibana_username, kibana_password)
 
     asyncio.run(
         generate_screenshot(
@@ -655,5 +1303,479 @@ async def generate_screenshot(  # noqa: PLR0913
         raise click.ClickException(msg) from e
 
 
+@cli.command('screenshots')
+@click.option(
+    '--dashboard-id',
+    'dashboard_ids',
+    multiple=True,
+    help='Kibana dashboard ID to capture. Repeat the option to capture several dashboards.',
+)
+@click.option(
+    '--manifest',
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help='Compiled NDJSON file, such as output/compiled_dashboards.ndjson. Every dashboard in it is captured.',
+)
+@click.option(
+    '--output-dir',
+    type=click.Path(file_okay=False, path_type=Path),
+    default=DEFAULT_OUTPUT_DIR / 'screenshots',
+    help='Directory where one <dashboard-id>.png file per dashboard will be saved.',
+)
+@click.option(
+    '--time-from',
+    type=str,
+    help='Start time for dashboard data range, in ISO 8601 or relative format ("now-7d"). If omitted, uses dashboard default.',
+)
+@click.option(
+    '--time-to',
+    type=str,
+    help='End time for dashboard data range, in ISO 8601 or relative format ("now"). If omitted, uses dashboard default.',
+)
+@click.option(
+    '--width',
+    type=click.IntRange(min=1),
+    default=1920,
+    help='Screenshot width in pixels. Default: 1920',
+)
+@click.option(
+    '--height',
+    type=click.IntRange(min=1),
+    default=1080,
+    help='Screenshot height in pixels. Default: 1080',
+)
+@click.option(
+    '--browser-timezone',
+    type=str,
+    default='UTC',
+    help='Browser timezone for rendering time-based data. Default: UTC',
+)
+@click.option(
+    '--timeout',
+    type=click.IntRange(min=1),
+    default=300,
+    help='Maximum time in seconds to wait for each screenshot. Default: 300',
+)
+@click.option(
+    '--concurrency',
+    type=click.IntRange(min=1),
+    default=DEFAULT_MAX_CONCURRENCY,
+    help=f'Maximum number of reporting jobs running in Kibana at the same time. Default: {DEFAULT_MAX_CONCURRENCY}',
+)
+@click.option(
+    '--kibana-url',
+    type=str,
+    envvar='KIBANA_URL',
+    default='http://localhost:5601',
+    help='Kibana base URL. Example: https://kibana.example.com (env: KIBANA_URL)',
+)
+@click.option(
+    '--kibana-username',
+    type=str,
+    envvar='KIBANA_USERNAME',
+    help=(
+        'Kibana username for basic authentication. Must be used with --kibana-password. '
+        'Mutually exclusive with --kibana-api-key. (env: KIBANA_USERNAME)'
+    ),
+)
+@click.option(
+    '--kibana-password',
+    type=str,
+    envvar='KIBANA_PASSWORD',
+    help=(
+        'Kibana password for basic authentication. Must be used with --kibana-username. '
+        'Mutually exclusive with --kibana-api-key. (env: KIBANA_PASSWORD)'
+    ),
+)
+@click.option(
+    '--kibana-api-key',
+    type=str,
+    envvar='KIBANA_API_KEY',
+    help=(
+        'Kibana API key for authentication (recommended for production). '
+        'Mutually exclusive with --kibana-username/--kibana-password. (env: KIBANA_API_KEY)'
+    ),
+)
+@click.option(
+    '--kibana-no-ssl-verify',
+    is_flag=True,
+    help='Disable SSL certificate verification (useful for self-signed certificates in local development).',
+)
+def screenshot_dashboards(  # noqa: PLR0913
+    dashboard_ids: tuple[str, ...],
+    manifest: Path | None,
+    output_dir: Path,
+    time_from: str | None,
+    time_to: str | None,
+    width: int,
+    height: int,
+    browser_timezone: str,
+    timeout: int,
+    concurrency: int,
+    kibana_url: str,
+    kibana_username: str | None,
+    kibana_password: str | None,
+    kibana_api_key: str | None,
+    kibana_no_ssl_verify: bool,
+) -> None:
+    r"""Generate PNG screenshots of many Kibana dashboards at once.
+
+    This command submits one reporting job per dashboard, keeping at most
+    --concurrency jobs running in Kibana, and saves each PNG to the output
+    directory as it finishes. Dashboards can be given by ID, taken from a
+    compiled NDJSON file, or both.
+
+    \b
+    Examples:
+        # Screenshot every dashboard that was just compiled
+        kb-dashboard compile --upload
+        kb-dashboard screenshots --manifest output/compiled_dashboards.ndjson
+
+        # Screenshot specific dashboards
+        kb-dashboard screenshots --dashboard-id first --dashboard-id second --output-dir ./review
+    """
+    validate_kibana_auth(kibana_api_key, kibana_username, kibana_password)
+
+    ids = list(dashboard_ids)
+    if manifest is not None:
+        try:
+            ids.extend(dashboard_ids_from_ndjson(manifest))
+        except (OSError, ValueError) as e:
+            msg = f'Error reading manifest {manifest}: {e}'
+            raise click.ClickException(msg) from e
+    ids = list(dict.fromkeys(ids))
+    if len(ids) == 0:
+        msg = 'No dashboards to capture. Pass --dashboard-id or --manifest.'
+        raise click.UsageError(msg)
+
+    client = KibanaClient(
+        url=kibana_url,
+        username=kibana_username,
+        password=kibana_password,
+        api_key=kibana_api_key,
+        ssl_verify=not kibana_no_ssl_verify,
+    )
+
+    with console.status(f'Capturing {len(ids)} dashboard(s)...'):
+        results = asyncio.run(
+            client.download_screenshots(
+                ids,
+                output_dir,
+                time_from=time_from,
+                time_to=time_to,
+                width=width,
+                height=height,
+                browser_timezone=browser_timezone,
+                timeout_seconds=timeout,
+                max_concurrency=concurrency,
+            )
+        )
+
+    console.print(create_screenshot_results_table(results))
+    failed = [result for result in results if result.error is not None]
+    if len(failed) > 0:
+        msg = f'{len(failed)} of {len(results)} screenshot(s) failed'
+        raise click.ClickException(msg)
+    console.print(f'[green]{ICON_SUCCESS}[/green] Saved {len(results)} screenshot(s) to: {output_dir}')
+
+
+def dashboard_ids_from_ndjson(ndjson_file: Path) -> list[str]:
+    """Read the IDs of the dashboards in a compiled NDJSON file.
+
+    Args:
+        ndjson_file: NDJSON file written by `kb-dashboard compile`.
+
+    Returns:
+        Dashboard IDs in file order. Other saved object types are ignored.
+
+    """
+    with ndjson_file.open('rb') as file:
+        saved_objects = [KibanaSavedObject.model_validate_json(line) for line in file if len(line.strip()) > 0]
+    return [obj.id for obj in saved_objects if obj.type == 'dashboard']
+
+
+def create_screenshot_results_table(results: list[KibanaScreenshotResult]) -> Table:
+    """Create a Rich table summarizing a batch of screenshots.
+
+    Args:
+        results: Screenshot results, one per dashboard.
+
+    Returns:
+        A formatted Rich table with one row per dashboard.
+
+    """
+    table = Table(show_header=True, header_style='bold')
+    table.add_column('Dashboard')
+    table.add_column('File')
+    table.add_column('Size', justify='right')
+    table.add_column('Time', justify='right')
+    table.add_column('Status')
+
+    for result in results:
+        status = f'[green]{ICON_SUCCESS} ok[/green]' if result.error is None else f'[red]{ICON_ERROR} {result.error}[/red]'
+        size = f'{result.size / 1024:.0f} KiB' if result.error is None else ''
+        table.add_row(result.dashboard_id, result.output_path.name, size, f'{result.elapsed:.1f}s', status)
+
+    return table
+
+
+def check_fields(yaml_files: list[Path], snapshot_path: Path) -> None:
+    """Check the fields used by YAML dashboards against a field snapshot, without contacting Kibana.
+
+    Files that fail to load are skipped here, compilation reports them.
+
+    Args:
+        yaml_files: YAML dashboard files to check.
+        snapshot_path: Snapshot written by `kb-dashboard fields pull`.
+
+    Raises:
+        click.ClickException: If the snapshot cannot be read or a field does not exist.
+
+    """
+    try:
+        index = FieldIndex(FieldSnapshot.load(snapshot_path))
+    except (OSError, ValueError) as e:
+        raise click.ClickException(str(e)) from e
+
+    issues: list[FieldIssue] = []
+    for yaml_file in yaml_files:
+        try:
+            dashboards = load(str(yaml_file))
+        except (OSError, ValueError, yaml.YAMLError):
+            continue
+        for dashboard in dashboards:
+            issues.extend(index.check(collect_field_references(dashboard)))
+
+    if len(issues) > 0:
+        console.print(f'[red]{ICON_ERROR}[/red] Found {len(issues)} unknown field(s):', style='red')
+        console.print(create_field_issues_table(issues))
+        msg = f'{len(issues)} field(s) do not exist in the field snapshot {snapshot_path}'
+        raise click.ClickException(msg)
+    console.print(f'[green]{ICON_SUCCESS}[/green] All fields exist in the field snapshot')
+
+
+def create_field_issues_table(issues: list[FieldIssue]) -> Table:
+    """Create a Rich table of field references that do not match the field snapshot.
+
+    Args:
+        issues: Issues found by the field check.
+
+    Returns:
+        A formatted Rich table with one row per issue.
+
+    """
+    table = Table(show_header=True, header_style='bold red')
+    table.add_column('Dashboard')
+    table.add_column('Problem', style='red')
+    table.add_column('Did you mean')
+
+    for issue in issues:
+        table.add_row(issue.reference.dashboard, issue.message, ', '.join(issue.suggestions))
+
+    return table
+
+
+@cli.group('fields')
+def fields() -> None:
+    """Work with the fields of Kibana data views."""
+
+
+@fields.command('pull')
+@click.option(
+    '--input-dir',
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+    default=DEFAULT_INPUT_DIR,
+    help='Directory containing YAML dashboard files. The fields of every data view they use are pulled.',
+)
+@click.option(
+    '--data-view',
+    'data_views',
+    multiple=True,
+    help='Additional data view ID or index pattern to pull. Repeat the option to pull several data views.',
+)
+@click.option(
+    '--output',
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=DEFAULT_FIELDS_SNAPSHOT,
+    help='File to write the field snapshot to.',
+)
+@click.option(
+    '--kibana-url',
+    type=str,
+    envvar='KIBANA_URL',
+    default='http://localhost:5601',
+    help='Kibana base URL. Example: https://kibana.example.com (env: KIBANA_URL)',
+)
+@click.option(
+    '--kibana-space',
+    type=str,
+    envvar='KIBANA_SPACE',
+    help='Kibana space to read data views from. Defaults to the default space. (env: KIBANA_SPACE)',
+)
+@click.option(
+    '--kibana-username',
+    type=str,
+    envvar='KIBANA_USERNAME',
+    help=(
+        'Kibana username for basic authentication. Must be used with --kibana-password. '
+        'Mutually exclusive with --kibana-api-key. (env: KIBANA_USERNAME)'
+    ),
+)
+@click.option(
+    '--kibana-password',
+    type=str,
+    envvar='KIBANA_PASSWORD',
+    help=(
+        'Kibana password for basic authentication. Must be used with --kibana-username. '
+        'Mutually exclusive with --kibana-api-key. (env: KIBANA_PASSWORD)'
+    ),
+)
+@click.option(
+    '--kibana-api-key',
+    type=str,
+    envvar='KIBANA_API_KEY',
+    help=(
+        'Kibana API key for authentication (recommended for production). '
+        'Mutually exclusive with --kibana-username/--kibana-password. (env: KIBANA_API_KEY)'
+    ),
+)
+@click.option(
+    '--kibana-no-ssl-verify',
+    is_flag=True,
+    help='Disable SSL certificate verification (useful for self-signed certificates in local development).',
+)
+@click.option(
+    '--concurrency',
+    type=click.IntRange(min=1),
+    default=DEFAULT_MAX_CONCURRENCY,
+    help=f'Maximum number of data views fetched in parallel. Default: {DEFAULT_MAX_CONCURRENCY}',
+)
+def pull_fields(  # noqa: PLR0913
+    input_dir: Path,
+    data_views: tuple[str, ...],
+    output: Path,
+    kibana_url: str,
+    kibana_space: str | None,
+    kibana_username: str | None,
+    kibana_password: str | None,
+    kibana_api_key: str | None,
+    kibana_no_ssl_verify: bool,
+    concurrency: int,
+) -> None:
+    r"""Save the field names of the data views used by the dashboards to a local snapshot.
+
+    This command finds every data view used by the YAML dashboards, fetches
+    their fields from Kibana and writes them to a snapshot file. Pass the
+    snapshot to `kb-dashboard compile --fields-snapshot` to catch misspelled
+    field names without a connection to Kibana.
+
+    \b
+    Examples:
+        # Pull the fields of every data view used in inputs/
+        kb-dashboard fields pull
+
+        # Include a data view that no dashboard uses yet
+        kb-dashboard fields pull --data-view logs-*
+    """
+    validate_kibana_auth(kibana_api_key, kibana_username, kibana_password)
+
+    dashboards = [dashboard for yaml_file in get_yaml_files(input_dir) for dashboard in _load_dashboards(yaml_file)]
+    wanted = list(dict.fromkeys([*referenced_data_views(dashboards), *data_views]))
+    if len(wanted) == 0:
+        console.print('[yellow]No data views to pull.[/yellow]')
+        return
+
+    client = KibanaClient(
+        url=kibana_url,
+        username=kibana_username,
+        password=kibana_password,
+        api_key=kibana_api_key,
+        ssl_verify=not kibana_no_ssl_verify,
+        space_id=kibana_space,
+    )
+    with console.status(f'Pulling the fields of {len(wanted)} data view(s)...'):
+        results = asyncio.run(client.get_data_views_fields(wanted, max_concurrency=concurrency))
+
+    console.print(create_data_view_fields_table(results))
+    FieldSnapshot.from_results(kibana_url.rstrip('/'), kibana_space, results).save(output)
+    console.print(f'[green]{ICON_SUCCESS}[/green] Wrote field snapshot: {_display_path(output)}')
+
+    failed = [result for result in results if result.error is not None]
+    if len(failed) > 0:
+        msg = f'{len(failed)} of {len(results)} data view(s) could not be pulled'
+        raise click.ClickException(msg)
+
+
+def _load_dashboards(yaml_file: Path) -> list[Dashboard]:
+    try:
+        return load(str(yaml_file))
+    except (OSError, ValueError, yaml.YAMLError) as e:
+        console.print(f'[yellow]{ICON_WARNING}[/yellow] Skipping {_display_path(yaml_file)}: {e}')
+        return []
+
+
+def create_data_view_fields_table(results: list[KibanaDataViewFields]) -> Table:
+    """Create a Rich table summarizing the pulled data views.
+
+    Args:
+        results: Fetched fields of each data view.
+
+    Returns:
+        A formatted Rich table with one row per data view.
+
+    """
+    table = Table(show_header=True, header_style='bold')
+    table.add_column('Data view')
+    table.add_column('Fields', justify='right')
+    table.add_column('Status')
+
+    for result in results:
+        status = f'[green]{ICON_SUCCESS} ok[/green]' if result.error is None else f'[red]{ICON_ERROR} {result.error}[/red]'
+        table.add_row(result.data_view, str(len(result.fields)) if result.error is None else '', status)
+
+    return table
+
+
+@cli.command('schema')
+@click.option(
+    '--output',
+    type=click.Path(dir_okay=False, path_type=Path),
+    help='File to write the JSON schema to. Prints the schema if omitted.',
+)
+@click.option(
+    '--hash',
+    'print_hash',
+    is_flag=True,
+    help='Print only the schema version hash, which changes whenever the schema does.',
+)
+def export_schema(output: Path | None, print_hash: bool) -> None:
+    r"""Export the JSON schema of dashboard YAML files.
+
+    Editors such as VS Code with the YAML extension can use the schema for validation,
+    auto-complete and hover documentation.
+
+    \b
+    Examples:
+        # Print the schema
+        kb-dashboard schema
+
+        # Write the schema to a file
+        kb-dashboard schema --output schema.json
+
+        # Print the version hash of the schema
+        kb-dashboard schema --hash
+    """
+    if print_hash is True:
+        click.echo(dashboard_schema_version())
+        return
+
+    if output is None:
+        click.echo(dashboard_schema_json(), nl=False)
+        return
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    _ = output.write_text(dashboard_schema_json())
+    console.print(f'[green]{ICON_SUCCESS}[/green] Wrote schema {dashboard_schema_version()} to {_display_path(output)}')
+
+
 if __name__ == '__main__':
     cli()
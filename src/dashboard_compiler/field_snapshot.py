@@ -0,0 +1,218 @@
+"""Local snapshot of the fields of Kibana data views, used to check field names without a connection to Kibana."""
+
+import difflib
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Literal, Self
+
+from pydantic import BaseModel, Field, ValidationError
+
+from dashboard_compiler.dashboard.config import Dashboard
+from dashboard_compiler.kibana_client import KibanaDataViewFields
+
+SNAPSHOT_VERSION = 1
+"""Version of the snapshot file format, bumped on incompatible changes."""
+
+MAX_SUGGESTIONS = 3
+
+
+class FieldSnapshot(BaseModel):
+    """The field names and types of data views, as pulled from a Kibana instance."""
+
+    version: Literal[1] = Field(default=SNAPSHOT_VERSION)
+    """Version of the snapshot file format."""
+
+    kibana_url: str = Field(...)
+    """Kibana base URL the fields were pulled from."""
+
+    space: str | None = Field(default=None)
+    """Kibana space the fields were pulled from. Defaults to the default space."""
+
+    data_views: dict[str, dict[str, str]] = Field(default_factory=dict)
+    """Field types by field name, for each data view ID or index pattern."""
+
+    @classmethod
+    def from_results(cls, kibana_url: str, space: str | None, results: list[KibanaDataViewFields]) -> Self:
+        """Create a snapshot from the data views that were fetched successfully.
+
+        Args:
+            kibana_url: Kibana base URL the fields were pulled from.
+            space: Kibana space the fields were pulled from.
+            results: Fetched fields of each data view. Results with an error are left out.
+
+        Returns:
+            The snapshot.
+
+        """
+        data_views = {result.data_view: {field.name: field.type for field in result.fields} for result in results if result.error is None}
+        return cls(kibana_url=kibana_url, space=space, data_views=data_views)
+
+    @classmethod
+    def load(cls, path: Path) -> Self:
+        """Load a snapshot file.
+
+        Args:
+            path: Path to the snapshot file.
+
+        Returns:
+            The snapshot.
+
+        Raises:
+            ValueError: If the file is corrupt or was written in a different format version.
+
+        """
+        try:
+            return cls.model_validate_json(path.read_bytes())
+        except ValidationError as e:
+            msg = f'Field snapshot {path} is invalid or from another version, run `kb-dashboard fields pull` again: {e}'
+            raise ValueError(msg) from e
+
+    def save(self, path: Path) -> None:
+        """Write the snapshot to a file, creating its directory if needed.
+
+        Args:
+            path: Path to write the snapshot to.
+
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _ = path.write_text(self.model_dump_json(indent=2) + '\n')
+
+
+class FieldReference(BaseModel):
+    """A field used by a dashboard, together with the data view it is read from."""
+
+    dashboard: str = Field(...)
+    """Name of the dashboard using the field."""
+
+    data_view: str = Field(...)
+    """ID or index pattern of the data view."""
+
+    field: str = Field(...)
+    """Name of the field."""
+
+
+class FieldIssue(BaseModel):
+    """A field reference that does not match the snapshot."""
+
+    reference: FieldReference = Field(...)
+    """The field reference."""
+
+    message: str = Field(...)
+    """What is wrong with the reference."""
+
+    suggestions: list[str] = Field(default_factory=list)
+    """Existing field names that are close to the referenced one."""
+
+
+class FieldIndex:
+    """In-memory index of a snapshot for fast field lookups and near-miss suggestions."""
+
+    _fields: dict[str, frozenset[str]]
+    _lowercase: dict[str, dict[str, str]]
+
+    def __init__(self, snapshot: FieldSnapshot) -> None:
+        """Index the fields of every data view in a snapshot.
+
+        Args:
+            snapshot: The snapshot to index.
+
+        """
+        self._fields = {data_view: frozenset(fields) for data_view, fields in snapshot.data_views.items()}
+        self._lowercase = {data_view: {name.lower(): name for name in fields} for data_view, fields in snapshot.data_views.items()}
+
+    def has_data_view(self, data_view: str) -> bool:
+        """Check whether the snapshot holds the fields of a data view."""
+        return data_view in self._fields
+
+    def has_field(self, data_view: str, field: str) -> bool:
+        """Check whether a data view has a field."""
+        return field in self._fields.get(data_view, frozenset())
+
+    def suggest(self, data_view: str, field: str) -> list[str]:
+        """Find the existing fields of a data view that are closest to a misspelled field name.
+
+        A field that only differs in case is always suggested first.
+
+        Args:
+            data_view: ID or index pattern of the data view.
+            field: The misspelled field name.
+
+        Returns:
+            Up to three field names, best match first.
+
+        """
+        suggestions: list[str] = []
+        same_but_case = self._lowercase.get(data_view, {}).get(field.lower())
+        if same_but_case is not None:
+            suggestions.append(same_but_case)
+        close = difflib.get_close_matches(field, self._fields.get(data_view, frozenset()), n=MAX_SUGGESTIONS, cutoff=0.75)
+        suggestions.extend(name for name in close if name not in suggestions)
+        return suggestions[:MAX_SUGGESTIONS]
+
+    def check(self, references: list[FieldReference]) -> list[FieldIssue]:
+        """Check field references against the snapshot.
+
+        Args:
+            references: The field references to check.
+
+        Returns:
+            One issue per reference to a missing field. References to data views that are not in
+            the snapshot get one issue per dashboard and data view.
+
+        """
+        issues: list[FieldIssue] = []
+        reported_data_views: set[tuple[str, str]] = set()
+        for reference in references:
+            if not self.has_data_view(reference.data_view):
+                if (reference.dashboard, reference.data_view) not in reported_data_views:
+                    reported_data_views.add((reference.dashboard, reference.data_view))
+                    message = f'Data view {reference.data_view} is not in the field snapshot'
+                    issues.append(FieldIssue(reference=reference, message=message))
+            elif not self.has_field(reference.data_view, reference.field):
+                message = f'Field {reference.field} does not exist in data view {reference.data_view}'
+                issues.append(
+                    FieldIssue(reference=reference, message=message, suggestions=self.suggest(reference.data_view, reference.field))
+                )
+        return issues
+
+
+def collect_field_references(dashboard: Dashboard) -> list[FieldReference]:
+    """Collect the fields a dashboard reads from data views.
+
+    Every `field` of a control, dimension, metric or filter is paired with the `data_view` of the
+    closest enclosing configuration that names one. Fields without a data view, such as those of
+    ES|QL panels or dashboard-wide filters, are left out.
+
+    Args:
+        dashboard: The dashboard configuration.
+
+    Returns:
+        The field references, in configuration order and without duplicates.
+
+    """
+    references = {
+        (data_view, field): FieldReference(dashboard=dashboard.name, data_view=data_view, field=field)
+        for data_view, field in _iter_fields(dashboard, data_view=None)
+    }
+    return list(references.values())
+
+
+def referenced_data_views(dashboards: list[Dashboard]) -> list[str]:
+    """Collect the data views whose fields the dashboards read, in configuration order."""
+    data_views = (reference.data_view for dashboard in dashboards for reference in collect_field_references(dashboard))
+    return list(dict.fromkeys(data_views))
+
+
+def _iter_fields(value: object, data_view: str | None) -> Iterator[tuple[str, str]]:
+    if isinstance(value, BaseModel):
+        own_data_view: object = getattr(value, 'data_view', None)
+        if isinstance(own_data_view, str):
+            data_view = own_data_view
+        field: object = getattr(value, 'field', None)
+        if isinstance(field, str) and data_view is not None:
+            yield data_view, field
+        for name in type(value).model_fields:
+            yield from _iter_fields(getattr(value, name), data_view)  # pyright: ignore[reportAny]
+    elif isinstance(value, list | tuple):
+        for item in value:  # pyright: ignore[reportUnknownVariableType]
+            yield from _iter_fields(item, data_view)  # pyright: ignore[reportUnknownArgumentType]
@@ -1,19 +1,63 @@
 """Kibana client for uploading dashboards via the Saved Objects API."""
 
 import asyncio
+import hashlib
+import json
 import logging
+import random
+import time
+from collections.abc import AsyncIterable, AsyncIterator, Awaitable, Callable, Iterable, Iterator, Mapping
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
 from pathlib import Path
-from typing import Any, ClassVar, TypedDict
+from typing import Any, ClassVar, Self, TypedDict
 
 import aiohttp
 import prison
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+
+from dashboard_compiler.upload_journal import UploadJournal
 
 logger = logging.getLogger(__name__)
 
 HTTP_OK = 200
+HTTP_NOT_FOUND = 404
 HTTP_SERVICE_UNAVAILABLE = 503
 
+DEFAULT_BATCH_SIZE = 500
+"""Maximum number of saved objects sent in a single `_import` request."""
+
+DEFAULT_BATCH_BYTES = 10 * 1024 * 1024
+"""Maximum NDJSON payload size of a single `_import` request (Kibana's default limit is 25 MiB)."""
+
+DEFAULT_MAX_CONCURRENCY = 4
+"""Maximum number of `_import` requests in flight at the same time."""
+
+DEFAULT_LINGER = 0.5
+"""Maximum seconds a streamed line waits for its batch to fill up before the batch is sent."""
+
+DEFAULT_RETRY_STATUSES = frozenset({429, 502, 503, 504})
+"""HTTP statuses treated as transient: rate limiting and gateway or availability errors."""
+
+DEFAULT_POLL_INTERVAL = 2.0
+"""Seconds to wait before the first poll of a reporting job."""
+
+DEFAULT_MAX_POLL_INTERVAL = 15.0
+"""Upper bound on the seconds between polls of a reporting job."""
+
+POLL_BACKOFF = 1.5
+"""Factor by which the interval between polls of a pending reporting job grows."""
+
+DOWNLOAD_CHUNK_BYTES = 64 * 1024
+"""Size of the chunks in which reports are streamed to disk."""
+
+MANAGED_TAG_ID = 'kb-dashboard-managed'
+"""ID of the tag that marks dashboards as managed by `kb-dashboard sync`."""
+
+CHECKED_REFERENCE_TYPES = frozenset({'index-pattern', 'dashboard'})
+"""Types of referenced saved objects that are checked before an import."""
+
 
 class _JobParamsLayout(TypedDict):
     id: str
@@ -41,10 +85,25 @@ class SavedObjectError(BaseModel):
 
     model_config: ClassVar[ConfigDict] = ConfigDict(extra='allow', populate_by_name=True)
 
+    id: str | None = None
+    type: str | None = None
     error: dict[str, Any] | None = None
     message: str | None = None
     status_code: int | None = Field(default=None, alias='statusCode')
 
+    def is_transient(self, retry_statuses: frozenset[int]) -> bool:
+        """Check whether the error was caused by a transient failure and the object can be submitted again.
+
+        Args:
+            retry_statuses: HTTP statuses treated as transient
+
+        Returns:
+            True if the error's status, or the status of its nested error, is in retry_statuses.
+
+        """
+        nested: object = self.error.get('statusCode') if self.error is not None else None
+        return self.status_code in retry_statuses or nested in retry_statuses
+
 
 class KibanaSavedObjectsResponse(BaseModel):
     """Response from Kibana saved objects import API."""
@@ -58,6 +117,150 @@ class KibanaSavedObjectsResponse(BaseModel):
     )
     errors: list[SavedObjectError] = Field(default_factory=list, description='List of errors encountered during import')
 
+    @classmethod
+    def merge(cls, responses: list['KibanaSavedObjectsResponse']) -> 'KibanaSavedObjectsResponse':
+        """Combine the responses of several batched imports into a single response.
+
+        The merged import is successful only if every batch was successful.
+
+        Args:
+            responses: Responses of the individual `_import` requests, in upload order.
+
+        Returns:
+            A single response with summed counts and concatenated results and errors.
+
+        """
+        return cls(
+            success=all(response.success for response in responses),
+            successCount=sum(response.success_count for response in responses),
+            successResults=[result for response in responses for result in response.success_results],
+            errors=[error for response in responses for error in response.errors],
+        )
+
+
+class KibanaIncrementalUploadResponse(BaseModel):
+    """Outcome of an incremental upload that skips objects Kibana already has."""
+
+    created: list[str] = Field(default_factory=list, description='IDs of objects that did not exist in Kibana')
+    updated: list[str] = Field(default_factory=list, description='IDs of objects whose content differed from Kibana')
+    skipped: list[str] = Field(default_factory=list, description='IDs of objects already up to date in Kibana')
+    import_response: KibanaSavedObjectsResponse = Field(
+        default_factory=lambda: KibanaSavedObjectsResponse(success=True), description='Merged response of the imports'
+    )
+
+    @classmethod
+    def merge(cls, responses: list['KibanaIncrementalUploadResponse']) -> 'KibanaIncrementalUploadResponse':
+        """Combine the responses of several batches into a single response.
+
+        Args:
+            responses: Responses of the individual batches, in upload order.
+
+        Returns:
+            A single response with concatenated IDs and merged import responses.
+
+        """
+        return cls(
+            created=[object_id for response in responses for object_id in response.created],
+            updated=[object_id for response in responses for object_id in response.updated],
+            skipped=[object_id for response in responses for object_id in response.skipped],
+            import_response=KibanaSavedObjectsResponse.merge([response.import_response for response in responses]),
+        )
+
+
+class KibanaSavedObject(BaseModel):
+    """A saved object as returned by Kibana's `_bulk_get` API."""
+
+    model_config: ClassVar[ConfigDict] = ConfigDict(extra='allow')
+
+    id: str
+    type: str
+    attributes: dict[str, Any] = Field(default_factory=dict)
+    references: list[dict[str, Any]] = Field(default_factory=list)
+    error: dict[str, Any] | None = Field(default=None, description='Set when the object could not be fetched, e.g. a 404')
+
+
+class KibanaBulkGetResponse(BaseModel):
+    """Response from Kibana saved objects bulk get API."""
+
+    model_config: ClassVar[ConfigDict] = ConfigDict(extra='allow')
+
+    saved_objects: list[KibanaSavedObject] = Field(default_factory=list)
+
+
+class KibanaFindResponse(BaseModel):
+    """Response from Kibana saved objects find API."""
+
+    model_config: ClassVar[ConfigDict] = ConfigDict(extra='allow', populate_by_name=True)
+
+    page: int = 1
+    per_page: int = 0
+    total: int = 0
+    saved_objects: list[KibanaSavedObject] = Field(default_factory=list)
+
+
+class KibanaDeleteResponse(BaseModel):
+    """Outcome of deleting several saved objects."""
+
+    deleted: list[str] = Field(default_factory=list, description='IDs of objects that were deleted or already gone')
+    errors: list[SavedObjectError] = Field(default_factory=list, description='List of errors encountered during deletion')
+
+
+class MissingReference(BaseModel):
+    """A saved object that a compiled dashboard references but the target Kibana space does not have."""
+
+    dashboard_id: str = Field(..., description='ID of the dashboard holding the reference')
+    type: str = Field(..., description="Type of the referenced object, e.g. 'index-pattern'")
+    id: str = Field(..., description='ID of the referenced object')
+    message: str = Field(..., description='Why the referenced object could not be resolved')
+
+
+class _ControlExplicitInput(BaseModel):
+    data_view_id: str | None = Field(default=None, alias='dataViewId')
+
+
+class _ControlPanel(BaseModel):
+    explicit_input: _ControlExplicitInput = Field(default_factory=_ControlExplicitInput, alias='explicitInput')
+
+
+class _ControlGroupInput(BaseModel):
+    panels_json: str = Field(default='{}', alias='panelsJSON')
+
+
+class _DashboardControls(BaseModel):
+    control_group_input: _ControlGroupInput | None = Field(default=None, alias='controlGroupInput')
+
+
+_CONTROL_PANELS = TypeAdapter(dict[str, _ControlPanel])
+
+
+class KibanaDataViewField(BaseModel):
+    """A field of a Kibana data view."""
+
+    model_config: ClassVar[ConfigDict] = ConfigDict(extra='allow')
+
+    name: str = Field(..., description='Full name of the field, e.g. host.name')
+    type: str = Field(default='unknown', description="Kibana field type, e.g. 'string' or 'number'")
+
+
+class KibanaDataViewFields(BaseModel):
+    """Outcome of fetching the fields of a single data view."""
+
+    data_view: str = Field(..., description='ID or index pattern of the data view')
+    fields: list[KibanaDataViewField] = Field(default_factory=list, description='Fields of the data view')
+    error: str | None = Field(default=None, description='Why the fields could not be fetched, if they could not')
+
+
+class _DataViewSpec(BaseModel):
+    fields: dict[str, KibanaDataViewField] = Field(default_factory=dict)
+
+
+class _DataViewResponse(BaseModel):
+    data_view: _DataViewSpec
+
+
+class _FieldsForWildcardResponse(BaseModel):
+    fields: list[KibanaDataViewField] = Field(default_factory=list)
+
 
 class KibanaReportingJobResponse(BaseModel):
     """Response from Kibana reporting job creation API."""
@@ -67,16 +270,68 @@ class KibanaReportingJobResponse(BaseModel):
     path: str = Field(..., description='Path to poll for job completion')
 
 
+class KibanaScreenshotResult(BaseModel):
+    """Outcome of capturing a single dashboard in a batch of screenshots."""
+
+    dashboard_id: str = Field(..., description='ID of the captured dashboard')
+    output_path: Path = Field(..., description='File the PNG was written to')
+    size: int = Field(default=0, description='Size of the PNG in bytes')
+    elapsed: float = Field(default=0.0, description='Seconds from submitting the job to the PNG being written')
+    error: str | None = Field(default=None, description='Why the screenshot failed, if it did')
+
+
+class RetryPolicy(BaseModel):
+    """Policy for retrying Kibana requests that fail for transient reasons.
+
+    Delays grow exponentially with full jitter, unless Kibana sends a `Retry-After` header,
+    which is honored as-is. Retrying stops after `max_attempts` or once the next attempt
+    would start after `total_timeout` seconds.
+    """
+
+    model_config: ClassVar[ConfigDict] = ConfigDict(frozen=True)
+
+    max_attempts: int = Field(default=5, ge=1, description='Maximum number of attempts, including the first one')
+    retry_statuses: frozenset[int] = Field(default=DEFAULT_RETRY_STATUSES, description='HTTP statuses that trigger a retry')
+    initial_delay: float = Field(default=0.5, ge=0, description='Upper bound of the first backoff delay in seconds')
+    max_delay: float = Field(default=30.0, ge=0, description='Upper bound of any backoff delay in seconds')
+    multiplier: float = Field(default=2.0, ge=1, description='Factor applied to the delay bound after each attempt')
+    total_timeout: float = Field(default=120.0, gt=0, description='Time budget in seconds for all attempts of one request')
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Get a jittered delay before the attempt following `attempt`.
+
+        Args:
+            attempt: Number of the attempt that just failed, starting at 1
+
+        Returns:
+            Delay in seconds, drawn uniformly between zero and the exponential bound
+
+        """
+        bound = min(self.max_delay, self.initial_delay * self.multiplier ** (attempt - 1))
+        return random.uniform(0, bound)  # noqa: S311
+
+
 class KibanaClient:
-    """Client for interacting with Kibana's Saved Objects API."""
+    """Client for interacting with Kibana's Saved Objects API.
+
+    Each operation opens its own HTTP session by default. Use the client as an async context
+    manager to share one pooled session, and its connections, across all operations:
+
+        async with KibanaClient(url) as client:
+            await client.upload_ndjson(first)
+            await client.upload_ndjson(second)
+    """
 
     url: str
     username: str | None
     password: str | None
     api_key: str | None
     ssl_verify: bool
+    space_id: str | None
+    retry_policy: RetryPolicy
+    _session: aiohttp.ClientSession | None
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         url: str,
         *,
@@ -84,6 +339,8 @@ class KibanaClient:
         password: str | None = None,
         api_key: str | None = None,
         ssl_verify: bool = True,
+        space_id: str | None = None,
+        retry_policy: RetryPolicy | None = None,
     ) -> None:
         """Initialize the Kibana client.
 
@@ -93,6 +350,9 @@ class KibanaClient:
             password: Basic auth password (optional)
             api_key: API key for authentication (optional)
             ssl_verify: Whether to verify SSL certificates (default: True). Set to False for self-signed certificates.
+            space_id: Kibana space to operate in (optional). Defaults to the default space.
+            retry_policy: Policy for retrying transient failures (default: RetryPolicy()).
+                Use RetryPolicy(max_attempts=1) to disable retries.
 
         """
         self.url = url.rstrip('/')
@@ -100,6 +360,55 @@ class KibanaClient:
         self.password = password
         self.api_key = api_key
         self.ssl_verify = ssl_verify
+        self.space_id = space_id if space_id is not None and space_id not in ('', 'default') else None
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self._session = None
+
+    async def __aenter__(self) -> Self:
+        """Open a pooled session that every request reuses until the client is closed."""
+        if self._session is None:
+            self._session = self._create_session()
+        return self
+
+    async def __aexit__(self, *_exc_info: object) -> None:
+        """Close the pooled session."""
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the pooled session, if one is open."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        """Create a session carrying the client's authentication and SSL settings."""
+        headers, auth = self._get_auth_headers_and_auth()
+        connector = aiohttp.TCPConnector(ssl=self.ssl_verify)
+        return aiohttp.ClientSession(connector=connector, headers=headers, auth=auth)
+
+    @asynccontextmanager
+    async def _use_session(self) -> AsyncIterator[aiohttp.ClientSession]:
+        """Yield the pooled session if the client is open, otherwise a session for a single operation."""
+        if self._session is not None:
+            yield self._session
+            return
+        async with self._create_session() as session:
+            yield session
+
+    @asynccontextmanager
+    async def _shared_session(self) -> AsyncIterator[None]:
+        """Keep one pooled session open for the duration of the block, unless the client already has one."""
+        if self._session is not None:
+            yield
+            return
+        async with self:
+            yield
+
+    def _space_url(self, path: str) -> str:
+        """Get the absolute URL of a path within the client's Kibana space."""
+        if self.space_id is None:
+            return f'{self.url}{path}'
+        return f'{self.url}/s/{self.space_id}{path}'
 
     def _get_auth_headers_and_auth(self) -> tuple[dict[str, str], aiohttp.BasicAuth | None]:
         """Get authentication headers and auth object for Kibana API requests.
@@ -118,45 +427,503 @@ class KibanaClient:
 
         return headers, auth
 
-    async def upload_ndjson(
+    async def _with_retry[T](self, operation: str, send: Callable[[], Awaitable[T]]) -> T:
+        """Run a request, retrying it according to the client's retry policy.
+
+        Args:
+            operation: Human-readable description of the request for log messages
+            send: Callable performing one attempt of the request. It must build a fresh request
+                body on every call and raise aiohttp.ClientResponseError for HTTP errors.
+
+        Returns:
+            The result of the first successful attempt
+
+        Raises:
+            aiohttp.ClientError: If the last attempt fails or the error is not transient
+
+        """
+        policy = self.retry_policy
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + policy.total_timeout
+        attempt = 1
+
+        while True:
+            try:
+                return await send()
+            except aiohttp.ClientResponseError as e:
+                if e.status not in policy.retry_statuses:
+                    raise
+                retry_after = _parse_retry_after(e.headers)
+                delay = retry_after if retry_after is not None else policy.backoff_delay(attempt)
+                reason = f'HTTP {e.status}'
+                error: aiohttp.ClientError = e
+            except aiohttp.ClientConnectionError as e:
+                delay = policy.backoff_delay(attempt)
+                reason = type(e).__name__
+                error = e
+
+            if attempt >= policy.max_attempts:
+                logger.warning('%s failed with %s after %d attempt(s), giving up', operation, reason, attempt)
+                raise error
+            if loop.time() + delay > deadline:
+                logger.warning('%s failed with %s, retry time budget of %.0fs exhausted', operation, reason, policy.total_timeout)
+                raise error
+
+            logger.warning('%s failed with %s, retrying in %.1fs (attempt %d/%d)', operation, reason, delay, attempt, policy.max_attempts)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def upload_ndjson(  # noqa: PLR0913
         self,
         ndjson_data: Path | str,
         overwrite: bool = True,
+        *,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        batch_bytes: int = DEFAULT_BATCH_BYTES,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        journal: UploadJournal | None = None,
     ) -> KibanaSavedObjectsResponse:
         """Upload NDJSON data to Kibana using the Saved Objects Import API.
 
+        The NDJSON content is streamed line by line into batches bounded by object count and
+        payload size. Batches are uploaded concurrently over a shared session, so at most
+        `max_concurrency` batches are held in memory regardless of the size of the input.
+
+        With a journal, lines it already records as imported are skipped, and the lines of every
+        batch are recorded as soon as Kibana accepts them. An upload that fails part way can then
+        be resumed with the same journal, sending only the objects that are still missing.
+
         Args:
             ndjson_data: Either a Path to an NDJSON file or a string containing NDJSON content
             overwrite: Whether to overwrite existing objects with the same IDs
+            batch_size: Maximum number of saved objects per `_import` request
+            batch_bytes: Maximum payload size in bytes per `_import` request. A single object larger
+                than this limit is still sent, on its own.
+            max_concurrency: Maximum number of `_import` requests in flight at the same time
+            journal: Journal of lines imported by earlier attempts, updated as batches complete
 
         Returns:
-            Pydantic model with parsed Kibana API response containing success status and results
+            Pydantic model with the merged Kibana API responses of all batches
 
         Raises:
-            aiohttp.ClientError: If the request fails
+            aiohttp.ClientError: If a request fails
+            ValueError: If a batching limit is not positive
+
+        """
+        _check_batch_limits(batch_size, batch_bytes, max_concurrency)
+        filename = ndjson_data.name if isinstance(ndjson_data, Path) else 'dashboard.ndjson'
+        batches = _aiter(_iter_ndjson_batches(ndjson_data, batch_size, batch_bytes))
+        return await self._import_batches(batches, overwrite=overwrite, filename=filename, max_concurrency=max_concurrency, journal=journal)
+
+    async def upload_ndjson_stream(  # noqa: PLR0913
+        self,
+        lines: AsyncIterable[str],
+        overwrite: bool = True,
+        *,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        batch_bytes: int = DEFAULT_BATCH_BYTES,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        linger: float = DEFAULT_LINGER,
+        journal: UploadJournal | None = None,
+    ) -> KibanaSavedObjectsResponse:
+        """Upload NDJSON lines to Kibana as they are produced, for example while dashboards are still compiling.
+
+        Lines are pulled from `lines` into a bounded queue and grouped into batches like `upload_ndjson`
+        does. A batch is also sent once its first line has waited `linger` seconds, so uploads keep up
+        with a slow producer instead of waiting for a full batch. When every upload slot is busy the
+        queue fills up and `lines` is no longer consumed, which applies backpressure to the producer.
+
+        Args:
+            lines: NDJSON lines, one saved object each
+            overwrite: Whether to overwrite existing objects with the same IDs
+            batch_size: Maximum number of saved objects per `_import` request
+            batch_bytes: Maximum payload size in bytes per `_import` request
+            max_concurrency: Maximum number of `_import` requests in flight at the same time
+            linger: Maximum seconds a line waits for its batch to fill up before the batch is sent
+            journal: Journal of lines imported by earlier attempts, updated as batches complete
+
+        Returns:
+            Pydantic model with the merged Kibana API responses of all batches
+
+        Raises:
+            aiohttp.ClientError: If a request fails
+            ValueError: If a batching limit is not positive
 
         """
-        endpoint = f'{self.url}/api/saved_objects/_import'
+        _check_batch_limits(batch_size, batch_bytes, max_concurrency)
+        batches = _aiter_ndjson_batches(lines, batch_size, batch_bytes, linger)
+        return await self._import_batches(
+            batches, overwrite=overwrite, filename='dashboard.ndjson', max_concurrency=max_concurrency, journal=journal
+        )
+
+    async def _import_batches(
+        self,
+        batches: AsyncIterator[list[bytes]],
+        *,
+        overwrite: bool,
+        filename: str,
+        max_concurrency: int,
+        journal: UploadJournal | None,
+    ) -> KibanaSavedObjectsResponse:
+        """Import batches concurrently, skipping and recording lines in the journal if one is given."""
+        endpoint = self._space_url('/api/saved_objects/_import')
         if overwrite:
             endpoint += '?overwrite=true'
 
-        headers, auth = self._get_auth_headers_and_auth()
-
-        connector = aiohttp.TCPConnector(ssl=self.ssl_verify)
-        async with aiohttp.ClientSession(connector=connector) as session:
-            data = aiohttp.FormData()
+        async def _upload(session: aiohttp.ClientSession, batch: list[bytes]) -> KibanaSavedObjectsResponse:
+            if journal is None:
+                return await self._import_batch(session, endpoint, batch, filename)
 
-            if isinstance(ndjson_data, Path):
-                with ndjson_data.open('rb') as f:
-                    content = f.read()
-                data.add_field('file', content, filename=ndjson_data.name, content_type='application/ndjson')
+            pending = [line for line in batch if not journal.is_done(line)]
+            if len(pending) == 0:
+                return KibanaSavedObjectsResponse(success=True)
+            response = await self._import_batch(session, endpoint, pending, filename)
+            if len(response.errors) == 0:
+                journal.record(pending)
             else:
-                data.add_field('file', ndjson_data.encode('utf-8'), filename='dashboard.ndjson', content_type='application/ndjson')
+                imported = {(result.type, result.id) for result in response.success_results}
+                journal.record([line for line in pending if _saved_object_key(line) in imported])
+            return response
+
+        responses = await self._map_batches(batches, _upload, max_concurrency=max_concurrency)
+        if len(responses) == 0:
+            return KibanaSavedObjectsResponse(success=True)
+
+        return KibanaSavedObjectsResponse.merge(responses)
+
+    async def upload_ndjson_incremental(
+        self,
+        ndjson_data: Path | str,
+        *,
+        dry_run: bool = False,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        batch_bytes: int = DEFAULT_BATCH_BYTES,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    ) -> KibanaIncrementalUploadResponse:
+        """Upload only the saved objects that are new or differ from what Kibana already has.
+
+        Each batch of NDJSON lines is first looked up with a single `_bulk_get` request. Objects
+        whose attributes and references match the stored copy (see `saved_object_fingerprint`)
+        are skipped, the remaining ones are imported with overwrite enabled.
+
+        Args:
+            ndjson_data: Either a Path to an NDJSON file or a string containing NDJSON content
+            dry_run: Only classify the objects, without importing anything
+            batch_size: Maximum number of saved objects per `_bulk_get` and `_import` request
+            batch_bytes: Maximum payload size in bytes per `_import` request
+            max_concurrency: Maximum number of batches processed at the same time
+
+        Returns:
+            The IDs of created, updated and skipped objects and the merged import response
+
+        Raises:
+            aiohttp.ClientError: If a request fails
+            ValueError: If a batching limit is not positive or a line is not a saved object
+
+        """
+        _check_batch_limits(batch_size, batch_bytes, max_concurrency)
+        endpoint = self._space_url('/api/saved_objects/_import?overwrite=true')
+        filename = ndjson_data.name if isinstance(ndjson_data, Path) else 'dashboard.ndjson'
+
+        async def _upload_changed(session: aiohttp.ClientSession, batch: list[bytes]) -> KibanaIncrementalUploadResponse:
+            compiled = [KibanaSavedObject.model_validate_json(line) for line in batch]
+            existing = await self._bulk_get(session, [(obj.type, obj.id) for obj in compiled])
+
+            result = KibanaIncrementalUploadResponse()
+            changed: list[bytes] = []
+            for line, obj, current in zip(batch, compiled, existing, strict=True):
+                if current.error is not None:
+                    result.created.append(obj.id)
+                elif saved_object_fingerprint(current) != saved_object_fingerprint(obj):
+                    result.updated.append(obj.id)
+                else:
+                    result.skipped.append(obj.id)
+                    continue
+                changed.append(line)
+
+            if len(changed) > 0 and dry_run is False:
+                result.import_response = await self._import_batch(session, endpoint, changed, filename)
+            return result
+
+        batches = _aiter(_iter_ndjson_batches(ndjson_data, batch_size, batch_bytes))
+        responses = await self._map_batches(batches, _upload_changed, max_concurrency=max_concurrency)
+        return KibanaIncrementalUploadResponse.merge(responses)
+
+    async def bulk_get_saved_objects(self, objects: list[tuple[str, str]]) -> list[KibanaSavedObject]:
+        """Fetch several saved objects in a single `_bulk_get` request.
+
+        Args:
+            objects: (type, id) pairs of the saved objects to fetch
+
+        Returns:
+            One KibanaSavedObject per requested pair, in request order. Objects that could not be
+            fetched, e.g. because they do not exist, have their `error` set.
+
+        Raises:
+            aiohttp.ClientError: If the request fails
+
+        """
+        async with self._use_session() as session:
+            return await self._bulk_get(session, objects)
+
+    async def check_references(self, ndjson_data: Path | str) -> list[MissingReference]:
+        """Check that the data views and dashboards referenced by compiled dashboards exist before importing them.
+
+        All unique references across the NDJSON content are resolved with a single `_bulk_get`
+        request. References to objects that are part of the content itself are not checked, since
+        they are created by the import.
+
+        Args:
+            ndjson_data: Path to an NDJSON file, or NDJSON content as a string
+
+        Returns:
+            One entry per dashboard and reference that could not be resolved, in dashboard order
+
+        Raises:
+            aiohttp.ClientError: If the request fails
+
+        """
+        referenced_by = collect_references(line.decode('utf-8') for line in _iter_ndjson_lines(ndjson_data))
+        async with self._use_session() as session:
+            resolved = await self._bulk_get(session, list(referenced_by))
+
+        missing: list[MissingReference] = []
+        for (object_type, object_id), saved_object in zip(referenced_by, resolved, strict=True):
+            if saved_object.error is None:
+                continue
+            reason: object = saved_object.error.get('message')
+            message = reason if isinstance(reason, str) else 'Saved object not found'
+            missing.extend(
+                MissingReference(dashboard_id=dashboard_id, type=object_type, id=object_id, message=message)
+                for dashboard_id in referenced_by[object_type, object_id]
+            )
+        dashboard_ids = list(dict.fromkeys(dashboard_id for dashboard_ids in referenced_by.values() for dashboard_id in dashboard_ids))
+        return sorted(missing, key=lambda reference: dashboard_ids.index(reference.dashboard_id))
+
+    async def find_saved_objects(
+        self,
+        object_type: str,
+        *,
+        has_reference: tuple[str, str] | None = None,
+        fields: list[str] | None = None,
+        per_page: int = 1000,
+    ) -> list[KibanaSavedObject]:
+        """List all saved objects of a type in the client's space, following pagination.
+
+        Args:
+            object_type: Saved object type to list, e.g. 'dashboard'
+            has_reference: Optional (type, id) of an object the listed objects must reference, e.g. a tag
+            fields: Optional attribute names to return, to keep responses small
+            per_page: Number of objects requested per page
+
+        Returns:
+            All matching saved objects
+
+        Raises:
+            aiohttp.ClientError: If a request fails
+
+        """
+        endpoint = self._space_url('/api/saved_objects/_find')
+        params: list[tuple[str, str]] = [('type', object_type), ('per_page', str(per_page))]
+        if has_reference is not None:
+            params.append(('has_reference', json.dumps({'type': has_reference[0], 'id': has_reference[1]})))
+        if fields is not None:
+            params.extend(('fields', field) for field in fields)
+
+        found: list[KibanaSavedObject] = []
+        async with self._use_session() as session:
+            page = 1
+            while True:
+                page_params = [*params, ('page', str(page))]
+
+                async def _send(page_params: list[tuple[str, str]] = page_params) -> KibanaFindResponse:
+                    async with session.get(endpoint, params=page_params) as response:
+                        response.raise_for_status()
+                        json_response = await response.json()  # pyright: ignore[reportAny]
+                        return KibanaFindResponse.model_validate(json_response)
+
+                result = await self._with_retry(f'Listing {object_type} saved objects (page {page})', _send)
+                found.extend(result.saved_objects)
+                if len(result.saved_objects) == 0 or len(found) >= result.total:
+                    return found
+                page += 1
+
+    async def delete_saved_objects(
+        self,
+        objects: list[tuple[str, str]],
+        *,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    ) -> KibanaDeleteResponse:
+        """Delete saved objects with bounded concurrency.
+
+        Objects that no longer exist count as deleted. Other failures are collected instead of
+        aborting the remaining deletions.
 
-            async with session.post(endpoint, data=data, headers=headers, auth=auth) as response:
+        Args:
+            objects: (type, id) pairs of the saved objects to delete
+            max_concurrency: Maximum number of delete requests in flight at the same time
+
+        Returns:
+            The IDs of deleted objects and the errors of failed deletions
+
+        """
+        result = KibanaDeleteResponse()
+        async with self._use_session() as session:
+            slots = asyncio.Semaphore(max_concurrency)
+
+            async def _delete(object_type: str, object_id: str) -> None:
+                endpoint = self._space_url(f'/api/saved_objects/{object_type}/{object_id}')
+
+                async def _send() -> None:
+                    async with session.delete(endpoint) as response:
+                        if response.status != HTTP_NOT_FOUND:
+                            response.raise_for_status()
+
+                async with slots:
+                    try:
+                        await self._with_retry(f'Deleting {object_type} {object_id}', _send)
+                    except aiohttp.ClientResponseError as e:
+                        result.errors.append(
+                            SavedObjectError(message=f'Failed to delete {object_type} {object_id}: {e.message}', statusCode=e.status)
+                        )
+                    except aiohttp.ClientError as e:
+                        reason = str(e) or type(e).__name__
+                        result.errors.append(
+                            SavedObjectError(message=f'Failed to delete {object_type} {object_id}: {reason}', statusCode=None)
+                        )
+                    else:
+                        result.deleted.append(object_id)
+
+            _ = await asyncio.gather(*(_delete(object_type, object_id) for object_type, object_id in objects))
+
+        return result
+
+    async def _bulk_get(self, session: aiohttp.ClientSession, objects: list[tuple[str, str]]) -> list[KibanaSavedObject]:
+        """Fetch saved objects with `_bulk_get` over an existing session."""
+        if len(objects) == 0:
+            return []
+
+        endpoint = self._space_url('/api/saved_objects/_bulk_get')
+        body = [{'type': object_type, 'id': object_id} for object_type, object_id in objects]
+
+        async def _send() -> list[KibanaSavedObject]:
+            async with session.post(endpoint, json=body) as response:
                 response.raise_for_status()
                 json_response = await response.json()  # pyright: ignore[reportAny]
-                return KibanaSavedObjectsResponse.model_validate(json_response)
+                return KibanaBulkGetResponse.model_validate(json_response).saved_objects
+
+        return await self._with_retry(f'Bulk get of {len(objects)} saved object(s)', _send)
+
+    async def _map_batches[T](
+        self,
+        batches: AsyncIterator[list[bytes]],
+        handle_batch: Callable[[aiohttp.ClientSession, list[bytes]], Awaitable[T]],
+        *,
+        max_concurrency: int,
+    ) -> list[T]:
+        """Handle batches of NDJSON lines concurrently over a shared session.
+
+        Batches are pulled lazily, so at most `max_concurrency` batches are held in memory.
+
+        Args:
+            batches: Batches of encoded NDJSON lines
+            handle_batch: Coroutine function called with the session and each batch of encoded lines
+            max_concurrency: Maximum number of batches handled at the same time
+
+        Returns:
+            The results of `handle_batch`, in batch order
+
+        """
+        async with self._use_session() as session:
+            slots = asyncio.Semaphore(max_concurrency)
+
+            async def _handle(batch_number: int, batch: list[bytes]) -> T:
+                try:
+                    logger.debug('Processing batch %d (%d objects)', batch_number, len(batch))
+                    return await handle_batch(session, batch)
+                finally:
+                    slots.release()
+
+            tasks: list[asyncio.Task[T]] = []
+            try:
+                async with asyncio.TaskGroup() as task_group:
+                    while True:
+                        # Take a slot before pulling the next batch, so that no batch waits in memory for a slot
+                        _ = await slots.acquire()
+                        try:
+                            batch = await anext(batches)
+                        except StopAsyncIteration:
+                            slots.release()
+                            break
+                        tasks.append(task_group.create_task(_handle(len(tasks), batch)))
+            except ExceptionGroup as exc_group:
+                # Surface the first failure as-is so callers can keep catching aiohttp.ClientError
+                raise exc_group.exceptions[0] from None
+
+        return [task.result() for task in tasks]
+
+    async def _import_batch(
+        self,
+        session: aiohttp.ClientSession,
+        endpoint: str,
+        batch: list[bytes],
+        filename: str,
+    ) -> KibanaSavedObjectsResponse:
+        """Post a single batch of NDJSON lines to the `_import` endpoint.
+
+        Objects that Kibana rejects with a transient status are submitted again, on their own,
+        with the same backoff and attempt limit as failed requests.
+
+        Args:
+            session: Session to send the request with
+            endpoint: Fully qualified `_import` URL including query parameters
+            batch: Encoded NDJSON lines without trailing newlines
+            filename: Filename reported to Kibana for the multipart upload
+
+        Returns:
+            Parsed Kibana API response for the batch, with the results of any resubmissions merged in
+
+        """
+
+        async def _post(lines: list[bytes]) -> KibanaSavedObjectsResponse:
+            payload = b'\n'.join(lines) + b'\n'
+
+            async def _send() -> KibanaSavedObjectsResponse:
+                # FormData can only be serialized once, so every attempt builds its own
+                data = aiohttp.FormData()
+                data.add_field('file', payload, filename=filename, content_type='application/ndjson')
+                async with session.post(endpoint, data=data) as response:
+                    response.raise_for_status()
+                    json_response = await response.json()  # pyright: ignore[reportAny]
+                    return KibanaSavedObjectsResponse.model_validate(json_response)
+
+            return await self._with_retry(f'Import of {len(lines)} saved object(s)', _send)
+
+        policy = self.retry_policy
+        response = await _post(batch)
+        settled: list[KibanaSavedObjectsResponse] = []
+        pending = batch
+        for attempt in range(1, policy.max_attempts):
+            transient = {(error.type, error.id) for error in response.errors if error.is_transient(policy.retry_statuses)}
+            if len(transient) == 0:
+                break
+            pending = [line for line in pending if _saved_object_key(line) in transient]
+            settled.append(response.model_copy(update={'errors': [e for e in response.errors if (e.type, e.id) not in transient]}))
+            delay = policy.backoff_delay(attempt)
+            logger.warning(
+                '%d saved object(s) failed transiently, resubmitting in %.1fs (attempt %d/%d)',
+                len(pending),
+                delay,
+                attempt + 1,
+                policy.max_attempts,
+            )
+            await asyncio.sleep(delay)
+            response = await _post(pending)
+
+        if len(settled) == 0:
+            return response
+        merged = KibanaSavedObjectsResponse.merge([*settled, response])
+        return merged.model_copy(update={'success': len(merged.errors) == 0})
 
     def get_dashboard_url(self, dashboard_id: str) -> str:
         """Get the URL for a specific dashboard.
@@ -168,7 +935,7 @@ class KibanaClient:
             Full URL to the dashboard in Kibana
 
         """
-        return f'{self.url}/app/dashboards#/view/{dashboard_id}'
+        return self._space_url(f'/app/dashboards#/view/{dashboard_id}')
 
     async def generate_screenshot(  # noqa: PLR0913
         self,
@@ -229,33 +996,33 @@ class KibanaClient:
             msg = f'prison.dumps() returned {type(rison_result).__name__}, expected str'  # pyright: ignore[reportUnknownArgumentType]
             raise TypeError(msg)
 
-        endpoint = f'{self.url}/api/reporting/generate/pngV2'
+        endpoint = self._space_url('/api/reporting/generate/pngV2')
         params: dict[str, str] = {'jobParams': rison_result}
 
-        headers, auth = self._get_auth_headers_and_auth()
+        async with self._use_session() as session:
 
-        connector = aiohttp.TCPConnector(ssl=self.ssl_verify)
-        async with (
-            aiohttp.ClientSession(connector=connector) as session,
-            session.post(endpoint, params=params, headers=headers, auth=auth) as response,
-        ):
-            response.raise_for_status()
-            json_response = await response.json()  # pyright: ignore[reportAny]
-            job_response = KibanaReportingJobResponse.model_validate(json_response)
-            return job_response.path
+            async def _send() -> str:
+                async with session.post(endpoint, params=params) as response:
+                    response.raise_for_status()
+                    json_response = await response.json()  # pyright: ignore[reportAny]
+                    return KibanaReportingJobResponse.model_validate(json_response).path
+
+            return await self._with_retry(f'Reporting job creation for dashboard {dashboard_id}', _send)
 
     async def wait_for_job_completion(
         self,
         job_path: str,
         timeout_seconds: int = 300,
-        poll_interval: int = 2,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        max_poll_interval: float = DEFAULT_MAX_POLL_INTERVAL,
     ) -> bytes:
         """Poll a reporting job until completion and download the result.
 
         Args:
             job_path: The reporting job path returned from generate_screenshot
             timeout_seconds: Maximum seconds to wait (default: 300)
-            poll_interval: Seconds between polls (default: 2)
+            poll_interval: Seconds before the first poll, growing while the job is pending (default: 2)
+            max_poll_interval: Upper bound on the seconds between polls (default: 15)
 
         Returns:
             PNG screenshot data as bytes
@@ -265,32 +1032,98 @@ class KibanaClient:
             aiohttp.ClientError: If the request fails
 
         """
-        endpoint = f'{self.url}{job_path}'
 
-        headers, auth = self._get_auth_headers_and_auth()
+        async def _read(response: aiohttp.ClientResponse) -> bytes:
+            return await response.read()
+
+        return await self._wait_for_report(job_path, _read, timeout_seconds, poll_interval, max_poll_interval)
+
+    async def download_report(
+        self,
+        job_path: str,
+        output_path: Path,
+        timeout_seconds: int = 300,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        max_poll_interval: float = DEFAULT_MAX_POLL_INTERVAL,
+    ) -> int:
+        """Poll a reporting job until completion and stream the result to a file.
+
+        The report is written in chunks to a temporary file next to `output_path`, which then
+        replaces `output_path`. The report is never held in memory as a whole, and an interrupted
+        download never leaves a truncated file behind.
+
+        Args:
+            job_path: The reporting job path returned from generate_screenshot
+            output_path: Local file path to save the report to
+            timeout_seconds: Maximum seconds to wait (default: 300)
+            poll_interval: Seconds before the first poll, growing while the job is pending (default: 2)
+            max_poll_interval: Upper bound on the seconds between polls (default: 15)
+
+        Returns:
+            Number of bytes written
+
+        Raises:
+            TimeoutError: If job doesn't complete within timeout
+            aiohttp.ClientError: If the request fails
+
+        """
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        partial_path = output_path.with_name(f'{output_path.name}.part')
+
+        async def _stream(response: aiohttp.ClientResponse) -> int:
+            size = 0
+            with partial_path.open('wb') as f:
+                async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_BYTES):
+                    size += f.write(chunk)
+            _ = partial_path.replace(output_path)
+            return size
 
         try:
-            async with asyncio.timeout(timeout_seconds):
-                connector = aiohttp.TCPConnector(ssl=self.ssl_verify)
-                async with aiohttp.ClientSession(connector=connector) as session:
-                    while True:
-                        async with session.get(endpoint, headers=headers, auth=auth) as response:
-                            if response.status == HTTP_OK:
-                                content_type = response.headers.get('Content-Type', '')
-                                if 'image/png' in content_type:
-                                    return await response.read()
-                                body = await response.text()
-                                msg = (
-                                    f'Unexpected response from Kibana (status {response.status}, content-type {content_type}): {body[:200]}'
-                                )
-                                raise ValueError(msg)
-
-                            if response.status == HTTP_SERVICE_UNAVAILABLE:
-                                pass
-                            else:
-                                response.raise_for_status()
-
-                        await asyncio.sleep(poll_interval)
+            return await self._wait_for_report(job_path, _stream, timeout_seconds, poll_interval, max_poll_interval)
+        finally:
+            partial_path.unlink(missing_ok=True)
+
+    async def _wait_for_report[T](
+        self,
+        job_path: str,
+        handle: Callable[[aiohttp.ClientResponse], Awaitable[T]],
+        timeout_seconds: int,
+        poll_interval: float,
+        max_poll_interval: float,
+    ) -> T:
+        """Poll a reporting job with growing intervals and hand the finished PNG response to `handle`.
+
+        While the job is pending, the interval between polls grows by `POLL_BACKOFF` up to
+        `max_poll_interval`. A `Retry-After` header sent by Kibana takes precedence, within the same bound.
+
+        Raises:
+            TimeoutError: If job doesn't complete within timeout
+            ValueError: If Kibana answers with something other than a PNG
+            aiohttp.ClientError: If the request fails
+
+        """
+        endpoint = f'{self.url}{job_path}'
+        interval = poll_interval
+
+        try:
+            async with asyncio.timeout(timeout_seconds), self._use_session() as session:
+                while True:
+                    async with session.get(endpoint) as response:
+                        if response.status == HTTP_OK:
+                            content_type = response.headers.get('Content-Type', '')
+                            if 'image/png' in content_type:
+                                return await handle(response)
+                            body = await response.text()
+                            msg = f'Unexpected response from Kibana (status {response.status}, content-type {content_type}): {body[:200]}'
+                            raise ValueError(msg)
+
+                        # 503 means the job is still pending, other transient errors are retried by polling again
+                        if response.status != HTTP_SERVICE_UNAVAILABLE and response.status not in self.retry_policy.retry_statuses:
+                            response.raise_for_status()
+                        retry_after = _parse_retry_after(response.headers)
+
+                    await asyncio.sleep(min(retry_after if retry_after is not None else interval, max_poll_interval))
+                    interval = min(interval * POLL_BACKOFF, max_poll_interval)
         except TimeoutError as e:
             msg = f'Screenshot generation timed out after {timeout_seconds} seconds'
             raise TimeoutError(msg) from e
@@ -308,7 +1141,7 @@ class KibanaClient:
     ) -> None:
         """Generate and download a screenshot of a dashboard to a file.
 
-        This is a convenience method that combines generate_screenshot and wait_for_job_completion.
+        This is a convenience method that combines generate_screenshot and download_report.
 
         Args:
             dashboard_id: The dashboard ID to screenshot
@@ -334,8 +1167,416 @@ class KibanaClient:
             browser_timezone=browser_timezone,
         )
 
-        screenshot_data = await self.wait_for_job_completion(job_path, timeout_seconds=timeout_seconds)
+        _ = await self.download_report(job_path, output_path, timeout_seconds=timeout_seconds)
 
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        with output_path.open('wb') as f:
-            _ = f.write(screenshot_data)
+    async def download_screenshots(  # noqa: PLR0913
+        self,
+        dashboard_ids: list[str],
+        output_dir: Path,
+        time_from: str | None = None,
+        time_to: str | None = None,
+        width: int = 1920,
+        height: int = 1080,
+        browser_timezone: str = 'UTC',
+        timeout_seconds: int = 300,
+        *,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        max_poll_interval: float = DEFAULT_MAX_POLL_INTERVAL,
+    ) -> list[KibanaScreenshotResult]:
+        """Capture screenshots of many dashboards, writing each to `<output_dir>/<dashboard_id>.png`.
+
+        At most `max_concurrency` reporting jobs are in flight at the same time, so Kibana's
+        reporting queue is not flooded. All jobs share one session, and a dashboard that fails
+        is reported in its result without stopping the others.
+
+        Args:
+            dashboard_ids: IDs of the dashboards to capture
+            output_dir: Directory to write the PNGs to
+            time_from: Optional start time for the dashboard time range (ISO 8601 format)
+            time_to: Optional end time for the dashboard time range (ISO 8601 format)
+            width: Screenshot width in pixels (default: 1920)
+            height: Screenshot height in pixels (default: 1080)
+            browser_timezone: Timezone for the screenshot (default: UTC)
+            timeout_seconds: Maximum seconds to wait for each screenshot (default: 300)
+            max_concurrency: Maximum number of reporting jobs in flight at the same time
+            poll_interval: Seconds before the first poll of each job (default: 2)
+            max_poll_interval: Upper bound on the seconds between polls of each job (default: 15)
+
+        Returns:
+            One result per dashboard, in the order of `dashboard_ids`
+
+        Raises:
+            ValueError: If max_concurrency is not positive
+
+        """
+        if max_concurrency < 1:
+            msg = 'max_concurrency must be positive'
+            raise ValueError(msg)
+
+        slots = asyncio.Semaphore(max_concurrency)
+
+        async def _capture(dashboard_id: str) -> KibanaScreenshotResult:
+            output_path = output_dir / f'{dashboard_id}.png'
+            async with slots:
+                started = time.perf_counter()
+                try:
+                    job_path = await self.generate_screenshot(dashboard_id, time_from, time_to, width, height, browser_timezone)
+                    size = await self.download_report(job_path, output_path, timeout_seconds, poll_interval, max_poll_interval)
+                except (aiohttp.ClientError, OSError, ValueError, TimeoutError) as e:
+                    error = str(e) or type(e).__name__
+                    return KibanaScreenshotResult(
+                        dashboard_id=dashboard_id, output_path=output_path, elapsed=time.perf_counter() - started, error=error
+                    )
+                return KibanaScreenshotResult(
+                    dashboard_id=dashboard_id, output_path=output_path, size=size, elapsed=time.perf_counter() - started
+                )
+
+        async with self._shared_session():
+            return list(await asyncio.gather(*(_capture(dashboard_id) for dashboard_id in dashboard_ids)))
+
+    async def get_data_view_fields(self, data_view: str) -> list[KibanaDataViewField]:
+        """Fetch the fields of a data view.
+
+        Dashboards may name a data view by ID or by index pattern, so if no data view has the
+        given ID, the fields of the indices matching it as an index pattern are returned instead.
+
+        Args:
+            data_view: ID or index pattern of the data view
+
+        Returns:
+            The fields of the data view, sorted by name
+
+        Raises:
+            aiohttp.ClientError: If a request fails, including when no index matches the pattern
+
+        """
+        async with self._use_session() as session:
+
+            async def _send_data_view() -> list[KibanaDataViewField] | None:
+                endpoint = self._space_url(f'/api/data_views/data_view/{data_view}')
+                async with session.get(endpoint) as response:
+                    if response.status == HTTP_NOT_FOUND:
+                        return None
+                    response.raise_for_status()
+                    json_response = await response.json()  # pyright: ignore[reportAny]
+                    return list(_DataViewResponse.model_validate(json_response).data_view.fields.values())
+
+            async def _send_fields_for_wildcard() -> list[KibanaDataViewField]:
+                endpoint = self._space_url('/api/index_patterns/_fields_for_wildcard')
+                async with session.get(endpoint, params={'pattern': data_view}) as response:
+                    response.raise_for_status()
+                    json_response = await response.json()  # pyright: ignore[reportAny]
+                    return _FieldsForWildcardResponse.model_validate(json_response).fields
+
+            fields = await self._with_retry(f'Fetching data view {data_view}', _send_data_view)
+            if fields is None:
+                fields = await self._with_retry(f'Fetching fields of index pattern {data_view}', _send_fields_for_wildcard)
+
+        return sorted(fields, key=lambda field: field.name)
+
+    async def get_data_views_fields(
+        self, data_views: list[str], *, max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+    ) -> list[KibanaDataViewFields]:
+        """Fetch the fields of several data views concurrently over one session.
+
+        A data view that cannot be fetched is reported in its result without stopping the others.
+
+        Args:
+            data_views: IDs or index patterns of the data views
+            max_concurrency: Maximum number of data views fetched at the same time
+
+        Returns:
+            One result per data view, in the order of `data_views`
+
+        Raises:
+            ValueError: If max_concurrency is not positive
+
+        """
+        if max_concurrency < 1:
+            msg = 'max_concurrency must be positive'
+            raise ValueError(msg)
+
+        slots = asyncio.Semaphore(max_concurrency)
+
+        async def _fetch(data_view: str) -> KibanaDataViewFields:
+            async with slots:
+                try:
+                    fields = await self.get_data_view_fields(data_view)
+                except aiohttp.ClientError as e:
+                    return KibanaDataViewFields(data_view=data_view, error=str(e) or type(e).__name__)
+                return KibanaDataViewFields(data_view=data_view, fields=fields)
+
+        async with self._shared_session():
+            return list(await asyncio.gather(*(_fetch(data_view) for data_view in data_views)))
+
+
+def saved_object_fingerprint(saved_object: KibanaSavedObject) -> str:
+    """Compute a fingerprint of the user-controlled content of a saved object.
+
+    Only `attributes` and `references` contribute, so metadata that Kibana manages itself
+    (timestamps, versions, namespaces) is ignored. Attributes holding stringified JSON, such as
+    `panelsJSON`, are parsed first so that re-serialization by Kibana does not change the result.
+
+    Args:
+        saved_object: A saved object parsed from compiled NDJSON or returned by Kibana
+
+    Returns:
+        Hex-encoded SHA-256 digest
+
+    """
+    references = [_normalize_json_value(reference) for reference in saved_object.references]
+    content = {
+        'attributes': _normalize_json_value(saved_object.attributes),
+        'references': sorted(references, key=lambda reference: json.dumps(reference, sort_keys=True)),
+    }
+    return hashlib.sha256(json.dumps(content, sort_keys=True, separators=(',', ':')).encode('utf-8')).hexdigest()
+
+
+def collect_references(ndjson_lines: Iterable[str]) -> dict[tuple[str, str], list[str]]:
+    """Collect the data views and dashboards referenced by compiled dashboards.
+
+    Besides the saved object `references`, the data views of dashboard controls are read from
+    their `dataViewId`, which Kibana stores inside the stringified control group panels.
+
+    Args:
+        ndjson_lines: NDJSON lines, one saved object each
+
+    Returns:
+        The IDs of the referencing dashboards for each (type, id) pair, in the order first seen.
+        Objects defined by the NDJSON lines themselves are left out.
+
+    """
+    defined: set[tuple[str, str]] = set()
+    referenced_by: dict[tuple[str, str], list[str]] = {}
+    for line in ndjson_lines:
+        saved_object = KibanaSavedObject.model_validate_json(line)
+        defined.add((saved_object.type, saved_object.id))
+        if saved_object.type != 'dashboard':
+            continue
+        keys = [
+            (str(reference.get('type')), str(reference.get('id')))
+            for reference in saved_object.references
+            if reference.get('type') in CHECKED_REFERENCE_TYPES
+        ]
+        keys.extend(('index-pattern', data_view_id) for data_view_id in _control_data_view_ids(saved_object.attributes))
+        for key in dict.fromkeys(keys):
+            referenced_by.setdefault(key, []).append(saved_object.id)
+    return {key: dashboard_ids for key, dashboard_ids in referenced_by.items() if key not in defined}
+
+
+def _control_data_view_ids(attributes: dict[str, Any]) -> list[str]:
+    controls = _DashboardControls.model_validate(attributes).control_group_input
+    if controls is None:
+        return []
+    panels = _CONTROL_PANELS.validate_json(controls.panels_json)
+    return [panel.explicit_input.data_view_id for panel in panels.values() if panel.explicit_input.data_view_id is not None]
+
+
+def managed_tag_ndjson(tag_id: str = MANAGED_TAG_ID) -> str:
+    """Get the NDJSON line of the tag that marks saved objects as managed by `kb-dashboard sync`.
+
+    Args:
+        tag_id: ID of the tag saved object
+
+    Returns:
+        A single NDJSON line without trailing newline
+
+    """
+    tag: dict[str, Any] = {
+        'id': tag_id,
+        'type': 'tag',
+        'attributes': {
+            'name': tag_id,
+            'description': 'Managed by kb-dashboard sync. Dashboards with this tag are deleted when removed from YAML.',
+            'color': '#6092C0',
+        },
+        'references': [],
+    }
+    return json.dumps(tag)
+
+
+def add_tag_reference(ndjson_line: str, tag_id: str = MANAGED_TAG_ID) -> str:
+    """Add a tag reference to a compiled saved object, leaving it unchanged if it is already tagged.
+
+    Args:
+        ndjson_line: A single NDJSON line holding a saved object
+        tag_id: ID of the tag to reference
+
+    Returns:
+        The NDJSON line of the tagged saved object
+
+    """
+    saved_object = KibanaSavedObject.model_validate_json(ndjson_line)
+    if any(reference.get('type') == 'tag' and reference.get('id') == tag_id for reference in saved_object.references):
+        return ndjson_line
+    saved_object.references.append({'type': 'tag', 'id': tag_id, 'name': f'tag-ref-{tag_id}'})
+    return saved_object.model_dump_json(exclude={'error'})
+
+
+def _normalize_json_value(value: object) -> object:
+    """Recursively parse strings that hold JSON objects or arrays."""
+    if isinstance(value, dict):
+        return {key: _normalize_json_value(item) for key, item in value.items()}  # pyright: ignore[reportUnknownVariableType, reportUnknownArgumentType]
+    if isinstance(value, list):
+        return [_normalize_json_value(item) for item in value]  # pyright: ignore[reportUnknownVariableType, reportUnknownArgumentType]
+    if isinstance(value, str) and value.startswith(('{', '[')):
+        try:
+            parsed: object = json.loads(value)  # pyright: ignore[reportAny]
+        except json.JSONDecodeError:
+            return value
+        return _normalize_json_value(parsed)
+    return value
+
+
+def _parse_retry_after(headers: Mapping[str, str] | None) -> float | None:
+    """Parse a `Retry-After` header given either in seconds or as an HTTP date.
+
+    Returns:
+        Seconds to wait, or None if the header is absent or malformed
+
+    """
+    if headers is None:
+        return None
+    value = headers.get('Retry-After')
+    if value is None:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=UTC)
+    return max(0.0, (retry_at - datetime.now(tz=UTC)).total_seconds())
+
+
+def _saved_object_key(line: bytes) -> tuple[str | None, str | None]:
+    saved_object = KibanaSavedObject.model_validate_json(line)
+    return saved_object.type, saved_object.id
+
+
+def _iter_ndjson_lines(ndjson_data: Path | str) -> Iterator[bytes]:
+    """Yield the non-empty lines of NDJSON content as bytes without reading a file fully into memory."""
+    if isinstance(ndjson_data, Path):
+        with ndjson_data.open('rb') as f:
+            for raw_line in f:
+                line = raw_line.strip()
+                if len(line) > 0:
+                    yield line
+        return
+
+    for text_line in ndjson_data.splitlines():
+        line = text_line.strip()
+        if len(line) > 0:
+            yield line.encode('utf-8')
+
+
+def _iter_ndjson_batches(ndjson_data: Path | str, batch_size: int, batch_bytes: int) -> Iterator[list[bytes]]:
+    """Group NDJSON lines into batches bounded by object count and payload size.
+
+    Args:
+        ndjson_data: Either a Path to an NDJSON file or a string containing NDJSON content
+        batch_size: Maximum number of lines per batch
+        batch_bytes: Maximum payload size per batch, counting one newline per line
+
+    Yields:
+        Lists of encoded NDJSON lines
+
+    """
+    batch: list[bytes] = []
+    size = 0
+    for line in _iter_ndjson_lines(ndjson_data):
+        line_size = len(line) + 1
+        if len(batch) > 0 and (len(batch) >= batch_size or size + line_size > batch_bytes):
+            yield batch
+            batch = []
+            size = 0
+        batch.append(line)
+        size += line_size
+
+    if len(batch) > 0:
+        yield batch
+
+
+async def _aiter_ndjson_batches(lines: AsyncIterable[str], batch_size: int, batch_bytes: int, linger: float) -> AsyncIterator[list[bytes]]:
+    """Group streamed NDJSON lines into batches bounded by object count, payload size and waiting time.
+
+    A background task moves lines into a queue of at most `batch_size` lines, so the producer
+    runs ahead of the uploads by no more than one batch.
+
+    Args:
+        lines: NDJSON lines, one saved object each
+        batch_size: Maximum number of lines per batch
+        batch_bytes: Maximum payload size per batch, counting one newline per line
+        linger: Maximum seconds the first line of a batch waits before the batch is yielded
+
+    Yields:
+        Lists of encoded NDJSON lines
+
+    """
+    queue: asyncio.Queue[bytes | None] = asyncio.Queue(maxsize=batch_size)
+
+    async def _pump() -> None:
+        try:
+            async for text_line in lines:
+                line = text_line.strip().encode('utf-8')
+                if len(line) > 0:
+                    await queue.put(line)
+        except Exception:
+            # Wake the consumer so it can re-raise the producer's exception
+            await queue.put(None)
+            raise
+        await queue.put(None)
+
+    pump = asyncio.create_task(_pump())
+    loop = asyncio.get_running_loop()
+    batch: list[bytes] = []
+    size = 0
+    deadline = 0.0
+    try:
+        while True:
+            try:
+                async with asyncio.timeout_at(deadline if len(batch) > 0 else None):
+                    line = await queue.get()
+            except TimeoutError:
+                yield batch
+                batch, size = [], 0
+                continue
+
+            if line is None:
+                break
+            line_size = len(line) + 1
+            if len(batch) > 0 and size + line_size > batch_bytes:
+                yield batch
+                batch, size = [], 0
+            if len(batch) == 0:
+                deadline = loop.time() + linger
+            batch.append(line)
+            size += line_size
+            if len(batch) >= batch_size:
+                yield batch
+                batch, size = [], 0
+
+        if len(batch) > 0:
+            yield batch
+        # Surface an exception raised by the producer
+        await pump
+    finally:
+        _ = pump.cancel()
+
+
+async def _aiter[T](items: Iterable[T]) -> AsyncIterator[T]:
+    for item in items:
+        yield item
+
+
+def _check_batch_limits(batch_size: int, batch_bytes: int, max_concurrency: int) -> None:
+    if batch_size < 1 or batch_bytes < 1 or max_concurrency < 1:
+        msg = 'batch_size, batch_bytes and max_concurrency must all be positive'
+        raise ValueError(msg)
@@ -0,0 +1,190 @@
+"""Targets file describing the Kibana instances and spaces that compiled dashboards are uploaded to."""
+
+import asyncio
+import os
+import time
+from collections.abc import Mapping
+from pathlib import Path
+
+import aiohttp
+import yaml
+from pydantic import BaseModel, Field, model_validator
+
+from dashboard_compiler.kibana_client import DEFAULT_MAX_CONCURRENCY, KibanaClient, KibanaSavedObjectsResponse, SavedObjectError
+from dashboard_compiler.shared.config import BaseCfgModel
+
+
+class KibanaTarget(BaseCfgModel):
+    """A Kibana instance, and optionally a space within it, to upload dashboards to.
+
+    Credentials are never stored in the targets file. Instead, each target names the
+    environment variables that hold them.
+    """
+
+    name: str = Field(...)
+    """Name of the target, shown in upload results."""
+
+    url: str = Field(...)
+    """Kibana base URL."""
+
+    space: str | None = Field(default=None)
+    """Kibana space to upload to. Defaults to the default space."""
+
+    api_key_env: str | None = Field(default=None)
+    """Name of the environment variable holding the Kibana API key."""
+
+    username_env: str | None = Field(default=None)
+    """Name of the environment variable holding the basic authentication username."""
+
+    password_env: str | None = Field(default=None)
+    """Name of the environment variable holding the basic authentication password."""
+
+    ssl_verify: bool = Field(default=True)
+    """Whether to verify SSL certificates."""
+
+    @model_validator(mode='after')
+    def validate_auth(self) -> 'KibanaTarget':
+        """Ensure the target uses either an API key or a username and password, but not both."""
+        if self.api_key_env is not None and (self.username_env is not None or self.password_env is not None):
+            msg = f'Target {self.name!r} cannot use both api_key_env and username_env/password_env'
+            raise ValueError(msg)
+        if (self.username_env is None) != (self.password_env is None):
+            msg = f'Target {self.name!r} must set username_env and password_env together'
+            raise ValueError(msg)
+        return self
+
+    def create_client(self, environ: Mapping[str, str] | None = None) -> KibanaClient:
+        """Create a client for this target, reading its credentials from the environment.
+
+        Args:
+            environ: Environment to read credentials from. Defaults to os.environ.
+
+        Returns:
+            A KibanaClient for the target's URL and space.
+
+        Raises:
+            ValueError: If a referenced environment variable is not set.
+
+        """
+        env = environ if environ is not None else os.environ
+
+        def _read(variable: str | None) -> str | None:
+            if variable is None:
+                return None
+            value = env.get(variable)
+            if value is None or len(value) == 0:
+                msg = f'Environment variable {variable} for target {self.name!r} is not set'
+                raise ValueError(msg)
+            return value
+
+        return KibanaClient(
+            url=self.url,
+            username=_read(self.username_env),
+            password=_read(self.password_env),
+            api_key=_read(self.api_key_env),
+            ssl_verify=self.ssl_verify,
+            space_id=self.space,
+        )
+
+
+class KibanaTargetsConfig(BaseCfgModel):
+    """Root configuration model for loading Kibana targets from YAML."""
+
+    targets: list[KibanaTarget] = Field(..., min_length=1)
+    """List of Kibana targets."""
+
+    @model_validator(mode='after')
+    def validate_unique_names(self) -> 'KibanaTargetsConfig':
+        """Ensure target names are unique so results can be told apart."""
+        names = [target.name for target in self.targets]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if len(duplicates) > 0:
+            msg = f'Duplicate target names: {", ".join(duplicates)}'
+            raise ValueError(msg)
+        return self
+
+
+class TargetUploadResult(BaseModel):
+    """Outcome of uploading to a single Kibana target."""
+
+    target: KibanaTarget = Field(...)
+    """The target that was uploaded to."""
+
+    uploaded: int = Field(default=0)
+    """Number of saved objects imported successfully."""
+
+    errors: list[SavedObjectError] = Field(default_factory=list)
+    """Errors for objects that failed to import, or for the target as a whole."""
+
+    elapsed: float = Field(default=0.0)
+    """Seconds spent uploading to the target."""
+
+    @property
+    def success(self) -> bool:
+        """Whether every object was uploaded without errors."""
+        return len(self.errors) == 0
+
+
+def load_targets(path: Path) -> list[KibanaTarget]:
+    """Load Kibana targets from a YAML file.
+
+    Args:
+        path: Path to the targets file.
+
+    Returns:
+        The targets defined in the file.
+
+    """
+    with path.open() as file:
+        config_data = yaml.safe_load(file)  # pyright: ignore[reportAny]
+
+    return KibanaTargetsConfig.model_validate(config_data).targets
+
+
+async def upload_to_targets(  # noqa: PLR0913
+    targets: list[KibanaTarget],
+    ndjson_data: Path | str,
+    *,
+    overwrite: bool = True,
+    skip_unchanged: bool = False,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    environ: Mapping[str, str] | None = None,
+) -> list[TargetUploadResult]:
+    """Upload the same NDJSON content to every target concurrently.
+
+    Each target gets its own pooled session and at most max_concurrency import requests in flight.
+    A failing target does not stop the others; its failure is reported in its result instead.
+
+    Args:
+        targets: Targets to upload to.
+        ndjson_data: Either a Path to an NDJSON file or a string containing NDJSON content.
+        overwrite: Whether to overwrite existing objects.
+        skip_unchanged: Whether to upload only objects that are new or differ from the target's copy.
+        max_concurrency: Maximum number of import requests in flight per target.
+        environ: Environment to read credentials from. Defaults to os.environ.
+
+    Returns:
+        One result per target, in the order of the targets.
+
+    """
+
+    async def _upload(target: KibanaTarget) -> TargetUploadResult:
+        started = time.perf_counter()
+        try:
+            async with target.create_client(environ) as client:
+                response: KibanaSavedObjectsResponse
+                if skip_unchanged is True:
+                    incremental = await client.upload_ndjson_incremental(ndjson_data, max_concurrency=max_concurrency)
+                    response = incremental.import_response
+                else:
+                    response = await client.upload_ndjson(ndjson_data, overwrite=overwrite, max_concurrency=max_concurrency)
+        except (aiohttp.ClientError, OSError, ValueError, TimeoutError) as e:
+            error = SavedObjectError(message=str(e) or type(e).__name__)
+            return TargetUploadResult(target=target, errors=[error], elapsed=time.perf_counter() - started)
+
+        errors = list(response.errors)
+        if response.success is False and len(errors) == 0:
+            errors.append(SavedObjectError(message='Upload failed'))
+        return TargetUploadResult(target=target, uploaded=response.success_count, errors=errors, elapsed=time.perf_counter() - started)
+
+    return list(await asyncio.gather(*(_upload(target) for target in targets)))
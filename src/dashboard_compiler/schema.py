@@ -0,0 +1,43 @@
+"""JSON schema of dashboard YAML files, generated once per process."""
+
+import functools
+import hashlib
+import json
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+from dashboard_compiler.dashboard.config import Dashboard
+
+
+class DashboardsRoot(BaseModel):
+    """Root structure for dashboard YAML files."""
+
+    dashboards: list[Dashboard] = Field(...)
+    """List of dashboard configurations."""
+
+
+@functools.cache
+def dashboard_schema() -> dict[str, Any]:
+    """Get the JSON schema for the root YAML structure.
+
+    Generating the schema walks the whole configuration model graph, so it is only done on
+    the first call. The schema never changes within a version of the compiler.
+
+    Returns:
+        The JSON schema, shared between callers and not to be modified.
+
+    """
+    return DashboardsRoot.model_json_schema()
+
+
+@functools.cache
+def dashboard_schema_json() -> str:
+    """Get the JSON schema serialized with sorted keys, so that equal schemas serialize equally."""
+    return json.dumps(dashboard_schema(), indent=2, sort_keys=True) + '\n'
+
+
+@functools.cache
+def dashboard_schema_version() -> str:
+    """Get a short hash of the schema, which clients can compare to skip fetching an unchanged schema."""
+    return hashlib.sha256(dashboard_schema_json().encode('utf-8')).hexdigest()[:16]
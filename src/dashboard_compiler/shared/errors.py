@@ -28,3 +28,14 @@ class UnexpectedTypeError(YamlToLensError):
         super().__init__(message)
         self.expected_type = expected_type
         self.actual_type = actual_type
+
+
+class CompileError(YamlToLensError):
+    """Exception raised for a dashboard source that could not be compiled in a batch."""
+
+    source: str
+
+    def __init__(self, source: str, reason: str) -> None:
+        """Initialize the CompileError with the source that failed and the reason."""
+        super().__init__(f'Error compiling {source}: {reason}')
+        self.source = source
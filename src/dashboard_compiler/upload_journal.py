@@ -0,0 +1,139 @@
+"""Local journal of saved objects already imported into Kibana, used to resume interrupted uploads."""
+
+import hashlib
+from pathlib import Path
+from typing import Self
+
+from pydantic import BaseModel, ValidationError
+
+
+class _JournalHeader(BaseModel):
+    target: str
+
+
+class _JournalEntry(BaseModel):
+    batch: int
+    objects: list[str]
+
+
+class UploadJournal:
+    """Append-only record of the NDJSON lines that were imported successfully.
+
+    The first line of the journal names the Kibana target it belongs to. Every batch that
+    finishes appends one line holding the SHA-256 digests of its imported NDJSON lines, so
+    an upload that is interrupted part way keeps everything it completed. A line is only
+    considered done if its exact content was imported, so changed objects are uploaded again.
+    """
+
+    path: Path
+    target: str
+    _completed: set[str]
+    _batches: int
+
+    def __init__(self, path: Path, target: str, completed: set[str] | None = None, batches: int = 0) -> None:
+        """Initialize the journal's in-memory state, use `start` or `resume` to open one.
+
+        Args:
+            path: File the journal is written to
+            target: Identifies the Kibana instance and space the upload goes to
+            completed: Digests of the lines imported so far
+            batches: Number of batches recorded so far
+
+        """
+        self.path = path
+        self.target = target
+        self._completed = completed if completed is not None else set()
+        self._batches = batches
+
+    @classmethod
+    def start(cls, path: Path, target: str) -> Self:
+        """Start an empty journal for a Kibana target, replacing any existing journal at the path.
+
+        Args:
+            path: File to write the journal to
+            target: Identifies the Kibana instance and space the upload goes to
+
+        Returns:
+            A journal with no completed lines
+
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _ = path.write_text(_JournalHeader(target=target).model_dump_json() + '\n')
+        return cls(path, target)
+
+    @classmethod
+    def resume(cls, path: Path, target: str) -> Self:
+        """Open an existing journal to continue an interrupted upload, or start a new one.
+
+        Args:
+            path: File the journal was written to
+            target: Identifies the Kibana instance and space the upload goes to
+
+        Returns:
+            A journal holding every line completed so far
+
+        Raises:
+            ValueError: If the journal is corrupt or belongs to a different target.
+
+        """
+        if not path.exists():
+            return cls.start(path, target)
+
+        with path.open() as file:
+            lines = [line for line in file if len(line.strip()) > 0]
+        if len(lines) == 0:
+            return cls.start(path, target)
+
+        try:
+            header = _JournalHeader.model_validate_json(lines[0])
+            entries = [_JournalEntry.model_validate_json(line) for line in lines[1:]]
+        except ValidationError as e:
+            msg = f'Upload journal {path} is corrupt, delete it to start over: {e}'
+            raise ValueError(msg) from e
+
+        if header.target != target:
+            msg = f'Upload journal {path} belongs to {header.target}, not {target}'
+            raise ValueError(msg)
+
+        completed = {digest for entry in entries for digest in entry.objects}
+        return cls(path, target, completed=completed, batches=len(entries))
+
+    def __len__(self) -> int:
+        """Return the number of NDJSON lines recorded as imported."""
+        return len(self._completed)
+
+    def is_done(self, line: bytes) -> bool:
+        """Check whether an NDJSON line was already imported.
+
+        Args:
+            line: Encoded NDJSON line without trailing newline
+
+        Returns:
+            True if exactly this line was imported by an earlier batch.
+
+        """
+        return _digest(line) in self._completed
+
+    def record(self, lines: list[bytes]) -> None:
+        """Append the lines of a completed batch to the journal.
+
+        Args:
+            lines: Encoded NDJSON lines that were imported successfully
+
+        """
+        if len(lines) == 0:
+            return
+        digests = [_digest(line) for line in lines]
+        entry = _JournalEntry(batch=self._batches, objects=digests)
+        with self.path.open('a') as file:
+            _ = file.write(entry.model_dump_json() + '\n')
+        self._completed.update(digests)
+        self._batches += 1
+
+    def remove(self) -> None:
+        """Delete the journal file once the upload has completed."""
+        self.path.unlink(missing_ok=True)
+
+
+def _digest(line: bytes) -> str:
+    return hashlib.sha256(line.strip()).hexdigest()
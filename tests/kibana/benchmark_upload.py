@@ -0,0 +1,170 @@
+"""Benchmark KibanaClient uploads against the fake Kibana across batch sizes and concurrency levels.
+
+The fake Kibana runs in a separate process, so the memory measured here is the client's alone.
+
+Run it from the repository root:
+
+    uv run python -m tests.kibana.benchmark_upload --objects 5000 --latency 0.02
+"""
+
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+
+import aiohttp
+from rich.console import Console
+from rich.table import Table
+
+from dashboard_compiler.kibana_client import DEFAULT_BATCH_BYTES, KibanaClient
+
+
+@dataclass(frozen=True)
+class BenchmarkResult:
+    """Measurements of a single upload."""
+
+    batch_size: int
+    concurrency: int
+    objects: int
+    seconds: float
+    requests: int
+    connections: int
+    peak_in_flight: int
+    peak_memory_bytes: int
+
+    @property
+    def objects_per_second(self) -> float:
+        """Throughput of the upload."""
+        return self.objects / self.seconds if self.seconds > 0 else 0.0
+
+
+def write_dashboards(path: Path, count: int, object_bytes: int) -> None:
+    """Write `count` synthetic dashboards of roughly `object_bytes` each as NDJSON."""
+    with path.open('w') as file:
+        for i in range(count):
+            attributes = {'title': f'Dashboard {i}', 'description': 'x' * object_bytes, 'panelsJSON': '[]'}
+            _ = file.write(json.dumps({'id': f'bench-{i}', 'type': 'dashboard', 'attributes': attributes, 'references': []}) + '\n')
+
+
+async def measure(
+    kibana_url: str,
+    ndjson_file: Path,
+    *,
+    batch_size: int,
+    concurrency: int,
+    batch_bytes: int = DEFAULT_BATCH_BYTES,
+) -> BenchmarkResult:
+    """Upload an NDJSON file once and measure throughput, connection use and client memory.
+
+    Args:
+        kibana_url: Base URL of a fake Kibana, whose `/_fake/stats` endpoint reports request counts.
+        ndjson_file: NDJSON file to upload.
+        batch_size: Maximum number of saved objects per `_import` request.
+        concurrency: Maximum number of `_import` requests in flight.
+        batch_bytes: Maximum payload size in bytes per `_import` request.
+
+    Returns:
+        The measurements of the upload.
+
+    """
+    before = await _fetch_stats(kibana_url, reset_peak=True)
+    client = KibanaClient(kibana_url)
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        response = await client.upload_ndjson(ndjson_file, batch_size=batch_size, batch_bytes=batch_bytes, max_concurrency=concurrency)
+        seconds = time.perf_counter() - started
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    after = await _fetch_stats(kibana_url)
+    return BenchmarkResult(
+        batch_size=batch_size,
+        concurrency=concurrency,
+        objects=response.success_count,
+        seconds=seconds,
+        requests=after['requests'] - before['requests'],
+        connections=after['connections'] - before['connections'],
+        peak_in_flight=after['peak_in_flight'],
+        peak_memory_bytes=peak_memory,
+    )
+
+
+async def _fetch_stats(kibana_url: str, *, reset_peak: bool = False) -> dict[str, int]:
+    params = {'reset_peak': '1'} if reset_peak is True else {}
+    async with aiohttp.ClientSession() as session, session.get(f'{kibana_url}/_fake/stats', params=params) as response:
+        response.raise_for_status()
+        stats: dict[str, int] = await response.json()
+        return stats
+
+
+async def run(kibana_url: str, ndjson_file: Path, batch_sizes: list[int], concurrency_levels: list[int]) -> list[BenchmarkResult]:
+    """Measure one upload for every combination of batch size and concurrency."""
+    return [
+        await measure(kibana_url, ndjson_file, batch_size=batch_size, concurrency=concurrency)
+        for batch_size in batch_sizes
+        for concurrency in concurrency_levels
+    ]
+
+
+def results_table(results: list[BenchmarkResult]) -> Table:
+    """Create a Rich table of benchmark results."""
+    table = Table(show_header=True, header_style='bold')
+    for column in ('Batch size', 'Concurrency', 'Objects/s', 'Seconds', 'Requests', 'Connections', 'Peak in flight', 'Peak memory'):
+        table.add_column(column, justify='right')
+    for result in results:
+        table.add_row(
+            str(result.batch_size),
+            str(result.concurrency),
+            f'{result.objects_per_second:,.0f}',
+            f'{result.seconds:.2f}',
+            str(result.requests),
+            str(result.connections),
+            str(result.peak_in_flight),
+            f'{result.peak_memory_bytes / 1024 / 1024:.1f} MiB',
+        )
+    return table
+
+
+def _int_list(value: str) -> list[int]:
+    return [int(item) for item in value.split(',')]
+
+
+def main() -> None:
+    """Start the fake Kibana in a subprocess and print a table of upload measurements."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    _ = parser.add_argument('--objects', type=int, default=5000, help='Number of dashboards to upload.')
+    _ = parser.add_argument('--object-bytes', type=int, default=2000, help='Approximate size of each dashboard.')
+    _ = parser.add_argument('--batch-sizes', type=_int_list, default=[100, 500, 1000], help='Comma-separated batch sizes.')
+    _ = parser.add_argument('--concurrency', type=_int_list, default=[1, 4, 8], help='Comma-separated concurrency levels.')
+    _ = parser.add_argument('--latency', type=float, default=0.02, help='Seconds the fake Kibana waits before each response.')
+    args = parser.parse_args()
+
+    server = subprocess.Popen(  # noqa: S603
+        [sys.executable, '-m', 'tests.kibana.fake_kibana', '--latency', str(args.latency)],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        kibana_url = server.stdout.readline().strip() if server.stdout is not None else ''
+        with tempfile.TemporaryDirectory() as temp_dir:
+            ndjson_file = Path(temp_dir) / 'dashboards.ndjson'
+            write_dashboards(ndjson_file, args.objects, args.object_bytes)
+            results = asyncio.run(run(kibana_url, ndjson_file, args.batch_sizes, args.concurrency))
+    finally:
+        server.terminate()
+        _ = server.wait()
+
+    Console().print(results_table(results))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,26 @@
+from collections.abc import AsyncIterator
+
+import pytest
+
+from .fake_kibana import FakeKibana, start_fake_kibana
+
+
+@pytest.fixture(autouse=True)
+def freezer() -> None:
+    """Run Kibana client tests on the real clock, asyncio timers never fire under a frozen clock."""
+
+
+@pytest.fixture
+def fake_kibana() -> FakeKibana:
+    """Fake Kibana state, configure it before requesting `kibana_url`."""
+    return FakeKibana()
+
+
+@pytest.fixture
+async def kibana_url(fake_kibana: FakeKibana) -> AsyncIterator[str]:
+    """Start a fake Kibana server and return its base URL."""
+    server = await start_fake_kibana(fake_kibana)
+    try:
+        yield str(server.make_url('')).rstrip('/')
+    finally:
+        await server.close()
@@ -0,0 +1,289 @@
+"""In-process stand-in for the parts of the Kibana HTTP API used by KibanaClient."""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import sys
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from aiohttp import BodyPartReader, web
+from aiohttp.test_utils import TestServer
+
+
+@dataclass
+class FakeKibana:
+    """State and behavior of the fake Kibana server."""
+
+    max_payload_bytes: int | None = None
+    """Reject `_import` payloads larger than this with HTTP 413."""
+
+    latency: float = 0.0
+    """Seconds to wait before answering each request."""
+
+    spaces: dict[str, dict[tuple[str, str], dict[str, Any]]] = field(default_factory=dict)
+    """Saved objects of each space, keyed by (type, id)."""
+
+    import_batches: list[int] = field(default_factory=list)
+    """Number of objects received by each `_import` request."""
+
+    import_queries: list[dict[str, str]] = field(default_factory=list)
+    """Query parameters of each `_import` request."""
+
+    requests: list[str] = field(default_factory=list)
+    """Method and path of every request received, including failed ones."""
+
+    reporting_jobs: list[str] = field(default_factory=list)
+    """Query string `jobParams` of each created reporting job."""
+
+    report_png: bytes = b'\x89PNG\r\n\x1a\n' + b'fake-png'
+    """Content served for every finished reporting job."""
+
+    report_pending_polls: int = 0
+    """Number of polls each reporting job answers with 503 before it is finished."""
+
+    report_polls: dict[str, int] = field(default_factory=dict)
+    """Number of download polls received for each reporting job."""
+
+    failing_dashboards: set[str] = field(default_factory=set)
+    """Dashboard IDs whose reporting jobs fail with HTTP 500 when downloaded."""
+
+    disconnecting_objects: set[str] = field(default_factory=set)
+    """Object IDs whose delete requests drop the connection without an answer."""
+
+    data_views: dict[str, dict[str, str]] = field(default_factory=dict)
+    """Field types by field name of each data view, keyed by data view ID."""
+
+    index_patterns: dict[str, dict[str, str]] = field(default_factory=dict)
+    """Field types by field name of the indices matching each index pattern that has no data view."""
+
+    active_reports: int = 0
+    peak_active_reports: int = 0
+
+    connections: set[int] = field(default_factory=set)
+    """Client ports of the TCP connections requests arrived on, one per connection."""
+
+    in_flight: int = 0
+    peak_in_flight: int = 0
+
+    _failures: deque[tuple[int, dict[str, str]]] = field(default_factory=deque)
+    _object_failures: dict[str, tuple[int, int]] = field(default_factory=dict)
+
+    @property
+    def saved_objects(self) -> dict[tuple[str, str], dict[str, Any]]:
+        """Saved objects of the default space, keyed by (type, id)."""
+        return self.spaces.setdefault('default', {})
+
+    def inject_failures(self, status: int, count: int = 1, retry_after: str | None = None) -> None:
+        """Answer the next `count` requests with `status`, optionally sending a `Retry-After` header."""
+        headers = {'Retry-After': retry_after} if retry_after is not None else {}
+        self._failures.extend((status, headers) for _ in range(count))
+
+    def inject_object_failures(self, object_id: str, status: int, count: int = 1) -> None:
+        """Reject the object with `object_id` in the next `count` imports that contain it, with an error of `status`."""
+        self._object_failures[object_id] = (status, count)
+
+    def app(self) -> web.Application:
+        """Build the aiohttp application serving the fake API."""
+        app = web.Application(middlewares=[self._middleware])
+        for prefix in ('', '/s/{space_id}'):
+            _ = app.router.add_post(f'{prefix}/api/saved_objects/_import', self._handle_import)
+            _ = app.router.add_post(f'{prefix}/api/saved_objects/_bulk_get', self._handle_bulk_get)
+            _ = app.router.add_get(f'{prefix}/api/saved_objects/_find', self._handle_find)
+            _ = app.router.add_delete(f'{prefix}/api/saved_objects/{{type}}/{{id}}', self._handle_delete)
+            _ = app.router.add_post(f'{prefix}/api/reporting/generate/pngV2', self._handle_generate_png)
+            _ = app.router.add_get(f'{prefix}/api/data_views/data_view/{{id}}', self._handle_data_view)
+            _ = app.router.add_get(f'{prefix}/api/index_patterns/_fields_for_wildcard', self._handle_fields_for_wildcard)
+        _ = app.router.add_get('/api/reporting/jobs/download/{job_id}', self._handle_download_report)
+        _ = app.router.add_get('/_fake/stats', self._handle_stats)
+        return app
+
+    def _space(self, request: web.Request) -> dict[tuple[str, str], dict[str, Any]]:
+        return self.spaces.setdefault(request.match_info.get('space_id', 'default'), {})
+
+    @web.middleware
+    async def _middleware(
+        self, request: web.Request, handler: Callable[[web.Request], Awaitable[web.StreamResponse]]
+    ) -> web.StreamResponse:
+        if request.path.startswith('/_fake/'):
+            return await handler(request)
+        self.requests.append(f'{request.method} {request.path}')
+        peername: object = request.transport.get_extra_info('peername') if request.transport is not None else None
+        if isinstance(peername, tuple):
+            self.connections.add(int(peername[1]))
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            if self.latency > 0:
+                await asyncio.sleep(self.latency)
+            if len(self._failures) > 0:
+                status, headers = self._failures.popleft()
+                return web.json_response({'statusCode': status, 'message': 'injected failure'}, status=status, headers=headers)
+            return await handler(request)
+        finally:
+            self.in_flight -= 1
+
+    async def _handle_stats(self, request: web.Request) -> web.Response:
+        stats = {
+            'requests': len(self.requests),
+            'connections': len(self.connections),
+            'import_batches': len(self.import_batches),
+            'peak_in_flight': self.peak_in_flight,
+        }
+        if request.query.get('reset_peak') == '1':
+            self.peak_in_flight = self.in_flight
+        return web.json_response(stats)
+
+    async def _handle_bulk_get(self, request: web.Request) -> web.Response:
+        wanted: list[dict[str, str]] = await request.json()
+        saved_objects: list[dict[str, Any]] = []
+        for ref in wanted:
+            stored = self._space(request).get((ref['type'], ref['id']))
+            if stored is None:
+                saved_objects.append({**ref, 'error': {'statusCode': 404, 'error': 'Not Found', 'message': 'Saved object not found'}})
+            else:
+                saved_objects.append(stored)
+        return web.json_response({'saved_objects': saved_objects})
+
+    async def _handle_find(self, request: web.Request) -> web.Response:
+        types = request.query.getall('type')
+        fields = request.query.getall('fields', [])
+        per_page = int(request.query.get('per_page', '20'))
+        page = int(request.query.get('page', '1'))
+        reference: dict[str, str] | None = json.loads(request.query['has_reference']) if 'has_reference' in request.query else None
+
+        matches = [
+            obj
+            for (object_type, _), obj in sorted(self._space(request).items())
+            if object_type in types
+            and (
+                reference is None
+                or any(ref['type'] == reference['type'] and ref['id'] == reference['id'] for ref in obj.get('references', []))
+            )
+        ]
+        page_objects = matches[(page - 1) * per_page : page * per_page]
+        if len(fields) > 0:
+            page_objects = [
+                {**obj, 'attributes': {key: obj['attributes'][key] for key in fields if key in obj['attributes']}} for obj in page_objects
+            ]
+        return web.json_response({'page': page, 'per_page': per_page, 'total': len(matches), 'saved_objects': page_objects})
+
+    async def _handle_delete(self, request: web.Request) -> web.Response:
+        key = (request.match_info['type'], request.match_info['id'])
+        if key[1] in self.disconnecting_objects and request.transport is not None:
+            request.transport.close()
+        if self._space(request).pop(key, None) is None:
+            return web.json_response({'statusCode': 404, 'error': 'Not Found', 'message': 'Saved object not found'}, status=404)
+        return web.json_response({})
+
+    async def _handle_data_view(self, request: web.Request) -> web.Response:
+        data_view_id = request.match_info['id']
+        fields = self.data_views.get(data_view_id)
+        if fields is None:
+            return web.json_response(
+                {'statusCode': 404, 'error': 'Not Found', 'message': f'Saved object [index-pattern/{data_view_id}] not found'}, status=404
+            )
+        specs = {name: {'name': name, 'type': field_type} for name, field_type in fields.items()}
+        return web.json_response({'data_view': {'id': data_view_id, 'title': data_view_id, 'fields': specs}})
+
+    async def _handle_fields_for_wildcard(self, request: web.Request) -> web.Response:
+        pattern = request.query['pattern']
+        fields = self.index_patterns.get(pattern)
+        if fields is None:
+            return web.json_response({'statusCode': 404, 'error': 'Not Found', 'message': f'No indices match "{pattern}"'}, status=404)
+        return web.json_response(
+            {'fields': [{'name': name, 'type': field_type} for name, field_type in fields.items()], 'indices': [pattern]}
+        )
+
+    async def _handle_generate_png(self, request: web.Request) -> web.Response:
+        job_id = f'job-{len(self.reporting_jobs)}'
+        self.reporting_jobs.append(request.query['jobParams'])
+        self.active_reports += 1
+        self.peak_active_reports = max(self.peak_active_reports, self.active_reports)
+        return web.json_response({'path': f'/api/reporting/jobs/download/{job_id}'})
+
+    async def _handle_download_report(self, request: web.Request) -> web.Response:
+        job_id = request.match_info['job_id']
+        polls = self.report_polls[job_id] = self.report_polls.get(job_id, 0) + 1
+        job_params = self.reporting_jobs[int(job_id.removeprefix('job-'))]
+        if any(dashboard_id in job_params for dashboard_id in self.failing_dashboards):
+            self.active_reports -= 1
+            return web.json_response({'statusCode': 500, 'message': 'report failed'}, status=500)
+        if polls <= self.report_pending_polls:
+            return web.json_response({'statusCode': 503, 'message': 'pending'}, status=503)
+        self.active_reports -= 1
+        return web.Response(body=self.report_png, content_type='image/png')
+
+    async def _handle_import(self, request: web.Request) -> web.Response:
+        reader = await request.multipart()
+        part = await reader.next()
+        if not isinstance(part, BodyPartReader):
+            return web.json_response({'statusCode': 400, 'message': 'missing file'}, status=400)
+        payload = await part.read()
+        if self.max_payload_bytes is not None and len(payload) > self.max_payload_bytes:
+            return web.json_response({'statusCode': 413, 'message': 'Payload content length greater than maximum allowed'}, status=413)
+
+        objects = [json.loads(line) for line in payload.decode('utf-8').splitlines() if len(line.strip()) > 0]
+        self.import_batches.append(len(objects))
+        self.import_queries.append(dict(request.query))
+        imported: list[dict[str, Any]] = []
+        errors: list[dict[str, Any]] = []
+        for obj in objects:
+            status, remaining = self._object_failures.get(obj['id'], (0, 0))
+            if remaining > 0:
+                self._object_failures[obj['id']] = (status, remaining - 1)
+                errors.append(
+                    {'id': obj['id'], 'type': obj['type'], 'error': {'type': 'unknown', 'statusCode': status, 'message': 'failed'}}
+                )
+                continue
+            self._space(request)[(obj['type'], obj['id'])] = obj
+            imported.append(obj)
+
+        return web.json_response(
+            {
+                'success': len(errors) == 0,
+                'successCount': len(imported),
+                'successResults': [{'id': obj['id'], 'type': obj['type']} for obj in imported],
+                'errors': errors,
+            }
+        )
+
+
+async def start_fake_kibana(fake: FakeKibana) -> TestServer:
+    """Start a server for the given fake on a free local port."""
+    server = TestServer(fake.app())
+    await server.start_server()
+    return server
+
+
+async def _serve(fake: FakeKibana, host: str, port: int) -> None:
+    server = TestServer(fake.app(), host=host, port=port)
+    await server.start_server()
+    # The first line of output tells a parent process where to connect
+    _ = sys.stdout.write(f'{str(server.make_url("")).rstrip("/")}\n')
+    _ = sys.stdout.flush()
+    try:
+        _ = await asyncio.Event().wait()
+    finally:
+        await server.close()
+
+
+def main() -> None:
+    """Run the fake Kibana as a standalone server, for benchmarks and manual testing."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    _ = parser.add_argument('--host', default='127.0.0.1')
+    _ = parser.add_argument('--port', type=int, default=0, help='Port to listen on, 0 picks a free port.')
+    _ = parser.add_argument('--latency', type=float, default=0.0, help='Seconds to wait before answering each request.')
+    _ = parser.add_argument('--max-payload-bytes', type=int, default=None, help='Reject larger _import payloads with HTTP 413.')
+    args = parser.parse_args()
+
+    fake = FakeKibana(max_payload_bytes=args.max_payload_bytes, latency=args.latency)
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(_serve(fake, args.host, args.port))
+
+
+if __name__ == '__main__':
+    main()
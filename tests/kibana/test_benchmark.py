@@ -0,0 +1,23 @@
+"""Tests for the upload benchmark against the fake Kibana."""
+
+from pathlib import Path
+
+from .benchmark_upload import measure, results_table, write_dashboards
+from .fake_kibana import FakeKibana
+
+
+async def test_measure_reports_requests_and_connections(fake_kibana: FakeKibana, kibana_url: str, tmp_path: Path) -> None:
+    """Test that a measured upload counts its requests and reuses at most one connection per concurrent request."""
+    ndjson_file = tmp_path / 'dashboards.ndjson'
+    write_dashboards(ndjson_file, count=50, object_bytes=100)
+
+    result = await measure(kibana_url, ndjson_file, batch_size=10, concurrency=2)
+
+    assert result.objects == 50
+    assert result.requests == 5
+    assert 1 <= result.connections <= 2
+    assert result.peak_in_flight <= 2
+    assert result.objects_per_second > 0
+    assert result.peak_memory_bytes > 0
+    assert len(fake_kibana.saved_objects) == 50
+    assert results_table([result]).row_count == 1
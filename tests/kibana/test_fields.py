@@ -0,0 +1,129 @@
+"""Tests for pulling data view fields into a snapshot and checking dashboard fields against it offline."""
+
+from pathlib import Path
+
+import click
+import pytest
+
+from dashboard_compiler.cli import check_fields
+from dashboard_compiler.dashboard_compiler import load
+from dashboard_compiler.field_snapshot import FieldIndex, FieldSnapshot, collect_field_references, referenced_data_views
+from dashboard_compiler.kibana_client import KibanaClient
+
+from .fake_kibana import FakeKibana
+
+DASHBOARD_YAML = """
+dashboards:
+  - name: Hosts
+    controls:
+      - type: options
+        label: Host
+        data_view: metrics-*
+        field: host.name
+    panels:
+      - title: CPU
+        grid: {x: 0, y: 0, w: 24, h: 10}
+        lens:
+          type: line
+          data_view: metrics-*
+          dimensions:
+            - field: '@timestamp'
+              type: date_histogram
+          metrics:
+            - aggregation: max
+              field: system.cpu.totl.pct
+      - title: Requests
+        grid: {x: 24, y: 0, w: 24, h: 10}
+        lens:
+          type: pie
+          data_view: logs-web
+          slice_by:
+            - field: url.path
+              type: values
+          metric:
+            aggregation: count
+"""
+
+SNAPSHOT = FieldSnapshot(
+    kibana_url='http://localhost:5601',
+    data_views={'metrics-*': {'@timestamp': 'date', 'host.name': 'string', 'system.cpu.total.pct': 'number'}},
+)
+
+
+@pytest.fixture
+def yaml_file(tmp_path: Path) -> Path:
+    """Write a dashboard using two data views and one misspelled field."""
+    path = tmp_path / 'hosts.yaml'
+    _ = path.write_text(DASHBOARD_YAML)
+    return path
+
+
+async def test_get_data_views_fields(fake_kibana: FakeKibana, kibana_url: str) -> None:
+    """Test that fields are read from data views or matching indices, and that a missing one does not stop the others."""
+    fake_kibana.data_views['logs-web'] = {'url.path': 'string', '@timestamp': 'date'}
+    fake_kibana.index_patterns['metrics-*'] = {'host.name': 'string'}
+
+    results = await KibanaClient(kibana_url).get_data_views_fields(['logs-web', 'metrics-*', 'missing'], max_concurrency=2)
+
+    assert [result.data_view for result in results] == ['logs-web', 'metrics-*', 'missing']
+    assert [field.name for field in results[0].fields] == ['@timestamp', 'url.path']
+    assert [field.type for field in results[1].fields] == ['string']
+    assert results[2].error is not None
+    assert '404' in results[2].error
+    assert fake_kibana.peak_in_flight <= 2
+
+    snapshot = FieldSnapshot.from_results(kibana_url, None, results)
+    assert set(snapshot.data_views) == {'logs-web', 'metrics-*'}
+
+
+def test_collect_field_references(yaml_file: Path) -> None:
+    """Test that fields are paired with the data view of their chart or control."""
+    dashboards = load(str(yaml_file))
+
+    references = collect_field_references(dashboards[0])
+
+    assert [(reference.data_view, reference.field) for reference in references] == [
+        ('metrics-*', 'host.name'),
+        ('metrics-*', '@timestamp'),
+        ('metrics-*', 'system.cpu.totl.pct'),
+        ('logs-web', 'url.path'),
+    ]
+    assert referenced_data_views(dashboards) == ['metrics-*', 'logs-web']
+
+
+def test_field_index_suggests_near_misses() -> None:
+    """Test that unknown fields get close field names as suggestions, exact case mismatches first."""
+    index = FieldIndex(SNAPSHOT)
+
+    assert index.has_field('metrics-*', 'host.name') is True
+    assert index.suggest('metrics-*', 'system.cpu.totl.pct') == ['system.cpu.total.pct']
+    assert index.suggest('metrics-*', 'Host.Name')[0] == 'host.name'
+    assert index.suggest('metrics-*', 'nothing.like.it') == []
+
+
+def test_snapshot_round_trip_and_version(tmp_path: Path) -> None:
+    """Test that a saved snapshot loads again and that other format versions are rejected."""
+    path = tmp_path / 'nested' / 'fields.json'
+    SNAPSHOT.save(path)
+
+    assert FieldSnapshot.load(path) == SNAPSHOT
+
+    _ = path.write_text(path.read_text().replace('"version": 1', '"version": 99'))
+    with pytest.raises(ValueError, match='fields pull'):
+        _ = FieldSnapshot.load(path)
+
+
+def test_check_fields_reports_unknown_fields_offline(yaml_file: Path, tmp_path: Path) -> None:
+    """Test that the compile check fails on a misspelled field and on a data view missing from the snapshot."""
+    snapshot_path = tmp_path / 'fields.json'
+    SNAPSHOT.save(snapshot_path)
+
+    with pytest.raises(click.ClickException, match='2 field'):
+        check_fields([yaml_file], snapshot_path)
+
+    issues = FieldIndex(SNAPSHOT).check(collect_field_references(load(str(yaml_file))[0]))
+    assert [issue.message for issue in issues] == [
+        'Field system.cpu.totl.pct does not exist in data view metrics-*',
+        'Data view logs-web is not in the field snapshot',
+    ]
+    assert issues[0].suggestions == ['system.cpu.total.pct']
@@ -0,0 +1,93 @@
+"""Tests for incremental uploads that skip saved objects Kibana already has."""
+
+import json
+
+from dashboard_compiler.kibana_client import KibanaClient, KibanaSavedObject, saved_object_fingerprint
+
+from .fake_kibana import FakeKibana
+
+
+def _dashboard(object_id: str, title: str = 'Title') -> dict[str, object]:
+    return {
+        'id': object_id,
+        'type': 'dashboard',
+        'attributes': {'title': title, 'panelsJSON': json.dumps([{'panelIndex': '1', 'type': 'lens'}])},
+        'references': [{'id': 'logs-*', 'name': 'ref-1', 'type': 'index-pattern'}],
+        'updated_at': '2023-10-01T00:00:00Z',
+    }
+
+
+def _ndjson(*objects: dict[str, object]) -> str:
+    return '\n'.join(json.dumps(obj) for obj in objects)
+
+
+async def test_incremental_upload_creates_then_skips(fake_kibana: FakeKibana, kibana_url: str) -> None:
+    """Test that a second upload of identical content makes no import requests."""
+    client = KibanaClient(kibana_url)
+    ndjson = _ndjson(_dashboard('a'), _dashboard('b'))
+
+    first = await client.upload_ndjson_incremental(ndjson)
+    second = await client.upload_ndjson_incremental(ndjson)
+
+    assert first.created == ['a', 'b']
+    assert first.import_response.success_count == 2
+    assert second.skipped == ['a', 'b']
+    assert second.created == []
+    assert second.updated == []
+    assert second.import_response.success is True
+    assert fake_kibana.import_batches == [2]
+
+
+async def test_incremental_upload_only_sends_changed_objects(fake_kibana: FakeKibana, kibana_url: str) -> None:
+    """Test that only new and changed objects are imported, with overwrite enabled."""
+    client = KibanaClient(kibana_url)
+    _ = await client.upload_ndjson_incremental(_ndjson(_dashboard('a'), _dashboard('b')))
+
+    result = await client.upload_ndjson_incremental(_ndjson(_dashboard('a'), _dashboard('b', title='New'), _dashboard('c')))
+
+    assert result.skipped == ['a']
+    assert result.updated == ['b']
+    assert result.created == ['c']
+    assert fake_kibana.import_batches == [2, 2]
+    assert fake_kibana.import_queries[-1] == {'overwrite': 'true'}
+    assert fake_kibana.saved_objects[('dashboard', 'b')]['attributes']['title'] == 'New'
+
+
+async def test_incremental_upload_ignores_kibana_reserialization(fake_kibana: FakeKibana, kibana_url: str) -> None:
+    """Test that metadata and re-serialized JSON attributes in Kibana do not count as changes."""
+    stored = _dashboard('a')
+    stored['attributes'] = {'title': 'Title', 'panelsJSON': '[ {"type": "lens", "panelIndex": "1"} ]'}
+    stored['references'] = [{'type': 'index-pattern', 'name': 'ref-1', 'id': 'logs-*'}]
+    stored['updated_at'] = '2025-01-01T00:00:00Z'
+    stored['namespaces'] = ['default']
+    fake_kibana.saved_objects[('dashboard', 'a')] = stored
+
+    result = await KibanaClient(kibana_url).upload_ndjson_incremental(_ndjson(_dashboard('a')))
+
+    assert result.skipped == ['a']
+    assert fake_kibana.import_batches == []
+
+
+async def test_incremental_upload_batches_bulk_get(fake_kibana: FakeKibana, kibana_url: str) -> None:
+    """Test that lookups are batched alongside imports."""
+    objects = [_dashboard(f'd{i}') for i in range(5)]
+
+    result = await KibanaClient(kibana_url).upload_ndjson_incremental(_ndjson(*objects), batch_size=2)
+
+    assert fake_kibana.requests.count('POST /api/saved_objects/_bulk_get') == 3
+    assert result.created == [f'd{i}' for i in range(5)]
+    assert result.import_response.success_count == 5
+
+
+def test_fingerprint_ignores_reference_order() -> None:
+    """Test that the fingerprint only depends on attributes and the set of references."""
+    first = KibanaSavedObject.model_validate(
+        {'id': 'a', 'type': 'dashboard', 'attributes': {'title': 'T'}, 'references': [{'id': '1'}, {'id': '2'}]}
+    )
+    second = KibanaSavedObject.model_validate(
+        {'id': 'a', 'type': 'dashboard', 'attributes': {'title': 'T'}, 'references': [{'id': '2'}, {'id': '1'}], 'version': 'WzEsMV0='}
+    )
+    changed = KibanaSavedObject.model_validate({'id': 'a', 'type': 'dashboard', 'attributes': {'title': 'U'}})
+
+    assert saved_object_fingerprint(first) == saved_object_fingerprint(second)
+    assert saved_object_fingerprint(first) != saved_object_fingerprint(changed)
@@ -0,0 +1,125 @@
+"""Tests for uploading NDJSON lines while they are still being produced."""
+
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+import aiohttp
+import click
+import pytest
+
+from dashboard_compiler.cli import upload_to_kibana
+from dashboard_compiler.kibana_client import KibanaClient
+
+from .fake_kibana import FakeKibana
+
+
+def _dashboard(index: int) -> str:
+    return json.dumps({'id': f'dash-{index}', 'type': 'dashboard', 'attributes': {'title': f'Dashboard {index}'}})
+
+
+async def test_slow_producer_is_uploaded_before_it_finishes(fake_kibana: FakeKibana, kibana_url: str) -> None:
+    """Test that lines from a slow producer are sent after lingering instead of waiting for a full batch."""
+    uploaded_before_last_line: list[int] = []
+
+    async def lines() -> AsyncIterator[str]:
+        for i in range(3):
+            if i == 2:
+                uploaded_before_last_line.append(len(fake_kibana.saved_objects))
+            yield _dashboard(i)
+            await asyncio.sleep(0.2)
+
+    result = await KibanaClient(kibana_url).upload_ndjson_stream(lines(), batch_size=100, linger=0.05)
+
+    assert result.success is True
+    assert result.success_count == 3
+    assert fake_kibana.import_batches == [1, 1, 1]
+    assert uploaded_before_last_line == [2]
+
+
+async def test_fast_producer_is_held_back_by_slow_uploads(fake_kibana: FakeKibana, kibana_url: str) -> None:
+    """Test that the producer runs at most a few batches ahead of the objects Kibana has imported."""
+    fake_kibana.latency = 0.05
+    lead: list[int] = []
+
+    async def lines() -> AsyncIterator[str]:
+        for i in range(40):
+            lead.append(i - len(fake_kibana.saved_objects))
+            yield _dashboard(i)
+
+    result = await KibanaClient(kibana_url).upload_ndjson_stream(lines(), batch_size=2, max_concurrency=1)
+
+    assert result.success_count == 40
+    assert fake_kibana.import_batches == [2] * 20
+    # One batch in flight, one waiting for a slot, one being filled, one queued and a line in hand
+    assert max(lead) <= 2 * 4 + 1
+
+
+async def test_batches_are_pulled_only_when_a_slot_is_free() -> None:
+    """Test that no more than `max_concurrency` batches are held in memory at the same time."""
+    live = 0
+    peak = 0
+
+    async def batches() -> AsyncIterator[list[bytes]]:
+        nonlocal live, peak
+        for i in range(10):
+            live += 1
+            peak = max(peak, live)
+            yield [_dashboard(i).encode()]
+
+    async def handle_batch(_session: aiohttp.ClientSession, _batch: list[bytes]) -> None:
+        nonlocal live
+        await asyncio.sleep(0.01)
+        live -= 1
+
+    _ = await KibanaClient('http://127.0.0.1:1')._map_batches(batches(), handle_batch, max_concurrency=2)  # pyright: ignore[reportPrivateUsage]
+
+    assert live == 0
+    assert peak == 2
+
+
+async def test_producer_errors_are_raised(fake_kibana: FakeKibana, kibana_url: str) -> None:
+    """Test that an exception in the producer stops the upload and is raised to the caller."""
+
+    async def lines() -> AsyncIterator[str]:
+        yield _dashboard(0)
+        msg = 'compilation failed'
+        raise RuntimeError(msg)
+
+    with pytest.raises(RuntimeError, match='compilation failed'):
+        _ = await KibanaClient(kibana_url).upload_ndjson_stream(lines(), batch_size=100, linger=10.0)
+
+    assert fake_kibana.import_batches == []
+
+
+async def test_upload_compiles_while_uploading(fake_kibana: FakeKibana, kibana_url: str, tmp_path: Path) -> None:
+    """Test that a pipelined upload compiles every YAML file, uploads it and writes the NDJSON files."""
+    yaml_files: list[Path] = []
+    for name in ('first', 'second'):
+        directory = tmp_path / 'inputs' / name
+        directory.mkdir(parents=True)
+        yaml_file = directory / 'dashboard.yaml'
+        _ = yaml_file.write_text(f'dashboards:\n  - name: {name}\n    id: {name}\n    panels: []\n')
+        yaml_files.append(yaml_file)
+    combined_file = tmp_path / 'output' / 'compiled_dashboards.ndjson'
+    combined_file.parent.mkdir()
+
+    await upload_to_kibana(combined_file, kibana_url, None, None, None, overwrite=True, open_browser=False, compile_from=yaml_files)
+
+    assert set(fake_kibana.saved_objects) == {('dashboard', 'first'), ('dashboard', 'second')}
+    assert [json.loads(line)['id'] for line in combined_file.read_text().splitlines()] == ['first', 'second']
+    assert (combined_file.parent / 'first.ndjson').exists()
+    assert not combined_file.with_name('compiled_dashboards.ndjson.journal').exists()
+
+
+async def test_upload_fails_when_nothing_compiles(fake_kibana: FakeKibana, kibana_url: str, tmp_path: Path) -> None:
+    """Test that a pipelined upload fails instead of reporting success when no dashboard compiled."""
+    yaml_file = tmp_path / 'broken.yaml'
+    _ = yaml_file.write_text('dashboards:\n- name: Broken\n  panels: not-a-list\n')
+    combined_file = tmp_path / 'compiled_dashboards.ndjson'
+
+    with pytest.raises(click.ClickException, match='No dashboards were compiled'):
+        await upload_to_kibana(combined_file, kibana_url, None, None, None, overwrite=True, open_browser=False, compile_from=[yaml_file])
+
+    assert fake_kibana.import_batches == []
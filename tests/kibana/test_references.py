@@ -0,0 +1,68 @@
+"""Tests for checking the references of compiled dashboards against Kibana before importing them."""
+
+import json
+from pathlib import Path
+
+import click
+import pytest
+
+from dashboard_compiler.cli import upload_to_kibana
+from dashboard_compiler.kibana_client import KibanaClient, collect_references
+
+from .fake_kibana import FakeKibana
+
+
+def _dashboard(object_id: str, references: list[tuple[str, str]], control_data_views: tuple[str, ...] = ()) -> str:
+    panels = {
+        f'control-{i}': {'type': 'optionsListControl', 'explicitInput': {'dataViewId': data_view}}
+        for i, data_view in enumerate(control_data_views)
+    }
+    attributes = {'title': object_id, 'controlGroupInput': {'panelsJSON': json.dumps(panels)}}
+    refs = [{'type': ref_type, 'id': ref_id, 'name': f'ref-{i}'} for i, (ref_type, ref_id) in enumerate(references)]
+    return json.dumps({'id': object_id, 'type': 'dashboard', 'attributes': attributes, 'references': refs})
+
+
+def test_collect_references_merges_dashboards_and_skips_defined_objects() -> None:
+    """Test that references are deduplicated across dashboards and that objects in the output are not checked."""
+    lines = [
+        _dashboard('a', [('index-pattern', 'logs-*'), ('dashboard', 'b'), ('tag', 'team')], control_data_views=('metrics-*',)),
+        _dashboard('b', [('index-pattern', 'logs-*'), ('index-pattern', 'logs-*'), ('dashboard', 'elsewhere')]),
+    ]
+
+    assert collect_references(lines) == {
+        ('index-pattern', 'logs-*'): ['a', 'b'],
+        ('index-pattern', 'metrics-*'): ['a'],
+        ('dashboard', 'elsewhere'): ['b'],
+    }
+
+
+async def test_check_references_uses_one_bulk_get(fake_kibana: FakeKibana, kibana_url: str) -> None:
+    """Test that all references are resolved in a single request and reported per dashboard."""
+    fake_kibana.saved_objects['index-pattern', 'logs-*'] = {'id': 'logs-*', 'type': 'index-pattern', 'attributes': {}}
+    ndjson = '\n'.join(
+        [
+            _dashboard('a', [('index-pattern', 'logs-*')], control_data_views=('metrics-*',)),
+            _dashboard('b', [('index-pattern', 'metrics-*'), ('dashboard', 'gone')]),
+        ]
+    )
+
+    missing = await KibanaClient(kibana_url).check_references(ndjson)
+
+    assert [(reference.dashboard_id, reference.type, reference.id) for reference in missing] == [
+        ('a', 'index-pattern', 'metrics-*'),
+        ('b', 'index-pattern', 'metrics-*'),
+        ('b', 'dashboard', 'gone'),
+    ]
+    assert missing[0].message == 'Saved object not found'
+    assert fake_kibana.requests == ['POST /api/saved_objects/_bulk_get']
+
+
+async def test_upload_stops_before_import_when_references_are_missing(fake_kibana: FakeKibana, kibana_url: str, tmp_path: Path) -> None:
+    """Test that an upload with a missing data view fails before anything is imported."""
+    ndjson_file = tmp_path / 'compiled_dashboards.ndjson'
+    _ = ndjson_file.write_text(_dashboard('a', [('index-pattern', 'missing')]) + '\n')
+
+    with pytest.raises(click.ClickException, match='1 missing reference'):
+        await upload_to_kibana(ndjson_file, kibana_url, None, None, None, overwrite=True, open_browser=False, check_references=True)
+
+    assert fake_kibana.import_batches == []
@@ -0,0 +1,94 @@
+"""Tests for resuming interrupted uploads and resubmitting objects that failed transiently."""
+
+import json
+from pathlib import Path
+
+import aiohttp
+import pytest
+
+from dashboard_compiler.kibana_client import KibanaClient, RetryPolicy
+from dashboard_compiler.upload_journal import UploadJournal
+
+from .fake_kibana import FakeKibana
+
+FAST_RETRIES = RetryPolicy(initial_delay=0.01, max_delay=0.02)
+NDJSON = '\n'.join(json.dumps({'id': f'dash-{i}', 'type': 'dashboard', 'attributes': {'title': f'Dashboard {i}'}}) for i in range(3))
+
+
+async def test_transient_object_errors_are_resubmitted(fake_kibana: FakeKibana, kibana_url: str) -> None:
+    """Test that objects rejected with a transient status are imported again on their own."""
+    fake_kibana.inject_object_failures('dash-1', status=503)
+
+    result = await KibanaClient(kibana_url, retry_policy=FAST_RETRIES).upload_ndjson(NDJSON)
+
+    assert result.success is True
+    assert result.errors == []
+    assert result.success_count == 3
+    assert fake_kibana.import_batches == [3, 1]
+
+
+async def test_permanent_object_errors_are_not_resubmitted(fake_kibana: FakeKibana, kibana_url: str) -> None:
+    """Test that objects rejected for a non-transient reason are reported without another import."""
+    fake_kibana.inject_object_failures('dash-1', status=409)
+
+    result = await KibanaClient(kibana_url, retry_policy=FAST_RETRIES).upload_ndjson(NDJSON)
+
+    assert result.success is False
+    assert [error.id for error in result.errors] == ['dash-1']
+    assert fake_kibana.import_batches == [3]
+
+
+async def test_resume_uploads_only_remaining_objects(fake_kibana: FakeKibana, kibana_url: str, tmp_path: Path) -> None:
+    """Test that an interrupted upload is resumed from its journal without re-sending completed batches."""
+    journal_path = tmp_path / 'upload.journal'
+    lines = [
+        json.dumps({'id': f'dash-{i}', 'type': 'dashboard', 'attributes': {'title': 'x' * (10 if i != 1 else 1000)}}) for i in range(3)
+    ]
+    ndjson = '\n'.join(lines)
+    client = KibanaClient(kibana_url)
+    fake_kibana.max_payload_bytes = 500  # the second object is too large, so the upload stops there
+
+    with pytest.raises(aiohttp.ClientResponseError):
+        _ = await client.upload_ndjson(ndjson, batch_size=1, max_concurrency=1, journal=UploadJournal.start(journal_path, kibana_url))
+
+    journal = UploadJournal.resume(journal_path, kibana_url)
+    assert len(journal) == 1
+
+    fake_kibana.max_payload_bytes = None
+    fake_kibana.import_batches.clear()
+    result = await client.upload_ndjson(ndjson, batch_size=1, max_concurrency=1, journal=journal)
+    assert result.success is True
+    assert result.success_count == 2
+    assert fake_kibana.import_batches == [1, 1]
+    assert len(UploadJournal.resume(journal_path, kibana_url)) == 3
+
+    fake_kibana.import_batches.clear()
+    _ = await client.upload_ndjson(ndjson, batch_size=1, max_concurrency=1, journal=UploadJournal.resume(journal_path, kibana_url))
+    assert fake_kibana.import_batches == []
+
+
+async def test_journal_records_only_imported_objects(fake_kibana: FakeKibana, kibana_url: str, tmp_path: Path) -> None:
+    """Test that objects rejected by Kibana stay pending in the journal and are retried on resume."""
+    journal_path = tmp_path / 'upload.journal'
+    fake_kibana.inject_object_failures('dash-1', status=409)
+    client = KibanaClient(kibana_url, retry_policy=FAST_RETRIES)
+
+    first = await client.upload_ndjson(NDJSON, journal=UploadJournal.start(journal_path, kibana_url))
+    assert first.success is False
+
+    journal = UploadJournal.resume(journal_path, kibana_url)
+    assert len(journal) == 2
+    second = await client.upload_ndjson(NDJSON, journal=journal)
+
+    assert second.success is True
+    assert fake_kibana.import_batches == [3, 1]
+    assert ('dashboard', 'dash-1') in fake_kibana.saved_objects
+
+
+def test_journal_rejects_other_target(tmp_path: Path) -> None:
+    """Test that a journal written for one Kibana cannot be used to resume an upload to another."""
+    journal_path = tmp_path / 'upload.journal'
+    _ = UploadJournal.start(journal_path, 'https://one.example.com')
+
+    with pytest.raises(ValueError, match=r'belongs to https://one\.example\.com'):
+        _ = UploadJournal.resume(journal_path, 'https://two.example.com')
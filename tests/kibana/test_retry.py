@@ -0,0 +1,129 @@
+"""Tests for retrying transient Kibana failures in KibanaClient."""
+
+import logging
+from datetime import UTC, datetime, timedelta
+from email.utils import format_datetime
+
+import aiohttp
+import pytest
+
+from dashboard_compiler.kibana_client import KibanaClient, RetryPolicy
+
+from .fake_kibana import FakeKibana
+
+FAST_RETRIES = RetryPolicy(initial_delay=0.01, max_delay=0.02)
+
+
+async def test_upload_retries_transient_statuses(fake_kibana: FakeKibana, kibana_url: str, caplog: pytest.LogCaptureFixture) -> None:
+    """Test that 429, 502 and 503 responses are retried until the import succeeds."""
+    fake_kibana.inject_failures(429)
+    fake_kibana.inject_failures(502)
+    fake_kibana.inject_failures(503)
+
+    with caplog.at_level(logging.WARNING, logger='dashboard_compiler.kibana_client'):
+        result = await KibanaClient(kibana_url, retry_policy=FAST_RETRIES).upload_ndjson('{"id": "a", "type": "dashboard"}')
+
+    assert result.success is True
+    assert fake_kibana.requests == ['POST /api/saved_objects/_import'] * 4
+    assert [record.getMessage().split(' failed with ')[1].split(',')[0] for record in caplog.records] == [
+        'HTTP 429',
+        'HTTP 502',
+        'HTTP 503',
+    ]
+
+
+async def test_upload_does_not_retry_other_statuses(fake_kibana: FakeKibana, kibana_url: str) -> None:
+    """Test that non-transient errors fail on the first attempt."""
+    fake_kibana.inject_failures(400)
+
+    with pytest.raises(aiohttp.ClientResponseError) as exc_info:
+        _ = await KibanaClient(kibana_url, retry_policy=FAST_RETRIES).upload_ndjson('{"id": "a", "type": "dashboard"}')
+
+    assert exc_info.value.status == 400
+    assert len(fake_kibana.requests) == 1
+
+
+async def test_upload_gives_up_after_max_attempts(fake_kibana: FakeKibana, kibana_url: str) -> None:
+    """Test that the last transient error is raised once attempts are exhausted."""
+    fake_kibana.inject_failures(503, count=10)
+    policy = RetryPolicy(max_attempts=3, initial_delay=0.01)
+
+    with pytest.raises(aiohttp.ClientResponseError) as exc_info:
+        _ = await KibanaClient(kibana_url, retry_policy=policy).upload_ndjson('{"id": "a", "type": "dashboard"}')
+
+    assert exc_info.value.status == 503
+    assert len(fake_kibana.requests) == 3
+
+
+async def test_upload_honors_retry_after_within_budget(fake_kibana: FakeKibana, kibana_url: str) -> None:
+    """Test that a Retry-After longer than the time budget stops retrying immediately."""
+    fake_kibana.inject_failures(429, retry_after='60')
+    policy = RetryPolicy(initial_delay=0.01, total_timeout=5)
+
+    with pytest.raises(aiohttp.ClientResponseError):
+        _ = await KibanaClient(kibana_url, retry_policy=policy).upload_ndjson('{"id": "a", "type": "dashboard"}')
+
+    assert len(fake_kibana.requests) == 1
+
+
+async def test_upload_uses_retry_after_delay(fake_kibana: FakeKibana, kibana_url: str, caplog: pytest.LogCaptureFixture) -> None:
+    """Test that the Retry-After delay replaces the backoff delay."""
+    fake_kibana.inject_failures(503, retry_after='0.05')
+
+    with caplog.at_level(logging.WARNING, logger='dashboard_compiler.kibana_client'):
+        result = await KibanaClient(kibana_url, retry_policy=FAST_RETRIES).upload_ndjson('{"id": "a", "type": "dashboard"}')
+
+    assert result.success is True
+    assert 'retrying in 0.1s (attempt 1/5)' in caplog.text
+
+
+@pytest.mark.parametrize(
+    ('retry_after', 'expected_delay'),
+    [
+        (format_datetime(datetime.now(tz=UTC) - timedelta(seconds=30), usegmt=True), 'retrying in 0.0s'),
+        ('soon', 'retrying in 0.0s'),
+    ],
+    ids=['http-date', 'malformed'],
+)
+async def test_upload_parses_retry_after_dates(
+    fake_kibana: FakeKibana, kibana_url: str, caplog: pytest.LogCaptureFixture, retry_after: str, expected_delay: str
+) -> None:
+    """Test that HTTP-date Retry-After values are honored and malformed ones fall back to backoff."""
+    fake_kibana.inject_failures(503, retry_after=retry_after)
+
+    with caplog.at_level(logging.WARNING, logger='dashboard_compiler.kibana_client'):
+        result = await KibanaClient(kibana_url, retry_policy=FAST_RETRIES).upload_ndjson('{"id": "a", "type": "dashboard"}')
+
+    assert result.success is True
+    assert expected_delay in caplog.text
+
+
+async def test_reporting_job_creation_is_retried(fake_kibana: FakeKibana, kibana_url: str) -> None:
+    """Test that creating a reporting job is retried on transient errors."""
+    fake_kibana.inject_failures(502, count=2)
+
+    job_path = await KibanaClient(kibana_url, retry_policy=FAST_RETRIES).generate_screenshot('my-dashboard')
+
+    assert job_path == '/api/reporting/jobs/download/job-0'
+    assert fake_kibana.requests == ['POST /api/reporting/generate/pngV2'] * 3
+
+
+async def test_connection_errors_are_retried() -> None:
+    """Test that connection failures are retried and eventually raised."""
+    policy = RetryPolicy(max_attempts=2, initial_delay=0.01)
+
+    with pytest.raises(aiohttp.ClientConnectionError):
+        _ = await KibanaClient('http://127.0.0.1:1', retry_policy=policy).upload_ndjson('{"id": "a", "type": "dashboard"}')
+
+
+class TestRetryPolicy:
+    """Tests for RetryPolicy delay computation."""
+
+    def test_backoff_delay_is_bounded_exponentially(self) -> None:
+        """Test that jittered delays stay under the exponential bound and max_delay."""
+        policy = RetryPolicy(initial_delay=1, multiplier=2, max_delay=5)
+
+        for _ in range(50):
+            assert 0 <= policy.backoff_delay(1) <= 1
+            assert 0 <= policy.backoff_delay(3) <= 4
+            assert 0 <= policy.backoff_delay(10) <= 5
@@ -0,0 +1,78 @@
+"""Tests for capturing dashboard screenshots through the Kibana reporting API."""
+
+import json
+from pathlib import Path
+
+from dashboard_compiler.cli import dashboard_ids_from_ndjson
+from dashboard_compiler.kibana_client import KibanaClient
+
+from .fake_kibana import FakeKibana
+
+
+async def test_download_screenshots_writes_every_dashboard(fake_kibana: FakeKibana, kibana_url: str, tmp_path: Path) -> None:
+    """Test that a batch of screenshots polls pending jobs and writes one PNG per dashboard."""
+    fake_kibana.report_pending_polls = 2
+    dashboard_ids = [f'dash-{i}' for i in range(6)]
+
+    results = await KibanaClient(kibana_url).download_screenshots(
+        dashboard_ids, tmp_path, max_concurrency=2, poll_interval=0.01, max_poll_interval=0.02
+    )
+
+    assert [result.dashboard_id for result in results] == dashboard_ids
+    assert all(result.error is None for result in results)
+    for result in results:
+        assert result.output_path == tmp_path / f'{result.dashboard_id}.png'
+        assert result.output_path.read_bytes() == fake_kibana.report_png
+        assert result.size == len(fake_kibana.report_png)
+    assert sorted(fake_kibana.report_polls.values()) == [3] * 6
+    assert fake_kibana.peak_active_reports == 2
+    assert list(tmp_path.glob('*.part')) == []
+
+
+async def test_download_screenshots_isolates_failures(fake_kibana: FakeKibana, kibana_url: str, tmp_path: Path) -> None:
+    """Test that a failing reporting job is reported without stopping the other screenshots."""
+    fake_kibana.failing_dashboards.add('broken')
+
+    results = await KibanaClient(kibana_url).download_screenshots(['ok', 'broken'], tmp_path, poll_interval=0.01)
+
+    assert results[0].error is None
+    assert results[1].error is not None
+    assert '500' in results[1].error
+    assert (tmp_path / 'ok.png').exists()
+    assert not (tmp_path / 'broken.png').exists()
+
+
+async def test_download_report_streams_large_reports(fake_kibana: FakeKibana, kibana_url: str, tmp_path: Path) -> None:
+    """Test that reports larger than one chunk are written to disk intact."""
+    fake_kibana.report_png = bytes(range(256)) * 4096
+    client = KibanaClient(kibana_url)
+    output_path = tmp_path / 'nested' / 'large.png'
+
+    job_path = await client.generate_screenshot('large')
+    size = await client.download_report(job_path, output_path, poll_interval=0.01)
+
+    assert size == len(fake_kibana.report_png)
+    assert output_path.read_bytes() == fake_kibana.report_png
+
+
+async def test_wait_for_job_completion_returns_bytes(fake_kibana: FakeKibana, kibana_url: str) -> None:
+    """Test that waiting for a job still returns the PNG content in memory."""
+    fake_kibana.report_pending_polls = 1
+    client = KibanaClient(kibana_url)
+
+    job_path = await client.generate_screenshot('dash')
+
+    assert await client.wait_for_job_completion(job_path, poll_interval=0.01) == fake_kibana.report_png
+
+
+def test_dashboard_ids_from_ndjson(tmp_path: Path) -> None:
+    """Test that only dashboard IDs are read from a compiled NDJSON file."""
+    ndjson_file = tmp_path / 'compiled.ndjson'
+    lines = [
+        json.dumps({'id': 'first', 'type': 'dashboard', 'attributes': {}}),
+        json.dumps({'id': 'tag', 'type': 'tag', 'attributes': {}}),
+        json.dumps({'id': 'second', 'type': 'dashboard', 'attributes': {}}),
+    ]
+    _ = ndjson_file.write_text('\n'.join(lines) + '\n')
+
+    assert dashboard_ids_from_ndjson(ndjson_file) == ['first', 'second']
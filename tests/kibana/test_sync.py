@@ -0,0 +1,138 @@
+"""Tests for syncing a Kibana space with the compiled dashboards, including pruning."""
+
+import json
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from dashboard_compiler.cli import cli, sync_to_kibana
+from dashboard_compiler.kibana_client import MANAGED_TAG_ID, KibanaClient, RetryPolicy, add_tag_reference
+
+from .fake_kibana import FakeKibana
+
+
+def _dashboard(object_id: str, title: str = 'Title') -> str:
+    return json.dumps({'id': object_id, 'type': 'dashboard', 'attributes': {'title': title}, 'references': []})
+
+
+async def test_sync_creates_tag_and_dashboards(fake_kibana: FakeKibana, kibana_url: str) -> None:
+    """Test that the first sync uploads the managed tag and tagged dashboards."""
+    await sync_to_kibana(KibanaClient(kibana_url), [_dashboard('a'), _dashboard('b')])
+
+    assert set(fake_kibana.saved_objects) == {('tag', MANAGED_TAG_ID), ('dashboard', 'a'), ('dashboard', 'b')}
+    assert fake_kibana.saved_objects[('dashboard', 'a')]['references'] == [
+        {'type': 'tag', 'id': MANAGED_TAG_ID, 'name': f'tag-ref-{MANAGED_TAG_ID}'}
+    ]
+
+
+async def test_sync_prunes_only_managed_dashboards(fake_kibana: FakeKibana, kibana_url: str) -> None:
+    """Test that managed dashboards removed from YAML are deleted and unmanaged ones are kept."""
+    client = KibanaClient(kibana_url)
+    fake_kibana.saved_objects[('dashboard', 'unmanaged')] = json.loads(_dashboard('unmanaged'))
+    await sync_to_kibana(client, [_dashboard('a'), _dashboard('b')])
+
+    await sync_to_kibana(client, [_dashboard('a', title='Changed')])
+
+    assert set(fake_kibana.saved_objects) == {('tag', MANAGED_TAG_ID), ('dashboard', 'a'), ('dashboard', 'unmanaged')}
+    assert fake_kibana.saved_objects[('dashboard', 'a')]['attributes']['title'] == 'Changed'
+    assert 'DELETE /api/saved_objects/dashboard/b' in fake_kibana.requests
+
+
+async def test_sync_dry_run_changes_nothing(fake_kibana: FakeKibana, kibana_url: str) -> None:
+    """Test that a dry run only reads from Kibana."""
+    fake_kibana.saved_objects[('dashboard', 'stale')] = json.loads(add_tag_reference(_dashboard('stale')))
+
+    await sync_to_kibana(KibanaClient(kibana_url), [_dashboard('a')], dry_run=True)
+
+    assert set(fake_kibana.saved_objects) == {('dashboard', 'stale')}
+    assert all(not request.startswith(('DELETE', 'POST /api/saved_objects/_import')) for request in fake_kibana.requests)
+
+
+async def test_sync_without_changes_makes_no_writes(fake_kibana: FakeKibana, kibana_url: str) -> None:
+    """Test that syncing an up-to-date space only issues lookups."""
+    client = KibanaClient(kibana_url)
+    await sync_to_kibana(client, [_dashboard('a')])
+    fake_kibana.requests.clear()
+
+    await sync_to_kibana(client, [_dashboard('a')])
+
+    assert sorted(fake_kibana.requests) == ['GET /api/saved_objects/_find', 'POST /api/saved_objects/_bulk_get']
+
+
+async def test_sync_targets_space(fake_kibana: FakeKibana, kibana_url: str) -> None:
+    """Test that all requests go to the configured space."""
+    await sync_to_kibana(KibanaClient(kibana_url, space_id='team-a'), [_dashboard('a')])
+
+    assert set(fake_kibana.spaces['team-a']) == {('tag', MANAGED_TAG_ID), ('dashboard', 'a')}
+    assert all(request.split(' ')[1].startswith('/s/team-a/') for request in fake_kibana.requests)
+
+
+async def test_find_saved_objects_follows_pages(fake_kibana: FakeKibana, kibana_url: str) -> None:
+    """Test that listing pages through all results and filters by reference."""
+    for i in range(7):
+        fake_kibana.saved_objects[('dashboard', f'd{i}')] = json.loads(add_tag_reference(_dashboard(f'd{i}')))
+    fake_kibana.saved_objects[('dashboard', 'untagged')] = json.loads(_dashboard('untagged'))
+
+    found = await KibanaClient(kibana_url).find_saved_objects('dashboard', has_reference=('tag', MANAGED_TAG_ID), per_page=3)
+
+    assert sorted(obj.id for obj in found) == [f'd{i}' for i in range(7)]
+    assert fake_kibana.requests.count('GET /api/saved_objects/_find') == 3
+
+
+async def test_delete_saved_objects_collects_errors(fake_kibana: FakeKibana, kibana_url: str) -> None:
+    """Test that missing objects count as deleted and other failures are reported."""
+    fake_kibana.saved_objects[('dashboard', 'a')] = json.loads(_dashboard('a'))
+    fake_kibana.inject_failures(403)
+
+    result = await KibanaClient(kibana_url).delete_saved_objects([('dashboard', 'a'), ('dashboard', 'gone')], max_concurrency=1)
+
+    assert result.deleted == ['gone']
+    assert len(result.errors) == 1
+    assert result.errors[0].status_code == 403
+
+
+async def test_delete_saved_objects_collects_connection_errors(fake_kibana: FakeKibana, kibana_url: str) -> None:
+    """Test that a deletion that loses its connection is reported and the other deletions still finish."""
+    for object_id in ('a', 'b', 'c'):
+        fake_kibana.saved_objects[('dashboard', object_id)] = json.loads(_dashboard(object_id))
+    fake_kibana.disconnecting_objects.add('b')
+    client = KibanaClient(kibana_url, retry_policy=RetryPolicy(max_attempts=2, initial_delay=0.01))
+
+    result = await client.delete_saved_objects([('dashboard', 'a'), ('dashboard', 'b'), ('dashboard', 'c')], max_concurrency=1)
+
+    assert sorted(result.deleted) == ['a', 'c']
+    assert len(result.errors) == 1
+    assert result.errors[0].status_code is None
+    assert result.errors[0].message is not None
+    assert result.errors[0].message.startswith('Failed to delete dashboard b: ')
+
+
+def test_add_tag_reference_is_idempotent() -> None:
+    """Test that tagging an already tagged object leaves it unchanged."""
+    tagged = add_tag_reference(_dashboard('a'))
+
+    assert add_tag_reference(tagged) == tagged
+    assert 'error' not in json.loads(tagged)
+
+
+def test_sync_refuses_when_compilation_fails(tmp_path: Path) -> None:
+    """Test that sync aborts before contacting Kibana if any file fails to compile."""
+    _ = (tmp_path / 'broken.yaml').write_text('dashboards:\n- name: Broken\n  panels: not-a-list\n')
+
+    result = CliRunner().invoke(cli, ['sync', '--input-dir', str(tmp_path), '--kibana-url', 'http://127.0.0.1:1'])
+
+    assert result.exit_code != 0
+    assert 'Refusing to sync' in result.output
+
+
+@pytest.mark.parametrize('files', [{}, {'empty.yaml': 'dashboards: []\n'}], ids=['no-yaml-files', 'no-dashboards'])
+def test_sync_refuses_when_nothing_compiles(tmp_path: Path, files: dict[str, str]) -> None:
+    """Test that sync aborts before contacting Kibana if the input directory has no dashboards, instead of deleting them all."""
+    for name, content in files.items():
+        _ = (tmp_path / name).write_text(content)
+
+    result = CliRunner().invoke(cli, ['sync', '--input-dir', str(tmp_path), '--kibana-url', 'http://127.0.0.1:1'])
+
+    assert result.exit_code != 0
+    assert 'no dashboards were compiled' in result.output
@@ -0,0 +1,128 @@
+"""Tests for uploading compiled dashboards to several Kibana targets at once."""
+
+import json
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+from pydantic import ValidationError
+
+from dashboard_compiler.cli import cli
+from dashboard_compiler.kibana_client import KibanaClient
+from dashboard_compiler.kibana_targets import KibanaTarget, load_targets, upload_to_targets
+
+from .fake_kibana import FakeKibana
+
+NDJSON = '\n'.join(json.dumps({'id': f'dash-{i}', 'type': 'dashboard', 'attributes': {'title': f'Dashboard {i}'}}) for i in range(3))
+
+
+def test_load_targets(tmp_path: Path) -> None:
+    """Test that a targets file is parsed into targets."""
+    targets_file = tmp_path / 'targets.yaml'
+    _ = targets_file.write_text(
+        """
+targets:
+  - name: prod
+    url: https://kibana.example.com
+    api_key_env: PROD_KIBANA_API_KEY
+  - name: staging
+    url: https://staging.example.com
+    space: observability
+    username_env: STAGING_USER
+    password_env: STAGING_PASSWORD
+    ssl_verify: false
+"""
+    )
+
+    targets = load_targets(targets_file)
+
+    assert [target.name for target in targets] == ['prod', 'staging']
+    assert targets[1].space == 'observability'
+    assert targets[1].ssl_verify is False
+
+
+def test_load_targets_rejects_duplicate_names(tmp_path: Path) -> None:
+    """Test that two targets with the same name are rejected."""
+    targets_file = tmp_path / 'targets.yaml'
+    _ = targets_file.write_text('targets:\n  - {name: a, url: http://one}\n  - {name: a, url: http://two}\n')
+
+    with pytest.raises(ValidationError, match='Duplicate target names: a'):
+        _ = load_targets(targets_file)
+
+
+def test_target_rejects_mixed_auth() -> None:
+    """Test that a target cannot combine an API key with basic authentication."""
+    with pytest.raises(ValidationError, match='cannot use both'):
+        _ = KibanaTarget(name='a', url='http://one', api_key_env='KEY', username_env='USER', password_env='PASSWORD')  # noqa: S106
+
+
+def test_target_create_client_requires_env_vars() -> None:
+    """Test that a missing credential environment variable is reported by name."""
+    target = KibanaTarget(name='prod', url='http://one', api_key_env='PROD_KIBANA_API_KEY')
+
+    with pytest.raises(ValueError, match='PROD_KIBANA_API_KEY'):
+        _ = target.create_client(environ={})
+
+    client = target.create_client(environ={'PROD_KIBANA_API_KEY': 'secret'})
+    assert client.api_key == 'secret'
+
+
+async def test_upload_to_targets_fans_out_to_every_space(fake_kibana: FakeKibana, kibana_url: str) -> None:
+    """Test that the same objects are imported into every target's space."""
+    targets = [
+        KibanaTarget(name='default', url=kibana_url),
+        KibanaTarget(name='eu', url=kibana_url, space='eu'),
+        KibanaTarget(name='us', url=kibana_url, space='us'),
+    ]
+
+    results = await upload_to_targets(targets, NDJSON, max_concurrency=1)
+
+    assert [result.target.name for result in results] == ['default', 'eu', 'us']
+    assert all(result.success for result in results)
+    assert [result.uploaded for result in results] == [3, 3, 3]
+    for space in ('default', 'eu', 'us'):
+        assert set(fake_kibana.spaces[space]) == {('dashboard', 'dash-0'), ('dashboard', 'dash-1'), ('dashboard', 'dash-2')}
+
+
+async def test_upload_to_targets_isolates_failing_target(fake_kibana: FakeKibana, kibana_url: str) -> None:
+    """Test that a target that cannot be uploaded to does not stop the others."""
+    targets = [
+        KibanaTarget(name='missing-key', url=kibana_url, space='a', api_key_env='UNSET_KIBANA_API_KEY'),
+        KibanaTarget(name='ok', url=kibana_url, space='b'),
+    ]
+
+    results = await upload_to_targets(targets, NDJSON, environ={})
+
+    assert results[0].success is False
+    assert results[0].errors[0].message is not None
+    assert 'UNSET_KIBANA_API_KEY' in results[0].errors[0].message
+    assert results[1].success is True
+    assert 'a' not in fake_kibana.spaces
+    assert len(fake_kibana.spaces['b']) == 3
+
+
+async def test_client_context_manager_reuses_session(fake_kibana: FakeKibana, kibana_url: str) -> None:
+    """Test that a client used as a context manager serves several operations from one session."""
+    async with KibanaClient(kibana_url) as client:
+        first = await client.upload_ndjson(NDJSON)
+        found = await client.find_saved_objects('dashboard')
+
+    assert first.success_count == 3
+    assert len(found) == 3
+    assert len(fake_kibana.import_batches) == 1
+
+
+def test_upload_command_reports_failed_targets(tmp_path: Path) -> None:
+    """Test that the upload command fails when a target's credentials are missing."""
+    input_dir = tmp_path / 'dashboards'
+    input_dir.mkdir()
+    _ = (input_dir / 'dashboard.yaml').write_text('dashboards:\n  - name: Example\n    panels: []\n')
+    targets_file = tmp_path / 'targets.yaml'
+    _ = targets_file.write_text('targets:\n  - {name: prod, url: http://localhost:1, api_key_env: UNSET_KIBANA_API_KEY}\n')
+
+    result = CliRunner().invoke(
+        cli, ['upload', '--targets', str(targets_file), '--input-dir', str(input_dir)], env={'UNSET_KIBANA_API_KEY': None}
+    )
+
+    assert result.exit_code != 0
+    assert 'Upload failed for 1 of 1 target(s)' in result.output
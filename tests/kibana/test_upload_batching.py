@@ -0,0 +1,100 @@
+"""Tests for batched, concurrent NDJSON uploads in KibanaClient."""
+
+import json
+from pathlib import Path
+
+import aiohttp
+import pytest
+
+from dashboard_compiler.kibana_client import KibanaClient, KibanaSavedObjectsResponse, SavedObjectError, SavedObjectResult
+
+from .fake_kibana import FakeKibana
+
+
+def _ndjson(count: int, padding: int = 0) -> str:
+    lines = [json.dumps({'id': f'dash-{i}', 'type': 'dashboard', 'attributes': {'title': 'x' * padding}}) for i in range(count)]
+    return '\n'.join(lines) + '\n'
+
+
+async def test_upload_splits_into_batches_by_count(fake_kibana: FakeKibana, kibana_url: str, tmp_path: Path) -> None:
+    """Test that a file is uploaded in batches of at most batch_size objects."""
+    ndjson_file = tmp_path / 'dashboards.ndjson'
+    _ = ndjson_file.write_text(_ndjson(25))
+
+    result = await KibanaClient(kibana_url).upload_ndjson(ndjson_file, batch_size=10)
+
+    assert sorted(fake_kibana.import_batches) == [5, 10, 10]
+    assert result.success is True
+    assert result.success_count == 25
+    assert {obj.id for obj in result.success_results} == {f'dash-{i}' for i in range(25)}
+    assert all(query == {'overwrite': 'true'} for query in fake_kibana.import_queries)
+
+
+async def test_upload_splits_into_batches_by_bytes(fake_kibana: FakeKibana, kibana_url: str) -> None:
+    """Test that batches stay under the payload byte limit."""
+    fake_kibana.max_payload_bytes = 2_500
+
+    result = await KibanaClient(kibana_url).upload_ndjson(_ndjson(10, padding=1_000), batch_bytes=2_500)
+
+    assert fake_kibana.import_batches == [2, 2, 2, 2, 2]
+    assert result.success_count == 10
+
+
+async def test_upload_respects_concurrency_limit(fake_kibana: FakeKibana, kibana_url: str) -> None:
+    """Test that no more than max_concurrency imports are in flight."""
+    fake_kibana.latency = 0.02
+
+    result = await KibanaClient(kibana_url).upload_ndjson(_ndjson(40), batch_size=2, max_concurrency=3)
+
+    assert len(fake_kibana.import_batches) == 20
+    assert fake_kibana.peak_in_flight == 3
+    assert result.success_count == 40
+
+
+async def test_upload_skips_blank_lines_and_empty_input(fake_kibana: FakeKibana, kibana_url: str) -> None:
+    """Test that blank lines are ignored and empty input makes no requests."""
+    client = KibanaClient(kibana_url)
+
+    empty = await client.upload_ndjson('\n\n')
+    result = await client.upload_ndjson('\n' + _ndjson(2) + '\n\n')
+
+    assert empty.success is True
+    assert empty.success_count == 0
+    assert fake_kibana.import_batches == [2]
+    assert result.success_count == 2
+
+
+async def test_upload_propagates_http_errors(fake_kibana: FakeKibana, kibana_url: str) -> None:
+    """Test that a rejected batch raises a client error."""
+    fake_kibana.max_payload_bytes = 100
+
+    with pytest.raises(aiohttp.ClientResponseError) as exc_info:
+        _ = await KibanaClient(kibana_url).upload_ndjson(_ndjson(4, padding=200), batch_size=1)
+
+    assert exc_info.value.status == 413
+
+
+async def test_upload_rejects_non_positive_limits() -> None:
+    """Test that invalid batching limits are rejected before any request."""
+    with pytest.raises(ValueError, match='must all be positive'):
+        _ = await KibanaClient('http://localhost:1').upload_ndjson('{}', batch_size=0)
+
+
+def test_merge_combines_batch_responses() -> None:
+    """Test that merged responses sum counts and fail if any batch failed."""
+    merged = KibanaSavedObjectsResponse.merge(
+        [
+            KibanaSavedObjectsResponse(success=True, success_count=1, success_results=[SavedObjectResult(id='a', type='dashboard')]),
+            KibanaSavedObjectsResponse(
+                success=False,
+                success_count=1,
+                success_results=[SavedObjectResult(id='b', type='dashboard')],
+                errors=[SavedObjectError(message='boom')],
+            ),
+        ]
+    )
+
+    assert merged.success is False
+    assert merged.success_count == 2
+    assert [obj.id for obj in merged.success_results] == ['a', 'b']
+    assert [error.message for error in merged.errors] == ['boom']
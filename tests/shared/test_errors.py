@@ -1,6 +1,7 @@
 """Tests for custom exception classes."""
 
 from dashboard_compiler.shared.errors import (
+    CompileError,
     UnexpectedTypeError,
     YamlToLensError,
 )
@@ -35,3 +36,14 @@ class TestUnexpectedTypeError:
         error = UnexpectedTypeError('str', 'int')
         assert isinstance(error, YamlToLensError)
         assert isinstance(error, Exception)
+
+
+class TestCompileError:
+    """Tests for CompileError exception."""
+
+    def test_stores_source_and_generates_message(self) -> None:
+        """Test that CompileError stores the source and names it in the message."""
+        error = CompileError('dashboards.yaml', 'file not found')
+        assert error.source == 'dashboards.yaml'
+        assert error.message == 'Error compiling dashboards.yaml: file not found'
+        assert isinstance(error, YamlToLensError)
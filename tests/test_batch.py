@@ -0,0 +1,91 @@
+"""Tests for compiling many dashboards with iter_compile and compile_many."""
+
+import io
+import json
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from dashboard_compiler import compile_many, iter_compile
+from dashboard_compiler.dashboard.config import Dashboard
+from dashboard_compiler.shared.errors import CompileError
+
+
+def dashboard_yaml(*names: str) -> str:
+    """Build the YAML text of a dashboard file with a dashboard per name."""
+    return 'dashboards:\n' + ''.join(f'  - name: {name}\n    panels: []\n' for name in names)
+
+
+def titles(lines: Iterator[str] | list[str]) -> list[str]:
+    """Get the titles of the compiled dashboards in NDJSON lines."""
+    return [json.loads(line)['attributes']['title'] for line in lines]
+
+
+class TestIterCompile:
+    """Tests for iter_compile."""
+
+    def test_compiles_paths_yaml_text_and_dashboards_in_order(self, tmp_path: Path) -> None:
+        """Test that each kind of source is compiled, one line per dashboard, in the order of the sources."""
+        path = tmp_path / 'dashboards.yaml'
+        _ = path.write_text(dashboard_yaml('From file 1', 'From file 2'))
+
+        lines = list(iter_compile([Dashboard(name='From object'), path, dashboard_yaml('From text')]))
+
+        assert titles(lines) == ['From object', 'From file 1', 'From file 2', 'From text']
+
+    def test_reads_sources_as_lines_are_consumed(self) -> None:
+        """Test that sources are only read from the iterable when their lines are needed."""
+        read: list[int] = []
+
+        def sources() -> Iterator[Dashboard]:
+            for index in range(3):
+                read.append(index)
+                yield Dashboard(name=f'Dashboard {index}')
+
+        lines = iter_compile(sources())
+        assert read == []
+        assert titles([next(lines)]) == ['Dashboard 0']
+        assert read == [0]
+
+    def test_raises_for_failed_source(self) -> None:
+        """Test that the first source that fails to compile raises without an error list."""
+        lines = iter_compile([dashboard_yaml('Good'), 'dashboards: [{panels: []}]'])
+
+        assert titles([next(lines)]) == ['Good']
+        with pytest.raises(CompileError, match=r'YAML text \(source 1\)') as exc_info:
+            _ = next(lines)
+        assert exc_info.value.source == 'YAML text (source 1)'
+
+    def test_collects_failed_sources(self, tmp_path: Path) -> None:
+        """Test that sources that fail to compile are skipped and collected with an error list."""
+        missing = tmp_path / 'missing.yaml'
+        errors: list[CompileError] = []
+
+        lines = list(iter_compile([missing, dashboard_yaml('Good'), 'dashboards: [{'], errors=errors))
+
+        assert titles(lines) == ['Good']
+        assert [error.source for error in errors] == [str(missing), 'YAML text (source 2)']
+
+    def test_workers_keep_the_order_of_the_sources(self) -> None:
+        """Test that compiling in a pool of processes gives the same lines in the same order."""
+        sources = [Dashboard(name=f'Dashboard {index}') for index in range(20)]
+        errors: list[CompileError] = []
+
+        lines = list(iter_compile([*sources, 'dashboards: [{'], workers=2, errors=errors))
+
+        assert titles(lines) == [f'Dashboard {index}' for index in range(20)]
+        assert [error.source for error in errors] == ['YAML text (source 20)']
+
+
+class TestCompileMany:
+    """Tests for compile_many."""
+
+    def test_writes_ndjson_and_counts_dashboards(self) -> None:
+        """Test that a line is written per dashboard and that the number of dashboards is returned."""
+        output = io.StringIO()
+
+        count = compile_many([dashboard_yaml('First', 'Second'), Dashboard(name='Third')], output)
+
+        assert count == 3
+        assert titles(output.getvalue().splitlines()) == ['First', 'Second', 'Third']
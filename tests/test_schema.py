@@ -0,0 +1,32 @@
+"""Tests for the cached JSON schema of dashboard YAML files and the schema command."""
+
+import json
+from pathlib import Path
+
+from click.testing import CliRunner
+
+from dashboard_compiler.cli import cli
+from dashboard_compiler.schema import DashboardsRoot, dashboard_schema, dashboard_schema_json, dashboard_schema_version
+
+
+def test_schema_is_generated_once() -> None:
+    """Test that repeated calls return the same schema object and a stable version."""
+    assert dashboard_schema() is dashboard_schema()
+    assert dashboard_schema() == DashboardsRoot.model_json_schema()
+    assert dashboard_schema_version() == dashboard_schema_version()
+    assert len(dashboard_schema_version()) == 16
+
+
+def test_schema_command_writes_schema(tmp_path: Path) -> None:
+    """Test that the schema command writes the schema file and prints its version hash."""
+    output = tmp_path / 'schemas' / 'dashboard.json'
+
+    result = CliRunner().invoke(cli, ['schema', '--output', str(output)])
+
+    assert result.exit_code == 0, result.output
+    assert output.read_text() == dashboard_schema_json()
+    assert json.loads(output.read_text())['required'] == ['dashboards']
+
+    result = CliRunner().invoke(cli, ['schema', '--hash'])
+
+    assert result.output.strip() == dashboard_schema_version()
@@ -2,16 +2,60 @@
 
 This implementation uses the Language Server Protocol with pygls v2 to provide
 dashboard compilation services to the VS Code extension.
+
+Documents open in the editor are synced incrementally and compiled from their
+in-memory text, so previews can follow unsaved edits. Other files are read from disk.
+Validation problems of open documents are published as diagnostics with their exact
+source ranges when a document is opened and after its edits settle.
+
+Parsing and compiling run in a small worker pool off the event loop, so a slow compile
+does not hold up other requests. A newer request for the same document supersedes an
+older one that is still waiting or running, and clients can cancel requests with
+`$/cancelRequest`.
+
+The preview is sent as deltas: only the panels that changed since the last payload sent
+for a dashboard, keyed by panel ID, with the whole dashboard as a fallback.
+
+An index of the dashboard files of the workspace is built in the background and kept
+up to date as files change. It is saved between sessions when the client passes an
+`indexCachePath` initialization option, and powers workspace symbols, go to definition
+from dashboard links, and find references of data views and dashboards.
+
+Completion and hover of keys come from the JSON schema of the configuration models,
+turned once into a graph of the keys that are valid at each YAML position. Requests are
+answered from the in-memory text of the document without parsing or validating it.
+
+The `dashboard.compileWorkspace` command compiles every dashboard file of the workspace
+into the same combined NDJSON file as `kb-dashboard compile`. Open documents go through
+the document cache, the other files through a pool of processes. Progress is reported as
+cancellable work done progress, and the problems of each file as its diagnostics.
+
+`dashboard/stats` reports the request latencies per method, the use of the compile
+workers, the time spent per phase of handling documents, the cache hit rates and the
+memory of the server. With the `statsLogInterval` initialization option, a summary is also
+logged to the client at that interval, in seconds.
+
+The server is ready for requests as soon as the compiler is imported. The rest of the
+work that the first requests would otherwise pay for, generating the schema, building the
+completion graph, indexing the workspace and importing the Kibana client, is warmed up in
+a background thread after initialization. Requests that need it wait for it, or, for
+completion and hover, leave the answer to the YAML extension until it is done.
 """
 
+import asyncio
+import importlib
 import json
 import logging
 import sys
+import uuid
+from collections.abc import Callable
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
 from lsprotocol import types
 from pygls.lsp.server import LanguageServer
+from pygls.uris import to_fs_path
 
 logger = logging.getLogger(__name__)
 
@@ -22,8 +66,17 @@ if src_path.exists() and str(src_path) not in sys.path:
     sys.path.insert(0, str(src_path))
 
 try:
-    from dashboard_compiler.dashboard_compiler import load, render
-    from dashboard_compiler.kibana_client import KibanaClient
+    from diagnostics import Issue, to_diagnostics
+    from document_cache import DocumentCache, normalize_path
+    from grid_updater import update_panel_grids
+    from preview_delta import PreviewDeltas
+    from schema_completion import is_dashboard_document, schema_completer
+    from server_stats import ServerStats, process_age, process_memory, summarize
+    from warm_start import WarmStart
+    from workspace_compile import FileResult, compile_file, create_pool, file_issue, workspace_files
+    from workspace_index import IndexEntry, WorkspaceIndex
+
+    from dashboard_compiler.schema import dashboard_schema, dashboard_schema_version
 except ImportError as e:
     msg = (
         f'Failed to import dashboard_compiler. Make sure the dashboard_compiler '
@@ -31,8 +84,116 @@ except ImportError as e:
     )
     raise ImportError(msg) from e
 
-# Initialize the language server
-server = LanguageServer('dashboard-compiler', 'v0.1')
+# Seconds without further edits before the client is told that an open document changed
+CHANGE_DEBOUNCE_SECONDS = 0.3
+
+# Initialize the language server, only the changed ranges of open documents are sent
+server = LanguageServer('dashboard-compiler', 'v0.1', text_document_sync_kind=types.TextDocumentSyncKind.Incremental)
+
+# URIs of the documents open in the editor, by normalized path
+open_documents: dict[str, str] = {}
+
+# Pending debounced change notifications, by document URI
+_pending_changes: dict[str, asyncio.TimerHandle] = {}
+
+# Diagnostics tasks that are still running, kept so that they are not garbage collected
+_diagnostics_tasks: set[asyncio.Task[None]] = set()
+
+
+def _read_document(path: str) -> str | bytes:
+    """Read a document from the editor's in-memory text if it is open, else from disk.
+
+    Args:
+        path: Normalized path of the document
+
+    Returns:
+        The document content
+    """
+    uri = open_documents.get(path)
+    if uri is not None:
+        return server.workspace.get_text_document(uri).source
+    return Path(path).read_bytes()
+
+
+# Parsed and compiled dashboards of each document, shared by all requests
+document_cache = DocumentCache(read_document=_read_document)
+
+# The last preview payload sent for each dashboard, to send only what changed next time
+preview_deltas = PreviewDeltas()
+
+# Dashboards, panels, data views and links of all dashboard files of the workspace
+workspace_index = WorkspaceIndex()
+
+# Where the workspace index is saved between sessions, if the client gave a location
+_index_cache_path: str | None = None
+
+# Worker threads for parsing and compiling. Threads share the document cache and the
+# in-memory documents with the event loop, which a process pool could not do.
+COMPILE_WORKERS = 2
+_compile_executor = ThreadPoolExecutor(max_workers=COMPILE_WORKERS, thread_name_prefix='compile')
+
+# Request latencies and compile worker utilisation, for dashboard/stats, timed from the start of the process
+stats = ServerStats(workers=COMPILE_WORKERS, loaded_after=process_age())
+
+# The schema, completion graph, workspace index and Kibana client, prepared in the background after initialization
+warm_start = WarmStart(busy=stats.busy)
+
+# Seconds between summaries of the stats logged to the client, 0 for none
+_stats_log_interval: float = 0
+
+# The periodic logging of the stats, kept so that it is not garbage collected
+_stats_tasks: set[asyncio.Task[None]] = set()
+
+# The newest pending request of each kind, by method, normalized path and dashboard index
+_latest_requests: dict[tuple[str, str, int], asyncio.Future[Any]] = {}
+
+# Grid updates rewrite whole files, so they are applied one at a time and in order
+_grid_update_lock = asyncio.Lock()
+
+# Processes for the compile workspace command, started on its first run
+_workspace_pool: ProcessPoolExecutor | None = None
+
+# Where the compile workspace command writes by default, relative to the first workspace folder
+WORKSPACE_OUTPUT = Path('output') / 'compiled_dashboards.ndjson'
+
+
+async def _run_in_worker[T](key: tuple[str, str, int] | None, func: Callable[..., T], *args: Any) -> T:  # pyright: ignore[reportAny]
+    """Run a blocking function in the compile pool without blocking the event loop.
+
+    A request with the same key that is still pending is cancelled: it is dropped if it has
+    not started yet, and its result is discarded if it has.
+
+    Args:
+        key: Method, normalized path and dashboard index of the request, or None if it is never superseded
+        func: The blocking function
+        *args: Arguments for the function
+
+    Returns:
+        The function result
+
+    Raises:
+        asyncio.CancelledError: If the request was superseded or cancelled by the client
+    """
+    future = stats.submit(_compile_executor, func, *args)
+    if key is None:
+        return await future
+
+    previous = _latest_requests.get(key)
+    if previous is not None:
+        _ = previous.cancel()
+    _latest_requests[key] = future
+    try:
+        return await future
+    finally:
+        if _latest_requests.get(key) is future:
+            del _latest_requests[key]
+
+
+def _request_key(method: str, path: str | None, dashboard_index: int = 0) -> tuple[str, str, int] | None:
+    """Get the key under which newer requests supersede older ones, or None without a path."""
+    if path is None or len(path) == 0:
+        return None
+    return method, normalize_path(path), dashboard_index
 
 
 def _params_to_dict(params: Any) -> dict[str, Any]:  # pyright: ignore[reportAny]
@@ -77,22 +238,21 @@ def _compile_dashboard(path: str, dashboard_index: int = 0) -> dict[str, Any]:
         return {'success': False, 'error': 'Missing path parameter'}
 
     try:
-        dashboards = load(path)
+        dashboards = document_cache.dashboards(path)
         if len(dashboards) == 0:
             return {'success': False, 'error': 'No dashboards found in YAML file'}
 
         if dashboard_index < 0 or dashboard_index >= len(dashboards):
             return {'success': False, 'error': f'Dashboard index {dashboard_index} out of range (0-{len(dashboards) - 1})'}
 
-        dashboard = dashboards[dashboard_index]
-        kbn_dashboard = render(dashboard)
-        return {'success': True, 'data': kbn_dashboard.model_dump(by_alias=True, mode='json')}
+        return {'success': True, 'data': document_cache.compiled(path, dashboard_index)}
     except Exception as e:
         return {'success': False, 'error': str(e)}
 
 
 @server.command('dashboard.compile')
-def compile_command(_ls: LanguageServer, args: list[Any]) -> dict[str, Any]:
+@stats.timed('dashboard.compile')
+async def compile_command(_ls: LanguageServer, args: list[Any]) -> dict[str, Any]:
     """Compile a dashboard using the workspace/executeCommand pattern.
 
     Args:
@@ -107,11 +267,12 @@ def compile_command(_ls: LanguageServer, args: list[Any]) -> dict[str, Any]:
     path: str = args[0]  # pyright: ignore[reportAny]
     dashboard_index: int = int(args[1]) if len(args) > 1 else 0  # pyright: ignore[reportAny]
 
-    return _compile_dashboard(path, dashboard_index)
+    return await _run_in_worker(_request_key('dashboard.compile', path, dashboard_index), _compile_dashboard, path, dashboard_index)
 
 
 @server.feature('dashboard/compile')
-def compile_custom(params: Any) -> dict[str, Any]:  # pyright: ignore[reportAny]
+@stats.timed('dashboard/compile')
+async def compile_custom(params: Any) -> dict[str, Any]:  # pyright: ignore[reportAny]
     """Handle custom compilation request for a dashboard.
 
     Args:
@@ -124,11 +285,182 @@ def compile_custom(params: Any) -> dict[str, Any]:  # pyright: ignore[reportAny]
     path: str = params_dict.get('path', '')  # pyright: ignore[reportAny]
     dashboard_index = int(params_dict.get('dashboard_index', 0))  # pyright: ignore[reportAny]
 
-    return _compile_dashboard(path, dashboard_index)
+    return await _run_in_worker(_request_key('dashboard/compile', path, dashboard_index), _compile_dashboard, path, dashboard_index)
+
+
+@server.feature('dashboard/compilePreview')
+@stats.timed('dashboard/compilePreview')
+async def compile_preview_custom(params: Any) -> dict[str, Any]:  # pyright: ignore[reportAny]
+    """Compile a dashboard for the preview, as a delta against the payload the client has.
+
+    Args:
+        params: Object containing path, dashboard_index and version, the version of the
+            client's last payload or null to get the whole dashboard
+
+    Returns:
+        Dictionary with success status and either the delta as data or error message
+    """
+    params_dict = _params_to_dict(params)
+    path: str = params_dict.get('path', '')  # pyright: ignore[reportAny]
+    dashboard_index = int(params_dict.get('dashboard_index', 0))  # pyright: ignore[reportAny]
+    version: int | None = params_dict.get('version')
+
+    return await _run_in_worker(
+        _request_key('dashboard/compilePreview', path, dashboard_index), _compile_preview, path, dashboard_index, version
+    )
+
+
+def _compile_preview(path: str, dashboard_index: int, version: int | None) -> dict[str, Any]:
+    """Compile a dashboard and get the preview delta from the client's version.
+
+    Args:
+        path: Path to the YAML file
+        dashboard_index: Index of the dashboard to compile
+        version: Version of the client's last payload, or None
+
+    Returns:
+        Dictionary with success status and either the delta as data or error message
+    """
+    result = _compile_dashboard(path, dashboard_index)
+    if result['success'] is not True:
+        return result
+    return {'success': True, 'data': preview_deltas.delta(normalize_path(path), dashboard_index, result['data'], version)}
+
+
+@server.command('dashboard.compileWorkspace')
+@stats.timed('dashboard.compileWorkspace')
+async def compile_workspace_command(ls: LanguageServer, output_path: str | None = None) -> dict[str, Any]:
+    """Compile every dashboard file of the workspace into one NDJSON file, like `kb-dashboard compile`.
+
+    Reports its progress to the client, which can cancel it, and publishes the problems of
+    each file as its diagnostics as soon as the file is done.
+
+    Args:
+        ls: Language server instance
+        output_path: The combined NDJSON file to write, relative to the first workspace folder,
+            by default output/compiled_dashboards.ndjson like `kb-dashboard compile`
+
+    Returns:
+        Dictionary with success status, the output path, the numbers of dashboard files and
+        dashboards, and the errors of the files that failed, or an error message
+    """
+    global _workspace_pool  # noqa: PLW0603
+    roots = _workspace_roots(ls)
+    if len(roots) == 0:
+        return {'success': False, 'error': 'No workspace folder to compile'}
+    output = Path(roots[0], output_path if output_path is not None and len(output_path) > 0 else WORKSPACE_OUTPUT)
+
+    paths = await asyncio.to_thread(workspace_files, roots)
+
+    token = str(uuid.uuid4())
+    await ls.work_done_progress.create_async(token)
+    ls.work_done_progress.begin(token, types.WorkDoneProgressBegin(title='Compiling workspace', cancellable=True, percentage=0))
+    cancellation = asyncio.wrap_future(ls.work_done_progress.tokens[token])
+
+    if _workspace_pool is None:
+        _workspace_pool = create_pool()
+    futures = _start_compiling(paths, _workspace_pool)
+    positions = {future: position for position, future in enumerate(futures)}
+    pending = set(futures)
+    done: set[asyncio.Future[FileResult | None]] = set()
+    results: dict[int, FileResult] = {}
+    end_message = 'Cancelled'
+    try:
+        while len(pending) > 0:
+            done, pending = await asyncio.wait(pending | {cancellation}, return_when=asyncio.FIRST_COMPLETED)
+            if cancellation in done:
+                return {'success': False, 'error': 'Workspace compilation was cancelled', 'cancelled': True}
+            pending.discard(cancellation)
+            for future in done:
+                result: FileResult | None = future.result()
+                if result is not None:
+                    results[positions[future]] = result
+                    uri = open_documents.get(result.path, Path(result.path).as_uri())
+                    ls.text_document_publish_diagnostics(types.PublishDiagnosticsParams(uri=uri, diagnostics=to_diagnostics(result.issues)))
+            finished = len(paths) - len(pending)
+            ls.work_done_progress.report(
+                token, types.WorkDoneProgressReport(message=f'{finished}/{len(paths)} files', percentage=finished * 100 // len(paths))
+            )
+
+        # The dashboards are written in the order the files were found in, like the CLI does
+        ordered = [results[position] for position in sorted(results)]
+        lines = [line for result in ordered for line in result.lines]
+        if len(lines) > 0:
+            await asyncio.to_thread(_write_workspace_output, output, lines)
+        errors = [{'path': result.path, 'error': result.error} for result in ordered if result.error is not None]
+        end_message = f'Compiled {len(lines)} dashboard(s), {len(errors)} file(s) with errors'
+        return {
+            'success': True,
+            'output': str(output) if len(lines) > 0 else None,
+            'files': len(results),
+            'dashboards': len(lines),
+            'errors': errors,
+        }
+    except BrokenExecutor as e:
+        # A worker process died, and all files that were waiting for the pool failed with it
+        for future in done:
+            _ = future.cancelled() or future.exception()
+        _workspace_pool = None
+        end_message = 'Failed'
+        return {'success': False, 'error': f'Workspace compilation failed: {e}'}
+    finally:
+        # Files that have not started yet are dropped, those in progress finish unused
+        for future in pending:
+            _ = future.cancel()
+        _ = cancellation.cancel()
+        ls.work_done_progress.end(token, types.WorkDoneProgressEnd(message=end_message))
+        _ = ls.work_done_progress.tokens.pop(token, None)
+
+
+def _start_compiling(paths: list[str], pool: ProcessPoolExecutor) -> list[asyncio.Future[FileResult | None]]:
+    """Start compiling files, open documents in the compile threads and the other files in the process pool."""
+    loop = asyncio.get_running_loop()
+    return [
+        stats.submit(_compile_executor, _compile_open_document, path)
+        if path in open_documents
+        else loop.run_in_executor(pool, compile_file, path)
+        for path in paths
+    ]
+
+
+def _compile_open_document(path: str) -> FileResult | None:
+    """Compile a document open in the editor from its in-memory text, with the dashboards validated by the document cache.
+
+    Args:
+        path: Normalized path of the document
+
+    Returns:
+        The result, or None if the document is not a dashboard file
+    """
+    try:
+        content = _read_document(path)
+        text = content.decode('utf-8', errors='replace') if isinstance(content, bytes) else content
+        if not is_dashboard_document(text.splitlines()):
+            return None
+        issues: list[Issue] = document_cache.issues(path)
+    except OSError as e:
+        return FileResult(path=path, issues=[file_issue(f'Cannot read {path}: {e.strerror}')])
+    if len(issues) > 0:
+        return FileResult(path=path, issues=issues)
+    from dashboard_compiler.cli import dashboard_ndjson_line
+
+    try:
+        return FileResult(path=path, lines=[dashboard_ndjson_line(dashboard) for dashboard in document_cache.dashboards(path)])
+    except (ValueError, TypeError, KeyError) as e:
+        return FileResult(path=path, issues=[file_issue(f'Error compiling {path}: {e}')])
+
+
+def _write_workspace_output(output: Path, lines: list[str]) -> None:
+    """Write the combined NDJSON file of a workspace compilation with the writer of `kb-dashboard compile`, creating its directory."""
+    from dashboard_compiler.cli import write_ndjson
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    write_ndjson(output, lines, overwrite=True)
 
 
 @server.feature('dashboard/getDashboards')
-def get_dashboards_custom(params: Any) -> dict[str, Any]:  # pyright: ignore[reportAny]
+@stats.timed('dashboard/getDashboards')
+async def get_dashboards_custom(params: Any) -> dict[str, Any]:  # pyright: ignore[reportAny]
     """Get list of dashboards from a YAML file.
 
     Args:
@@ -138,13 +470,25 @@ def get_dashboards_custom(params: Any) -> dict[str, Any]:  # pyright: ignore[rep
         Dictionary with list of dashboards or error
     """
     params_dict = _params_to_dict(params)
-    path = params_dict.get('path')
+    path: str | None = params_dict.get('path')
+
+    return await _run_in_worker(_request_key('dashboard/getDashboards', path), _get_dashboards, path)
+
 
+def _get_dashboards(path: str | None) -> dict[str, Any]:
+    """List the dashboards of a YAML file.
+
+    Args:
+        path: Path to the YAML file
+
+    Returns:
+        Dictionary with list of dashboards or error
+    """
     if path is None or len(path) == 0:
         return {'success': False, 'error': 'Missing path parameter'}
 
     try:
-        dashboards = load(path)  # pyright: ignore[reportAny]
+        dashboards = document_cache.dashboards(path)
         dashboard_list = [
             {'index': i, 'title': dashboard.name or f'Dashboard {i + 1}', 'description': dashboard.description or ''}
             for i, dashboard in enumerate(dashboards)
@@ -176,7 +520,8 @@ def _get_panel_type(panel: Any) -> str:  # pyright: ignore[reportAny]
 
 
 @server.feature('dashboard/getGridLayout')
-def get_grid_layout_custom(params: Any) -> dict[str, Any]:  # pyright: ignore[reportAny]
+@stats.timed('dashboard/getGridLayout')
+async def get_grid_layout_custom(params: Any) -> dict[str, Any]:  # pyright: ignore[reportAny]
     """Get grid layout information from a YAML dashboard file.
 
     Args:
@@ -186,14 +531,27 @@ def get_grid_layout_custom(params: Any) -> dict[str, Any]:  # pyright: ignore[re
         Dictionary with grid layout information or error
     """
     params_dict = _params_to_dict(params)
-    path = params_dict.get('path')
+    path: str | None = params_dict.get('path')
     dashboard_index = int(params_dict.get('dashboard_index', 0))  # pyright: ignore[reportAny]
 
+    return await _run_in_worker(_request_key('dashboard/getGridLayout', path, dashboard_index), _get_grid_layout, path, dashboard_index)
+
+
+def _get_grid_layout(path: str | None, dashboard_index: int) -> dict[str, Any]:
+    """Extract the grid layout of one dashboard of a YAML file.
+
+    Args:
+        path: Path to the YAML file
+        dashboard_index: Index of the dashboard in the file
+
+    Returns:
+        Dictionary with grid layout information or error
+    """
     if path is None or len(path) == 0:
         return {'success': False, 'error': 'Missing path parameter'}
 
     try:
-        dashboards = load(path)  # pyright: ignore[reportAny]
+        dashboards = document_cache.dashboards(path)
         if len(dashboards) == 0:
             return {'success': False, 'error': 'No dashboards found in YAML file'}
 
@@ -229,8 +587,51 @@ def get_grid_layout_custom(params: Any) -> dict[str, Any]:  # pyright: ignore[re
         return {'success': True, 'data': result}
 
 
+@server.feature('dashboard/updateGrid')
+@stats.timed('dashboard/updateGrid')
+async def update_grid_custom(params: Any) -> dict[str, Any]:  # pyright: ignore[reportAny]
+    """Update the grid coordinates of one or more panels in a YAML dashboard file.
+
+    A batch of updates is applied with a single parse and a single write of the file.
+
+    Args:
+        params: Object containing path, dashboard_index, and either panel_id and grid with x, y, w and h,
+            or updates, a list of objects with panel_id and grid
+
+    Returns:
+        Dictionary with success status and message or error
+    """
+    params_dict = _params_to_dict(params)
+    path: str | None = params_dict.get('path')
+    dashboard_index = int(params_dict.get('dashboard_index', 0))  # pyright: ignore[reportAny]
+    updates: Any = params_dict.get('updates')  # pyright: ignore[reportExplicitAny]
+    if updates is None:
+        updates = [{'panel_id': params_dict.get('panel_id'), 'grid': params_dict.get('grid')}]
+
+    missing_error = {'success': False, 'error': 'Missing required parameters (path, panel_id and grid)'}
+    if path is None or len(path) == 0 or len(updates) == 0:  # pyright: ignore[reportAny]
+        return missing_error
+
+    new_grids: dict[str, dict[str, Any]] = {}
+    for update in updates:  # pyright: ignore[reportAny]
+        update_dict = _params_to_dict(update)
+        panel_id: str | None = update_dict.get('panel_id')
+        grid: Any = update_dict.get('grid')  # pyright: ignore[reportExplicitAny]
+        if panel_id is None or grid is None:
+            return missing_error
+        new_grids[panel_id] = _params_to_dict(grid)
+
+    async with _grid_update_lock:
+        try:
+            result = await _run_in_worker(None, update_panel_grids, path, new_grids, dashboard_index)
+        finally:
+            document_cache.invalidate(path)
+    return result
+
+
 @server.feature('dashboard/getSchema')
-def get_schema_custom(_params: Any) -> dict[str, Any]:  # pyright: ignore[reportAny]
+@stats.timed('dashboard/getSchema')
+async def get_schema_custom(params: Any) -> dict[str, Any]:  # pyright: ignore[reportAny]
     """Get the JSON schema for the Dashboard configuration model.
 
     This endpoint returns the JSON schema for the root YAML structure,
@@ -238,27 +639,472 @@ def get_schema_custom(_params: Any) -> dict[str, Any]:  # pyright: ignore[report
     can be used by VS Code extensions to provide auto-complete, validation,
     and hover documentation for YAML dashboard files.
 
+    The schema is generated once per process. Clients that cached an earlier
+    response can pass its version and get the schema only if it changed.
+
     Args:
-        _params: Request parameters (unused)
+        params: Object containing the optional version of the client's cached schema
 
     Returns:
-        Dictionary with success status and schema data or error message
+        Dictionary with success status, the schema version and the schema data
+        (omitted if it matches the client's version) or error message
     """
-    try:
-        from pydantic import BaseModel
+    params_dict = _params_to_dict(params)
+    cached_version: str | None = params_dict.get('version')
 
-        from dashboard_compiler.dashboard.config import Dashboard
+    # The warm-up generates the schema, it is not generated a second time alongside it
+    await warm_start.ready('schema')
+    return await _run_in_worker(None, _get_schema, cached_version)
 
-        class DashboardsRoot(BaseModel):
-            """Root structure for dashboard YAML files."""
 
-            dashboards: list[Dashboard]
+def _get_schema(cached_version: str | None) -> dict[str, Any]:
+    """Get the schema and its version, leaving out the schema if the client has it already.
+
+    Args:
+        cached_version: Version of the client's cached schema, if any
 
-        schema = DashboardsRoot.model_json_schema()
+    Returns:
+        Dictionary with success status, version and schema data or error message
+    """
+    try:
+        version = dashboard_schema_version()
+        if cached_version == version:
+            return {'success': True, 'version': version}
+        return {'success': True, 'version': version, 'data': dashboard_schema()}
     except Exception as e:
         return {'success': False, 'error': str(e)}
-    else:
-        return {'success': True, 'data': schema}
+
+
+@server.feature('dashboard/stats')
+async def stats_custom(_params: Any) -> dict[str, Any]:  # pyright: ignore[reportAny]
+    """Get the performance figures of the server, e.g. to find out why the preview is slow.
+
+    Args:
+        _params: Request parameters, unused
+
+    Returns:
+        Dictionary with success status and data with the request counts and latency percentiles
+        per method, the compile worker utilisation, the time spent per phase, the cache hit
+        rates, the memory of the server process and the state of the warm-up
+    """
+    return {'success': True, 'data': _stats_snapshot()}
+
+
+def _stats_snapshot() -> dict[str, Any]:
+    """Collect the performance figures of the server."""
+    cache = document_cache.stats()
+    lookups = cache['hits'] + cache['misses']
+    return {
+        **stats.snapshot(),
+        'phases': document_cache.timings.snapshot(),
+        'caches': {
+            'documents': {**cache, 'hit_rate': round(cache['hits'] / lookups, 4) if lookups > 0 else None},
+            'workspace_index': workspace_index.stats(),
+        },
+        'memory': process_memory(),
+        'warm_up': warm_start.snapshot(),
+    }
+
+
+async def _log_stats(ls: LanguageServer, interval: float) -> None:
+    """Log a summary of the performance figures to the client at an interval.
+
+    Args:
+        ls: Language server instance
+        interval: Seconds between summaries
+    """
+    while True:
+        await asyncio.sleep(interval)
+        ls.window_log_message(types.LogMessageParams(type=types.MessageType.Info, message=summarize(_stats_snapshot())))
+
+
+@server.feature(types.INITIALIZE)
+def initialize(_ls: LanguageServer, params: types.InitializeParams) -> None:
+    """Read the initialization options of the client.
+
+    Args:
+        _ls: Language server instance
+        params: Initialize request parameters, with the optional indexCachePath and statsLogInterval options
+    """
+    global _index_cache_path, _stats_log_interval  # noqa: PLW0603
+    options: Any = params.initialization_options  # pyright: ignore[reportExplicitAny]
+    cache_path: Any = options.get('indexCachePath') if isinstance(options, dict) else None  # pyright: ignore[reportExplicitAny, reportUnknownMemberType]
+    _index_cache_path = cache_path if isinstance(cache_path, str) and len(cache_path) > 0 else None
+    interval: Any = options.get('statsLogInterval') if isinstance(options, dict) else None  # pyright: ignore[reportExplicitAny, reportUnknownMemberType]
+    _stats_log_interval = float(interval) if isinstance(interval, int | float) and interval > 0 else 0  # pyright: ignore[reportUnknownArgumentType]
+
+
+@server.feature(types.INITIALIZED)
+def initialized(ls: LanguageServer, _params: types.InitializedParams) -> None:
+    """Start the warm-up and logging the stats.
+
+    The schema comes first, as the client asks for it right away, then the completion graph,
+    the workspace index and the Kibana client, which is only needed for uploads.
+
+    Args:
+        ls: Language server instance
+        _params: Initialized notification parameters
+    """
+    roots = _workspace_roots(ls)
+    _ = warm_start.start(
+        [
+            ('schema', dashboard_schema_version),
+            ('completion', schema_completer),
+            ('workspace_index', lambda: _build_workspace_index(roots)),
+            ('kibana_client', lambda: importlib.import_module('dashboard_compiler.kibana_client')),
+        ]
+    )
+    if _stats_log_interval > 0:
+        stats_task = asyncio.get_running_loop().create_task(_log_stats(ls, _stats_log_interval))
+        _stats_tasks.add(stats_task)
+        stats_task.add_done_callback(_stats_tasks.discard)
+
+
+@server.feature(types.SHUTDOWN)
+def shutdown(_ls: LanguageServer, _params: None) -> None:
+    """Save the workspace index for the next session, and stop the workspace compilation processes.
+
+    Args:
+        _ls: Language server instance
+        _params: Shutdown request parameters, always None
+    """
+    _save_workspace_index()
+    if _workspace_pool is not None:
+        _workspace_pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _workspace_roots(ls: LanguageServer) -> list[str]:
+    """Get the directories of the workspace folders, or of the workspace root if there are none."""
+    roots = [to_fs_path(folder.uri) for folder in ls.workspace.folders.values()]
+    if len(roots) == 0:
+        roots = [ls.workspace.root_path]
+    return [root for root in roots if root is not None and len(root) > 0]
+
+
+def _build_workspace_index(roots: list[str]) -> None:
+    """Load the index of the last session, bring it up to date with the workspace and save it.
+
+    Args:
+        roots: Directories of the workspace
+    """
+    try:
+        if _index_cache_path is not None:
+            _ = workspace_index.load(_index_cache_path)
+        workspace_index.scan(roots)
+        for path, uri in list(open_documents.items()):
+            _ = workspace_index.update_file(path, server.workspace.get_text_document(uri).source)
+        _save_workspace_index()
+    except OSError:
+        logger.exception('Failed to build the workspace index')
+    logger.debug(f'Workspace index: {workspace_index.stats()}')
+
+
+def _save_workspace_index() -> None:
+    """Save the workspace index, if the client gave a location for it."""
+    if _index_cache_path is None:
+        return
+    try:
+        workspace_index.save(_index_cache_path)
+    except OSError:
+        logger.exception(f'Failed to save the workspace index to {_index_cache_path}')
+
+
+def _index_document(path: str) -> None:
+    """Index a document again if it changed, from its in-memory text if it is open in the editor.
+
+    Args:
+        path: Normalized path of the document
+    """
+    uri = open_documents.get(path)
+    _ = workspace_index.update_file(path, server.workspace.get_text_document(uri).source if uri is not None else None)
+
+
+def _location(path: str, entry: IndexEntry) -> types.Location:
+    """Get the location of an index entry."""
+    start_line, start_character, end_line, end_character = entry.range
+    return types.Location(
+        uri=Path(path).as_uri(),
+        range=types.Range(
+            start=types.Position(line=start_line, character=start_character),
+            end=types.Position(line=end_line, character=end_character),
+        ),
+    )
+
+
+@server.feature(types.WORKSPACE_SYMBOL)
+@stats.timed(types.WORKSPACE_SYMBOL)
+async def workspace_symbol(params: types.WorkspaceSymbolParams) -> list[types.SymbolInformation]:
+    """Search the dashboards and panels of all dashboard files of the workspace.
+
+    Args:
+        params: Workspace symbol parameters with the query
+
+    Returns:
+        The matching dashboards and panels
+    """
+    await warm_start.ready('workspace_index')
+    matches = workspace_index.symbols(params.query)
+    return [
+        types.SymbolInformation(
+            name=entry.name,
+            kind=types.SymbolKind.Module if entry.kind == 'dashboard' else types.SymbolKind.Field,
+            location=_location(path, entry),
+            container_name=entry.container,
+        )
+        for path, entry in matches
+    ]
+
+
+@server.feature(types.TEXT_DOCUMENT_DEFINITION)
+@stats.timed(types.TEXT_DOCUMENT_DEFINITION)
+async def definition(params: types.DefinitionParams) -> list[types.Location] | None:
+    """Go from a dashboard link to the dashboard it points to.
+
+    Args:
+        params: Definition parameters with the document and position
+
+    Returns:
+        The locations of the linked dashboard, or None if the position is not on a dashboard link
+    """
+    path = to_fs_path(params.text_document.uri)
+    if path is None:
+        return None
+    await warm_start.ready('workspace_index')
+    return await _run_in_worker(None, _definition, normalize_path(path), params.position.line, params.position.character)
+
+
+def _definition(path: str, line: int, character: int) -> list[types.Location] | None:
+    _index_document(path)
+    entry = workspace_index.entry_at(path, line, character)
+    if entry is None or entry.kind != 'link':
+        return None
+    return [_location(target_path, target) for target_path, target in workspace_index.find('dashboard', entry_id=entry.name)]
+
+
+@server.feature(types.TEXT_DOCUMENT_REFERENCES)
+@stats.timed(types.TEXT_DOCUMENT_REFERENCES)
+async def references(params: types.ReferenceParams) -> list[types.Location] | None:
+    """Find the uses of a data view, or the links to a dashboard, in all dashboard files of the workspace.
+
+    Args:
+        params: Reference parameters with the document, position and whether to include the declaration
+
+    Returns:
+        The locations of the references, or None if the position is not on a data view, dashboard or dashboard link
+    """
+    path = to_fs_path(params.text_document.uri)
+    if path is None:
+        return None
+    await warm_start.ready('workspace_index')
+    return await _run_in_worker(
+        None, _references, normalize_path(path), params.position.line, params.position.character, params.context.include_declaration
+    )
+
+
+def _references(path: str, line: int, character: int, include_declaration: bool) -> list[types.Location] | None:
+    _index_document(path)
+    entry = workspace_index.entry_at(path, line, character)
+    if entry is None or entry.kind == 'panel':
+        return None
+    if entry.kind == 'data_view':
+        return [_location(match_path, match) for match_path, match in workspace_index.find('data_view', name=entry.name)]
+
+    dashboard_id = entry.name if entry.kind == 'link' else entry.id
+    matches = workspace_index.find('link', name=dashboard_id)
+    if include_declaration is True:
+        matches = workspace_index.find('dashboard', entry_id=dashboard_id) + matches
+    return [_location(match_path, match) for match_path, match in matches]
+
+
+@server.feature(types.TEXT_DOCUMENT_COMPLETION)
+@stats.timed(types.TEXT_DOCUMENT_COMPLETION)
+def completion(params: types.CompletionParams) -> list[types.CompletionItem] | None:
+    """Complete the keys valid at the cursor, or the values of the key before it.
+
+    Args:
+        params: Completion parameters with the document and position
+
+    Returns:
+        The completion items, or None if the document is not a dashboard file or the completion graph is not built yet
+    """
+    lines = _dashboard_lines(params.text_document.uri)
+    if lines is None or not warm_start.done('completion'):
+        return None
+    return schema_completer().complete(lines, params.position.line, params.position.character)
+
+
+@server.feature(types.TEXT_DOCUMENT_HOVER)
+@stats.timed(types.TEXT_DOCUMENT_HOVER)
+def hover(params: types.HoverParams) -> types.Hover | None:
+    """Describe the key under the cursor.
+
+    Args:
+        params: Hover parameters with the document and position
+
+    Returns:
+        The description of the key, or None if the position is not on a known key of a dashboard file
+        or the completion graph is not built yet
+    """
+    lines = _dashboard_lines(params.text_document.uri)
+    if lines is None or not warm_start.done('completion'):
+        return None
+    return schema_completer().hover(lines, params.position.line, params.position.character)
+
+
+def _dashboard_lines(uri: str) -> list[str] | None:
+    """Get the lines of a document, or None if it is not a dashboard file."""
+    path = to_fs_path(uri)
+    if path is None:
+        return None
+    try:
+        content = _read_document(normalize_path(path))
+    except OSError:
+        return None
+    lines = (content.decode('utf-8', errors='replace') if isinstance(content, bytes) else content).splitlines()
+    return lines if is_dashboard_document(lines) else None
+
+
+@server.feature(types.WORKSPACE_DID_CHANGE_WATCHED_FILES)
+async def did_change_watched_files(params: types.DidChangeWatchedFilesParams) -> None:
+    """Update the workspace index when YAML files are created, changed or deleted outside of the editor.
+
+    Args:
+        params: The file events
+    """
+
+    def update() -> None:
+        for change in params.changes:
+            path = to_fs_path(change.uri)
+            if path is None:
+                continue
+            if change.type == types.FileChangeType.Deleted:
+                workspace_index.remove_file(normalize_path(path))
+            else:
+                _index_document(normalize_path(path))
+
+    await asyncio.to_thread(update)
+
+
+def _invalidate_document(uri: str) -> None:
+    """Drop the cached dashboards of a document.
+
+    Args:
+        uri: Document URI
+    """
+    path = to_fs_path(uri)
+    if path is not None:
+        document_cache.invalidate(path)
+
+
+def _cancel_pending_change(uri: str) -> None:
+    """Cancel the debounced change notification of a document, if one is pending.
+
+    Args:
+        uri: Document URI
+    """
+    pending = _pending_changes.pop(uri, None)
+    if pending is not None:
+        pending.cancel()
+
+
+def _notify_document_changed(ls: LanguageServer, uri: str, version: int) -> None:
+    """Tell the client that an open document changed, so that it can refresh its preview, and update its diagnostics.
+
+    Args:
+        ls: Language server instance
+        uri: Document URI
+        version: Document version the notification refers to
+    """
+    _ = _pending_changes.pop(uri, None)
+    ls.protocol.notify('dashboard/documentChanged', {'uri': uri, 'version': version})
+    _schedule_diagnostics(ls, uri, version)
+    path = to_fs_path(uri)
+    if path is not None:
+        _ = stats.submit(_compile_executor, _index_document, normalize_path(path))
+
+
+def _schedule_diagnostics(ls: LanguageServer, uri: str, version: int) -> None:
+    """Validate a document in the compile pool and publish its diagnostics when done.
+
+    Args:
+        ls: Language server instance
+        uri: Document URI
+        version: Document version the diagnostics refer to
+    """
+    task = asyncio.get_running_loop().create_task(_publish_diagnostics(ls, uri, version))
+    _diagnostics_tasks.add(task)
+    task.add_done_callback(_diagnostics_tasks.discard)
+
+
+@stats.timed('textDocument/publishDiagnostics')
+async def _publish_diagnostics(ls: LanguageServer, uri: str, version: int) -> None:
+    """Publish the validation problems of a document, unless a newer version supersedes it.
+
+    Args:
+        ls: Language server instance
+        uri: Document URI
+        version: Document version the diagnostics refer to
+    """
+    path = to_fs_path(uri)
+    if path is None:
+        return
+    try:
+        issues = await _run_in_worker(_request_key('diagnostics', path), document_cache.issues, path)
+    except OSError:
+        logger.exception(f'Cannot read {path} for diagnostics')
+        return
+    ls.text_document_publish_diagnostics(types.PublishDiagnosticsParams(uri=uri, diagnostics=to_diagnostics(issues), version=version))
+
+
+@server.feature(types.TEXT_DOCUMENT_DID_OPEN)
+def did_open(ls: LanguageServer, params: types.DidOpenTextDocumentParams) -> None:
+    """Start serving a document from its in-memory text and publish its diagnostics.
+
+    Args:
+        ls: Language server instance
+        params: Open event parameters
+    """
+    path = to_fs_path(params.text_document.uri)
+    if path is not None:
+        open_documents[normalize_path(path)] = params.text_document.uri
+        _schedule_diagnostics(ls, params.text_document.uri, params.text_document.version)
+
+
+@server.feature(types.TEXT_DOCUMENT_DID_CHANGE)
+def did_change(ls: LanguageServer, params: types.DidChangeTextDocumentParams) -> None:
+    """Handle document edits by dropping the cached dashboards and scheduling a change notification.
+
+    pygls has already applied the changed ranges to the in-memory document. The notification is
+    debounced, so a burst of keystrokes triggers a single preview refresh.
+
+    Args:
+        ls: Language server instance
+        params: Change event parameters
+    """
+    uri = params.text_document.uri
+    _invalidate_document(uri)
+    _cancel_pending_change(uri)
+    loop = asyncio.get_running_loop()
+    _pending_changes[uri] = loop.call_later(CHANGE_DEBOUNCE_SECONDS, _notify_document_changed, ls, uri, params.text_document.version)
+
+
+@server.feature(types.TEXT_DOCUMENT_DID_CLOSE)
+def did_close(ls: LanguageServer, params: types.DidCloseTextDocumentParams) -> None:
+    """Go back to reading a closed document from disk, and clear its diagnostics.
+
+    Args:
+        ls: Language server instance
+        params: Close event parameters
+    """
+    uri = params.text_document.uri
+    _cancel_pending_change(uri)
+    path = to_fs_path(uri)
+    if path is not None:
+        document_cache.close(path)
+        preview_deltas.forget(normalize_path(path))
+        _ = open_documents.pop(normalize_path(path), None)
+        _ = stats.submit(_compile_executor, _index_document, normalize_path(path))
+    ls.text_document_publish_diagnostics(types.PublishDiagnosticsParams(uri=uri, diagnostics=[]))
 
 
 @server.feature(types.TEXT_DOCUMENT_DID_SAVE)
@@ -270,10 +1116,13 @@ def did_save(ls: LanguageServer, params: types.DidSaveTextDocumentParams) -> Non
         params: Save event parameters
     """
     file_path = params.text_document.uri
+    _invalidate_document(file_path)
     ls.protocol.notify('dashboard/fileChanged', {'uri': file_path})
+    logger.debug(f'Document cache: {document_cache.stats()}')
 
 
 @server.feature('dashboard/uploadToKibana')
+@stats.timed('dashboard/uploadToKibana')
 async def upload_to_kibana_custom(params: Any) -> dict[str, Any]:  # pyright: ignore[reportAny]
     """Upload a compiled dashboard to Kibana.
 
@@ -306,7 +1155,7 @@ async def upload_to_kibana_custom(params: Any) -> dict[str, Any]:  # pyright: ig
     try:
         # Compile the dashboard first
         logger.info(f'Compiling dashboard from {path} (index {dashboard_index})')
-        compile_result = _compile_dashboard(path, dashboard_index)
+        compile_result = await _run_in_worker(None, _compile_dashboard, path, dashboard_index)
         if compile_result['success'] is not True:
             logger.error(f'Compilation failed: {compile_result.get("error")}')
             return compile_result
@@ -315,6 +1164,10 @@ async def upload_to_kibana_custom(params: Any) -> dict[str, Any]:  # pyright: ig
         ndjson_content = json.dumps(compile_result['data'])
         logger.debug(f'Generated NDJSON content: {len(ndjson_content)} bytes')
 
+        # The Kibana client is imported by the warm-up, not when the server starts, as it is slow to import
+        await warm_start.ready('kibana_client')
+        from dashboard_compiler.kibana_client import KibanaClient
+
         # Create Kibana client
         logger.info(f'Uploading dashboard to Kibana at {kibana_url}')
         client = KibanaClient(
@@ -0,0 +1,256 @@
+"""Validation of dashboard YAML documents with source positions, for LSP diagnostics.
+
+A document is parsed once into a YAML node tree, which serves both as the source of the
+data to validate and as an index of the line and column of every key and item. Pydantic
+error locations are mapped back onto that tree, so every problem can be shown where it is.
+
+Dashboards are validated one at a time and the results are kept for the next parse of the
+same document. After an edit, only the dashboards whose content changed are validated again.
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from typing import Any
+
+import yaml
+from lsprotocol import types
+from pydantic import ValidationError
+from server_stats import PhaseTimings
+from yaml_nodes import YamlLoader
+
+from dashboard_compiler.dashboard.config import Dashboard
+from dashboard_compiler.loader import DashboardConfig
+
+type Loc = tuple[str | int, ...]
+
+
+@dataclass(frozen=True)
+class Issue:
+    """A validation problem and where it is in the document."""
+
+    loc: Loc
+    """Path of the problem in the document data, e.g. ('dashboards', 0, 'panels', 2, 'grid')."""
+
+    message: str
+    """Description of the problem."""
+
+    range: types.Range
+    """Source range the problem is reported at."""
+
+
+@dataclass
+class ParsedDocument:
+    """The result of parsing and validating a document."""
+
+    dashboards: list[Dashboard] = field(default_factory=list)
+    """The valid dashboards. Empty if the document has any issue."""
+
+    issues: list[Issue] = field(default_factory=list)
+    """Problems found in the document, in document order."""
+
+    def error(self) -> ValueError | None:
+        """Summarize the issues as a single error, or None if the document is valid."""
+        if len(self.issues) == 0:
+            return None
+        lines = [f'{_format_loc(issue.loc)} (line {issue.range.start.line + 1}): {issue.message}' for issue in self.issues]
+        return ValueError(f'{len(self.issues)} validation error(s)\n' + '\n'.join(lines))
+
+
+class YamlPositions:
+    """Maps paths into the document data onto the source ranges of the YAML nodes."""
+
+    _root: yaml.Node
+
+    def __init__(self, root: yaml.Node) -> None:
+        """Index a composed YAML document.
+
+        Args:
+            root: Root node of the document
+        """
+        self._root = root
+
+    def range_of(self, loc: Loc) -> types.Range:
+        """Find the source range of the deepest node a pydantic error location points to.
+
+        Error locations contain union member tags in addition to keys and indexes. Elements
+        that do not match the document are skipped, preferring the path that matches the most.
+
+        Args:
+            loc: Pydantic error location
+
+        Returns:
+            The range of the matching key, also covering the value for scalar values, or the start of a sequence item
+        """
+        _, key, value = _deepest(self._root, None, loc, 0)
+        if key is None:
+            return _point(value)
+        if isinstance(value, yaml.ScalarNode):
+            return types.Range(start=_position(key.start_mark), end=_position(value.end_mark))
+        return types.Range(start=_position(key.start_mark), end=_position(key.end_mark))
+
+
+@dataclass
+class DocumentParser:
+    """Parses and validates successive versions of one document, reusing unchanged dashboards."""
+
+    validated: int = 0
+    """Number of dashboards validated, as opposed to reused from the previous version."""
+
+    timings: PhaseTimings = field(default_factory=PhaseTimings)
+    """Where the time spent loading and validating documents is added up."""
+
+    _dashboards: dict[str, Dashboard | list[tuple[Loc, str]]] = field(default_factory=dict)
+
+    def parse(self, content: str | bytes) -> ParsedDocument:
+        """Parse and validate a version of the document.
+
+        Args:
+            content: The document content
+
+        Returns:
+            The valid dashboards, or the issues found
+        """
+        try:
+            with self.timings.measure('load'):
+                root, data = _compose(content)
+        except yaml.MarkedYAMLError as e:
+            mark = e.problem_mark if e.problem_mark is not None else e.context_mark
+            position = _position(mark) if mark is not None else types.Position(line=0, character=0)
+            return ParsedDocument(issues=[Issue(loc=(), message=str(e.problem or e), range=types.Range(start=position, end=position))])
+
+        if root is None:
+            return ParsedDocument(issues=[Issue(loc=(), message='Document is empty', range=_empty_range())])
+
+        positions = YamlPositions(root)
+        items: object = data.get('dashboards') if isinstance(data, dict) else None  # pyright: ignore[reportUnknownMemberType]
+        with self.timings.measure('validate'):
+            if not isinstance(items, list):
+                return self._parse_whole(data, positions)
+
+            dashboards: list[Dashboard] = []
+            problems: list[tuple[Loc, str]] = []
+            results: dict[str, Dashboard | list[tuple[Loc, str]]] = {}
+            for index, item in enumerate(items):  # pyright: ignore[reportUnknownArgumentType, reportUnknownVariableType]
+                content_hash = _hash(item)
+                result = self._dashboards.get(content_hash)
+                if result is None:
+                    result = _validate_dashboard(item)
+                    self.validated += 1
+                results[content_hash] = result
+                if isinstance(result, Dashboard):
+                    dashboards.append(result)
+                else:
+                    problems.extend((('dashboards', index, *loc), message) for loc, message in result)
+            self._dashboards = results
+
+            issues = _issues(problems, positions)
+            return ParsedDocument(dashboards=dashboards if len(issues) == 0 else [], issues=issues)
+
+    def _parse_whole(self, data: object, positions: YamlPositions) -> ParsedDocument:
+        """Validate a document without a list of dashboards at its root."""
+        self._dashboards = {}
+        try:
+            return ParsedDocument(dashboards=DashboardConfig.model_validate(data).dashboards)
+        except ValidationError as e:
+            return ParsedDocument(issues=_issues([(tuple(error['loc']), error['msg']) for error in e.errors()], positions))
+
+
+def to_diagnostics(issues: list[Issue]) -> list[types.Diagnostic]:
+    """Convert issues into LSP diagnostics.
+
+    Args:
+        issues: Issues of a document
+
+    Returns:
+        One error diagnostic per issue
+    """
+    return [
+        types.Diagnostic(
+            range=issue.range,
+            message=issue.message,
+            severity=types.DiagnosticSeverity.Error,
+            source='dashboard-compiler',
+            code=_format_loc(issue.loc) if len(issue.loc) > 0 else None,
+        )
+        for issue in issues
+    ]
+
+
+def _compose(content: str | bytes) -> tuple[yaml.Node | None, Any]:  # pyright: ignore[reportExplicitAny]
+    """Parse a document once into its node tree and the data built from it."""
+    loader = YamlLoader(content)
+    try:
+        root = loader.get_single_node()
+        data: Any = loader.construct_document(root) if root is not None else None  # pyright: ignore[reportExplicitAny]
+    finally:
+        loader.dispose()
+    return root, data
+
+
+def _validate_dashboard(item: object) -> Dashboard | list[tuple[Loc, str]]:
+    try:
+        return Dashboard.model_validate(item)
+    except ValidationError as e:
+        return [(tuple(error['loc']), error['msg']) for error in e.errors()]
+
+
+def _issues(problems: list[tuple[Loc, str]], positions: YamlPositions) -> list[Issue]:
+    """Locate problems in the document, dropping the duplicates reported for several union members."""
+    issues: dict[tuple[int, int, int, int, str], Issue] = {}
+    for loc, message in problems:
+        source_range = positions.range_of(loc)
+        key = (source_range.start.line, source_range.start.character, source_range.end.line, source_range.end.character, message)
+        _ = issues.setdefault(key, Issue(loc=loc, message=message, range=source_range))
+    return sorted(issues.values(), key=lambda issue: (issue.range.start.line, issue.range.start.character))
+
+
+def _deepest(node: yaml.Node, key: yaml.Node | None, loc: Loc, start: int) -> tuple[int, yaml.Node | None, yaml.Node]:
+    """Find the deepest node reachable by following a subsequence of the location.
+
+    Returns:
+        The number of elements followed, and the key and value node reached
+    """
+    if start >= len(loc):
+        return 0, key, node
+
+    best = _deepest(node, key, loc, start + 1)
+    child = _child(node, loc[start])
+    if child is not None:
+        depth, child_key, child_value = _deepest(child[1], child[0], loc, start + 1)
+        if depth + 1 > best[0]:
+            best = depth + 1, child_key, child_value
+    return best
+
+
+def _child(node: yaml.Node, element: str | int) -> tuple[yaml.Node | None, yaml.Node] | None:
+    """Get the key and value node of a mapping entry, or the node of a sequence item without a key."""
+    if isinstance(node, yaml.MappingNode) and isinstance(element, str):
+        for key_node, value_node in node.value:  # pyright: ignore[reportAny]
+            if isinstance(key_node, yaml.ScalarNode) and key_node.value == element:
+                return key_node, value_node  # pyright: ignore[reportUnknownVariableType]
+    if isinstance(node, yaml.SequenceNode) and isinstance(element, int) and 0 <= element < len(node.value):  # pyright: ignore[reportAny]
+        item: yaml.Node = node.value[element]  # pyright: ignore[reportAny]
+        return None, item
+    return None
+
+
+def _hash(value: object) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def _format_loc(loc: Loc) -> str:
+    return '.'.join(str(element) for element in loc)
+
+
+def _position(mark: yaml.Mark) -> types.Position:
+    return types.Position(line=mark.line, character=mark.column)
+
+
+def _point(node: yaml.Node) -> types.Range:
+    position = _position(node.start_mark)
+    return types.Range(start=position, end=position)
+
+
+def _empty_range() -> types.Range:
+    return types.Range(start=types.Position(line=0, character=0), end=types.Position(line=0, character=0))
@@ -0,0 +1,197 @@
+"""Per-document cache of parsed and compiled dashboards for the LSP compile server.
+
+The extension often sends several requests for the same file back-to-back (compile,
+getDashboards, getGridLayout). The cache keeps the validated dashboards and compiled
+results of each document, keyed by a hash of its content, so only the first request
+after a change pays for parsing and compiling.
+
+Documents are read through a callable, so that the server can serve the in-memory
+text of documents open in the editor instead of reading them from disk.
+
+The cache is shared by the server's compile worker threads. Its bookkeeping is guarded
+by a lock, while parsing and compiling run outside of it, so a slow document does not
+hold up requests for other documents.
+
+Each document keeps a parser across versions, so that after an edit only the dashboards
+that changed are validated again. Closing a document drops it from the cache.
+
+The time spent loading, validating, compiling and serializing documents is added up in
+the cache's phase timings.
+"""
+
+import hashlib
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from diagnostics import DocumentParser, Issue
+from server_stats import PhaseTimings
+
+from dashboard_compiler.dashboard.config import Dashboard
+from dashboard_compiler.dashboard_compiler import render
+
+
+@dataclass
+class _CacheEntry:
+    """Cached state of a single document version."""
+
+    content_hash: str
+    dashboards: list[Dashboard] | None = None
+    error: Exception | None = None
+    issues: list[Issue] = field(default_factory=list)
+    compiled: dict[int, dict[str, Any]] = field(default_factory=dict)
+
+
+@dataclass
+class DocumentCache:
+    """Cache of validated dashboards and compiled results, one entry per document."""
+
+    hits: int = 0
+    """Number of requests answered from the cache."""
+
+    misses: int = 0
+    """Number of requests that had to parse or compile a document."""
+
+    read_document: Callable[[str], str | bytes] = field(default=lambda path: Path(path).read_bytes())
+    """Returns the current content of a document, given its normalized path."""
+
+    timings: PhaseTimings = field(default_factory=PhaseTimings)
+    """Time spent in each phase of handling documents."""
+
+    _entries: dict[str, _CacheEntry] = field(default_factory=dict)
+    _parsers: dict[str, DocumentParser] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def dashboards(self, path: str) -> list[Dashboard]:
+        """Get the validated dashboards of a YAML file, parsing it only if its content changed.
+
+        Args:
+            path: Path to the YAML file
+
+        Returns:
+            The dashboards defined in the file
+
+        Raises:
+            OSError: If the file cannot be read
+            Exception: The parse or validation error of the file, raised again for as long as the content is unchanged
+        """
+        entry, reused = self._entry(path)
+        self._count(hit=reused)
+        return _dashboards(entry)
+
+    def compiled(self, path: str, dashboard_index: int) -> dict[str, Any]:
+        """Get the compiled Kibana JSON of one dashboard, compiling it only if the file changed.
+
+        Args:
+            path: Path to the YAML file
+            dashboard_index: Index of the dashboard in the file, must be in range
+
+        Returns:
+            The compiled dashboard as a JSON-compatible dict, shared between callers and not to be modified
+        """
+        entry, _ = self._entry(path)
+        result = entry.compiled.get(dashboard_index)
+        self._count(hit=result is not None)
+        if result is None:
+            dashboard = _dashboards(entry)[dashboard_index]
+            with self.timings.measure('compile'):
+                rendered = render(dashboard)
+            with self.timings.measure('serialize'):
+                result = rendered.model_dump(by_alias=True, mode='json')
+            entry.compiled[dashboard_index] = result
+        return result
+
+    def issues(self, path: str) -> list[Issue]:
+        """Get the validation issues of a YAML file, with their source ranges.
+
+        Args:
+            path: Path to the YAML file
+
+        Returns:
+            The issues, empty if the file is valid
+
+        Raises:
+            OSError: If the file cannot be read
+        """
+        entry, reused = self._entry(path)
+        self._count(hit=reused)
+        return entry.issues
+
+    def close(self, path: str) -> None:
+        """Drop everything kept for a document, including its parser.
+
+        Args:
+            path: Path to the YAML file
+        """
+        key = normalize_path(path)
+        with self._lock:
+            _ = self._entries.pop(key, None)
+            _ = self._parsers.pop(key, None)
+
+    def invalidate(self, path: str) -> None:
+        """Drop the cached state of a document, e.g. when it was changed or saved.
+
+        Args:
+            path: Path to the YAML file
+        """
+        with self._lock:
+            _ = self._entries.pop(normalize_path(path), None)
+
+    def stats(self) -> dict[str, int]:
+        """Get the cache counters.
+
+        Returns:
+            Dictionary with the number of hits, misses and cached documents
+        """
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'documents': len(self._entries)}
+
+    def _count(self, *, hit: bool) -> None:
+        with self._lock:
+            if hit is True:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _entry(self, path: str) -> tuple[_CacheEntry, bool]:
+        """Get the entry of a document, replacing it if the document content changed.
+
+        Returns:
+            The entry, and whether it was reused from an earlier request
+        """
+        key = normalize_path(path)
+        with self.timings.measure('load'):
+            content = self.read_document(key)
+            content_hash = hashlib.sha256(content.encode('utf-8') if isinstance(content, str) else content).hexdigest()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            parser = self._parsers.setdefault(key, DocumentParser(timings=self.timings))
+        if entry is not None and entry.content_hash == content_hash:
+            return entry, True
+
+        entry = _CacheEntry(content_hash=content_hash)
+        try:
+            parsed = parser.parse(content)
+            entry.dashboards = parsed.dashboards
+            entry.issues = parsed.issues
+            entry.error = parsed.error()
+        except Exception as e:
+            entry.error = e
+        with self._lock:
+            self._entries[key] = entry
+        return entry, False
+
+
+def _dashboards(entry: _CacheEntry) -> list[Dashboard]:
+    """Get the dashboards of an entry, raising its parse error if parsing failed."""
+    if entry.error is not None:
+        raise entry.error
+    return entry.dashboards if entry.dashboards is not None else []
+
+
+def normalize_path(path: str) -> str:
+    """Normalize a path so that different spellings of the same file share an entry."""
+    return str(Path(path).resolve())
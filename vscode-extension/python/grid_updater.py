@@ -1,15 +1,26 @@
 #!/usr/bin/env python3
 """Update panel grid coordinates in a YAML dashboard file.
 
-This script updates the grid coordinates for a specific panel in a YAML dashboard file,
-preserving the file's formatting and comments as much as possible.
+This script updates the grid coordinates of panels in a YAML dashboard file, preserving
+the file's formatting and comments. The file is parsed once into a YAML node tree, which
+gives the exact position of every panel's grid values. A batch of changes is applied in a
+single pass by replacing only those values, and the file is written once, atomically.
 """
 
 import json
+import os
 import re
 import sys
+import tempfile
+from collections.abc import Mapping
 from pathlib import Path
 
+import yaml
+from yaml_nodes import YamlLoader, mapping_value
+
+# Accepted keys of each grid coordinate, the short name first
+_GRID_KEYS = {'x': ('x', 'from_left'), 'y': ('y', 'from_top'), 'w': ('w', 'width'), 'h': ('h', 'height')}
+
 
 def _validate_panel_id(panel_id: str) -> bool:
     """Validate that panel_id contains only safe characters.
@@ -39,7 +50,7 @@ def _validate_grid_coords(grid: dict) -> bool:
     return all(isinstance(grid[key], int) and grid[key] >= 0 for key in required_keys)
 
 
-def update_panel_grid(yaml_path: str, panel_id: str, new_grid: dict, dashboard_index: int = 0) -> dict:  # noqa: PLR0912, PLR0915
+def update_panel_grid(yaml_path: str, panel_id: str, new_grid: dict, dashboard_index: int = 0) -> dict:
     """Update grid coordinates for a specific panel in a YAML file.
 
     Args:
@@ -51,91 +62,145 @@ def update_panel_grid(yaml_path: str, panel_id: str, new_grid: dict, dashboard_i
     Returns:
         Dictionary with success status and message
     """
-    if not _validate_panel_id(panel_id):
-        return {'success': False, 'error': f'Invalid panel ID: {panel_id}. Only alphanumeric, underscore, and hyphen allowed.'}
+    result = update_panel_grids(yaml_path, {panel_id: new_grid}, dashboard_index)
+    if result['success'] is True:
+        return {'success': True, 'message': f'Updated grid for {panel_id}'}
+    return result
 
-    if not _validate_grid_coords(new_grid):
-        return {'success': False, 'error': f'Invalid grid coordinates: {new_grid}'}
 
-    yaml_file = Path(yaml_path)
-    if not yaml_file.exists():
-        return {'success': False, 'error': f'File not found: {yaml_path}'}
-
-    content = yaml_file.read_text()
+def update_panel_grids(yaml_path: str, updates: Mapping[str, dict], dashboard_index: int = 0) -> dict:
+    """Update the grid coordinates of several panels in a YAML file with a single write.
 
-    if 'dashboards:' in content:
-        dashboard_pattern = r'^dashboards:\s*$'
-        dashboards_match = re.search(dashboard_pattern, content, re.MULTILINE)
-        if dashboards_match is None:
-            return {'success': False, 'error': 'Could not find dashboards section'}
+    Either all updates are applied or, if any of them is invalid, none.
 
-        dashboard_starts = list(re.finditer(r'^- (?:title:|name:|panels:)', content[dashboards_match.end() :], re.MULTILINE))
-        if dashboard_index >= len(dashboard_starts):
-            return {'success': False, 'error': f'Dashboard index {dashboard_index} out of range (0-{len(dashboard_starts) - 1})'}
+    Args:
+        yaml_path: Path to the YAML dashboard file
+        updates: New grid coordinates with keys x, y, w and h, by panel ID
+        dashboard_index: Index of the dashboard to update (default: 0)
 
-        dashboard_start = dashboards_match.end() + dashboard_starts[dashboard_index].start()
-        if dashboard_index + 1 < len(dashboard_starts):
-            dashboard_end = dashboards_match.end() + dashboard_starts[dashboard_index + 1].start()
-        else:
-            dashboard_end = len(content)
+    Returns:
+        Dictionary with success status and message
+    """
+    for panel_id, new_grid in updates.items():
+        if not _validate_panel_id(panel_id):
+            return {'success': False, 'error': f'Invalid panel ID: {panel_id}. Only alphanumeric, underscore, and hyphen allowed.'}
+        if not _validate_grid_coords(new_grid):
+            return {'success': False, 'error': f'Invalid grid coordinates: {new_grid}'}
 
-        search_content = content[dashboard_start:dashboard_end]
-        content_offset = dashboard_start
-    else:
-        search_content = content
-        content_offset = 0
+    yaml_file = Path(yaml_path)
+    if not yaml_file.exists():
+        return {'success': False, 'error': f'File not found: {yaml_path}'}
 
-    if panel_id.startswith('panel_'):
-        try:
-            panel_index = int(panel_id.split('_')[1])
-            panel_blocks = list(re.finditer(r'^\s*- (?:title:|id:|type:|grid:)', search_content, re.MULTILINE))
-            if panel_index < len(panel_blocks):
-                panel_start = panel_blocks[panel_index].start()
-                panel_end = panel_blocks[panel_index + 1].start() if panel_index + 1 < len(panel_blocks) else len(search_content)
-                panel_content = search_content[panel_start:panel_end]
-
-                new_grid_str = f'grid: {{ x: {new_grid["x"]}, y: {new_grid["y"]}, w: {new_grid["w"]}, h: {new_grid["h"]} }}'
-
-                inline_pattern = r'grid:\s*\{[^}]+\}'
-                multiline_pattern = r'grid:\s*\n\s+x:.*?\n\s+h:.*?(?=\n\s+\w+:|\n[^\s]|$)'
-
-                updated_panel = re.sub(inline_pattern, new_grid_str, panel_content, count=1)
-                if updated_panel == panel_content:
-                    updated_panel = re.sub(multiline_pattern, new_grid_str, panel_content, count=1, flags=re.DOTALL)
-
-                abs_panel_start = content_offset + panel_start
-                abs_panel_end = content_offset + panel_end
-                updated_content = content[:abs_panel_start] + updated_panel + content[abs_panel_end:]
-                yaml_file.write_text(updated_content)
-                return {'success': True, 'message': f'Updated grid for {panel_id}'}
-        except (ValueError, IndexError) as e:
-            return {'success': False, 'error': f'Invalid panel ID format: {e}'}
-    else:
-        id_pattern = rf'id:\s+{re.escape(panel_id)}'
-        id_match = re.search(id_pattern, search_content)
-        if id_match is None:
-            return {'success': False, 'error': f'Panel with ID {panel_id} not found'}
+    try:
+        updated_content = rewrite_grids(yaml_file.read_text(), updates, dashboard_index)
+    except (ValueError, yaml.YAMLError) as e:
+        return {'success': False, 'error': str(e)}
 
-        panel_markers = list(re.finditer(r'\n\s*- (?:title:|id:|type:|grid:)', search_content[: id_match.start()]))
-        panel_start = panel_markers[-1].start() if panel_markers else 0
+    _write_atomically(yaml_file, updated_content)
+    return {'success': True, 'message': f'Updated grid for {len(updates)} panel(s)'}
 
-        next_panel_match = re.search(r'\n\s*- (?:title:|id:|type:|grid:)', search_content[id_match.end() :])
-        panel_end = id_match.end() + next_panel_match.start() if next_panel_match else len(search_content)
 
-        panel_content = search_content[panel_start:panel_end]
+def rewrite_grids(content: str, updates: Mapping[str, Mapping[str, int]], dashboard_index: int = 0) -> str:
+    """Replace the grid coordinates of panels in YAML content, leaving everything else untouched.
 
-        new_grid_str = f'grid: {{ x: {new_grid["x"]}, y: {new_grid["y"]}, w: {new_grid["w"]}, h: {new_grid["h"]} }}'
+    Panels are identified by their `id`, or as `panel_<index>` if they have none. The dashboard
+    is the item at `dashboard_index` of a root `dashboards` list, or else a root `dashboard` mapping.
 
-        inline_pattern = r'grid:\s*\{[^}]+\}'
-        updated_panel = re.sub(inline_pattern, new_grid_str, panel_content, count=1)
+    Args:
+        content: The YAML content
+        updates: New grid coordinates with keys x, y, w and h, by panel ID
+        dashboard_index: Index of the dashboard to update (default: 0)
 
-        abs_panel_start = content_offset + panel_start
-        abs_panel_end = content_offset + panel_end
-        updated_content = content[:abs_panel_start] + updated_panel + content[abs_panel_end:]
-        yaml_file.write_text(updated_content)
-        return {'success': True, 'message': f'Updated grid for panel {panel_id}'}
+    Returns:
+        The updated content
 
-    return {'success': False, 'error': 'Failed to update grid'}
+    Raises:
+        ValueError: If the dashboard, a panel or its grid cannot be found
+        yaml.YAMLError: If the content is not valid YAML
+    """
+    grids = _index_grids(content, dashboard_index)
+
+    edits: list[tuple[int, int, str]] = []
+    for panel_id, new_grid in updates.items():
+        if panel_id not in grids:
+            msg = f'Panel with ID {panel_id} not found'
+            raise ValueError(msg)
+        grid_node = grids[panel_id]
+        if grid_node is None:
+            msg = f'Panel {panel_id} has no grid'
+            raise ValueError(msg)
+        edits.extend(_grid_edits(panel_id, grid_node, new_grid))
+
+    pieces: list[str] = []
+    position = 0
+    for start, end, text in sorted(edits):
+        pieces.extend((content[position:start], text))
+        position = end
+    pieces.append(content[position:])
+    return ''.join(pieces)
+
+
+def _index_grids(content: str, dashboard_index: int) -> dict[str, yaml.Node | None]:
+    """Parse the content once and find the grid node of every panel of a dashboard, by panel ID."""
+    loader = YamlLoader(content)
+    try:
+        root = loader.get_single_node()
+    finally:
+        loader.dispose()
+
+    dashboards = mapping_value(root, 'dashboards')
+    if isinstance(dashboards, yaml.SequenceNode):
+        items: list[yaml.Node] = dashboards.value
+        if dashboard_index < 0 or dashboard_index >= len(items):
+            msg = f'Dashboard index {dashboard_index} out of range (0-{len(items) - 1})'
+            raise ValueError(msg)
+        dashboard = items[dashboard_index]
+    else:
+        dashboard = mapping_value(root, 'dashboard') or root
+
+    panels = mapping_value(dashboard, 'panels')
+    if not isinstance(panels, yaml.SequenceNode):
+        msg = 'Could not find the panels of the dashboard'
+        raise ValueError(msg)  # noqa: TRY004
+
+    grids: dict[str, yaml.Node | None] = {}
+    for index, panel in enumerate(panels.value):
+        id_node = mapping_value(panel, 'id')
+        panel_id = id_node.value if isinstance(id_node, yaml.ScalarNode) else f'panel_{index}'
+        grids[panel_id] = mapping_value(panel, 'grid')
+    return grids
+
+
+def _grid_edits(panel_id: str, grid_node: yaml.Node, new_grid: Mapping[str, int]) -> list[tuple[int, int, str]]:
+    """Get the replacements that set the coordinates of a grid, as start index, end index and text."""
+    value_nodes = {coordinate: mapping_value(grid_node, *keys) for coordinate, keys in _GRID_KEYS.items()}
+    if all(isinstance(node, yaml.ScalarNode) for node in value_nodes.values()):
+        return [
+            (node.start_mark.index, node.end_mark.index, str(new_grid[coordinate]))
+            for coordinate, node in value_nodes.items()
+            if node is not None
+        ]
+
+    if isinstance(grid_node, yaml.MappingNode) and grid_node.flow_style is True:
+        text = f'{{ x: {new_grid["x"]}, y: {new_grid["y"]}, w: {new_grid["w"]}, h: {new_grid["h"]} }}'
+        return [(grid_node.start_mark.index, grid_node.end_mark.index, text)]
+
+    msg = f'Grid of panel {panel_id} must set x, y, w and h'
+    raise ValueError(msg)
+
+
+def _write_atomically(path: Path, content: str) -> None:
+    """Write a file through a temporary file in the same directory, so readers never see a partial write."""
+    file_descriptor, temp_name = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+    temp_path = Path(temp_name)
+    try:
+        with os.fdopen(file_descriptor, 'w') as temp_file:
+            temp_file.write(content)
+        temp_path.chmod(path.stat().st_mode & 0o777)
+        _ = temp_path.replace(path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
 
 
 if __name__ == '__main__':
@@ -0,0 +1,117 @@
+"""Delta updates of compiled dashboards for the preview panel.
+
+A compiled dashboard keeps its panels as a JSON string in `attributes.panelsJSON`, which
+for large dashboards is most of the payload. The server remembers the last payload sent
+for each previewed dashboard, split into the dashboard without its panels and the panels
+by their `panelIndex`. The next payload only carries the panels that changed or were
+removed, and the rest of the dashboard only if it changed.
+
+Each payload has a version. A client that asks for a delta passes the version it has,
+and gets the whole dashboard again instead if that is not the version the server sent
+last, e.g. after a lost or cancelled response.
+"""
+
+import json
+import threading
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass(frozen=True)
+class _Snapshot:
+    """The last payload sent for a dashboard."""
+
+    version: int
+    dashboard: dict[str, Any]
+    panels: dict[str, Any]
+    order: list[str]
+
+
+@dataclass
+class PreviewDeltas:
+    """Computes preview payloads as deltas against the last payload sent for each dashboard."""
+
+    _snapshots: dict[tuple[str, int], _Snapshot] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def delta(self, path: str, dashboard_index: int, compiled: dict[str, Any], client_version: int | None) -> dict[str, Any]:
+        """Get the payload that brings a client from its version to the compiled dashboard.
+
+        Args:
+            path: Normalized path of the YAML file
+            dashboard_index: Index of the dashboard in the file
+            compiled: The compiled dashboard
+            client_version: Version of the payload the client has, or None if it has none
+
+        Returns:
+            Dictionary with the new version, the base_version it applies to (None for a whole
+            dashboard), the dashboard without its panels if it changed, the panel order if it
+            changed, the changed panels by ID as upsert and the IDs of removed panels as remove
+        """
+        dashboard, panels, order = split_panels(compiled)
+        key = (path, dashboard_index)
+        with self._lock:
+            previous = self._snapshots.get(key)
+            version = previous.version + 1 if previous is not None else 1
+            self._snapshots[key] = _Snapshot(version=version, dashboard=dashboard, panels=panels, order=order)
+
+        if previous is None or client_version is None or previous.version != client_version:
+            return {'version': version, 'base_version': None, 'dashboard': dashboard, 'order': order, 'upsert': panels, 'remove': []}
+
+        result: dict[str, Any] = {
+            'version': version,
+            'base_version': previous.version,
+            'upsert': {panel_id: panel for panel_id, panel in panels.items() if previous.panels.get(panel_id) != panel},  # pyright: ignore[reportAny]
+            'remove': [panel_id for panel_id in previous.order if panel_id not in panels],
+        }
+        if dashboard != previous.dashboard:
+            result['dashboard'] = dashboard
+        if order != previous.order:
+            result['order'] = order
+        return result
+
+    def forget(self, path: str) -> None:
+        """Drop the payloads remembered for all dashboards of a file.
+
+        Args:
+            path: Normalized path of the YAML file
+        """
+        with self._lock:
+            for key in [key for key in self._snapshots if key[0] == path]:
+                del self._snapshots[key]
+
+
+def split_panels(compiled: dict[str, Any]) -> tuple[dict[str, Any], dict[str, Any], list[str]]:
+    """Split a compiled dashboard into the dashboard without `attributes.panelsJSON` and its panels.
+
+    Dashboards whose panels cannot be told apart by `panelIndex` are not split.
+
+    Args:
+        compiled: The compiled dashboard
+
+    Returns:
+        The dashboard without its panels, the panels by ID and the panel IDs in order
+    """
+    attributes: object = compiled.get('attributes')
+    if not isinstance(attributes, dict):
+        return compiled, {}, []
+    panels_json: object = attributes.get('panelsJSON')  # pyright: ignore[reportUnknownMemberType]
+    if not isinstance(panels_json, str):
+        return compiled, {}, []
+
+    try:
+        panel_list: object = json.loads(panels_json)
+    except json.JSONDecodeError:
+        return compiled, {}, []
+    if not isinstance(panel_list, list):
+        return compiled, {}, []
+
+    panels: dict[str, Any] = {}
+    for panel in panel_list:  # pyright: ignore[reportUnknownVariableType]
+        panel_id: object = panel.get('panelIndex') if isinstance(panel, dict) else None  # pyright: ignore[reportUnknownMemberType]
+        if not isinstance(panel_id, str) or panel_id in panels:
+            return compiled, {}, []
+        panels[panel_id] = panel
+
+    dashboard_attributes = {name: value for name, value in attributes.items() if name != 'panelsJSON'}  # pyright: ignore[reportUnknownVariableType]
+    return {**compiled, 'attributes': dashboard_attributes}, panels, list(panels)
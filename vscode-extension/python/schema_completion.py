@@ -0,0 +1,451 @@
+"""Completion and hover of dashboard YAML keys, from the JSON schema of the configuration models.
+
+The schema carries the attribute docstrings of the models as descriptions, and marks
+unions such as the panel types and the chart `type` values. It is turned once into a
+graph of nodes, one per YAML position, where each node knows the keys that are valid
+there and the node of each key's value. Unions are kept as several variants of a node,
+and the keys and scalar values already present in the mapping select among them.
+
+A request only finds the path of mappings from the document root to the cursor, by
+indentation, and follows it through the graph. This works on documents that are being
+typed and are not valid YAML, and never walks the models or the schema again.
+"""
+
+import functools
+import itertools
+import re
+from dataclasses import dataclass, field
+from typing import Any
+
+from lsprotocol import types
+
+from dashboard_compiler.schema import dashboard_schema
+
+# Key of a block mapping entry, with the value that follows it on the same line
+_ENTRY = re.compile(r'(?P<key>[\w.-]+)[ \t]*:(?:[ \t]+(?P<value>.*))?$')
+_KEY_PREFIX = re.compile(r'[\w.-]*')
+_VALUE_PREFIX = re.compile(r'(?P<key>[\w.-]+)[ \t]*:[ \t]+(?P<value>[\w.*-]*)')
+
+
+@dataclass(frozen=True)
+class KeyInfo:
+    """A key that is valid in a mapping."""
+
+    description: str | None
+    """Description of the key, from the attribute docstring of the model."""
+
+    node: 'SchemaNode'
+    """What the key's value may be."""
+
+
+@dataclass(frozen=True)
+class ObjectVariant:
+    """One of the mappings that are valid at a position."""
+
+    keys: dict[str, KeyInfo]
+    """The valid keys, in the order of the model."""
+
+    constants: dict[str, str]
+    """Keys that must have a single value, e.g. the chart `type`, which tell variants apart."""
+
+
+@dataclass(eq=False)
+class SchemaNode:
+    """What is valid at a position: mappings, sequences and scalar values."""
+
+    variants: list[ObjectVariant] = field(default_factory=list)
+    """The mappings that are valid at this position."""
+
+    values: list[str] = field(default_factory=list)
+    """The scalar values that are valid at this position, if they are a fixed set."""
+
+    items: 'SchemaNode | None' = None
+    """What the items are, if a sequence is valid at this position."""
+
+    _members: list['SchemaNode'] = field(default_factory=list)
+    _item_members: list['SchemaNode'] = field(default_factory=list)
+
+    def select(self, present: dict[str, str | None]) -> list[ObjectVariant]:
+        """Get the variants that agree with the keys and scalar values present in a mapping.
+
+        Args:
+            present: The keys of the mapping, with their scalar values
+
+        Returns:
+            The variants that have all present keys and whose constants match, or all variants if none does
+        """
+        matching = [
+            variant
+            for variant in self.variants
+            if all(key in variant.keys for key in present)
+            and all(present.get(key) in (None, value) for key, value in variant.constants.items() if key in present)
+        ]
+        return matching if len(matching) > 0 else self.variants
+
+    def key(self, name: str, present: dict[str, str | None]) -> KeyInfo | None:
+        """Get a key of the variants that agree with a mapping.
+
+        Args:
+            name: The key
+            present: The keys of the mapping, with their scalar values
+
+        Returns:
+            The key, or None if it is not valid in the mapping
+        """
+        return next((variant.keys[name] for variant in self.select(present) if name in variant.keys), None)
+
+
+class SchemaCompleter:
+    """Completes and describes the keys and values of dashboard YAML documents."""
+
+    root: SchemaNode
+    """What is valid at the root of a document."""
+
+    _definitions: dict[str, Any]
+    _nodes: dict[str, SchemaNode]
+
+    def __init__(self, schema: dict[str, Any]) -> None:
+        """Turn a JSON schema into the graph of valid positions.
+
+        Args:
+            schema: JSON schema of the document root
+        """
+        self._definitions = schema.get('$defs', {})
+        self._nodes = {}
+        self.root = self._build(schema)
+        _resolve_all(self.root)
+
+    def complete(self, lines: list[str], line: int, character: int) -> list[types.CompletionItem]:
+        """Get the keys or values that are valid at a position of a document.
+
+        Args:
+            lines: Lines of the document
+            line: Zero-based line of the cursor
+            character: Zero-based column of the cursor
+
+        Returns:
+            The valid keys that are not yet in the mapping, or the valid values of the key before the cursor
+        """
+        before = lines[line][:character] if line < len(lines) else ''
+        indent, rest = _split_indent(before)
+
+        value_match = _VALUE_PREFIX.fullmatch(rest)
+        if value_match is not None:
+            path = _path(lines, line, indent)
+            node = self._follow(path) if path is not None else None
+            if node is None:
+                return []
+            values = {
+                value: None
+                for variant in node.variants
+                if value_match['key'] in variant.keys
+                for value in variant.keys[value_match['key']].node.values
+            }
+            return [
+                types.CompletionItem(label=value, kind=types.CompletionItemKind.EnumMember, sort_text=f'{index:04}')
+                for index, value in enumerate(values)
+            ]
+
+        if _KEY_PREFIX.fullmatch(rest) is None:
+            return []
+        path = _path(lines, line, indent)
+        node = self._follow(path) if path is not None else None
+        if node is None or path is None:
+            return []
+        present = path[-1].present
+        keys = {name: info for variant in node.select(present) for name, info in variant.keys.items() if name not in present}
+        return [
+            types.CompletionItem(
+                label=name,
+                kind=types.CompletionItemKind.Property,
+                documentation=types.MarkupContent(kind=types.MarkupKind.Markdown, value=info.description)
+                if info.description is not None
+                else None,
+                insert_text=f'{name}: ',
+                sort_text=f'{index:04}',
+            )
+            for index, (name, info) in enumerate(keys.items())
+        ]
+
+    def hover(self, lines: list[str], line: int, character: int) -> types.Hover | None:
+        """Describe the key at a position of a document.
+
+        Args:
+            lines: Lines of the document
+            line: Zero-based line of the cursor
+            character: Zero-based column of the cursor
+
+        Returns:
+            The description of the key, or None if the position is not on a known key
+        """
+        if line >= len(lines):
+            return None
+        indent, rest = _split_indent(lines[line])
+        entry = _ENTRY.match(rest)
+        if entry is None or not indent <= character <= indent + len(entry['key']):
+            return None
+
+        path = _path(lines, line, indent)
+        node = self._follow(path) if path is not None else None
+        if node is None or path is None:
+            return None
+        info = node.key(entry['key'], path[-1].present)
+        if info is None or info.description is None:
+            return None
+        return types.Hover(
+            contents=types.MarkupContent(kind=types.MarkupKind.Markdown, value=f'**{entry["key"]}**\n\n{info.description}'),
+            range=types.Range(
+                start=types.Position(line=line, character=indent), end=types.Position(line=line, character=indent + len(entry['key']))
+            ),
+        )
+
+    def _follow(self, path: list['_Mapping']) -> SchemaNode | None:
+        """Follow the path of mappings from the root to the node of the innermost one."""
+        node = self.root
+        for parent, child in itertools.pairwise(path):
+            if child.key is None:
+                return None
+            info = node.key(child.key, parent.present if len(node.variants) > 1 else {})
+            if info is None:
+                return None
+            node = info.node
+            if child.is_item:
+                if node.items is None:
+                    return None
+                node = node.items
+        return node
+
+    def _build(self, schema: dict[str, Any]) -> SchemaNode:
+        """Get the node of a schema, building each definition only once."""
+        ref: str | None = schema.get('$ref')
+        if ref is not None:
+            name = ref.rsplit('/', 1)[-1]
+            node = self._nodes.get(name)
+            if node is None:
+                node = SchemaNode()
+                self._nodes[name] = node
+                self._fill(node, self._definitions.get(name, {}))
+            return node
+        node = SchemaNode()
+        self._fill(node, schema)
+        return node
+
+    def _fill(self, node: SchemaNode, schema: dict[str, Any]) -> None:
+        for union in ('anyOf', 'oneOf', 'allOf'):
+            node._members.extend(self._build(member) for member in schema.get(union, []))  # pyright: ignore[reportPrivateUsage]
+
+        types_: object = schema.get('type')
+        type_names = types_ if isinstance(types_, list) else [types_]
+        if 'const' in schema:
+            node.values.append(_scalar(schema['const']))
+        node.values.extend(_scalar(value) for value in schema.get('enum', []))
+        if 'boolean' in type_names and len(node.values) == 0:
+            node.values.extend(['true', 'false'])
+
+        if 'properties' in schema:
+            properties: dict[str, Any] = schema['properties']
+            node.variants.append(
+                ObjectVariant(
+                    keys={name: KeyInfo(description=prop.get('description'), node=self._build(prop)) for name, prop in properties.items()},
+                    constants={name: _scalar(prop['const']) for name, prop in properties.items() if 'const' in prop},
+                )
+            )
+        if 'items' in schema:
+            node._item_members.append(self._build(schema['items']))  # pyright: ignore[reportPrivateUsage]
+
+
+@dataclass
+class _Mapping:
+    """A block mapping on the path from the document root to the cursor."""
+
+    key: str | None
+    """The key whose value the mapping is, None for the root."""
+
+    is_item: bool
+    """Whether the mapping is an item of a sequence, which is the key's value."""
+
+    column: int
+    """Column of the mapping's keys."""
+
+    start: int
+    """Line where the mapping starts."""
+
+    lines: list[str] = field(repr=False)
+    skip: int
+    """Line whose key is left out of the present keys, the one at the cursor."""
+
+    @functools.cached_property
+    def present(self) -> dict[str, str | None]:
+        """The keys of the mapping, with their scalar values."""
+        return _present(self.lines, self.start, self.skip, self.column)
+
+
+@dataclass(frozen=True)
+class _Line:
+    indent: int
+    """Column of the first key of the line, after any sequence item markers."""
+
+    item: bool
+    """Whether a sequence item marker comes right before the key column."""
+
+    key: str | None
+    value: str | None
+
+
+def _path(lines: list[str], line: int, indent: int) -> list[_Mapping] | None:
+    """Find the block mappings from the document root to a key column of a line, by indentation.
+
+    Args:
+        lines: Lines of the document
+        line: Zero-based line
+        indent: Column of the key on the line
+
+    Returns:
+        The mappings, outermost first, or None if the position is not in a block mapping
+    """
+    cursor = _parse_line(lines[line]) if line < len(lines) else None
+    path = [
+        _Mapping(
+            key=None,
+            is_item=cursor is not None and cursor.item and cursor.indent == indent,
+            column=indent,
+            start=line,
+            lines=lines,
+            skip=line,
+        )
+    ]
+    for index in range(line - 1, -1, -1):
+        text = lines[index]
+        # Lines indented to the mapping's column or deeper cannot start it or its parent, nor
+        # can the item markers of other items once the mapping's own one is found
+        spaces = len(text) - len(text.lstrip(' '))
+        if spaces >= path[0].column or (path[0].is_item and spaces + 2 == path[0].column and text.startswith('- ', spaces)):
+            continue
+        parsed = _parse_line(text)
+        if parsed is None or parsed.indent > path[0].column:
+            continue
+        if parsed.indent == path[0].column:
+            if not path[0].is_item and parsed.item:
+                path[0].is_item = True
+                path[0].start = index
+            continue
+        if parsed.key is None:
+            return None
+        if not path[0].is_item:
+            path[0].start = index + 1
+        path[0].key = parsed.key
+        path.insert(0, _Mapping(key=None, is_item=parsed.item, column=parsed.indent, start=index, lines=lines, skip=line))
+
+    # The mapping left without a key is the root, which starts at the top of the document
+    if not path[0].is_item:
+        path[0].start = 0
+    return path
+
+
+def _present(lines: list[str], start: int, skip: int, column: int) -> dict[str, str | None]:
+    """Get the keys of the block mapping that starts at a line, except those of one line."""
+    present: dict[str, str | None] = {}
+    for index in range(start, len(lines)):
+        text = lines[index]
+        spaces = len(text) - len(text.lstrip(' '))
+        if spaces > column or (spaces == column and text.startswith('- ', spaces)):
+            continue
+        parsed = _parse_line(text)
+        if parsed is None or parsed.indent > column:
+            continue
+        if parsed.indent < column or (index > start and parsed.item):
+            break
+        if index != skip and parsed.key is not None:
+            present[parsed.key] = parsed.value
+    return present
+
+
+def _parse_line(text: str) -> _Line | None:
+    """Parse a line of a block mapping, or get None for blank lines, comments and document markers."""
+    indent, rest = _split_indent(text)
+    item = indent >= 2 and text[indent - 2 : indent] in ('- ', '-')
+    if len(rest.strip()) == 0 or rest.startswith(('#', '---', '...', '%')):
+        return _Line(indent=indent, item=True, key=None, value=None) if item and len(rest.strip()) == 0 else None
+    entry = _ENTRY.match(rest)
+    if entry is None:
+        return _Line(indent=indent, item=item, key=None, value=None)
+    value: str | None = entry['value']
+    if value is not None:
+        value = value.split(' #', 1)[0].strip().strip('\'"') or None
+    return _Line(indent=indent, item=item, key=entry['key'], value=value)
+
+
+def _split_indent(text: str) -> tuple[int, str]:
+    """Split a line into the column after its indentation and sequence item markers, and the rest."""
+    index = 0
+    while True:
+        while index < len(text) and text[index] == ' ':
+            index += 1
+        if text.startswith('- ', index) or text[index:] == '-':
+            index += 2
+            continue
+        return index, text[index:]
+
+
+def _scalar(value: object) -> str:
+    if isinstance(value, bool):
+        return 'true' if value is True else 'false'
+    return str(value)
+
+
+def _resolve_all(root: SchemaNode) -> None:
+    """Merge the members of unions into their nodes, so that requests never follow unions again."""
+    resolved: set[int] = set()
+    pending = [root]
+    while len(pending) > 0:
+        node = pending.pop()
+        if id(node) in resolved:
+            continue
+        resolved.add(id(node))
+        _merge_members(node)
+        pending.extend(info.node for variant in node.variants for info in variant.keys.values())
+        if node.items is not None:
+            pending.append(node.items)
+
+
+def _merge_members(node: SchemaNode) -> None:
+    """Merge the variants, values and item schemas of a node's union members into the node."""
+    members: list[SchemaNode] = []
+    seen: set[int] = {id(node)}
+    pending = list(node._members)  # pyright: ignore[reportPrivateUsage]
+    while len(pending) > 0:
+        member = pending.pop(0)
+        if id(member) in seen:
+            continue
+        seen.add(id(member))
+        members.append(member)
+        pending.extend(member._members)  # pyright: ignore[reportPrivateUsage]
+
+    item_members = list(node._item_members)  # pyright: ignore[reportPrivateUsage]
+    for member in members:
+        node.variants.extend(member.variants)
+        node.values.extend(value for value in member.values if value not in node.values)
+        item_members.extend(member._item_members)  # pyright: ignore[reportPrivateUsage]
+
+    if len(item_members) == 1:
+        node.items = item_members[0]
+    elif len(item_members) > 1:
+        node.items = SchemaNode(_members=item_members)
+
+
+@functools.cache
+def schema_completer() -> SchemaCompleter:
+    """Get the completer of dashboard documents, built from the dashboard schema on the first call."""
+    return SchemaCompleter(dashboard_schema())
+
+
+def is_dashboard_document(lines: list[str]) -> bool:
+    """Whether a YAML document has a root `dashboards` key, so that other YAML files get no completions.
+
+    Args:
+        lines: Lines of the document
+
+    Returns:
+        True if a line starts with the `dashboards` key
+    """
+    return any(line.startswith('dashboards:') for line in lines)
@@ -0,0 +1,322 @@
+"""Performance figures of the LSP compile server, for the `dashboard/stats` request.
+
+Requests are timed per method, keeping the latencies of the most recent requests for
+percentiles. The work of the document cache is timed per phase: loading a document,
+validating it, compiling its dashboards and serializing the results. The compile worker
+pool is tracked by how many tasks are waiting and running and how long the workers were busy.
+The first request of each method is kept apart, with how long after the start of the process
+it was answered, to follow how long the first preview takes after the extension started.
+
+Everything is kept in memory and is cheap to record, so it is always on.
+"""
+
+import asyncio
+import functools
+import inspect
+import os
+import sys
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import Executor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+if sys.platform != 'win32':
+    import resource
+
+# Number of latest requests per method that percentiles are computed over
+LATENCY_WINDOW = 1000
+
+
+@dataclass
+class PhaseTimings:
+    """Time spent in each phase of handling documents, summed over all documents."""
+
+    _seconds: dict[str, float] = field(default_factory=dict)
+    _counts: dict[str, int] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+
+    @contextmanager
+    def measure(self, phase: str) -> Iterator[None]:
+        """Time a block of work as part of a phase.
+
+        Args:
+            phase: Name of the phase, e.g. load, validate, compile or serialize
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self._seconds[phase] = self._seconds.get(phase, 0.0) + elapsed
+                self._counts[phase] = self._counts.get(phase, 0) + 1
+
+    def snapshot(self) -> dict[str, dict[str, float]]:
+        """Get the totals of each phase.
+
+        Returns:
+            Dictionary with the count, total_ms and mean_ms of each phase
+        """
+        with self._lock:
+            return {
+                phase: {'count': count, 'total_ms': _ms(self._seconds[phase]), 'mean_ms': _ms(self._seconds[phase] / count)}
+                for phase, count in self._counts.items()
+            }
+
+
+@dataclass
+class ServerStats:
+    """Request latencies and compile worker utilisation of the server."""
+
+    workers: int
+    """Number of compile worker threads."""
+
+    loaded_after: float | None = None
+    """Seconds from the start of the process until the server was loaded, if the platform tells it."""
+
+    started: float = field(default_factory=time.monotonic)
+    """When the process started on the monotonic clock, or when the stats were created if that is not known."""
+
+    _latencies: dict[str, deque[float]] = field(default_factory=dict)
+    _counts: dict[str, dict[str, int]] = field(default_factory=dict)
+    _waiting: int = 0
+    _running: int = 0
+    _busy_seconds: float = 0.0
+    _first: dict[str, tuple[float, float]] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def __post_init__(self) -> None:
+        """Count the uptime from the start of the process rather than from when the server was loaded."""
+        if self.loaded_after is not None:
+            self.started -= self.loaded_after
+
+    def record(self, method: str, seconds: float, outcome: str = 'ok') -> None:
+        """Record a handled request.
+
+        Args:
+            method: LSP method or command of the request
+            seconds: Time the request took
+            outcome: ok, error or cancelled, cancelled requests do not count towards the latencies
+        """
+        with self._lock:
+            counts = self._counts.setdefault(method, {'ok': 0, 'error': 0, 'cancelled': 0})
+            counts[outcome] += 1
+            if outcome != 'cancelled':
+                self._latencies.setdefault(method, deque(maxlen=LATENCY_WINDOW)).append(seconds)
+                _ = self._first.setdefault(method, (time.monotonic() - self.started, seconds))
+
+    def timed[F: Callable[..., Any]](self, method: str) -> Callable[[F], F]:
+        """Decorate a request handler to record its latency, keeping it a coroutine function if it is one.
+
+        Args:
+            method: LSP method or command the handler serves
+
+        Returns:
+            The decorator
+        """
+
+        def decorator(handler: F) -> F:
+            if inspect.iscoroutinefunction(handler):
+
+                @functools.wraps(handler)
+                async def timed_async(*args: Any, **kwargs: Any) -> Any:  # pyright: ignore[reportAny, reportExplicitAny]
+                    start = time.perf_counter()
+                    outcome = 'ok'
+                    try:
+                        return await handler(*args, **kwargs)  # pyright: ignore[reportAny]
+                    except BaseException as e:
+                        outcome = _outcome(e)
+                        raise
+                    finally:
+                        self.record(method, time.perf_counter() - start, outcome)
+
+                return timed_async  # pyright: ignore[reportReturnType]
+
+            @functools.wraps(handler)
+            def timed_sync(*args: Any, **kwargs: Any) -> Any:  # pyright: ignore[reportAny, reportExplicitAny]
+                start = time.perf_counter()
+                outcome = 'ok'
+                try:
+                    return handler(*args, **kwargs)  # pyright: ignore[reportAny]
+                except BaseException:
+                    outcome = 'error'
+                    raise
+                finally:
+                    self.record(method, time.perf_counter() - start, outcome)
+
+            return timed_sync  # pyright: ignore[reportReturnType]
+
+        return decorator
+
+    def submit[T](self, executor: Executor, func: Callable[..., T], *args: Any) -> asyncio.Future[T]:  # pyright: ignore[reportAny, reportExplicitAny]
+        """Run a task in the compile workers from the event loop, tracking how long it waits and runs.
+
+        Args:
+            executor: The compile worker pool
+            func: The task
+            *args: Arguments for the task
+
+        Returns:
+            The future of the task result
+        """
+        task = _WorkerTask()
+        with self._lock:
+            self._waiting += 1
+        future = asyncio.get_running_loop().run_in_executor(executor, self._run, task, func, *args)
+        future.add_done_callback(lambda _: self._start(task))
+        return future
+
+    def _run[T](self, task: '_WorkerTask', func: Callable[..., T], *args: Any) -> T:  # pyright: ignore[reportAny, reportExplicitAny]
+        self._start(task)
+        with self._lock:
+            self._running += 1
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._busy_seconds += time.perf_counter() - start
+
+    def busy(self) -> bool:
+        """Whether tasks are waiting for or running in the compile workers."""
+        with self._lock:
+            return self._waiting + self._running > 0
+
+    def _start(self, task: '_WorkerTask') -> None:
+        """Stop counting a task as waiting, when a worker starts it or when it is cancelled before that."""
+        with self._lock:
+            if task.waiting is True:
+                task.waiting = False
+                self._waiting -= 1
+
+    def snapshot(self) -> dict[str, Any]:  # pyright: ignore[reportExplicitAny]
+        """Get the request figures and the worker utilisation.
+
+        Returns:
+            Dictionary with the uptime and load time, the counts and latency percentiles of each method with
+            the latency of its first request and when that was answered, and the workers
+        """
+        uptime = time.monotonic() - self.started
+        with self._lock:
+            requests = {
+                method: {**counts, **_percentiles(sorted(self._latencies.get(method, ()))), **_first(self._first.get(method))}
+                for method, counts in sorted(self._counts.items())
+            }
+            workers = {
+                'size': self.workers,
+                'waiting': self._waiting,
+                'running': self._running,
+                'busy_seconds': round(self._busy_seconds, 3),
+                'utilisation': round(self._busy_seconds / (self.workers * uptime), 4) if uptime > 0 else 0.0,
+            }
+        loaded = round(self.loaded_after, 3) if self.loaded_after is not None else None
+        return {'uptime_seconds': round(uptime, 1), 'loaded_seconds': loaded, 'requests': requests, 'workers': workers}
+
+
+@dataclass
+class _WorkerTask:
+    waiting: bool = True
+
+
+def process_memory() -> dict[str, int | None]:
+    """Get the resident set size of the server process.
+
+    Returns:
+        Dictionary with the current rss_bytes, where the platform tells it, and the peak_rss_bytes
+    """
+    rss: int | None = None
+    try:
+        with open('/proc/self/statm') as statm:  # noqa: PTH123
+            rss = int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        pass
+
+    peak: int | None = None
+    if sys.platform != 'win32':
+        # Kilobytes on Linux, bytes on macOS
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        peak = max_rss if sys.platform == 'darwin' else max_rss * 1024
+    return {'rss_bytes': rss, 'peak_rss_bytes': peak}
+
+
+def process_age() -> float | None:
+    """Get how long ago the server process started.
+
+    Returns:
+        Seconds since the start of the process, or None where the platform does not tell it
+    """
+    try:
+        with open('/proc/self/stat') as stat, open('/proc/uptime') as uptime:  # noqa: PTH123
+            # The start time is the 22nd field, counted after the command name, which may contain spaces
+            start_ticks = int(stat.read().rsplit(')', 1)[1].split()[19])
+            boot_seconds = float(uptime.read().split()[0])
+    except (OSError, ValueError, IndexError):
+        return None
+    return max(boot_seconds - start_ticks / os.sysconf('SC_CLK_TCK'), 0.0)
+
+
+def summarize(snapshot: dict[str, Any]) -> str:  # pyright: ignore[reportExplicitAny]
+    """Summarize the performance figures of the server in one log line.
+
+    Args:
+        snapshot: The figures, as returned by dashboard/stats
+
+    Returns:
+        When the first preview was answered, the busiest methods with their latency percentiles, the time per
+        phase, the document cache hit rate, the worker utilisation and the memory
+    """
+    requests: dict[str, dict[str, float]] = snapshot.get('requests', {})
+    busiest = sorted(requests.items(), key=lambda item: -item[1].get('ok', 0) - item[1].get('error', 0))[:5]
+    parts = [
+        f'{method} {counts.get("ok", 0) + counts.get("error", 0)}x p50 {counts.get("p50_ms", 0)} ms p90 {counts.get("p90_ms", 0)} ms'
+        for method, counts in busiest
+    ]
+    first_preview = requests.get('dashboard/compilePreview', {}).get('first_at_seconds')
+    if first_preview is not None:
+        parts.insert(0, f'first preview after {first_preview:.1f} s')
+    phases: dict[str, dict[str, float]] = snapshot.get('phases', {})
+    if len(phases) > 0:
+        parts.append(' '.join(f'{phase} {figures["total_ms"]:.0f} ms' for phase, figures in phases.items()))
+    hit_rate: float | None = snapshot.get('caches', {}).get('documents', {}).get('hit_rate')
+    if hit_rate is not None:
+        parts.append(f'cache hits {hit_rate:.0%}')
+    workers: dict[str, float] = snapshot.get('workers', {})
+    parts.append(f'workers {workers.get("utilisation", 0):.0%} busy, {workers.get("waiting", 0)} waiting')
+    rss: int | None = snapshot.get('memory', {}).get('rss_bytes')
+    if rss is not None:
+        parts.append(f'rss {rss / 2**20:.0f} MB')
+    return 'Server stats: ' + ' | '.join(parts)
+
+
+def _outcome(error: BaseException) -> str:
+    return 'cancelled' if isinstance(error, asyncio.CancelledError) else 'error'
+
+
+def _first(first: tuple[float, float] | None) -> dict[str, float]:
+    """Get when the first request of a method was answered, in seconds after the start of the process, and its latency."""
+    if first is None:
+        return {}
+    answered, seconds = first
+    return {'first_at_seconds': round(answered, 3), 'first_ms': _ms(seconds)}
+
+
+def _percentiles(latencies: list[float]) -> dict[str, float]:
+    """Get the median, p90, p99 and maximum of sorted latencies, in milliseconds."""
+    if len(latencies) == 0:
+        return {}
+    last = len(latencies) - 1
+    return {
+        'p50_ms': _ms(latencies[round(last * 0.5)]),
+        'p90_ms': _ms(latencies[round(last * 0.9)]),
+        'p99_ms': _ms(latencies[round(last * 0.99)]),
+        'max_ms': _ms(latencies[last]),
+    }
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 2)
@@ -1,19 +1,30 @@
 #!/usr/bin/env python3
 """Unit tests for compile_server.py LSP handlers."""
 
+import asyncio
+import json
 import sys
 import tempfile
+import threading
 import unittest
 from pathlib import Path
 from typing import Any
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
 # Add parent directories to path for importing
 sys.path.insert(0, str(Path(__file__).parent))
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
 
+import compile_server
+from click.testing import CliRunner
 from compile_server import _compile_dashboard, _params_to_dict, compile_command, compile_custom, get_dashboards_custom
 from lsprotocol import types
+from pygls.progress import Progress
+from warm_start import WarmStart
+from workspace_compile import compile_file
+from workspace_index import WorkspaceIndex
+
+from dashboard_compiler.cli import cli, compile_yaml_to_json
 
 
 class TestParamsToDict(unittest.TestCase):
@@ -166,7 +177,7 @@ class TestCompileDashboard(unittest.TestCase):
         self.assertIn('error', result)
 
 
-class TestCompileCommand(unittest.TestCase):
+class TestCompileCommand(unittest.IsolatedAsyncioTestCase):
     """Test the compile_command handler (workspace/executeCommand pattern)."""
 
     def setUp(self) -> None:
@@ -187,58 +198,58 @@ class TestCompileCommand(unittest.TestCase):
 
         shutil.rmtree(self.temp_dir)
 
-    def test_compile_command_with_path_only(self) -> None:
+    async def test_compile_command_with_path_only(self) -> None:
         """Test executeCommand with just path argument."""
         mock_ls = MagicMock()
         args = [str(self.temp_file)]
 
-        result = compile_command(mock_ls, args)
+        result = await compile_command(mock_ls, args)
 
         self.assertTrue(result['success'])
         self.assertIn('data', result)
 
-    def test_compile_command_with_index(self) -> None:
+    async def test_compile_command_with_index(self) -> None:
         """Test executeCommand with path and dashboard index."""
         mock_ls = MagicMock()
         args = [str(self.temp_file), 1]
 
-        result = compile_command(mock_ls, args)
+        result = await compile_command(mock_ls, args)
 
         self.assertTrue(result['success'])
         self.assertEqual(result['data']['attributes']['title'], 'Second Dashboard')
 
-    def test_compile_command_with_string_index(self) -> None:
+    async def test_compile_command_with_string_index(self) -> None:
         """Test executeCommand with dashboard index as string."""
         mock_ls = MagicMock()
         args = [str(self.temp_file), '1']
 
-        result = compile_command(mock_ls, args)
+        result = await compile_command(mock_ls, args)
 
         self.assertTrue(result['success'])
         self.assertEqual(result['data']['attributes']['title'], 'Second Dashboard')
 
-    def test_compile_command_missing_args(self) -> None:
+    async def test_compile_command_missing_args(self) -> None:
         """Test executeCommand with no arguments returns error."""
         mock_ls = MagicMock()
         args: list[Any] = []
 
-        result = compile_command(mock_ls, args)
+        result = await compile_command(mock_ls, args)
 
         self.assertFalse(result['success'])
         self.assertIn('error', result)
         self.assertIn('Missing path', result['error'])
 
-    def test_compile_command_empty_args(self) -> None:
+    async def test_compile_command_empty_args(self) -> None:
         """Test executeCommand with None args returns error."""
         mock_ls = MagicMock()
 
-        result = compile_command(mock_ls, [])
+        result = await compile_command(mock_ls, [])
 
         self.assertFalse(result['success'])
         self.assertIn('error', result)
 
 
-class TestCompileCustom(unittest.TestCase):
+class TestCompileCustom(unittest.IsolatedAsyncioTestCase):
     """Test the compile_custom handler (custom request pattern)."""
 
     def setUp(self) -> None:
@@ -259,55 +270,55 @@ class TestCompileCustom(unittest.TestCase):
 
         shutil.rmtree(self.temp_dir)
 
-    def test_compile_custom_with_dict_params(self) -> None:
+    async def test_compile_custom_with_dict_params(self) -> None:
         """Test custom request with dict parameters."""
         params = {'path': str(self.temp_file), 'dashboard_index': 0}
 
-        result = compile_custom(params)
+        result = await compile_custom(params)
 
         self.assertTrue(result['success'])
         self.assertIn('data', result)
 
-    def test_compile_custom_with_string_index(self) -> None:
+    async def test_compile_custom_with_string_index(self) -> None:
         """Test custom request with string dashboard index."""
         params = {'path': str(self.temp_file), 'dashboard_index': '1'}
 
-        result = compile_custom(params)
+        result = await compile_custom(params)
 
         self.assertTrue(result['success'])
         self.assertEqual(result['data']['attributes']['title'], 'Second Dashboard')
 
-    def test_compile_custom_missing_path(self) -> None:
+    async def test_compile_custom_missing_path(self) -> None:
         """Test custom request with missing path parameter."""
         params = {'dashboard_index': 0}
 
-        result = compile_custom(params)
+        result = await compile_custom(params)
 
         self.assertFalse(result['success'])
         self.assertIn('error', result)
 
-    def test_compile_custom_default_index(self) -> None:
+    async def test_compile_custom_default_index(self) -> None:
         """Test custom request defaults to index 0 when not provided."""
         params = {'path': str(self.temp_file)}
 
-        result = compile_custom(params)
+        result = await compile_custom(params)
 
         self.assertTrue(result['success'])
         self.assertEqual(result['data']['attributes']['title'], 'Test Dashboard')
 
-    def test_compile_custom_with_namedtuple(self) -> None:
+    async def test_compile_custom_with_namedtuple(self) -> None:
         """Test custom request with namedtuple params (like pygls.protocol.Object)."""
         from collections import namedtuple
 
         ParamsType = namedtuple('ParamsType', ['path', 'dashboard_index'])
         params = ParamsType(path=str(self.temp_file), dashboard_index=0)
 
-        result = compile_custom(params)
+        result = await compile_custom(params)
 
         self.assertTrue(result['success'])
 
 
-class TestGetDashboardsCustom(unittest.TestCase):
+class TestGetDashboardsCustom(unittest.IsolatedAsyncioTestCase):
     """Test the get_dashboards_custom handler."""
 
     def setUp(self) -> None:
@@ -321,7 +332,7 @@ class TestGetDashboardsCustom(unittest.TestCase):
 
         shutil.rmtree(self.temp_dir)
 
-    def test_get_dashboards_single(self) -> None:
+    async def test_get_dashboards_single(self) -> None:
         """Test getting list of dashboards from single dashboard file."""
         yaml_content = """dashboards:
 - name: Test Dashboard
@@ -331,7 +342,7 @@ class TestGetDashboardsCustom(unittest.TestCase):
         self.temp_file.write_text(yaml_content)
 
         params = {'path': str(self.temp_file)}
-        result = get_dashboards_custom(params)
+        result = await get_dashboards_custom(params)
 
         self.assertTrue(result['success'])
         self.assertIn('data', result)
@@ -340,7 +351,7 @@ class TestGetDashboardsCustom(unittest.TestCase):
         self.assertEqual(result['data'][0]['title'], 'Test Dashboard')
         self.assertEqual(result['data'][0]['description'], 'A test dashboard')
 
-    def test_get_dashboards_multiple(self) -> None:
+    async def test_get_dashboards_multiple(self) -> None:
         """Test getting list of multiple dashboards."""
         yaml_content = """dashboards:
 - name: First Dashboard
@@ -355,7 +366,7 @@ class TestGetDashboardsCustom(unittest.TestCase):
         self.temp_file.write_text(yaml_content)
 
         params = {'path': str(self.temp_file)}
-        result = get_dashboards_custom(params)
+        result = await get_dashboards_custom(params)
 
         self.assertTrue(result['success'])
         self.assertEqual(len(result['data']), 3)
@@ -363,7 +374,7 @@ class TestGetDashboardsCustom(unittest.TestCase):
         self.assertEqual(result['data'][1]['title'], 'Second Dashboard')
         self.assertEqual(result['data'][2]['title'], 'Third Dashboard')
 
-    def test_get_dashboards_no_description(self) -> None:
+    async def test_get_dashboards_no_description(self) -> None:
         """Test dashboard without description gets empty string."""
         yaml_content = """dashboards:
 - name: No Description Dashboard
@@ -372,12 +383,12 @@ class TestGetDashboardsCustom(unittest.TestCase):
         self.temp_file.write_text(yaml_content)
 
         params = {'path': str(self.temp_file)}
-        result = get_dashboards_custom(params)
+        result = await get_dashboards_custom(params)
 
         self.assertTrue(result['success'])
         self.assertEqual(result['data'][0]['description'], '')
 
-    def test_get_dashboards_no_name(self) -> None:
+    async def test_get_dashboards_no_name(self) -> None:
         """Test dashboard without name returns validation error."""
         yaml_content = """dashboards:
 - panels: []
@@ -385,32 +396,32 @@ class TestGetDashboardsCustom(unittest.TestCase):
         self.temp_file.write_text(yaml_content)
 
         params = {'path': str(self.temp_file)}
-        result = get_dashboards_custom(params)
+        result = await get_dashboards_custom(params)
 
         # Dashboard requires name field, so this should fail validation
         self.assertFalse(result['success'])
         self.assertIn('error', result)
 
-    def test_get_dashboards_missing_path(self) -> None:
+    async def test_get_dashboards_missing_path(self) -> None:
         """Test that missing path returns error."""
         params = {}
 
-        result = get_dashboards_custom(params)
+        result = await get_dashboards_custom(params)
 
         self.assertFalse(result['success'])
         self.assertIn('error', result)
         self.assertIn('Missing path', result['error'])
 
-    def test_get_dashboards_nonexistent_file(self) -> None:
+    async def test_get_dashboards_nonexistent_file(self) -> None:
         """Test that nonexistent file returns error."""
         params = {'path': '/nonexistent/file.yaml'}
 
-        result = get_dashboards_custom(params)
+        result = await get_dashboards_custom(params)
 
         self.assertFalse(result['success'])
         self.assertIn('error', result)
 
-    def test_get_dashboards_with_namedtuple(self) -> None:
+    async def test_get_dashboards_with_namedtuple(self) -> None:
         """Test with namedtuple params (like pygls.protocol.Object)."""
         from collections import namedtuple
 
@@ -423,7 +434,7 @@ class TestGetDashboardsCustom(unittest.TestCase):
         ParamsType = namedtuple('ParamsType', ['path'])
         params = ParamsType(path=str(self.temp_file))
 
-        result = get_dashboards_custom(params)
+        result = await get_dashboards_custom(params)
 
         self.assertTrue(result['success'])
 
@@ -471,5 +482,495 @@ class TestDidSaveHandler(unittest.TestCase):
             mock_protocol.notify.assert_called_once_with('dashboard/fileChanged', {'uri': uri})
 
 
+class TestCompileWorkers(unittest.IsolatedAsyncioTestCase):
+    """Test that compiles run off the event loop and that newer requests supersede older ones."""
+
+    def setUp(self) -> None:
+        """Replace the compile function with one that blocks until released."""
+        self.release = threading.Event()
+        self.started = threading.Semaphore(0)
+
+        def blocking_compile(path: str, dashboard_index: int) -> dict[str, Any]:
+            self.started.release()
+            _ = self.release.wait(timeout=5)
+            return {'success': True, 'data': {'path': path, 'index': dashboard_index}}
+
+        patcher = patch.object(compile_server, '_compile_dashboard', blocking_compile)
+        _ = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.release.set)
+
+    async def _wait_started(self) -> None:
+        """Wait until a worker has entered the compile function."""
+        self.assertTrue(await asyncio.to_thread(self.started.acquire, timeout=5))
+
+    async def test_event_loop_keeps_serving_while_compiling(self) -> None:
+        """Test that the event loop is free while a compile is running."""
+        task = asyncio.create_task(compile_custom({'path': '/dashboards/slow.yaml'}))
+        await self._wait_started()
+
+        self.assertTrue((await compile_server.get_schema_custom({}))['success'])
+        self.assertFalse(task.done())
+
+        self.release.set()
+        self.assertEqual((await task)['data'], {'path': '/dashboards/slow.yaml', 'index': 0})
+
+    async def test_newer_request_supersedes_older(self) -> None:
+        """Test that a second request for the same dashboard cancels the first one."""
+        first = asyncio.create_task(compile_custom({'path': '/dashboards/edited.yaml'}))
+        await self._wait_started()
+        second = asyncio.create_task(compile_custom({'path': '/dashboards/edited.yaml'}))
+        other = asyncio.create_task(compile_custom({'path': '/dashboards/edited.yaml', 'dashboard_index': 1}))
+        await asyncio.sleep(0.01)
+
+        self.release.set()
+
+        with self.assertRaises(asyncio.CancelledError):
+            _ = await first
+        self.assertTrue((await second)['success'])
+        self.assertTrue((await other)['success'])
+        self.assertEqual(compile_server._latest_requests, {})  # pyright: ignore[reportPrivateUsage]
+
+
+class TestUpdateGridCustom(unittest.IsolatedAsyncioTestCase):
+    """Test the update_grid_custom handler."""
+
+    def setUp(self) -> None:
+        """Create a dashboard file with two panels."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.temp_file = Path(self.temp_dir.name) / 'test_dashboard.yaml'
+        self.temp_file.write_text("""dashboards:
+- name: Test Dashboard
+  panels:
+  - title: Notes
+    grid: { x: 0, y: 0, w: 24, h: 10 }
+    markdown:
+      content: "# Notes"
+  - title: More Notes
+    id: more-notes
+    grid: { x: 24, y: 0, w: 24, h: 10 }
+    markdown:
+      content: "# More"
+""")
+
+    def tearDown(self) -> None:
+        """Clean up temporary files."""
+        self.temp_dir.cleanup()
+
+    async def test_update_grid_rewrites_file_and_refreshes_layout(self) -> None:
+        """Test that moves are written to the file and seen by the next getGridLayout request."""
+        path = str(self.temp_file)
+        before = await compile_server.get_grid_layout_custom({'path': path})
+        self.assertEqual(before['data']['panels'][1]['grid'], {'x': 24, 'y': 0, 'w': 24, 'h': 10})
+
+        results = await asyncio.gather(
+            compile_server.update_grid_custom({'path': path, 'panel_id': 'panel_0', 'grid': {'x': 0, 'y': 10, 'w': 24, 'h': 10}}),
+            compile_server.update_grid_custom({'path': path, 'panel_id': 'more-notes', 'grid': {'x': 0, 'y': 0, 'w': 48, 'h': 10}}),
+        )
+
+        self.assertTrue(all(result['success'] for result in results))
+        after = await compile_server.get_grid_layout_custom({'path': path})
+        self.assertEqual(
+            [panel['grid'] for panel in after['data']['panels']],
+            [{'x': 0, 'y': 10, 'w': 24, 'h': 10}, {'x': 0, 'y': 0, 'w': 48, 'h': 10}],
+        )
+
+    async def test_update_grid_batch(self) -> None:
+        """Test that a batch of moves is applied with one request."""
+        path = str(self.temp_file)
+        result = await compile_server.update_grid_custom(
+            {
+                'path': path,
+                'updates': [
+                    {'panel_id': 'panel_0', 'grid': {'x': 24, 'y': 0, 'w': 24, 'h': 10}},
+                    {'panel_id': 'more-notes', 'grid': {'x': 0, 'y': 0, 'w': 24, 'h': 10}},
+                ],
+            }
+        )
+
+        self.assertEqual(result, {'success': True, 'message': 'Updated grid for 2 panel(s)'})
+        after = await compile_server.get_grid_layout_custom({'path': path})
+        self.assertEqual([panel['grid']['x'] for panel in after['data']['panels']], [24, 0])
+
+    async def test_update_grid_missing_params(self) -> None:
+        """Test that a request without a panel ID or grid is rejected."""
+        result = await compile_server.update_grid_custom({'path': str(self.temp_file), 'grid': {'x': 0, 'y': 0, 'w': 1, 'h': 1}})
+
+        self.assertFalse(result['success'])
+        self.assertIn('Missing required parameters', result['error'])
+
+
+class TestCompilePreviewCustom(unittest.IsolatedAsyncioTestCase):
+    """Test the compile_preview_custom handler."""
+
+    def setUp(self) -> None:
+        """Create a dashboard file with two panels."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.temp_file = Path(self.temp_dir.name) / 'test_dashboard.yaml'
+        self.temp_file.write_text("""dashboards:
+- name: Test Dashboard
+  panels:
+  - title: Notes
+    grid: { x: 0, y: 0, w: 24, h: 10 }
+    markdown:
+      content: "# Notes"
+  - title: More Notes
+    grid: { x: 24, y: 0, w: 24, h: 10 }
+    markdown:
+      content: "# More"
+""")
+
+    def tearDown(self) -> None:
+        """Clean up temporary files."""
+        self.temp_dir.cleanup()
+
+    async def test_edits_send_changed_panels(self) -> None:
+        """Test that after the whole dashboard only the edited panel is sent."""
+        params = {'path': str(self.temp_file), 'dashboard_index': 0}
+        first = await compile_server.compile_preview_custom({**params, 'version': None})
+        self.assertTrue(first['success'])
+        self.assertIsNone(first['data']['base_version'])
+        self.assertEqual(len(first['data']['upsert']), 2)
+
+        self.temp_file.write_text(self.temp_file.read_text().replace('# More', '# Edited'))
+        second = await compile_server.compile_preview_custom({**params, 'version': first['data']['version']})
+
+        self.assertEqual(second['data']['base_version'], first['data']['version'])
+        self.assertEqual(len(second['data']['upsert']), 1)
+        self.assertIn('# Edited', json.dumps(second['data']['upsert']))
+
+    async def test_compile_error(self) -> None:
+        """Test that compilation errors are returned instead of a delta."""
+        self.temp_file.write_text('dashboards: []\n')
+
+        result = await compile_server.compile_preview_custom({'path': str(self.temp_file)})
+
+        self.assertFalse(result['success'])
+        self.assertIn('No dashboards found', result['error'])
+
+
+class TestWorkspaceIndexFeatures(unittest.IsolatedAsyncioTestCase):
+    """Test workspace symbols, go to definition and find references."""
+
+    def setUp(self) -> None:
+        """Create a workspace with a dashboard linking to another and index it."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name).resolve()
+        self.overview = self.root / 'overview.yaml'
+        self.overview.write_text("""dashboards:
+- name: Overview
+  panels:
+  - links:
+      links:
+      - dashboard: hosts
+""")
+        self.hosts = self.root / 'hosts.yaml'
+        self.hosts.write_text("""dashboards:
+- id: hosts
+  name: Hosts
+  controls:
+  - type: options
+    data_view: metrics-*
+    field: host.name
+""")
+        compile_server.workspace_index = WorkspaceIndex()
+        compile_server.workspace_index.scan([str(self.root)])
+
+    def tearDown(self) -> None:
+        """Clean up temporary files."""
+        self.temp_dir.cleanup()
+
+    async def test_definition_of_link(self) -> None:
+        """Test that a dashboard link leads to the linked dashboard."""
+        params = types.DefinitionParams(
+            text_document=types.TextDocumentIdentifier(uri=self.overview.as_uri()), position=types.Position(line=5, character=20)
+        )
+
+        locations = await compile_server.definition(params)
+
+        assert locations is not None
+        self.assertEqual([(location.uri, location.range.start.line) for location in locations], [(self.hosts.as_uri(), 2)])
+
+    async def test_references_of_dashboard(self) -> None:
+        """Test that the references of a dashboard are the links to it."""
+        params = types.ReferenceParams(
+            text_document=types.TextDocumentIdentifier(uri=self.hosts.as_uri()),
+            position=types.Position(line=2, character=9),
+            context=types.ReferenceContext(include_declaration=True),
+        )
+
+        locations = await compile_server.references(params)
+
+        assert locations is not None
+        self.assertEqual([location.uri for location in locations], [self.hosts.as_uri(), self.overview.as_uri()])
+
+    async def test_workspace_symbols(self) -> None:
+        """Test that dashboards are found by name across the workspace."""
+        symbols = await compile_server.workspace_symbol(types.WorkspaceSymbolParams(query='host'))
+
+        self.assertEqual([(symbol.name, symbol.kind) for symbol in symbols], [('Hosts', types.SymbolKind.Module)])
+
+
+class TestCompletionAndHover(unittest.TestCase):
+    """Test schema completion and hover of dashboard files."""
+
+    def setUp(self) -> None:
+        """Create a dashboard file and a YAML file that is not one."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name).resolve()
+        self.dashboard = self.root / 'dashboard.yaml'
+        self.dashboard.write_text("""dashboards:
+- name: Logs
+  panels:
+  - title: Pie
+    lens:
+      type: pie
+      data_view: logs-*
+""")
+        self.other = self.root / 'workflow.yaml'
+        self.other.write_text('name: build\n')
+        self.warm_start = WarmStart()
+        self.patcher = patch.object(compile_server, 'warm_start', self.warm_start)
+        _ = self.patcher.start()
+        self.warm_start.start([('completion', compile_server.schema_completer)]).join()
+
+    def tearDown(self) -> None:
+        """Clean up temporary files."""
+        self.patcher.stop()
+        self.temp_dir.cleanup()
+
+    def test_before_initialized(self) -> None:
+        """Test that completion and hover before the warm-up started leave the answer to the YAML extension without building the graph."""
+        completion_params = types.CompletionParams(
+            text_document=types.TextDocumentIdentifier(uri=self.dashboard.as_uri()), position=types.Position(line=7, character=8)
+        )
+        hover_params = types.HoverParams(
+            text_document=types.TextDocumentIdentifier(uri=self.dashboard.as_uri()), position=types.Position(line=6, character=8)
+        )
+
+        with patch.object(compile_server, 'warm_start', WarmStart()), patch.object(compile_server, 'schema_completer') as completer:
+            self.assertIsNone(compile_server.completion(completion_params))
+            self.assertIsNone(compile_server.hover(hover_params))
+        completer.assert_not_called()
+
+    def test_completion(self) -> None:
+        """Test that the keys of the chart type are completed, and only in dashboard files."""
+        self.dashboard.write_text(self.dashboard.read_text() + '      sl')
+        params = types.CompletionParams(
+            text_document=types.TextDocumentIdentifier(uri=self.dashboard.as_uri()), position=types.Position(line=7, character=8)
+        )
+
+        items = compile_server.completion(params)
+
+        assert items is not None
+        self.assertIn('slice_by', [item.label for item in items])
+        self.assertNotIn('data_view', [item.label for item in items])
+
+        params.text_document.uri = self.other.as_uri()
+        self.assertIsNone(compile_server.completion(params))
+
+    def test_hover(self) -> None:
+        """Test that hovering a key shows the description of the model attribute."""
+        params = types.HoverParams(
+            text_document=types.TextDocumentIdentifier(uri=self.dashboard.as_uri()), position=types.Position(line=6, character=8)
+        )
+
+        hover = compile_server.hover(params)
+
+        assert hover is not None
+        assert isinstance(hover.contents, types.MarkupContent)
+        self.assertTrue(hover.contents.value.startswith('**data_view**'))
+
+
+class TestWarmStart(unittest.IsolatedAsyncioTestCase):
+    """Test requests that arrive while the server is still warming up."""
+
+    def setUp(self) -> None:
+        """Create a dashboard file and hold the warm-up at its first step."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.dashboard = Path(self.temp_dir.name).resolve() / 'dashboard.yaml'
+        self.dashboard.write_text('dashboards:\n- name: Logs\n  panels: []\n')
+        self.release = threading.Event()
+        self.warm_start = WarmStart()
+        self.patcher = patch.object(compile_server, 'warm_start', self.warm_start)
+        _ = self.patcher.start()
+        self.thread = self.warm_start.start([('schema', self.release.wait), ('completion', compile_server.schema_completer)])
+
+    def tearDown(self) -> None:
+        """Finish the warm-up and clean up temporary files."""
+        self.release.set()
+        self.thread.join()
+        self.patcher.stop()
+        self.temp_dir.cleanup()
+
+    async def test_requests_during_warm_up(self) -> None:
+        """Test that getSchema waits for the warm-up, completion leaves the answer to the YAML extension, and compiles go ahead."""
+        params = types.CompletionParams(
+            text_document=types.TextDocumentIdentifier(uri=self.dashboard.as_uri()), position=types.Position(line=2, character=2)
+        )
+        self.assertIsNone(compile_server.completion(params))
+
+        compiled = await compile_custom({'path': str(self.dashboard)})
+        self.assertTrue(compiled['success'])
+
+        schema = asyncio.create_task(compile_server.get_schema_custom({}))
+        await asyncio.sleep(0.05)
+        self.assertFalse(schema.done())
+
+        self.release.set()
+        self.assertTrue((await schema)['success'])
+        await self.warm_start.ready('completion')
+        self.assertIsNotNone(compile_server.completion(params))
+
+
+class TestCompileWorkspaceCommand(unittest.IsolatedAsyncioTestCase):
+    """Test compiling all dashboard files of the workspace."""
+
+    def setUp(self) -> None:
+        """Create a workspace with a valid and an invalid dashboard file, and a YAML file that is not one."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name).resolve()
+        self.valid = self.root / 'valid.yaml'
+        self.valid.write_text("""dashboards:
+- name: First
+  panels:
+  - title: Notes
+    grid: {x: 0, y: 0, w: 12, h: 10}
+    markdown:
+      content: "# Notes"
+- name: Second
+""")
+        self.invalid = self.root / 'nested' / 'invalid.yaml'
+        self.invalid.parent.mkdir()
+        self.invalid.write_text('dashboards:\n- panels: []\n')
+        (self.root / 'workflow.yaml').write_text('name: build\n')
+
+        self.ls = MagicMock()
+        self.ls.workspace.folders = {}
+        self.ls.workspace.root_path = str(self.root)
+        self.ls.work_done_progress = Progress(MagicMock(send_request_async=AsyncMock(return_value=None)))
+
+    def tearDown(self) -> None:
+        """Clean up temporary files."""
+        self.temp_dir.cleanup()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        """Stop the compilation processes."""
+        if compile_server._workspace_pool is not None:  # pyright: ignore[reportPrivateUsage]
+            compile_server._workspace_pool.shutdown()  # pyright: ignore[reportPrivateUsage]
+            compile_server._workspace_pool = None  # pyright: ignore[reportPrivateUsage]
+
+    async def test_compile_workspace(self) -> None:
+        """Test that valid dashboards are written like the CLI does, and that every dashboard file gets diagnostics."""
+        result = await compile_server.compile_workspace_command(self.ls)
+
+        output = self.root / 'output' / 'compiled_dashboards.ndjson'
+        self.assertTrue(result['success'])
+        self.assertEqual((result['output'], result['files'], result['dashboards']), (str(output), 2, 2))
+        self.assertEqual([error['path'] for error in result['errors']], [str(self.invalid)])
+
+        cli_lines, _ = compile_yaml_to_json(self.valid)
+        self.assertEqual(output.read_text(), ''.join(f'{line}\n' for line in cli_lines))
+
+        published = {call.args[0].uri: call.args[0].diagnostics for call in self.ls.text_document_publish_diagnostics.call_args_list}
+        self.assertEqual(set(published), {self.valid.as_uri(), self.invalid.as_uri()})
+        self.assertEqual(published[self.valid.as_uri()], [])
+        self.assertEqual(len(published[self.invalid.as_uri()]), 1)
+        self.assertEqual(self.ls.work_done_progress.tokens, {})
+
+    async def test_output_matches_cli(self) -> None:
+        """Test that the combined file is byte for byte the one `kb-dashboard compile` writes for a nested tree."""
+        for directory in ('a', 'a-b', 'a.b', 'a_b', 'a/c'):
+            path = self.root / directory / 'dashboards.yaml'
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(f'dashboards:\n- name: Dashboard {directory}\n  panels:\n  - markdown: {{content: "ratio 1e-05 \u00e9"}}\n')
+        (self.root / 'a' / 'other.yml').write_text('dashboards:\n- name: Not compiled by the CLI\n')
+        cli_output = Path(self.temp_dir.name) / 'cli-output'
+
+        _ = CliRunner().invoke(cli, ['compile', '--input-dir', str(self.root), '--output-dir', str(cli_output)])
+        result = await compile_server.compile_workspace_command(self.ls)
+
+        self.assertEqual(Path(result['output']).read_bytes(), (cli_output / 'compiled_dashboards.ndjson').read_bytes())
+
+    async def test_cancel(self) -> None:
+        """Test that cancelling the progress stops the compilation without writing the output."""
+        begin = self.ls.work_done_progress.begin
+
+        def begin_and_cancel(token: str, value: types.WorkDoneProgressBegin) -> None:
+            begin(token, value)
+            _ = self.ls.work_done_progress.tokens[token].cancel()
+
+        with patch.object(self.ls.work_done_progress, 'begin', side_effect=begin_and_cancel):
+            result = await compile_server.compile_workspace_command(self.ls, 'out.ndjson')
+
+        self.assertEqual(result['cancelled'], True)
+        self.assertFalse((self.root / 'out.ndjson').exists())
+
+    def test_open_documents_compile_like_other_files(self) -> None:
+        """Test that compiling through the document cache gives the same NDJSON lines as the worker processes."""
+        path = str(self.valid)
+
+        cached = compile_server._compile_open_document(path)  # pyright: ignore[reportPrivateUsage]
+
+        self.assertEqual(cached, compile_file(path))
+
+
+class TestGetSchemaCustom(unittest.IsolatedAsyncioTestCase):
+    """Test the get_schema_custom handler."""
+
+    async def test_get_schema(self) -> None:
+        """Test that the schema is returned together with its version."""
+        result = await compile_server.get_schema_custom({})
+
+        self.assertTrue(result['success'])
+        self.assertIn('dashboards', result['data']['properties'])
+        self.assertEqual(len(result['version']), 16)
+
+    async def test_get_schema_skips_unchanged_schema(self) -> None:
+        """Test that the schema is left out when the client already has the current version."""
+        version = (await compile_server.get_schema_custom({}))['version']
+
+        result = await compile_server.get_schema_custom({'version': version})
+
+        self.assertEqual(result, {'success': True, 'version': version})
+
+
+class TestStatsCustom(unittest.IsolatedAsyncioTestCase):
+    """Test the stats_custom handler."""
+
+    def setUp(self) -> None:
+        """Create a temporary dashboard file."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.temp_file = Path(self.temp_dir) / 'stats.yaml'
+        self.temp_file.write_text('dashboards:\n- name: Stats Dashboard\n  panels: []\n')
+
+    def tearDown(self) -> None:
+        """Clean up temporary files."""
+        import shutil
+
+        shutil.rmtree(self.temp_dir)
+
+    async def test_stats_after_compiling(self) -> None:
+        """Test that a compile shows in the request latencies, the phases and the cache figures."""
+        for _ in range(2):
+            result = await compile_custom({'path': str(self.temp_file)})
+            self.assertTrue(result['success'])
+
+        response = await compile_server.stats_custom({})
+
+        self.assertTrue(response['success'])
+        data = response['data']
+        self.assertGreaterEqual(data['requests']['dashboard/compile']['ok'], 2)
+        self.assertIn('p99_ms', data['requests']['dashboard/compile'])
+        self.assertGreater(data['workers']['busy_seconds'], 0)
+        self.assertEqual(data['workers']['size'], compile_server.COMPILE_WORKERS)
+        self.assertIn('compile', data['phases'])
+        self.assertIn('load', data['phases'])
+        self.assertGreater(data['caches']['documents']['hit_rate'], 0)
+        self.assertIn('workspace_index', data['caches'])
+        self.assertIn('rss_bytes', data['memory'])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Unit tests for validating dashboard documents with source positions."""
+
+import sys
+import unittest
+from pathlib import Path
+
+# Add parent directories to path for importing
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+
+from diagnostics import DocumentParser, to_diagnostics
+from lsprotocol import types
+
+DASHBOARD_YAML = """dashboards:
+- name: {name}
+  panels:
+  - title: Notes
+    grid: {{x: 0, y: 0, w: 12, h: 10}}
+    markdown:
+      content: "# Notes"
+"""
+
+INVALID_YAML = """dashboards:
+- name: Broken
+  panels:
+  - title: Notes
+    grid: {x: 0, y: 0, w: 12}
+    markdown:
+      contnt: "# Notes"
+  - title: Pie
+    grid: {x: 12, y: 0, w: 12, h: 10}
+    lens:
+      type: pie
+      data_view: logs-*
+      metrics:
+      - aggregation: count
+      slice_by:
+      - field: 42
+"""
+
+
+def _start(parser: DocumentParser, content: str, code: str) -> tuple[int, int]:
+    """Get the start line and character of the diagnostic with a code."""
+    diagnostics = {diagnostic.code: diagnostic for diagnostic in to_diagnostics(parser.parse(content).issues)}
+    start = diagnostics[code].range.start
+    return start.line, start.character
+
+
+class TestDocumentParser(unittest.TestCase):
+    """Test parsing documents into dashboards and located issues."""
+
+    def test_valid_document(self) -> None:
+        """Test that a valid document yields its dashboards and no issues."""
+        parsed = DocumentParser().parse(DASHBOARD_YAML.format(name='First'))
+
+        self.assertEqual([dashboard.name for dashboard in parsed.dashboards], ['First'])
+        self.assertEqual(parsed.issues, [])
+        self.assertIsNone(parsed.error())
+
+    def test_issues_point_at_the_yaml_source(self) -> None:
+        """Test that validation errors are located at the key or value they concern, skipping union tags."""
+        parser = DocumentParser()
+
+        self.assertEqual(_start(parser, INVALID_YAML, 'dashboards.0.panels.0.markdown.grid.h'), (4, 4))
+        self.assertEqual(_start(parser, INVALID_YAML, 'dashboards.0.panels.0.markdown.markdown.contnt'), (6, 6))
+        self.assertEqual(
+            _start(parser, INVALID_YAML, 'dashboards.0.panels.1.lens.lens.pie.slice_by.0.LensTopValuesDimension.field'), (15, 8)
+        )
+
+        parsed = parser.parse(INVALID_YAML)
+        self.assertEqual(parsed.dashboards, [])
+        self.assertIn('(line 5): Field required', str(parsed.error()))
+
+    def test_syntax_errors_are_located(self) -> None:
+        """Test that a YAML syntax error is reported where the parser stopped."""
+        issues = DocumentParser().parse('dashboards:\n- name: [unclosed\n').issues
+
+        self.assertEqual(len(issues), 1)
+        self.assertEqual(issues[0].range.start, types.Position(line=2, character=0))
+
+    def test_missing_root_key(self) -> None:
+        """Test that a document without dashboards is reported at its start."""
+        issues = DocumentParser().parse('title: not a dashboard file\n').issues
+
+        self.assertEqual([(issue.loc, issue.message) for issue in issues], [(('dashboards',), 'Field required')])
+
+    def test_only_changed_dashboards_are_validated(self) -> None:
+        """Test that unchanged dashboards are reused across versions, even when they move."""
+        parser = DocumentParser()
+        first = DASHBOARD_YAML.format(name='First')
+        second = DASHBOARD_YAML.format(name='Second').removeprefix('dashboards:\n')
+
+        _ = parser.parse(first + second)
+        self.assertEqual(parser.validated, 2)
+
+        parsed = parser.parse(first + second.replace('Second', 'Renamed'))
+        self.assertEqual(parser.validated, 3)
+        self.assertEqual([dashboard.name for dashboard in parsed.dashboards], ['First', 'Renamed'])
+
+        _ = parser.parse('# moved down\n' + first + second.replace('Second', 'Renamed'))
+        self.assertEqual(parser.validated, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""Unit tests for the document cache of the LSP compile server."""
+
+import asyncio
+import sys
+import tempfile
+import unittest
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+from unittest import mock
+
+# Add parent directories to path for importing
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+
+import compile_server
+from compile_server import compile_custom, get_dashboards_custom, get_grid_layout_custom
+from document_cache import DocumentCache
+from lsprotocol import types
+
+DASHBOARD_YAML = """dashboards:
+- name: {name}
+  panels:
+  - title: Notes
+    grid: {{x: 0, y: 0, w: 12, h: 10}}
+    markdown:
+      content: "# Notes"
+"""
+
+
+class TestDocumentCache(unittest.TestCase):
+    """Test caching of parsed and compiled dashboards."""
+
+    def setUp(self) -> None:
+        """Create a dashboard file and an empty cache."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.temp_dir.name) / 'dashboard.yaml'
+        self.path.write_text(DASHBOARD_YAML.format(name='First'))
+        self.cache = DocumentCache()
+
+    def tearDown(self) -> None:
+        """Clean up temporary files."""
+        self.temp_dir.cleanup()
+
+    def test_repeated_requests_hit_the_cache(self) -> None:
+        """Test that an unchanged file is parsed and compiled only once."""
+        first = self.cache.compiled(str(self.path), 0)
+        dashboards = self.cache.dashboards(str(self.path))
+        second = self.cache.compiled(str(self.path), 0)
+
+        self.assertIs(first, second)
+        self.assertEqual(dashboards[0].name, 'First')
+        self.assertEqual(self.cache.stats(), {'hits': 2, 'misses': 1, 'documents': 1})
+
+    def test_changed_content_is_parsed_again(self) -> None:
+        """Test that the cache notices changed content even without an invalidation."""
+        _ = self.cache.dashboards(str(self.path))
+        self.path.write_text(DASHBOARD_YAML.format(name='Second'))
+
+        self.assertEqual(self.cache.dashboards(str(self.path))[0].name, 'Second')
+        self.assertEqual(self.cache.misses, 2)
+
+    def test_invalidate_drops_the_document(self) -> None:
+        """Test that an invalidated document is parsed again on the next request."""
+        _ = self.cache.dashboards(str(self.path))
+        self.cache.invalidate(str(self.path))
+
+        self.assertEqual(self.cache.stats()['documents'], 0)
+        _ = self.cache.dashboards(str(self.path))
+        self.assertEqual(self.cache.misses, 2)
+
+    def test_parse_errors_are_cached(self) -> None:
+        """Test that an invalid file raises the same error again without being parsed again."""
+        self.path.write_text('dashboards:\n- panels: not-a-list\n')
+
+        with self.assertRaises(Exception) as first:
+            _ = self.cache.dashboards(str(self.path))
+        with self.assertRaises(Exception) as second:
+            _ = self.cache.dashboards(str(self.path))
+
+        self.assertIs(first.exception, second.exception)
+        self.assertEqual(self.cache.stats(), {'hits': 1, 'misses': 1, 'documents': 1})
+
+
+class TestServerUsesCache(unittest.IsolatedAsyncioTestCase):
+    """Test that the LSP handlers share one parse of a document."""
+
+    def setUp(self) -> None:
+        """Create a dashboard file and reset the server's cache."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.temp_dir.name) / 'dashboard.yaml'
+        self.path.write_text(DASHBOARD_YAML.format(name='First'))
+        compile_server.document_cache = DocumentCache()
+
+    def tearDown(self) -> None:
+        """Clean up temporary files."""
+        self.temp_dir.cleanup()
+
+    async def test_handlers_share_the_parsed_document(self) -> None:
+        """Test that compile, getDashboards and getGridLayout parse the file once."""
+        self.assertTrue((await compile_custom({'path': str(self.path)}))['success'])
+        self.assertTrue((await get_dashboards_custom({'path': str(self.path)}))['success'])
+        self.assertTrue((await get_grid_layout_custom({'path': str(self.path), 'dashboard_index': 0}))['success'])
+
+        self.assertEqual(compile_server.document_cache.stats(), {'hits': 2, 'misses': 2, 'documents': 1})
+
+    async def test_did_change_invalidates_the_document(self) -> None:
+        """Test that a change notification drops the cached document."""
+        _ = await get_dashboards_custom({'path': str(self.path)})
+        params = types.DidChangeTextDocumentParams(
+            text_document=types.VersionedTextDocumentIdentifier(uri=self.path.as_uri(), version=2),
+            content_changes=[],
+        )
+
+        compile_server.did_change(None, params)  # pyright: ignore[reportArgumentType]
+
+        self.assertEqual(compile_server.document_cache.stats()['documents'], 0)
+        compile_server._cancel_pending_change(self.path.as_uri())  # pyright: ignore[reportPrivateUsage]
+
+
+def _dispatch(handlers: Iterable[tuple[Any, tuple[Any, ...], Any]]) -> None:
+    """Run the user handlers that a pygls built-in notification handler yields."""
+    for handler, args, _ in handlers:
+        handler(*args)
+
+
+class TestOpenDocuments(unittest.IsolatedAsyncioTestCase):
+    """Test that open documents are compiled from their in-memory text and get diagnostics."""
+
+    async def asyncSetUp(self) -> None:
+        """Create a dashboard file, reset the server's cache, initialize its workspace and open the document."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.temp_dir.name) / 'dashboard.yaml'
+        self.path.write_text(DASHBOARD_YAML.format(name='On disk'))
+        self.uri = self.path.as_uri()
+        compile_server.document_cache = DocumentCache(read_document=compile_server._read_document)  # pyright: ignore[reportPrivateUsage]
+        protocol = compile_server.server.protocol
+        patcher = mock.patch.object(protocol, 'notify')
+        self.notify = patcher.start()
+        self.addCleanup(patcher.stop)
+        _ = list(protocol.lsp_initialize(types.InitializeParams(capabilities=types.ClientCapabilities())))
+        _dispatch(
+            protocol.lsp_text_document__did_open(
+                types.DidOpenTextDocumentParams(
+                    text_document=types.TextDocumentItem(
+                        uri=self.uri, language_id='yaml', version=1, text=DASHBOARD_YAML.format(name='First')
+                    )
+                )
+            )
+        )
+
+    async def asyncTearDown(self) -> None:
+        """Close the document and clean up temporary files."""
+        await self._settle()
+        self._close()
+        self.temp_dir.cleanup()
+
+    def _close(self) -> None:
+        """Send a close notification for the document."""
+        _dispatch(
+            compile_server.server.protocol.lsp_text_document__did_close(
+                types.DidCloseTextDocumentParams(text_document=types.TextDocumentIdentifier(uri=self.uri))
+            )
+        )
+
+    async def _settle(self) -> None:
+        """Wait for debounced notifications and diagnostics to be sent."""
+        await asyncio.sleep(0.05)
+        _ = await asyncio.gather(*compile_server._diagnostics_tasks, return_exceptions=True)  # pyright: ignore[reportPrivateUsage]
+
+    def _sent(self, method: str) -> list[Any]:
+        """Get the params of the notifications sent with a method."""
+        return [call.args[1] for call in self.notify.call_args_list if call.args[0] == method]
+
+    def _edit(self, version: int, old: str, new: str) -> None:
+        """Send an incremental change replacing text on the dashboard name line."""
+        line = DASHBOARD_YAML.splitlines()[1].format(name=old)
+        start = line.index(old)
+        change = types.TextDocumentContentChangePartial(
+            range=types.Range(start=types.Position(line=1, character=start), end=types.Position(line=1, character=start + len(old))),
+            text=new,
+        )
+        _dispatch(
+            compile_server.server.protocol.lsp_text_document__did_change(
+                types.DidChangeTextDocumentParams(
+                    text_document=types.VersionedTextDocumentIdentifier(uri=self.uri, version=version),
+                    content_changes=[change],
+                )
+            )
+        )
+
+    async def test_unsaved_edits_are_compiled(self) -> None:
+        """Test that compile and getDashboards see the editor text instead of the file on disk."""
+        self.assertEqual((await get_dashboards_custom({'path': str(self.path)}))['data'][0]['title'], 'First')
+
+        self._edit(2, 'First', 'Edited')
+
+        self.assertEqual((await get_dashboards_custom({'path': str(self.path)}))['data'][0]['title'], 'Edited')
+        self.assertEqual((await compile_custom({'path': str(self.path)}))['data']['attributes']['title'], 'Edited')
+
+    async def test_closed_documents_are_read_from_disk(self) -> None:
+        """Test that a closed document is compiled from the file on disk again."""
+        self._edit(2, 'First', 'Unsaved')
+        self._close()
+
+        self.assertEqual((await get_dashboards_custom({'path': str(self.path)}))['data'][0]['title'], 'On disk')
+
+    async def test_rapid_changes_send_one_notification(self) -> None:
+        """Test that a burst of edits is debounced into a single documentChanged notification."""
+        with mock.patch.object(compile_server, 'CHANGE_DEBOUNCE_SECONDS', 0.01):
+            self._edit(2, 'First', 'Fi')
+            self._edit(3, 'Fi', 'Final')
+            await self._settle()
+
+        self.assertEqual(self._sent('dashboard/documentChanged'), [{'uri': self.uri, 'version': 3}])
+
+    async def test_diagnostics_follow_edits(self) -> None:
+        """Test that diagnostics with source ranges are published on open and after edits, and cleared on close."""
+        with mock.patch.object(compile_server, 'CHANGE_DEBOUNCE_SECONDS', 0.01):
+            await self._settle()
+            self._edit(2, 'First', 'First\n  colour: red')
+            await self._settle()
+
+        opened, edited = self._sent(types.TEXT_DOCUMENT_PUBLISH_DIAGNOSTICS)
+        self.assertEqual((opened.version, opened.diagnostics), (1, []))
+        self.assertEqual(edited.version, 2)
+        self.assertEqual([diagnostic.code for diagnostic in edited.diagnostics], ['dashboards.0.colour'])
+        self.assertEqual(edited.diagnostics[0].range.start, types.Position(line=2, character=2))
+
+        self._close()
+        self.assertEqual(self._sent(types.TEXT_DOCUMENT_PUBLISH_DIAGNOSTICS)[-1].diagnostics, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
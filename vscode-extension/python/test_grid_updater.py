@@ -8,7 +8,7 @@ from pathlib import Path
 
 # Add parent directory to path for importing
 sys.path.insert(0, str(Path(__file__).parent))
-from grid_updater import update_panel_grid
+from grid_updater import rewrite_grids, update_panel_grid, update_panel_grids
 
 
 class TestGridUpdater(unittest.TestCase):
@@ -196,6 +196,93 @@ class TestGridUpdater(unittest.TestCase):
             self.assertFalse(result['success'], f'Should reject invalid grid: {invalid_grid}')
             self.assertIn('Invalid grid', result['error'])
 
+    def test_update_panel_with_id_first(self):
+        """Test updating a panel whose ID is its first key, next to other panels."""
+        yaml_content = """dashboard:
+  name: Test Dashboard
+  panels:
+    - id: first
+      grid: { x: 0, y: 0, w: 24, h: 15 }
+      markdown:
+        content: "Test 1"
+    - id: second
+      grid: { x: 24, y: 0, w: 24, h: 15 }
+      markdown:
+        content: "Test 2"
+"""
+        self.temp_file.write_text(yaml_content)
+
+        result = update_panel_grid(str(self.temp_file), 'second', {'x': 1, 'y': 2, 'w': 3, 'h': 4})
+
+        self.assertTrue(result['success'])
+        self.assertEqual(self.temp_file.read_text(), yaml_content.replace('x: 24, y: 0, w: 24, h: 15', 'x: 1, y: 2, w: 3, h: 4'))
+
+    def test_batch_update(self):
+        """Test that several panels of a dashboard list are updated at once, leaving everything else untouched."""
+        yaml_content = """# Layout
+dashboards:
+  - name: Other
+    panels:
+      - title: Untouched
+        grid: { x: 0, y: 0, w: 12, h: 5 }
+  - name: Test Dashboard
+    panels:
+      - title: Block
+        grid:  # block style
+          x: 0   # left
+          y: 0
+          w: 24
+          h: 15
+      - id: aliases
+        grid: { from_left: 24, from_top: 0, width: 24, height: 15 }
+      - title: Partial
+        grid: { x: 0, y: 15 }
+"""
+        self.temp_file.write_text(yaml_content)
+
+        result = update_panel_grids(
+            str(self.temp_file),
+            {
+                'panel_0': {'x': 24, 'y': 30, 'w': 12, 'h': 8},
+                'aliases': {'x': 0, 'y': 0, 'w': 48, 'h': 6},
+                'panel_2': {'x': 4, 'y': 5, 'w': 6, 'h': 7},
+            },
+            dashboard_index=1,
+        )
+
+        self.assertEqual(result, {'success': True, 'message': 'Updated grid for 3 panel(s)'})
+        expected = (
+            yaml_content.replace('x: 0   # left', 'x: 24   # left')
+            .replace('y: 0\n          w: 24\n          h: 15', 'y: 30\n          w: 12\n          h: 8')
+            .replace('from_left: 24, from_top: 0, width: 24, height: 15', 'from_left: 0, from_top: 0, width: 48, height: 6')
+            .replace('{ x: 0, y: 15 }', '{ x: 4, y: 5, w: 6, h: 7 }')
+        )
+        self.assertEqual(self.temp_file.read_text(), expected)
+        self.assertEqual(list(Path(self.temp_dir).iterdir()), [self.temp_file])
+
+    def test_batch_update_is_all_or_nothing(self):
+        """Test that a batch with an unknown panel leaves the file unchanged."""
+        yaml_content = """dashboards:
+  - name: Test Dashboard
+    panels:
+      - title: Panel 1
+        grid: { x: 0, y: 0, w: 24, h: 15 }
+"""
+        self.temp_file.write_text(yaml_content)
+
+        result = update_panel_grids(
+            str(self.temp_file), {'panel_0': {'x': 1, 'y': 1, 'w': 1, 'h': 1}, 'missing': {'x': 1, 'y': 1, 'w': 1, 'h': 1}}
+        )
+
+        self.assertFalse(result['success'])
+        self.assertIn('Panel with ID missing not found', result['error'])
+        self.assertEqual(self.temp_file.read_text(), yaml_content)
+
+    def test_dashboard_index_out_of_range(self):
+        """Test that an out of range dashboard index is reported."""
+        with self.assertRaisesRegex(ValueError, r'Dashboard index 2 out of range \(0-0\)'):
+            _ = rewrite_grids('dashboards:\n  - panels: []\n', {'panel_0': {'x': 0, 'y': 0, 'w': 1, 'h': 1}}, 2)
+
 
 if __name__ == '__main__':
     unittest.main()
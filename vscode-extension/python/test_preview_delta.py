@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""Unit tests for delta updates of the preview panel."""
+
+import json
+import sys
+import unittest
+from pathlib import Path
+from typing import Any
+
+# Add parent directory to path for importing
+sys.path.insert(0, str(Path(__file__).parent))
+
+from preview_delta import PreviewDeltas, split_panels
+
+
+def _compiled(title: str, *panels: tuple[str, int]) -> dict[str, Any]:
+    """Build a compiled dashboard with panels given as ID and width."""
+    panels_json = json.dumps([{'panelIndex': panel_id, 'gridData': {'w': width}} for panel_id, width in panels])
+    return {'id': 'dashboard', 'attributes': {'title': title, 'panelsJSON': panels_json}}
+
+
+class TestPreviewDeltas(unittest.TestCase):
+    """Test computing preview payloads against the last payload sent."""
+
+    def test_first_payload_is_whole(self) -> None:
+        """Test that a client without a version gets the whole dashboard, split into its panels."""
+        delta = PreviewDeltas().delta('/d.yaml', 0, _compiled('T', ('a', 1), ('b', 2)), None)
+
+        self.assertEqual(delta['version'], 1)
+        self.assertIsNone(delta['base_version'])
+        self.assertEqual(delta['dashboard'], {'id': 'dashboard', 'attributes': {'title': 'T'}})
+        self.assertEqual(delta['order'], ['a', 'b'])
+        self.assertEqual(delta['upsert']['b'], {'panelIndex': 'b', 'gridData': {'w': 2}})
+
+    def test_only_changes_are_sent(self) -> None:
+        """Test that the next payload has only the changed, added and removed panels."""
+        deltas = PreviewDeltas()
+        _ = deltas.delta('/d.yaml', 0, _compiled('T', ('a', 1), ('b', 2), ('c', 3)), None)
+
+        delta = deltas.delta('/d.yaml', 0, _compiled('T', ('a', 1), ('b', 5), ('d', 4)), 1)
+
+        self.assertEqual(delta['base_version'], 1)
+        self.assertEqual(set(delta['upsert']), {'b', 'd'})
+        self.assertEqual(delta['remove'], ['c'])
+        self.assertEqual(delta['order'], ['a', 'b', 'd'])
+        self.assertNotIn('dashboard', delta)
+
+        unchanged = deltas.delta('/d.yaml', 0, _compiled('T', ('a', 1), ('b', 5), ('d', 4)), 2)
+        self.assertEqual((unchanged['version'], unchanged['upsert'], unchanged['remove']), (3, {}, []))
+        self.assertNotIn('order', unchanged)
+
+    def test_stale_client_gets_whole_dashboard(self) -> None:
+        """Test that a client whose version the server did not send last gets a full resync."""
+        deltas = PreviewDeltas()
+        _ = deltas.delta('/d.yaml', 0, _compiled('T', ('a', 1)), None)
+        _ = deltas.delta('/d.yaml', 0, _compiled('T', ('a', 2)), 1)
+
+        delta = deltas.delta('/d.yaml', 0, _compiled('Renamed', ('a', 2)), 1)
+
+        self.assertIsNone(delta['base_version'])
+        self.assertEqual(delta['dashboard']['attributes']['title'], 'Renamed')
+
+        deltas.forget('/d.yaml')
+        self.assertEqual(deltas.delta('/d.yaml', 0, _compiled('T', ('a', 2)), 3)['version'], 1)
+
+    def test_duplicate_panel_ids_are_not_split(self) -> None:
+        """Test that panels without unique IDs are left in the dashboard."""
+        compiled = _compiled('T', ('a', 1), ('a', 2))
+
+        self.assertEqual(split_panels(compiled), (compiled, {}, []))
+
+
+if __name__ == '__main__':
+    unittest.main()
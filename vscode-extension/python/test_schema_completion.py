@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Unit tests for schema completion and hover of dashboard YAML."""
+
+import sys
+import unittest
+from pathlib import Path
+
+# Add parent directories to path for importing
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+
+from lsprotocol import types
+from schema_completion import is_dashboard_document, schema_completer
+
+DASHBOARD_YAML = """# Dashboards of the logs team
+dashboards:
+- name: Logs
+  panels:
+  - title: Pie
+    grid: {{x: 0, y: 0, w: 12, h: 10}}
+    lens:
+      type: pie
+      data_view: logs-*
+{blank}
+      metrics:
+      - aggregation: count
+{blank}
+  -
+"""
+
+
+def _labels(lines: list[str], line: int, character: int) -> list[str]:
+    """Get the labels of the completions at a position."""
+    return [item.label for item in schema_completer().complete(lines, line, character)]
+
+
+class TestSchemaCompleter(unittest.TestCase):
+    """Test completing and describing keys from the dashboard schema."""
+
+    def setUp(self) -> None:
+        """Split the dashboard document into lines."""
+        self.lines = DASHBOARD_YAML.format(blank=' ' * 6).splitlines()
+
+    def test_keys_of_the_mapping(self) -> None:
+        """Test that the keys valid in a mapping are completed, except those already in it."""
+        labels = _labels(self.lines, 13, 4)
+        self.assertIn('markdown', labels)
+        self.assertIn('lens', labels)
+
+        self.lines[3] = '  '
+        self.assertIn('panels', _labels(self.lines, 3, 2))
+        self.assertNotIn('name', _labels(self.lines, 3, 2))
+
+    def test_chart_type_selects_the_keys(self) -> None:
+        """Test that the chart type and the keys present select the keys of the matching chart."""
+        labels = _labels(self.lines, 9, 6)
+        self.assertIn('slice_by', labels)
+        self.assertNotIn('dimensions', labels)
+        self.assertNotIn('metrics', labels)
+
+        self.lines[7] = '      type: heat'
+        self.assertIn('heatmap', _labels(self.lines, 7, 16))
+
+    def test_keys_of_sequence_items(self) -> None:
+        """Test that the keys of sequence items are completed, both on the item marker line and after it."""
+        self.lines[12] = '        fi'
+        self.assertIn('field', _labels(self.lines, 12, 10))
+
+        self.lines[11] = '      - '
+        self.assertIn('aggregation', _labels(self.lines, 11, 8))
+
+    def test_hover_describes_the_key(self) -> None:
+        """Test that hovering a key shows its description, and that other positions have none."""
+        hover = schema_completer().hover(self.lines, 8, 7)
+
+        assert hover is not None
+        assert isinstance(hover.contents, types.MarkupContent)
+        self.assertEqual(hover.contents.value, '**data_view**\n\nThe data view that determines the data for the pie chart.')
+        self.assertEqual(hover.range, types.Range(start=types.Position(line=8, character=6), end=types.Position(line=8, character=15)))
+
+        self.assertIsNone(schema_completer().hover(self.lines, 8, 20))
+        self.assertIsNone(schema_completer().hover(self.lines, 0, 3))
+
+    def test_dashboard_documents(self) -> None:
+        """Test that only documents with a root dashboards key are dashboard documents."""
+        self.assertTrue(is_dashboard_document(self.lines))
+        self.assertFalse(is_dashboard_document(['on: push', 'jobs:', '  dashboards: 1']))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""Unit tests for the performance figures of the LSP compile server."""
+
+import asyncio
+import sys
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add parent directories to path for importing
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+
+from server_stats import LATENCY_WINDOW, PhaseTimings, ServerStats, process_age, process_memory, summarize
+
+
+class TestPhaseTimings(unittest.TestCase):
+    """Test cases for timing the phases of handling documents."""
+
+    def test_measure_sums_per_phase(self) -> None:
+        """Test that each phase is counted and timed separately, also when the work fails."""
+        timings = PhaseTimings()
+        with timings.measure('load'):
+            pass
+        with timings.measure('load'):
+            pass
+        with self.assertRaises(ValueError), timings.measure('compile'):
+            raise ValueError
+
+        snapshot = timings.snapshot()
+        self.assertEqual(set(snapshot), {'load', 'compile'})
+        self.assertEqual(snapshot['load']['count'], 2)
+        self.assertEqual(snapshot['compile']['count'], 1)
+        self.assertGreaterEqual(snapshot['load']['total_ms'], snapshot['load']['mean_ms'])
+
+
+class TestServerStats(unittest.IsolatedAsyncioTestCase):
+    """Test cases for the request latencies and worker utilisation."""
+
+    def test_percentiles_of_recorded_requests(self) -> None:
+        """Test that the percentiles are computed over the latencies of a method."""
+        stats = ServerStats(workers=2)
+        for ms in range(1, 101):
+            stats.record('dashboard/compile', ms / 1000)
+        stats.record('dashboard/compile', 5, 'error')
+        stats.record('dashboard/compile', 10, 'cancelled')
+
+        figures = stats.snapshot()['requests']['dashboard/compile']
+        self.assertEqual((figures['ok'], figures['error'], figures['cancelled']), (100, 1, 1))
+        self.assertEqual(figures['p50_ms'], 51.0)
+        self.assertEqual(figures['p90_ms'], 91.0)
+        self.assertEqual(figures['p99_ms'], 100.0)
+        self.assertEqual(figures['max_ms'], 5000.0)
+
+    def test_first_request_of_each_method(self) -> None:
+        """Test that the first answered request of a method is kept with when it was answered after the start of the process."""
+        stats = ServerStats(workers=1, loaded_after=2.5)
+        stats.record('dashboard/compilePreview', 1, 'cancelled')
+        stats.record('dashboard/compilePreview', 0.25)
+        stats.record('dashboard/compilePreview', 0.01)
+
+        snapshot = stats.snapshot()
+        figures = snapshot['requests']['dashboard/compilePreview']
+        self.assertEqual(figures['first_ms'], 250.0)
+        self.assertGreaterEqual(figures['first_at_seconds'], 2.5)
+        self.assertEqual(snapshot['loaded_seconds'], 2.5)
+        self.assertGreaterEqual(snapshot['uptime_seconds'], 2.5)
+
+    def test_process_age(self) -> None:
+        """Test that the age of the process is known on Linux and is not negative."""
+        age = process_age()
+        if sys.platform == 'linux':
+            self.assertIsNotNone(age)
+        if age is not None:
+            self.assertGreaterEqual(age, 0)
+
+    def test_latency_window_keeps_latest_requests(self) -> None:
+        """Test that old latencies drop out of the percentiles, but are still counted."""
+        stats = ServerStats(workers=1)
+        for _ in range(LATENCY_WINDOW):
+            stats.record('textDocument/hover', 1.0)
+        for _ in range(LATENCY_WINDOW):
+            stats.record('textDocument/hover', 0.001)
+
+        figures = stats.snapshot()['requests']['textDocument/hover']
+        self.assertEqual(figures['ok'], 2 * LATENCY_WINDOW)
+        self.assertEqual(figures['max_ms'], 1.0)
+
+    async def test_timed_records_outcomes(self) -> None:
+        """Test that timed handlers record successes, errors and cancellations, and keep their results."""
+        stats = ServerStats(workers=1)
+
+        @stats.timed('dashboard/compile')
+        async def handler(fail: bool) -> str:
+            if fail is True:
+                raise ValueError
+            return 'done'
+
+        @stats.timed('dashboard/compilePreview')
+        async def superseded() -> None:
+            raise asyncio.CancelledError
+
+        @stats.timed('textDocument/completion')
+        def sync_handler() -> int:
+            return 1
+
+        self.assertTrue(asyncio.iscoroutinefunction(handler))
+        self.assertFalse(asyncio.iscoroutinefunction(sync_handler))
+        self.assertEqual(await handler(False), 'done')
+        with self.assertRaises(ValueError):
+            await handler(True)
+        with self.assertRaises(asyncio.CancelledError):
+            await superseded()
+        self.assertEqual(sync_handler(), 1)
+
+        requests = stats.snapshot()['requests']
+        self.assertEqual((requests['dashboard/compile']['ok'], requests['dashboard/compile']['error']), (1, 1))
+        self.assertEqual(requests['dashboard/compilePreview']['cancelled'], 1)
+        self.assertNotIn('p50_ms', requests['dashboard/compilePreview'])
+        self.assertEqual(requests['textDocument/completion']['ok'], 1)
+
+    async def test_submit_tracks_waiting_and_running_tasks(self) -> None:
+        """Test that tasks count as waiting until a worker starts them, and as running until they finish."""
+        stats = ServerStats(workers=1)
+        release = threading.Event()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            first = stats.submit(executor, release.wait)
+            second = stats.submit(executor, lambda: 'second')
+            while stats.snapshot()['workers']['running'] == 0:
+                await asyncio.sleep(0.01)
+
+            workers = stats.snapshot()['workers']
+            self.assertEqual((workers['running'], workers['waiting']), (1, 1))
+            self.assertTrue(stats.busy())
+
+            # Keep the worker busy long enough to show in the rounded busy time
+            await asyncio.sleep(0.01)
+            release.set()
+            _ = await first
+            self.assertEqual(await second, 'second')
+
+        workers = stats.snapshot()['workers']
+        self.assertEqual((workers['running'], workers['waiting']), (0, 0))
+        self.assertFalse(stats.busy())
+        self.assertGreater(workers['busy_seconds'], 0)
+        self.assertGreater(workers['utilisation'], 0)
+
+    async def test_cancelled_task_stops_waiting(self) -> None:
+        """Test that a task cancelled before a worker starts it no longer counts as waiting."""
+        stats = ServerStats(workers=1)
+        release = threading.Event()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            first = stats.submit(executor, release.wait)
+            second = stats.submit(executor, lambda: None)
+            _ = second.cancel()
+            await asyncio.sleep(0)
+            self.assertEqual(stats.snapshot()['workers']['waiting'], 0)
+            release.set()
+            _ = await first
+
+
+class TestSummarize(unittest.TestCase):
+    """Test cases for the log line summary of the figures."""
+
+    def test_summary_of_figures(self) -> None:
+        """Test that the summary has the methods, phases, cache hit rate, workers and memory."""
+        stats = ServerStats(workers=2)
+        stats.record('dashboard/compilePreview', 0.02)
+        timings = PhaseTimings()
+        with timings.measure('compile'):
+            pass
+        snapshot = {
+            **stats.snapshot(),
+            'phases': timings.snapshot(),
+            'caches': {'documents': {'hit_rate': 0.75}},
+            'memory': process_memory(),
+        }
+
+        summary = summarize(snapshot)
+        self.assertTrue(summary.startswith('Server stats: first preview after '))
+        self.assertIn('dashboard/compilePreview 1x p50 20.0 ms', summary)
+        self.assertIn('compile 0 ms', summary)
+        self.assertIn('cache hits 75%', summary)
+        self.assertIn('workers 0% busy, 0 waiting', summary)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Unit tests for the background warm-up of the LSP compile server."""
+
+import asyncio
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add parent directories to path for importing
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+
+import warm_start
+from warm_start import WarmStart
+
+
+class TestWarmStart(unittest.IsolatedAsyncioTestCase):
+    """Test cases for running warm-up steps and waiting for them."""
+
+    async def test_steps_run_in_order(self) -> None:
+        """Test that the steps run one after another, and that requests can wait for each of them."""
+        order: list[str] = []
+        release = threading.Event()
+        warm = WarmStart()
+        thread = warm.start([('schema', lambda: order.append('schema')), ('index', lambda: (release.wait(), order.append('index')))])
+
+        await warm.ready('schema')
+        self.assertTrue(warm.done('schema'))
+        self.assertFalse(warm.done('index'))
+
+        release.set()
+        await warm.ready('index')
+        thread.join()
+        self.assertEqual(order, ['schema', 'index'])
+        self.assertTrue(warm.snapshot()['index']['done'])
+
+    async def test_unknown_step_is_not_waited_for(self) -> None:
+        """Test that a step that was never started is not waited for, so requests do the work themselves, but is not done."""
+        warm = WarmStart()
+
+        await warm.ready('schema')
+        self.assertFalse(warm.done('schema'))
+        self.assertEqual(warm.snapshot(), {})
+
+    async def test_failed_step_is_done(self) -> None:
+        """Test that a failing step does not stop the later steps and releases the requests waiting for it."""
+
+        def fail() -> None:
+            msg = 'no schema'
+            raise ValueError(msg)
+
+        warm = WarmStart()
+        with self.assertLogs(warm_start.logger, level='ERROR'):
+            thread = warm.start([('schema', fail), ('completion', lambda: None)])
+            await warm.ready('completion')
+            thread.join()
+
+        snapshot = warm.snapshot()
+        self.assertEqual(snapshot['schema']['error'], 'no schema')
+        self.assertTrue(snapshot['schema']['done'])
+        self.assertIsNone(snapshot['completion']['error'])
+
+    def test_steps_wait_while_workers_are_busy(self) -> None:
+        """Test that a step waits for the compile workers to be idle, but not longer than the limit."""
+        busy = threading.Event()
+        busy.set()
+        warm = WarmStart(busy=busy.is_set)
+        with mock.patch.object(warm_start, 'IDLE_POLL_SECONDS', 0.01):
+            thread = warm.start([('schema', lambda: None)])
+            time.sleep(0.1)
+            self.assertFalse(warm.done('schema'))
+            busy.clear()
+            thread.join(timeout=5)
+        self.assertTrue(warm.done('schema'))
+
+        busy.set()
+        warm = WarmStart(busy=busy.is_set)
+        with mock.patch.object(warm_start, 'IDLE_WAIT_SECONDS', 0.05):
+            warm.start([('schema', lambda: None)]).join(timeout=5)
+        self.assertTrue(warm.done('schema'))
+
+    async def test_ready_does_not_block_the_event_loop(self) -> None:
+        """Test that other tasks keep running while a request waits for a step."""
+        release = threading.Event()
+        warm = WarmStart()
+        thread = warm.start([('schema', release.wait)])
+
+        waiting = asyncio.create_task(warm.ready('schema'))
+        await asyncio.sleep(0.05)
+        self.assertFalse(waiting.done())
+
+        release.set()
+        await waiting
+        thread.join()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""Unit tests for the workspace-wide dashboard index."""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add parent directories to path for importing
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+
+from workspace_index import WorkspaceIndex, index_document
+
+OVERVIEW_YAML = """dashboards:
+- id: overview
+  name: Overview
+  panels:
+  - title: Navigation
+    grid: {x: 0, y: 0, w: 48, h: 2}
+    links:
+      links:
+      - label: Hosts
+        dashboard: hosts
+  - id: cpu
+    grid: {x: 0, y: 2, w: 24, h: 10}
+    lens:
+      type: metric
+      data_view: metrics-*
+      primary:
+        aggregation: count
+"""
+
+HOSTS_YAML = """dashboards:
+- id: hosts
+  name: Hosts
+  controls:
+  - type: options
+    data_view: metrics-*
+    field: host.name
+"""
+
+
+class TestIndexDocument(unittest.TestCase):
+    """Test finding the entries of a document."""
+
+    def test_entries(self) -> None:
+        """Test that dashboards, panels, data views and links are found with their source ranges."""
+        entries = index_document(OVERVIEW_YAML)
+
+        self.assertEqual(
+            [(entry.kind, entry.name, entry.id, entry.range[:2]) for entry in entries],
+            [
+                ('dashboard', 'Overview', 'overview', (2, 8)),
+                ('panel', 'Navigation', None, (4, 11)),
+                ('link', 'hosts', None, (9, 19)),
+                ('panel', 'cpu', 'cpu', (10, 8)),
+                ('data_view', 'metrics-*', None, (14, 17)),
+            ],
+        )
+        self.assertTrue(all(entry.container == 'Overview' for entry in entries[1:]))
+
+    def test_generated_dashboard_id(self) -> None:
+        """Test that dashboards without an ID get the ID the compiler generates for them."""
+        entry = index_document('dashboards:\n- name: Untitled\n')[0]
+
+        self.assertIsNotNone(entry.id)
+        self.assertEqual(entry.id, index_document('dashboards:\n- name: Untitled\n  panels: []\n')[0].id)
+
+    def test_invalid_documents(self) -> None:
+        """Test that invalid YAML and files without dashboards have no entries."""
+        self.assertEqual(index_document('dashboards: [unclosed\n'), [])
+        self.assertEqual(index_document('services:\n- name: web\n'), [])
+
+
+class TestWorkspaceIndex(unittest.TestCase):
+    """Test indexing, searching and saving a workspace."""
+
+    def setUp(self) -> None:
+        """Create a workspace with two dashboard files."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name).resolve()
+        (self.root / 'overview.yaml').write_text(OVERVIEW_YAML)
+        (self.root / 'nested').mkdir()
+        (self.root / 'nested' / 'hosts.yml').write_text(HOSTS_YAML)
+        (self.root / 'node_modules').mkdir()
+        (self.root / 'node_modules' / 'ignored.yaml').write_text(HOSTS_YAML)
+        self.index = WorkspaceIndex()
+        self.index.scan([str(self.root)])
+
+    def tearDown(self) -> None:
+        """Clean up temporary files."""
+        self.temp_dir.cleanup()
+
+    def test_find_across_files(self) -> None:
+        """Test that links resolve to dashboards and data view uses are found in all files."""
+        link = self.index.entry_at(str(self.root / 'overview.yaml'), 9, 22)
+        assert link is not None
+
+        self.assertEqual([path for path, _ in self.index.find('dashboard', entry_id=link.name)], [str(self.root / 'nested' / 'hosts.yml')])
+        self.assertEqual(len(self.index.find('data_view', name='metrics-*')), 2)
+        self.assertEqual([entry.name for _, entry in self.index.symbols('HOST')], ['Hosts'])
+
+    def test_only_changed_files_are_indexed_again(self) -> None:
+        """Test that a rescan reads only changed files, and drops deleted ones."""
+        self.assertEqual(self.index.indexed, 2)
+        (self.root / 'overview.yaml').write_text(OVERVIEW_YAML.replace('Overview', 'Home'))
+        (self.root / 'nested' / 'hosts.yml').unlink()
+
+        self.index.scan([str(self.root)])
+
+        self.assertEqual(self.index.indexed, 3)
+        self.assertEqual([entry.name for _, entry in self.index.symbols('')][:1], ['Home'])
+        self.assertEqual(self.index.find('dashboard', entry_id='hosts'), [])
+
+    def test_open_documents_are_indexed_from_their_text(self) -> None:
+        """Test that unsaved text replaces the entries read from disk."""
+        path = str(self.root / 'overview.yaml')
+
+        self.assertTrue(self.index.update_file(path, OVERVIEW_YAML.replace('Navigation', 'Menu')))
+        self.assertFalse(self.index.update_file(path, OVERVIEW_YAML.replace('Navigation', 'Menu')))
+        self.assertEqual(self.index.entries(path)[1].name, 'Menu')
+
+    def test_saved_index_is_reused(self) -> None:
+        """Test that a loaded index skips the files that did not change since it was saved."""
+        cache = self.root / 'cache' / 'index.json'
+        self.index.save(str(cache))
+
+        loaded = WorkspaceIndex()
+        self.assertTrue(loaded.load(str(cache)))
+        loaded.scan([str(self.root)])
+
+        self.assertEqual(loaded.indexed, 0)
+        self.assertEqual(loaded.stats(), {**self.index.stats(), 'indexed': 0})
+        self.assertFalse(WorkspaceIndex().load(str(self.root / 'missing.json')))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""Unit tests for the YAML node helpers shared by the LSP server modules."""
+
+import sys
+import unittest
+from pathlib import Path
+
+import yaml
+
+# Add parent directories to path for importing
+sys.path.insert(0, str(Path(__file__).parent))
+
+from yaml_nodes import YamlLoader, mapping_value
+
+
+def _root(content: str) -> yaml.Node | None:
+    loader = YamlLoader(content)
+    try:
+        return loader.get_single_node()
+    finally:
+        loader.dispose()
+
+
+class TestMappingValue(unittest.TestCase):
+    """Test cases for looking up the value nodes of mapping keys."""
+
+    def test_first_key_present_wins(self) -> None:
+        """Test that the keys are tried in order and the first one the mapping has is used."""
+        root = _root('width: 12\nw: 6\n')
+
+        node = mapping_value(root, 'w', 'width')
+
+        self.assertIsInstance(node, yaml.ScalarNode)
+        self.assertEqual(node.value if isinstance(node, yaml.ScalarNode) else None, '6')
+        self.assertIsNone(mapping_value(root, 'h', 'height'))
+
+    def test_non_mapping_has_no_values(self) -> None:
+        """Test that sequences, scalars and missing nodes have no values."""
+        self.assertIsNone(mapping_value(_root('- w: 6\n'), 'w'))
+        self.assertIsNone(mapping_value(_root('6'), 'w'))
+        self.assertIsNone(mapping_value(None, 'w'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+"""Warm-up of the LSP compile server in the background, once the client is initialized.
+
+Generating the schema, building the completion graph, indexing the workspace and importing
+the Kibana client would otherwise fall to the first requests that need them. They run one
+after another in a background thread instead. Requests that need a step wait for it rather
+than doing the same work at the same time, and each step first waits for the compile workers
+to be idle, so that the warm-up does not hold up the first preview.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Longest a step waits for the compile workers to be idle, so that constant edits do not hold it off
+IDLE_WAIT_SECONDS = 2.0
+
+# Interval at which a step checks whether the compile workers are idle
+IDLE_POLL_SECONDS = 0.05
+
+
+@dataclass
+class WarmStart:
+    """Warm-up steps run in a background thread, which requests can wait for."""
+
+    busy: Callable[[], bool] = field(default=lambda: False)
+    """Whether the compile workers have work, each step waits until they are idle."""
+
+    _done: dict[str, threading.Event] = field(default_factory=dict)
+    _milliseconds: dict[str, float] = field(default_factory=dict)
+    _errors: dict[str, str] = field(default_factory=dict)
+
+    def start(self, steps: list[tuple[str, Callable[[], object]]]) -> threading.Thread:
+        """Run the steps in order in a background thread.
+
+        Args:
+            steps: Names and functions of the steps
+
+        Returns:
+            The thread running the steps
+        """
+        for name, _ in steps:
+            self._done[name] = threading.Event()
+        thread = threading.Thread(target=self._run, args=(steps,), name='warm-start', daemon=True)
+        thread.start()
+        return thread
+
+    def _run(self, steps: list[tuple[str, Callable[[], object]]]) -> None:
+        for name, step in steps:
+            self._wait_until_idle()
+            start = time.perf_counter()
+            try:
+                _ = step()
+            except Exception as e:
+                logger.exception(f'Warm-up step {name} failed')
+                self._errors[name] = str(e)
+            finally:
+                self._milliseconds[name] = round((time.perf_counter() - start) * 1000, 2)
+                self._done[name].set()
+
+    def _wait_until_idle(self) -> None:
+        deadline = time.monotonic() + IDLE_WAIT_SECONDS
+        while self.busy() is True and time.monotonic() < deadline:
+            time.sleep(IDLE_POLL_SECONDS)
+
+    def done(self, step: str) -> bool:
+        """Check whether a step has run, also if it failed.
+
+        Args:
+            step: Name of the step
+
+        Returns:
+            True if the step has run, False while it is pending or before the warm-up started
+        """
+        event = self._done.get(step)
+        return event is not None and event.is_set()
+
+    async def ready(self, step: str) -> None:
+        """Wait for a step to have run, without blocking the event loop.
+
+        Args:
+            step: Name of the step, a step that was never started is not waited for
+        """
+        event = self._done.get(step)
+        if event is not None and not event.is_set():
+            _ = await asyncio.to_thread(event.wait)
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:  # pyright: ignore[reportExplicitAny]
+        """Get the state of the steps.
+
+        Returns:
+            Dictionary with whether each step is done, the milliseconds it took and its error, if it failed
+        """
+        return {
+            name: {'done': event.is_set(), 'ms': self._milliseconds.get(name), 'error': self._errors.get(name)}
+            for name, event in self._done.items()
+        }
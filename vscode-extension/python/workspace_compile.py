@@ -0,0 +1,117 @@
+"""Compilation of every dashboard file of a workspace, for the compile workspace command.
+
+The files are found and serialized with the functions of `kb-dashboard compile`, so that
+the combined output is the same. Files are compiled one per task, so that the server can
+spread them over a pool of processes and report each file as soon as it is done. A task
+returns the NDJSON lines of the file's dashboards and the validation issues with their
+source ranges, so that they can be published as diagnostics.
+
+Tasks only take and return plain, picklable data. Files that are not dashboard files,
+those without a root `dashboards` key, are skipped.
+
+The CLI is imported when a workspace is first compiled, as importing it would slow down
+the start of the server.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from diagnostics import DocumentParser, Issue
+from document_cache import normalize_path
+from lsprotocol import types
+from schema_completion import is_dashboard_document
+
+# Processes for compiling a workspace, one core is left to the editor and the server
+WORKSPACE_COMPILE_WORKERS = max(1, min((os.cpu_count() or 2) - 1, 8))
+
+
+@dataclass(frozen=True)
+class FileResult:
+    """The result of compiling one dashboard file."""
+
+    path: str
+    """Normalized path of the file."""
+
+    lines: list[str] = field(default_factory=list)
+    """NDJSON lines of the compiled dashboards, empty if the file has errors."""
+
+    issues: list[Issue] = field(default_factory=list)
+    """Problems of the file, located in its source."""
+
+    @property
+    def error(self) -> str | None:
+        """The first problem of the file, for summaries, or None if it compiled."""
+        return self.issues[0].message if len(self.issues) > 0 else None
+
+
+def compile_file(path: str, content: str | bytes | None = None) -> FileResult | None:
+    """Compile all dashboards of a file into NDJSON lines.
+
+    Args:
+        path: Normalized path of the file
+        content: The file content, or None to read the file from disk
+
+    Returns:
+        The result, or None if the file is not a dashboard file
+    """
+    if content is None:
+        try:
+            content = Path(path).read_bytes()
+        except OSError as e:
+            return FileResult(path=path, issues=[file_issue(f'Cannot read {path}: {e.strerror}')])
+
+    text = content.decode('utf-8', errors='replace') if isinstance(content, bytes) else content
+    if not is_dashboard_document(text.splitlines()):
+        return None
+
+    parsed = DocumentParser().parse(content)
+    if len(parsed.issues) > 0:
+        return FileResult(path=path, issues=parsed.issues)
+    from dashboard_compiler.cli import dashboard_ndjson_line
+
+    try:
+        lines = [dashboard_ndjson_line(dashboard) for dashboard in parsed.dashboards]
+    except (ValueError, TypeError, KeyError) as e:
+        return FileResult(path=path, issues=[file_issue(f'Error compiling {path}: {e}')])
+    return FileResult(path=path, lines=lines)
+
+
+def workspace_files(roots: list[str]) -> list[str]:
+    """Find the YAML files of the workspace folders like `kb-dashboard compile` finds those of its input directory.
+
+    Args:
+        roots: Paths of the workspace folders
+
+    Returns:
+        Normalized paths of the files, in the order their dashboards are written in
+    """
+    from dashboard_compiler.cli import find_yaml_files
+
+    return [normalize_path(str(path)) for root in roots for path in find_yaml_files(Path(root))]
+
+
+def file_issue(message: str) -> Issue:
+    """Make an issue of a whole file, located at its start.
+
+    Args:
+        message: Description of the problem
+
+    Returns:
+        The issue
+    """
+    start = types.Position(line=0, character=0)
+    return Issue(loc=(), message=message, range=types.Range(start=start, end=start))
+
+
+def create_pool() -> ProcessPoolExecutor:
+    """Create the process pool for compiling a workspace.
+
+    Processes are spawned rather than forked, as forking the multi-threaded server is unsafe.
+
+    Returns:
+        The pool, whose processes start on first use
+    """
+    return ProcessPoolExecutor(max_workers=WORKSPACE_COMPILE_WORKERS, mp_context=multiprocessing.get_context('spawn'))
@@ -0,0 +1,347 @@
+"""Workspace-wide index of the dashboards, panels, data views and dashboard links in YAML files.
+
+The index is built from the YAML node trees of the files rather than from validated
+dashboards, so it also covers files with validation errors, and every entry has its
+source range. It answers workspace symbol searches, finds the dashboard a links panel
+points to and finds every use of a data view, without reading the workspace again.
+
+Files are indexed again only when they changed: files on disk are compared by size and
+modification time, and documents open in the editor by a hash of their text. The index
+can be saved to a JSON file and loaded in the next session, after which a scan of the
+workspace only reads the files that changed in the meantime.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections.abc import Iterable, Iterator
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Literal
+
+import yaml
+from yaml_nodes import YamlLoader, mapping_value
+
+from dashboard_compiler.shared.config import stable_id_generator
+
+# Version of the saved index format, saved indexes of another version are ignored
+INDEX_FORMAT_VERSION = 1
+
+# Directories that never contain dashboards of the workspace
+_SKIPPED_DIRECTORIES = frozenset({'.git', '.hg', '.svn', '.venv', 'venv', 'node_modules', '__pycache__', '.mypy_cache', '.ruff_cache'})
+
+type EntryKind = Literal['dashboard', 'panel', 'data_view', 'link']
+
+
+@dataclass(frozen=True)
+class IndexEntry:
+    """Something defined or referenced in a dashboard file."""
+
+    kind: EntryKind
+    """A dashboard, a panel, a use of a data view, or a link to a dashboard."""
+
+    name: str
+    """Name of the dashboard, title of the panel, name of the data view, or ID of the linked dashboard."""
+
+    range: tuple[int, int, int, int]
+    """Start line, start column, end line and end column of the value in the file, zero-based."""
+
+    id: str | None = None
+    """ID of the dashboard or panel, for dashboards without an explicit ID the one the compiler generates."""
+
+    container: str | None = None
+    """Name of the dashboard the entry belongs to, for all but dashboards."""
+
+    def contains(self, line: int, character: int) -> bool:
+        """Whether a position is within the entry's range."""
+        start_line, start_character, end_line, end_character = self.range
+        return (start_line, start_character) <= (line, character) <= (end_line, end_character)
+
+
+@dataclass(frozen=True)
+class _FileEntry:
+    """The entries of one file, and what they were indexed from."""
+
+    size: int
+    mtime_ns: int
+    content_hash: str
+    entries: list[IndexEntry]
+
+
+@dataclass
+class WorkspaceIndex:
+    """Index of the dashboard files of a workspace, updated file by file."""
+
+    indexed: int = 0
+    """Number of times a file was indexed, as opposed to skipped because it did not change."""
+
+    _files: dict[str, _FileEntry] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def scan(self, roots: Iterable[str]) -> None:
+        """Index the YAML files under some directories, skipping unchanged ones, and drop files that no longer exist.
+
+        Args:
+            roots: Directories to scan
+        """
+        found: set[str] = set()
+        for path in _yaml_files(roots):
+            found.add(path)
+            _ = self.update_file(path)
+        root_paths = [str(Path(root).resolve()) for root in roots]
+        with self._lock:
+            gone = [path for path in self._files if path not in found and any(_is_within(path, root) for root in root_paths)]
+            for path in gone:
+                del self._files[path]
+
+    def update_file(self, path: str, content: str | bytes | None = None) -> bool:
+        """Index a file again if it changed.
+
+        Args:
+            path: Normalized path of the file
+            content: The file content if it is open in the editor, else the file is read from disk
+
+        Returns:
+            Whether the file was indexed, False if it did not change or cannot be read
+        """
+        with self._lock:
+            previous = self._files.get(path)
+        size, mtime_ns = -1, -1
+        if content is None:
+            try:
+                stat = Path(path).stat()
+            except OSError:
+                self.remove_file(path)
+                return False
+            size, mtime_ns = stat.st_size, stat.st_mtime_ns
+            if previous is not None and (previous.size, previous.mtime_ns) == (size, mtime_ns):
+                return False
+            try:
+                content = Path(path).read_bytes()
+            except OSError:
+                self.remove_file(path)
+                return False
+
+        content_hash = hashlib.sha256(content.encode('utf-8') if isinstance(content, str) else content).hexdigest()
+        if previous is not None and previous.content_hash == content_hash:
+            with self._lock:
+                self._files[path] = _FileEntry(size=size, mtime_ns=mtime_ns, content_hash=content_hash, entries=previous.entries)
+            return False
+
+        entries = index_document(content)
+        with self._lock:
+            self._files[path] = _FileEntry(size=size, mtime_ns=mtime_ns, content_hash=content_hash, entries=entries)
+            self.indexed += 1
+        return True
+
+    def remove_file(self, path: str) -> None:
+        """Drop a file from the index, e.g. when it was deleted.
+
+        Args:
+            path: Normalized path of the file
+        """
+        with self._lock:
+            _ = self._files.pop(path, None)
+
+    def entries(self, path: str) -> list[IndexEntry]:
+        """Get the entries of a file.
+
+        Args:
+            path: Normalized path of the file
+
+        Returns:
+            The entries in document order, empty if the file is not indexed
+        """
+        with self._lock:
+            file_entry = self._files.get(path)
+        return file_entry.entries if file_entry is not None else []
+
+    def entry_at(self, path: str, line: int, character: int) -> IndexEntry | None:
+        """Get the entry at a position of a file.
+
+        Args:
+            path: Normalized path of the file
+            line: Zero-based line
+            character: Zero-based column
+
+        Returns:
+            The entry whose range contains the position, or None
+        """
+        return next((entry for entry in self.entries(path) if entry.contains(line, character)), None)
+
+    def find(self, kind: EntryKind, *, name: str | None = None, entry_id: str | None = None) -> list[tuple[str, IndexEntry]]:
+        """Find the entries of a kind with a name or ID, in all files.
+
+        Args:
+            kind: Kind of the entries
+            name: Name the entries must have, if given
+            entry_id: ID the entries must have, if given
+
+        Returns:
+            The matching entries with the paths of their files, ordered by path
+        """
+        return [
+            (path, entry)
+            for path, entry in self._all()
+            if entry.kind == kind and (name is None or entry.name == name) and (entry_id is None or entry.id == entry_id)
+        ]
+
+    def symbols(self, query: str) -> list[tuple[str, IndexEntry]]:
+        """Search the dashboards and panels of all files.
+
+        Args:
+            query: Text to search for, matched case-insensitively against names and IDs; empty matches everything
+
+        Returns:
+            The matching dashboards and panels with the paths of their files, ordered by path
+        """
+        query = query.casefold()
+        return [
+            (path, entry)
+            for path, entry in self._all()
+            if entry.kind in ('dashboard', 'panel') and (query in entry.name.casefold() or query in (entry.id or '').casefold())
+        ]
+
+    def save(self, path: str) -> None:
+        """Save the index to a JSON file, through a temporary file so that a partial write is never loaded.
+
+        Args:
+            path: Path of the file to write
+        """
+        with self._lock:
+            files = {file_path: asdict(file_entry) for file_path, file_entry in self._files.items()}
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temp = target.with_name(f'.{target.name}.tmp')
+        _ = temp.write_text(json.dumps({'version': INDEX_FORMAT_VERSION, 'files': files}))
+        _ = temp.replace(target)
+
+    def load(self, path: str) -> bool:
+        """Load an index saved by an earlier session, replacing the current one.
+
+        Args:
+            path: Path of the saved index
+
+        Returns:
+            Whether the index was loaded, False if the file is missing, invalid or of another format version
+        """
+        try:
+            data = json.loads(Path(path).read_bytes())  # pyright: ignore[reportAny]
+            if data['version'] != INDEX_FORMAT_VERSION:
+                return False
+            files = {
+                file_path: _FileEntry(
+                    size=file_entry['size'],
+                    mtime_ns=file_entry['mtime_ns'],
+                    content_hash=file_entry['content_hash'],
+                    entries=[IndexEntry(**{**entry, 'range': tuple(entry['range'])}) for entry in file_entry['entries']],
+                )
+                for file_path, file_entry in data['files'].items()  # pyright: ignore[reportAny]
+            }
+        except (OSError, ValueError, KeyError, TypeError):
+            return False
+        with self._lock:
+            self._files = files
+        return True
+
+    def stats(self) -> dict[str, int]:
+        """Get the index counters.
+
+        Returns:
+            Dictionary with the number of indexed files, entries and times a file was indexed
+        """
+        with self._lock:
+            return {
+                'files': len(self._files),
+                'entries': sum(len(file_entry.entries) for file_entry in self._files.values()),
+                'indexed': self.indexed,
+            }
+
+    def _all(self) -> list[tuple[str, IndexEntry]]:
+        with self._lock:
+            files = sorted(self._files.items())
+        return [(path, entry) for path, file_entry in files for entry in file_entry.entries]
+
+
+def index_document(content: str | bytes) -> list[IndexEntry]:
+    """Find the dashboards, panels, data views and dashboard links of a YAML document.
+
+    Args:
+        content: The document content
+
+    Returns:
+        The entries in document order, empty if the document is not valid YAML or has no dashboards
+    """
+    loader = YamlLoader(content)
+    try:
+        root = loader.get_single_node()
+    except yaml.YAMLError:
+        return []
+    finally:
+        loader.dispose()
+
+    dashboards = mapping_value(root, 'dashboards')
+    if not isinstance(dashboards, yaml.SequenceNode):
+        return []
+
+    entries: dict[IndexEntry, None] = {}
+    for dashboard in dashboards.value:  # pyright: ignore[reportAny]
+        name_node = mapping_value(dashboard, 'name')  # pyright: ignore[reportAny]
+        if not isinstance(name_node, yaml.ScalarNode):
+            continue
+        name: str = name_node.value  # pyright: ignore[reportAny]
+        id_node = mapping_value(dashboard, 'id')  # pyright: ignore[reportAny]
+        dashboard_id: str = id_node.value if isinstance(id_node, yaml.ScalarNode) else stable_id_generator([name])  # pyright: ignore[reportAny]
+        entries[IndexEntry(kind='dashboard', name=name, range=_range(name_node), id=dashboard_id)] = None
+        for entry in _walk(dashboard, name, parent_key=None):  # pyright: ignore[reportAny]
+            entries[entry] = None
+    return list(entries)
+
+
+def _walk(node: yaml.Node, dashboard: str, parent_key: str | None) -> Iterator[IndexEntry]:
+    """Find the panels, data views and dashboard links below a node of a dashboard."""
+    if isinstance(node, yaml.SequenceNode):
+        for item in node.value:  # pyright: ignore[reportAny]
+            if parent_key == 'panels':
+                yield from _panel(item, dashboard)  # pyright: ignore[reportAny]
+            if parent_key == 'links':
+                link_node = mapping_value(item, 'dashboard')  # pyright: ignore[reportAny]
+                if isinstance(link_node, yaml.ScalarNode):
+                    yield IndexEntry(kind='link', name=link_node.value, range=_range(link_node), container=dashboard)  # pyright: ignore[reportAny]
+            yield from _walk(item, dashboard, parent_key=None)  # pyright: ignore[reportAny]
+    elif isinstance(node, yaml.MappingNode):
+        for key_node, value_node in node.value:  # pyright: ignore[reportAny]
+            key: object = key_node.value if isinstance(key_node, yaml.ScalarNode) else None  # pyright: ignore[reportAny]
+            if key == 'data_view' and isinstance(value_node, yaml.ScalarNode):
+                yield IndexEntry(kind='data_view', name=value_node.value, range=_range(value_node), container=dashboard)  # pyright: ignore[reportAny]
+            yield from _walk(value_node, dashboard, parent_key=key if isinstance(key, str) else None)  # pyright: ignore[reportAny]
+
+
+def _panel(node: yaml.Node, dashboard: str) -> Iterator[IndexEntry]:
+    """Get the entry of a panel, located at its title, or at its ID if it has no title."""
+    title_node = mapping_value(node, 'title')
+    id_node = mapping_value(node, 'id')
+    panel_id: str | None = id_node.value if isinstance(id_node, yaml.ScalarNode) else None  # pyright: ignore[reportAny]
+    if isinstance(title_node, yaml.ScalarNode) and len(title_node.value) > 0:  # pyright: ignore[reportAny]
+        yield IndexEntry(kind='panel', name=title_node.value, range=_range(title_node), id=panel_id, container=dashboard)  # pyright: ignore[reportAny]
+    elif isinstance(id_node, yaml.ScalarNode) and panel_id is not None:
+        yield IndexEntry(kind='panel', name=panel_id, range=_range(id_node), id=panel_id, container=dashboard)
+
+
+def _range(node: yaml.Node) -> tuple[int, int, int, int]:
+    return node.start_mark.line, node.start_mark.column, node.end_mark.line, node.end_mark.column
+
+
+def _yaml_files(roots: Iterable[str]) -> Iterator[str]:
+    """Find the YAML files under some directories, skipping version control, cache and dependency directories."""
+    for root in roots:
+        for directory, subdirectories, files in os.walk(root):
+            subdirectories[:] = [name for name in subdirectories if name not in _SKIPPED_DIRECTORIES]
+            for name in files:
+                if name.endswith(('.yaml', '.yml')):
+                    yield str(Path(directory, name).resolve())
+
+
+def _is_within(path: str, root: str) -> bool:
+    return path == root or path.startswith(root.rstrip(os.sep) + os.sep)
@@ -0,0 +1,28 @@
+"""Parsing YAML documents into node trees, which keep the position of every value in the document.
+
+Kept free of the compiler and LSP imports, so that the grid updater can still run as a lightweight script.
+"""
+
+import yaml
+
+# libyaml is several times faster than the pure Python parser, use it when it is installed
+YamlLoader: type[yaml.SafeLoader] = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+def mapping_value(node: yaml.Node | None, *keys: str) -> yaml.Node | None:
+    """Get the value node of the first of the keys that a mapping node has.
+
+    Args:
+        node: The node to look in, anything but a mapping node has no values
+        keys: The keys to look for, in order of preference
+
+    Returns:
+        The value node, or None if the node is not a mapping or has none of the keys
+    """
+    if not isinstance(node, yaml.MappingNode):
+        return None
+    for key in keys:
+        for key_node, value_node in node.value:  # pyright: ignore[reportAny]
+            if isinstance(key_node, yaml.ScalarNode) and key_node.value == key:  # pyright: ignore[reportAny]
+                return value_node  # pyright: ignore[reportAny]
+    return None
@@ -48,6 +48,30 @@ interface CompileResult {
     error?: string;
 }
 
+/**
+ * Changes of a compiled dashboard since an earlier preview payload, see python/preview_delta.py.
+ * A payload without base_version is a whole dashboard.
+ */
+export interface PreviewDelta {
+    version: number;
+    // eslint-disable-next-line @typescript-eslint/naming-convention
+    base_version: number | null;
+    // The compiled dashboard without attributes.panelsJSON, if it changed
+    dashboard?: Record<string, unknown>;
+    // Panel IDs in order, if it changed
+    order?: string[];
+    // Changed or added panels by panelIndex
+    upsert: Record<string, unknown>;
+    // IDs of removed panels
+    remove: string[];
+}
+
+interface PreviewResult {
+    success: boolean;
+    data?: PreviewDelta;
+    error?: string;
+}
+
 interface DashboardListResult {
     success: boolean;
     data?: DashboardInfo[];
@@ -60,6 +84,13 @@ interface GridLayoutResult {
     error?: string;
 }
 
+// Matches Python LSP server response format
+interface UpdateGridResult {
+    success: boolean;
+    message?: string;
+    error?: string;
+}
+
 // Matches Python LSP server response format
 interface UploadResult {
     success: boolean;
@@ -70,9 +101,42 @@ interface UploadResult {
     error?: string;
 }
 
+// Matches Python LSP server response format for dashboard.compileWorkspace
+export interface CompileWorkspaceResult {
+    success: boolean;
+    output?: string | null;
+    files?: number;
+    dashboards?: number;
+    errors?: { path: string; error: string }[];
+    cancelled?: boolean;
+    error?: string;
+}
+
+// Matches Python LSP server response format for dashboard/stats, see python/server_stats.py
+interface StatsResult {
+    success: boolean;
+    data?: Record<string, unknown>;
+    error?: string;
+}
+
+// Matches Python LSP server response format, data is left out when the client's version is current
+export interface SchemaResult {
+    success: boolean;
+    version?: string;
+    data?: unknown;
+    error?: string;
+}
+
 export class DashboardCompilerLSP {
     private client: LanguageClient | null = null;
     private outputChannel: vscode.OutputChannel;
+    private documentChangedEmitter = new vscode.EventEmitter<string>();
+
+    /**
+     * Fires with the file path of an open YAML document after its unsaved edits have settled.
+     * The server debounces the edits, so a burst of keystrokes fires once.
+     */
+    readonly onDidChangeDocument = this.documentChangedEmitter.event;
 
     constructor(
         private context: vscode.ExtensionContext,
@@ -176,6 +240,15 @@ export class DashboardCompilerLSP {
 
             // Use our output channel for logging
             outputChannel: this.outputChannel,
+
+            // Where the server keeps its index of the workspace's dashboards between sessions,
+            // and how often it logs a summary of its performance figures
+            initializationOptions: {
+                indexCachePath: this.context.storageUri
+                    ? path.join(this.context.storageUri.fsPath, 'workspace-index.json')
+                    : undefined,
+                statsLogInterval: this.configService.getServerStatsLogInterval(),
+            },
         };
 
         // Create the language client
@@ -193,6 +266,11 @@ export class DashboardCompilerLSP {
         this.client.onNotification('dashboard/fileChanged', (params: { uri: string }) => {
             this.outputChannel.appendLine(`Dashboard file changed: ${params.uri}`);
         });
+
+        // Register notification handler for settled edits of open documents
+        this.client.onNotification('dashboard/documentChanged', (params: { uri: string }) => {
+            this.documentChangedEmitter.fire(vscode.Uri.parse(params.uri).fsPath);
+        });
     }
 
     /**
@@ -200,9 +278,10 @@ export class DashboardCompilerLSP {
      *
      * @param filePath Path to the YAML file
      * @param dashboardIndex Index of the dashboard to compile (default: 0)
+     * @param token Optional token to cancel the request when its result is no longer needed
      * @returns Compiled dashboard object
      */
-    async compile(filePath: string, dashboardIndex: number = 0): Promise<CompiledDashboard> {
+    async compile(filePath: string, dashboardIndex: number = 0, token?: vscode.CancellationToken): Promise<CompiledDashboard> {
         if (!this.client) {
             throw new Error('LSP client not started');
         }
@@ -210,12 +289,42 @@ export class DashboardCompilerLSP {
         const result = await this.client.sendRequest<CompileResult>(
             'dashboard/compile',
             // eslint-disable-next-line @typescript-eslint/naming-convention
-            { path: filePath, dashboard_index: dashboardIndex }
+            { path: filePath, dashboard_index: dashboardIndex },
+            token
         );
 
         return this.checkLspResult(result, 'Compilation failed') as CompiledDashboard;
     }
 
+    /**
+     * Compile a dashboard for the preview, as the changes since the payload the preview has.
+     *
+     * @param filePath Path to the YAML file
+     * @param dashboardIndex Index of the dashboard to compile
+     * @param version Version of the preview's last payload, or undefined to get the whole dashboard
+     * @param token Optional token to cancel the request
+     * @returns The changes, or the whole dashboard if the server no longer has that version
+     */
+    async compilePreview(
+        filePath: string,
+        dashboardIndex: number,
+        version: number | undefined,
+        token?: vscode.CancellationToken
+    ): Promise<PreviewDelta> {
+        if (!this.client) {
+            throw new Error('LSP client not started');
+        }
+
+        const result = await this.client.sendRequest<PreviewResult>(
+            'dashboard/compilePreview',
+            // eslint-disable-next-line @typescript-eslint/naming-convention
+            { path: filePath, dashboard_index: dashboardIndex, version: version ?? null },
+            token
+        );
+
+        return this.checkLspResult(result, 'Compilation failed') as PreviewDelta;
+    }
+
     /**
      * Get list of dashboards from a YAML file.
      *
@@ -240,9 +349,10 @@ export class DashboardCompilerLSP {
      *
      * @param filePath Path to the YAML file
      * @param dashboardIndex Index of the dashboard to extract (default: 0)
+     * @param token Optional token to cancel the request when its result is no longer needed
      * @returns Grid layout information
      */
-    async getGridLayout(filePath: string, dashboardIndex: number = 0): Promise<DashboardGridInfo> {
+    async getGridLayout(filePath: string, dashboardIndex: number = 0, token?: vscode.CancellationToken): Promise<DashboardGridInfo> {
         if (!this.client) {
             throw new Error('LSP client not started');
         }
@@ -250,12 +360,37 @@ export class DashboardCompilerLSP {
         const result = await this.client.sendRequest<GridLayoutResult>(
             'dashboard/getGridLayout',
             // eslint-disable-next-line @typescript-eslint/naming-convention
-            { path: filePath, dashboard_index: dashboardIndex }
+            { path: filePath, dashboard_index: dashboardIndex },
+            token
         );
 
         return (this.checkLspResult(result, 'Failed to get grid layout') || { title: '', description: '', panels: [] }) as DashboardGridInfo;
     }
 
+    /**
+     * Update the grid coordinates of panels in a YAML dashboard file.
+     * All updates are applied with a single rewrite of the file.
+     *
+     * @param filePath Path to the YAML file
+     * @param dashboardIndex Index of the dashboard containing the panels
+     * @param grids New grid coordinates by panel ID, or panel_<index> for panels without an ID
+     */
+    async updateGrids(filePath: string, dashboardIndex: number, grids: Map<string, PanelGridInfo['grid']>): Promise<void> {
+        if (!this.client) {
+            throw new Error('LSP client not started');
+        }
+
+        // eslint-disable-next-line @typescript-eslint/naming-convention
+        const updates = Array.from(grids, ([panelId, grid]) => ({ panel_id: panelId, grid }));
+        const result = await this.client.sendRequest<UpdateGridResult>(
+            'dashboard/updateGrid',
+            // eslint-disable-next-line @typescript-eslint/naming-convention
+            { path: filePath, dashboard_index: dashboardIndex, updates }
+        );
+
+        this.checkLspResult(result, 'Failed to update grid');
+    }
+
     /**
      * Upload a compiled dashboard to Kibana.
      *
@@ -310,19 +445,55 @@ export class DashboardCompilerLSP {
         };
     }
 
+    /**
+     * Compile every dashboard file of the workspace into one NDJSON file, like `kb-dashboard compile`.
+     * The server reports its progress, which the user can cancel, and publishes the problems of each file as diagnostics.
+     *
+     * @returns The output path, the numbers of dashboard files and dashboards, and the files that failed
+     */
+    async compileWorkspace(): Promise<CompileWorkspaceResult> {
+        if (!this.client) {
+            throw new Error('LSP client not started');
+        }
+
+        const result = await this.client.sendRequest<CompileWorkspaceResult>('workspace/executeCommand', {
+            command: 'dashboard.compileWorkspace'
+        });
+        if (!result.success && !result.cancelled) {
+            throw new Error(result.error || 'Workspace compilation failed');
+        }
+        return result;
+    }
+
+    /**
+     * Write the performance figures of the server to its output channel: request latencies, compile worker
+     * utilisation, time per phase, cache hit rates and memory.
+     */
+    async showStats(): Promise<void> {
+        if (!this.client) {
+            throw new Error('LSP client not started');
+        }
+
+        const result = await this.client.sendRequest<StatsResult>('dashboard/stats', {});
+        this.checkLspResult(result, 'Getting server stats failed');
+        this.outputChannel.appendLine(`Server stats: ${JSON.stringify(result.data, null, 2)}`);
+        this.outputChannel.show(true);
+    }
+
     /**
      * Get the JSON schema for dashboard YAML files.
      * This schema is used for auto-complete and validation in the YAML editor.
      *
-     * @returns Schema result with success status and schema data
+     * @param cachedVersion Version of a previously fetched schema, the server leaves out the schema data if it is unchanged
+     * @returns Schema result with success status, schema version and schema data
      */
-    async getSchema(): Promise<{ success: boolean; data?: unknown; error?: string }> {
+    async getSchema(cachedVersion?: string): Promise<SchemaResult> {
         if (!this.client) {
             return { success: false, error: 'LSP client not started' };
         }
 
         try {
-            return await this.client.sendRequest('dashboard/getSchema', {});
+            return await this.client.sendRequest<SchemaResult>('dashboard/getSchema', { version: cachedVersion });
         } catch (error) {
             return { success: false, error: error instanceof Error ? error.message : String(error) };
         }
@@ -333,6 +504,7 @@ export class DashboardCompilerLSP {
             await this.client.stop();
             this.client = null;
         }
+        this.documentChangedEmitter.dispose();
         this.outputChannel.dispose();
     }
 }
@@ -40,6 +40,22 @@ export class ConfigService {
         return ConfigService.get<boolean>('compileOnSave', true);
     }
 
+    /**
+     * Gets the preview on type setting.
+     * @returns True if the preview should follow unsaved edits, false otherwise
+     */
+    getPreviewOnType(): boolean {
+        return ConfigService.get<boolean>('previewOnType', true);
+    }
+
+    /**
+     * Gets the server stats log interval setting.
+     * @returns Seconds between summaries of the server's performance figures in its output channel, 0 for none
+     */
+    getServerStatsLogInterval(): number {
+        return ConfigService.get<number>('serverStatsLogInterval', 0);
+    }
+
     /**
      * Gets the Kibana URL setting.
      * @returns The configured Kibana URL
@@ -11,6 +11,16 @@ let previewPanel: PreviewPanel;
 let gridEditorPanel: GridEditorPanel;
 let configService: ConfigService;
 
+// Schema served to the YAML extension, and the key under which it is cached between sessions
+const schemaStateKey = 'yamlDashboard.schema';
+let schemaJSON: string | undefined;
+let schemaRegistered = false;
+
+interface CachedSchema {
+    version: string;
+    json: string;
+}
+
 /**
  * Checks if a YAML document contains a 'dashboards' root key.
  * Uses VS Code's TextDocument API when available to access in-memory content,
@@ -144,8 +154,48 @@ function createDashboardCommand(action: (filePath: string, dashboardIndex: numbe
  * Register JSON schema with the YAML extension for auto-complete support.
  * This enables schema-based validation, hover documentation, and auto-complete
  * for dashboard YAML files.
+ *
+ * The schema cached by a previous session is registered right away, before the
+ * LSP server has started. Call refreshYamlSchema once it has.
+ */
+async function registerYamlSchema(context: vscode.ExtensionContext): Promise<void> {
+    const cached = context.globalState.get<CachedSchema>(schemaStateKey);
+    if (cached) {
+        schemaJSON = cached.json;
+        await registerSchemaContributor();
+    }
+}
+
+/**
+ * Fetch the schema from the LSP server, which only sends it if it differs from the cached one,
+ * and register or update it.
+ */
+async function refreshYamlSchema(context: vscode.ExtensionContext): Promise<void> {
+    const cached = context.globalState.get<CachedSchema>(schemaStateKey);
+    const schemaResult = await compiler.getSchema(cached?.version);
+
+    if (!schemaResult.success) {
+        console.error('Failed to get schema from LSP server:', schemaResult.error);
+        return;
+    }
+
+    if (schemaResult.data && schemaResult.version) {
+        schemaJSON = JSON.stringify(schemaResult.data);
+        await context.globalState.update(schemaStateKey, { version: schemaResult.version, json: schemaJSON });
+    }
+
+    await registerSchemaContributor();
+}
+
+/**
+ * Register the schema contributor with the YAML extension once a schema is available.
+ * The contributor serves the latest schema, so later refreshes need no new registration.
  */
-async function registerYamlSchema(): Promise<void> {
+async function registerSchemaContributor(): Promise<void> {
+    if (schemaRegistered || !schemaJSON) {
+        return;
+    }
+
     // Check if YAML extension is available
     const yamlExtension = vscode.extensions.getExtension('redhat.vscode-yaml');
     if (!yamlExtension) {
@@ -157,16 +207,6 @@ async function registerYamlSchema(): Promise<void> {
         // Activate the YAML extension if not already active
         const yamlApi = await yamlExtension.activate();
 
-        // Fetch schema from our LSP server
-        const schemaResult = await compiler.getSchema();
-
-        if (!schemaResult.success || !schemaResult.data) {
-            console.error('Failed to get schema from LSP server:', schemaResult.error);
-            return;
-        }
-
-        const schemaJSON = JSON.stringify(schemaResult.data);
-
         // Register the schema contributor
         // The contributor provides schemas for matching URIs
         yamlApi.registerContributor(
@@ -190,6 +230,7 @@ async function registerYamlSchema(): Promise<void> {
             }
         );
 
+        schemaRegistered = true;
         console.log('YAML schema registered successfully');
     } catch (error) {
         console.error('Failed to register YAML schema:', error);
@@ -202,14 +243,20 @@ export async function activate(context: vscode.ExtensionContext) {
     configService = new ConfigService(context);
     compiler = new DashboardCompilerLSP(context, configService);
 
+    // Register the schema cached by a previous session with the YAML extension for auto-complete
+    await registerYamlSchema(context);
+
     // Start the LSP server
     await compiler.start();
 
-    // Register JSON schema with YAML extension for auto-complete
-    await registerYamlSchema();
+    // Fetch the current schema, the server only sends it if it changed. The server generates it
+    // in the background after starting, so activation does not wait for it
+    refreshYamlSchema(context).catch((error) => {
+        console.error('Failed to refresh YAML schema:', error);
+    });
 
     previewPanel = new PreviewPanel(compiler);
-    gridEditorPanel = new GridEditorPanel(context, configService);
+    gridEditorPanel = new GridEditorPanel(context, compiler);
 
     // Setup file watching for auto-compile
     const fileWatcherDisposables = setupFileWatcher(compiler, previewPanel, configService);
@@ -232,6 +279,40 @@ export async function activate(context: vscode.ExtensionContext) {
         }))
     );
 
+    // Register compile workspace command, the server shows the progress
+    context.subscriptions.push(
+        vscode.commands.registerCommand('yamlDashboard.compileWorkspace', async () => {
+            try {
+                const result = await compiler.compileWorkspace();
+                if (result.cancelled) {
+                    vscode.window.showInformationMessage('Workspace compilation cancelled');
+                    return;
+                }
+                const errors = result.errors ?? [];
+                const summary = `Compiled ${result.dashboards ?? 0} dashboard(s) from ${result.files ?? 0} file(s)`
+                    + (result.output ? ` to ${vscode.workspace.asRelativePath(result.output)}` : '');
+                if (errors.length > 0) {
+                    vscode.window.showWarningMessage(`${summary}, ${errors.length} file(s) with errors, see the Problems view`);
+                } else {
+                    vscode.window.showInformationMessage(summary);
+                }
+            } catch (error) {
+                vscode.window.showErrorMessage(`Workspace compilation failed: ${error instanceof Error ? error.message : String(error)}`);
+            }
+        })
+    );
+
+    // Register show server stats command
+    context.subscriptions.push(
+        vscode.commands.registerCommand('yamlDashboard.showServerStats', async () => {
+            try {
+                await compiler.showStats();
+            } catch (error) {
+                vscode.window.showErrorMessage(`Getting server stats failed: ${error instanceof Error ? error.message : String(error)}`);
+            }
+        })
+    );
+
     // Register preview command
     context.subscriptions.push(
         vscode.commands.registerCommand('yamlDashboard.preview', createDashboardCommand(async (filePath, dashboardIndex) => {
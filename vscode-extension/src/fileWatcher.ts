@@ -92,5 +92,13 @@ export function setupFileWatcher(
         }
     });
 
-    return [saveWatcher, fileWatcher];
+    // Follow unsaved edits, the server sends one notification per burst of edits
+    const changeWatcher = compiler.onDidChangeDocument(async (filePath) => {
+        if (configService.getPreviewOnType()) {
+            // Update preview if it's open
+            await previewPanel.updatePreview(filePath);
+        }
+    });
+
+    return [saveWatcher, fileWatcher, changeWatcher];
 }
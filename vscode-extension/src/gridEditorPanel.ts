@@ -1,38 +1,20 @@
 import * as vscode from 'vscode';
 import * as path from 'path';
-import { spawn } from 'child_process';
+import { DashboardCompilerLSP, DashboardGridInfo, PanelGridInfo } from './compiler';
 import { escapeHtml, getLoadingContent, getErrorContent } from './webviewUtils';
-import { ConfigService } from './configService';
-
-interface PanelGridInfo {
-    id: string;
-    title: string;
-    type: string;
-    grid: {
-        x: number;
-        y: number;
-        w: number;
-        h: number;
-    };
-}
-
-interface DashboardGridInfo {
-    title: string;
-    description: string;
-    panels: PanelGridInfo[];
-}
 
 export class GridEditorPanel {
     private panel: vscode.WebviewPanel | undefined;
     private currentDashboardPath: string | undefined;
     private currentDashboardIndex: number = 0;
-    private extensionPath: string;
+    // Moves made while an update is being written, sent together as the next batch
+    private pendingGrids = new Map<string, PanelGridInfo['grid']>();
+    private updateInFlight: Promise<void> | undefined;
 
     constructor(
         private context: vscode.ExtensionContext,
-        private configService: ConfigService
+        private compiler: DashboardCompilerLSP
     ) {
-        this.extensionPath = context.extensionPath;
     }
 
     async show(dashboardPath: string, dashboardIndex: number = 0) {
@@ -86,112 +68,37 @@ export class GridEditorPanel {
         this.panel.webview.html = getLoadingContent('Loading grid editor...');
 
         try {
-            const gridInfo = await this.extractGridInfo(dashboardPath, dashboardIndex);
+            const gridInfo = await this.compiler.getGridLayout(dashboardPath, dashboardIndex);
             this.panel.webview.html = this.getGridEditorContent(gridInfo, dashboardPath);
         } catch (error) {
             this.panel.webview.html = getErrorContent(error, 'Grid Editor Error');
         }
     }
 
-    private async extractGridInfo(dashboardPath: string, dashboardIndex: number = 0): Promise<DashboardGridInfo> {
-        const pythonPath = this.configService.getPythonPath();
-        const scriptPath = path.join(this.extensionPath, 'python', 'grid_extractor.py');
-
-        return new Promise((resolve, reject) => {
-            const process = spawn(pythonPath, [scriptPath, dashboardPath, dashboardIndex.toString()], {
-                cwd: path.join(this.extensionPath, '..')
-            });
-
-            let stdout = '';
-            let stderr = '';
-
-            const timeout = setTimeout(() => {
-                process.kill();
-                reject(new Error('Grid extraction timed out after 30 seconds'));
-            }, 30000);
-
-            process.on('error', (err) => {
-                clearTimeout(timeout);
-                reject(new Error(`Failed to start Python: ${err.message}`));
-            });
-
-            process.stdout.on('data', (data) => {
-                stdout += data.toString();
-            });
-
-            process.stderr.on('data', (data) => {
-                stderr += data.toString();
-            });
-
-            process.on('close', (code) => {
-                clearTimeout(timeout);
-                if (code !== 0) {
-                    reject(new Error(`Grid extraction failed: ${stderr || stdout}`));
-                    return;
-                }
-
-                try {
-                    const result = JSON.parse(stdout);
-                    if (result.error) {
-                        reject(new Error(result.error));
-                    } else {
-                        resolve(result);
-                    }
-                } catch (error) {
-                    reject(new Error(`Failed to parse grid info: ${error}`));
-                }
-            });
-        });
-    }
-
-    private async updatePanelGrid(panelId: string, grid: { x: number; y: number; w: number; h: number }): Promise<string | undefined> {
+    private async updatePanelGrid(panelId: string, grid: PanelGridInfo['grid']): Promise<void> {
         if (!this.currentDashboardPath) {
             return;
         }
 
-        const pythonPath = this.configService.getPythonPath();
-        const scriptPath = path.join(this.extensionPath, 'python', 'grid_updater.py');
-
-        return new Promise((resolve, reject) => {
-            const process = spawn(
-                pythonPath,
-                [scriptPath, this.currentDashboardPath!, panelId, JSON.stringify(grid), this.currentDashboardIndex.toString()],
-                {
-                    cwd: path.join(this.extensionPath, '..')
-                }
-            );
-
-            let stdout = '';
-            let stderr = '';
-
-            const timeout = setTimeout(() => {
-                process.kill();
-                reject(new Error('Grid update timed out after 30 seconds'));
-            }, 30000);
-
-            process.on('error', (err) => {
-                clearTimeout(timeout);
-                reject(new Error(`Failed to start Python: ${err.message}`));
-            });
-
-            process.stdout.on('data', (data) => {
-                stdout += data.toString();
-            });
-
-            process.stderr.on('data', (data) => {
-                stderr += data.toString();
+        this.pendingGrids.set(panelId, grid);
+        if (!this.updateInFlight) {
+            this.updateInFlight = this.flushGridUpdates().finally(() => {
+                this.updateInFlight = undefined;
             });
+        }
+        await this.updateInFlight;
+    }
 
-            process.on('close', (code) => {
-                clearTimeout(timeout);
-                if (code !== 0) {
-                    vscode.window.showErrorMessage(`Failed to update grid: ${stderr || stdout}`);
-                    reject(new Error(stderr || stdout));
-                } else {
-                    resolve(stdout);
-                }
-            });
-        });
+    private async flushGridUpdates(): Promise<void> {
+        while (this.pendingGrids.size > 0 && this.currentDashboardPath) {
+            const grids = this.pendingGrids;
+            this.pendingGrids = new Map();
+            try {
+                await this.compiler.updateGrids(this.currentDashboardPath, this.currentDashboardIndex, grids);
+            } catch (error) {
+                vscode.window.showErrorMessage(`Failed to update grid: ${error instanceof Error ? error.message : String(error)}`);
+            }
+        }
     }
 
     private isPathInWorkspace(filePath: string): boolean {
@@ -1,6 +1,6 @@
 import * as vscode from 'vscode';
 import * as path from 'path';
-import { DashboardCompilerLSP, CompiledDashboard, DashboardGridInfo } from './compiler';
+import { DashboardCompilerLSP, DashboardGridInfo, PreviewDelta } from './compiler';
 import { escapeHtml, getLoadingContent, getErrorContent } from './webviewUtils';
 
 export class PreviewPanel {
@@ -10,6 +10,9 @@ export class PreviewPanel {
     private panel: vscode.WebviewPanel | undefined;
     private currentDashboardPath: string | undefined;
     private currentDashboardIndex: number = 0;
+    private pendingUpdate: vscode.CancellationTokenSource | undefined;
+    // Version of the payload the webview has, undefined until it has the whole dashboard
+    private previewVersion: number | undefined;
 
     constructor(private compiler: DashboardCompilerLSP) {
     }
@@ -17,6 +20,7 @@ export class PreviewPanel {
     async show(dashboardPath: string, dashboardIndex: number = 0) {
         this.currentDashboardPath = dashboardPath;
         this.currentDashboardIndex = dashboardIndex;
+        this.previewVersion = undefined;
 
         if (!this.panel) {
             this.panel = vscode.window.createWebviewPanel(
@@ -31,6 +35,16 @@ export class PreviewPanel {
 
             this.panel.onDidDispose(() => {
                 this.panel = undefined;
+                this.previewVersion = undefined;
+                this.pendingUpdate?.cancel();
+            });
+
+            // The webview asks for the whole dashboard when a delta does not apply to its version
+            this.panel.webview.onDidReceiveMessage(async message => {
+                if (message.command === 'resync' && this.currentDashboardPath) {
+                    this.previewVersion = undefined;
+                    await this.updatePreview(this.currentDashboardPath, this.currentDashboardIndex);
+                }
             });
         }
 
@@ -47,30 +61,54 @@ export class PreviewPanel {
             return;
         }
 
-        this.panel.webview.html = getLoadingContent('Compiling dashboard...');
+        // Cancel the compile of an older version, only the latest one is shown
+        this.pendingUpdate?.cancel();
+        this.pendingUpdate?.dispose();
+        const update = new vscode.CancellationTokenSource();
+        this.pendingUpdate = update;
+        const token = update.token;
+
+        // A preview that is already shown is updated in place, without reloading the webview
+        if (this.previewVersion === undefined) {
+            this.panel.webview.html = getLoadingContent('Compiling dashboard...');
+        }
 
         try {
-            const compiled = await this.compiler.compile(dashboardPath, dashboardIndex);
+            const delta = await this.compiler.compilePreview(dashboardPath, dashboardIndex, this.previewVersion, token);
             let gridInfo: DashboardGridInfo = { title: '', description: '', panels: [] };
             try {
-                gridInfo = await this.compiler.getGridLayout(dashboardPath, dashboardIndex);
+                gridInfo = await this.compiler.getGridLayout(dashboardPath, dashboardIndex, token);
             } catch (gridError) {
-                console.warn('Grid extraction failed, showing preview without layout:', gridError);
+                if (!token.isCancellationRequested) {
+                    console.warn('Grid extraction failed, showing preview without layout:', gridError);
+                }
+            }
+            if (!token.isCancellationRequested && this.panel) {
+                const layoutHtml = this.generateLayoutHtml(gridInfo);
+                if (delta.base_version === null) {
+                    this.panel.webview.html = this.getWebviewContent(delta, dashboardPath, layoutHtml);
+                } else {
+                    await this.panel.webview.postMessage({ command: 'applyDelta', delta, layoutHtml });
+                }
+                this.previewVersion = delta.version;
             }
-            this.panel.webview.html = this.getWebviewContent(compiled, dashboardPath, gridInfo);
         } catch (error) {
-            this.panel.webview.html = getErrorContent(error, 'Compilation Error');
+            if (!token.isCancellationRequested && this.panel) {
+                this.panel.webview.html = getErrorContent(error, 'Compilation Error');
+                this.previewVersion = undefined;
+            }
+        } finally {
+            if (this.pendingUpdate === update) {
+                this.pendingUpdate = undefined;
+                update.dispose();
+            }
         }
     }
 
-    private getWebviewContent(dashboard: CompiledDashboard, filePath: string, gridInfo: DashboardGridInfo): string {
-        // Cast to any for property access since CompiledDashboard structure is dynamic
-        // eslint-disable-next-line @typescript-eslint/no-explicit-any
-        const dashboardData = dashboard as any;
+    private getWebviewContent(delta: PreviewDelta, filePath: string, layoutHtml: string): string {
         const fileName = path.basename(filePath);
-        const ndjson = JSON.stringify(dashboard);
-        const layoutHtml = this.generateLayoutHtml(gridInfo);
-        const jsonFieldsHtml = this.generateJsonFieldsHtml(dashboardData);
+        // Escape '<' so that the payload cannot close the script element it is embedded in
+        const deltaJson = JSON.stringify(delta).replace(/</g, '\\u003c');
 
         return `
             <!DOCTYPE html>
@@ -262,7 +300,7 @@ export class PreviewPanel {
             </head>
             <body>
                 <div class="header">
-                    <div class="title">${escapeHtml(dashboardData.attributes?.title || 'Dashboard')}</div>
+                    <div class="title" id="title"></div>
                     <div class="file-path">${escapeHtml(fileName)}</div>
                     <div class="actions">
                         <button class="export-btn" onclick="copyToClipboard()">
@@ -281,28 +319,149 @@ export class PreviewPanel {
                     <div class="section-title">Dashboard Information</div>
                     <div class="info-grid">
                         <div class="info-label">Type:</div>
-                        <div class="info-value">${escapeHtml(dashboardData.type || 'N/A')}</div>
+                        <div class="info-value" id="info-type"></div>
                         <div class="info-label">ID:</div>
-                        <div class="info-value">${escapeHtml(dashboardData.id || 'N/A')}</div>
+                        <div class="info-value" id="info-id"></div>
                         <div class="info-label">Version:</div>
-                        <div class="info-value">${escapeHtml(dashboardData.version || 'N/A')}</div>
+                        <div class="info-value" id="info-version"></div>
                     </div>
                 </div>
 
                 <div class="section">
                     <div class="section-title">Dashboard Layout</div>
-                    ${layoutHtml}
+                    <div id="layout">${layoutHtml}</div>
                 </div>
 
-                ${jsonFieldsHtml}
+                <div class="section">
+                    <div class="section-title">Dashboard JSON Fields</div>
+                    ${this.generateJsonFieldHtml('panels-json', 'Panels JSON')}
+                    ${this.generateJsonFieldHtml('options-json', 'Options JSON')}
+                    ${this.generateJsonFieldHtml('controls-json', 'Controls JSON')}
+                </div>
 
                 <div class="section">
                     <div class="section-title">Compiled NDJSON Output</div>
-                    <pre><code>${escapeHtml(JSON.stringify(dashboard, null, 2))}</code></pre>
+                    <pre><code id="ndjson-code"></code></pre>
                 </div>
 
                 <script>
-                    const ndjsonData = ${JSON.stringify(ndjson)};
+                    const vscode = acquireVsCodeApi();
+                    let ndjsonData = '';
+
+                    // The previewed dashboard without its panels, and its panels by ID, kept in step
+                    // with the server by applying its deltas
+                    const state = { version: null, dashboard: {}, order: [], panels: {} };
+                    const panelElements = new Map();
+
+                    function applyDelta(delta) {
+                        if (delta.base_version !== null && delta.base_version !== state.version) {
+                            return false;
+                        }
+                        if (delta.base_version === null) {
+                            state.panels = {};
+                            panelElements.forEach(element => element.remove());
+                            panelElements.clear();
+                        }
+                        if (delta.dashboard !== undefined) {
+                            state.dashboard = delta.dashboard;
+                        }
+                        if (delta.order !== undefined) {
+                            state.order = delta.order;
+                        }
+
+                        for (const id of delta.remove) {
+                            delete state.panels[id];
+                            const element = panelElements.get(id);
+                            if (element) {
+                                element.remove();
+                                panelElements.delete(id);
+                            }
+                        }
+                        for (const [id, panel] of Object.entries(delta.upsert)) {
+                            state.panels[id] = panel;
+                            let element = panelElements.get(id);
+                            if (!element) {
+                                element = document.createElement('pre');
+                                element.appendChild(document.createElement('code'));
+                                panelElements.set(id, element);
+                            }
+                            element.firstChild.textContent = JSON.stringify(panel, null, 2);
+                        }
+                        if (delta.order !== undefined) {
+                            const list = document.getElementById('panels-json-list');
+                            state.order.forEach(id => list.appendChild(panelElements.get(id)));
+                        }
+
+                        state.version = delta.version;
+                        render();
+                        return true;
+                    }
+
+                    // Whether the panels were split off the dashboard, which the server does not do
+                    // for panels without unique IDs
+                    function hasSplitPanels() {
+                        const attributes = state.dashboard.attributes;
+                        return attributes !== undefined && attributes !== null && !('panelsJSON' in attributes);
+                    }
+
+                    function currentDashboard() {
+                        if (!hasSplitPanels()) {
+                            return state.dashboard;
+                        }
+                        const panelsJSON = JSON.stringify(state.order.map(id => state.panels[id]));
+                        return { ...state.dashboard, attributes: { ...state.dashboard.attributes, panelsJSON } };
+                    }
+
+                    function formatJson(json) {
+                        try {
+                            return JSON.stringify(JSON.parse(json), null, 2);
+                        } catch {
+                            return json;
+                        }
+                    }
+
+                    function showJsonField(id, json) {
+                        document.getElementById(id + '-section').style.display = typeof json === 'string' ? '' : 'none';
+                        document.getElementById(id + '-code').textContent = typeof json === 'string' ? formatJson(json) : '';
+                    }
+
+                    function render() {
+                        const dashboard = currentDashboard();
+                        const attributes = dashboard.attributes || {};
+                        const controls = attributes.controlGroupInput || {};
+                        const split = hasSplitPanels();
+
+                        document.getElementById('title').textContent = attributes.title || 'Dashboard';
+                        document.getElementById('info-type').textContent = dashboard.type || 'N/A';
+                        document.getElementById('info-id').textContent = dashboard.id || 'N/A';
+                        document.getElementById('info-version').textContent = dashboard.version || 'N/A';
+
+                        if (split) {
+                            document.getElementById('panels-json-section').style.display = '';
+                        } else {
+                            showJsonField('panels-json', attributes.panelsJSON);
+                        }
+                        document.getElementById('panels-json-list').style.display = split ? '' : 'none';
+                        document.getElementById('panels-json-code').parentElement.style.display = split ? 'none' : '';
+                        showJsonField('options-json', attributes.optionsJSON);
+                        showJsonField('controls-json', controls.panelsJSON);
+
+                        ndjsonData = JSON.stringify(dashboard);
+                        document.getElementById('ndjson-code').textContent = JSON.stringify(dashboard, null, 2);
+                    }
+
+                    window.addEventListener('message', event => {
+                        const message = event.data;
+                        if (message.command === 'applyDelta') {
+                            if (applyDelta(message.delta)) {
+                                document.getElementById('layout').innerHTML = message.layoutHtml;
+                            } else {
+                                vscode.postMessage({ command: 'resync' });
+                            }
+                        }
+                    });
+
+                    applyDelta(${deltaJson});
 
                     function toggleCollapsible(id) {
                         const content = document.getElementById(id);
@@ -398,87 +557,20 @@ export class PreviewPanel {
         return labels[type.toLowerCase()] || type;
     }
 
-    private generateJsonFieldsHtml(dashboardData: Record<string, unknown>): string {
-        const sections: Array<{ id: string; title: string; json: string | null }> = [];
-
-        // Extract panelsJSON
-        const panelsJSON = this.getNestedProperty(dashboardData, 'attributes.panelsJSON');
-        if (panelsJSON && typeof panelsJSON === 'string') {
-            sections.push({
-                id: 'panels-json',
-                title: 'Panels JSON',
-                json: panelsJSON,
-            });
-        }
-
-        // Extract optionsJSON
-        const optionsJSON = this.getNestedProperty(dashboardData, 'attributes.optionsJSON');
-        if (optionsJSON && typeof optionsJSON === 'string') {
-            sections.push({
-                id: 'options-json',
-                title: 'Options JSON',
-                json: optionsJSON,
-            });
-        }
-
-        // Extract controlGroupInput.panelsJSON (controls)
-        const controlsJSON = this.getNestedProperty(dashboardData, 'attributes.controlGroupInput.panelsJSON');
-        if (controlsJSON && typeof controlsJSON === 'string') {
-            sections.push({
-                id: 'controls-json',
-                title: 'Controls JSON',
-                json: controlsJSON,
-            });
-        }
-
-        if (sections.length === 0) {
-            return '';
-        }
-
-        let html = '<div class="section"><div class="section-title">Dashboard JSON Fields</div>';
-
-        for (const section of sections) {
-            if (section.json === null) {
-                continue;
-            }
-
-            let formattedJson: string;
-            try {
-                const parsed = JSON.parse(section.json);
-                formattedJson = JSON.stringify(parsed, null, 2);
-            } catch {
-                formattedJson = section.json;
-            }
-
-            html += `
-                <div class="collapsible-section json-field-section">
-                    <div class="collapsible-header" onclick="toggleCollapsible('${section.id}')">
-                        <span class="collapsible-arrow" id="${section.id}-arrow">▶</span>
-                        <span>${escapeHtml(section.title)}</span>
-                    </div>
-                    <div class="collapsible-content" id="${section.id}">
-                        <pre><code>${escapeHtml(formattedJson)}</code></pre>
-                    </div>
+    private generateJsonFieldHtml(id: string, title: string): string {
+        // Filled in by the webview script, panels get one block each so they can be updated one at a time
+        return `
+            <div class="collapsible-section json-field-section" id="${id}-section">
+                <div class="collapsible-header" onclick="toggleCollapsible('${id}')">
+                    <span class="collapsible-arrow" id="${id}-arrow">▶</span>
+                    <span>${escapeHtml(title)}</span>
                 </div>
-            `;
-        }
-
-        html += '</div>';
-        return html;
-    }
-
-    private getNestedProperty(obj: Record<string, unknown>, path: string): unknown {
-        const parts = path.split('.');
-        let current: unknown = obj;
-
-        for (const part of parts) {
-            if (current === null || current === undefined || typeof current !== 'object') {
-                return undefined;
-            }
-            current = (current as Record<string, unknown>)[part];
-        }
-
-        return current;
+                <div class="collapsible-content" id="${id}">
+                    ${id === 'panels-json' ? '<div id="panels-json-list"></div>' : ''}
+                    <pre><code id="${id}-code"></code></pre>
+                </div>
+            </div>
+        `;
     }
 
     private generateLayoutHtml(gridInfo: DashboardGridInfo): string {